@@ -3,7 +3,7 @@ from rclpy.duration import Duration
 from rclpy.node import Node
 from sensor_msgs.msg import Image, CameraInfo
 from geometry_msgs.msg import PoseStamped, TransformStamped
-from std_msgs.msg import Int32, Int32MultiArray
+from std_msgs.msg import Int32
 from cv_bridge import CvBridge
 from tf2_ros import TransformListener, Buffer
 import tf2_geometry_msgs
@@ -13,6 +13,7 @@ import time
 import math
 from collections import deque
 from geometry_msgs.msg import PoseArray, Pose
+from logistics_interfaces.msg import MarkerPoseArray
 
 # 상수 정의
 TARGET_WIDTH = 320
@@ -22,6 +23,7 @@ DEPTH_SCALE = 0.001
 MIN_DEPTH = 0.3
 MAX_DEPTH = 3.0
 FRAME_SKIP = 2
+MAX_REPROJ_ERROR = 4.0  # 픽셀, 이 이상이면 신뢰도 0
 
 class FastArucoWithDepth(Node):
     def __init__(self):
@@ -34,7 +36,9 @@ class FastArucoWithDepth(Node):
         # 마커별 이동평균 버퍼
         self.position_buffers = {}  # {marker_id: deque([...])}
 
+        # RViz 시각화용 PoseArray, 노드 간 전달은 id/pose/quality가 묶인 MarkerPoseArray 사용
         self.odom_pose_array_pub = self.create_publisher(PoseArray, '/aruco/marker_pose_array_odom', 1)
+        self.marker_poses_pub = self.create_publisher(MarkerPoseArray, '/aruco/marker_poses', 10)
 
         # 파라미터 선언 및 가져오기
         self.declare_parameter('camera_frame', 'camera_color_optical_frame')
@@ -80,7 +84,6 @@ class FastArucoWithDepth(Node):
         self.pose_pub = self.create_publisher(PoseStamped, '/aruco/marker_pose', 1)
         self.odom_pose_pub = self.create_publisher(PoseStamped, '/aruco/marker_pose_odom', 1)
         self.visualization_pub = self.create_publisher(Image, '/aruco/visualization', 1)
-        self.detected_ids_pub = self.create_publisher(Int32MultiArray, '/aruco/detected_marker_ids', 1)
 
         # 상태 확인을 위한 타이머 (디버깅용)
         self.status_timer = self.create_timer(2.0, self.status_callback)
@@ -187,10 +190,12 @@ class FastArucoWithDepth(Node):
             ], dtype=np.float32)
             dist_coeffs = np.zeros((4, 1))
 
-            pose_array = []
             odom_pose_array = PoseArray()
             odom_pose_array.header.stamp = self.latest_header.stamp
             odom_pose_array.header.frame_id = self.reference_frame
+            marker_poses_msg = MarkerPoseArray()
+            marker_poses_msg.header.stamp = self.latest_header.stamp
+            marker_poses_msg.header.frame_id = self.reference_frame
 
             for marker_id, marker_corners in zip(ids.flatten(), corners):
                 marker_corners = marker_corners[0]
@@ -213,6 +218,11 @@ class FastArucoWithDepth(Node):
                 if not success:
                     continue
 
+                # 재투영 오차 기반 신뢰도
+                projected, _ = cv2.projectPoints(marker_points, rvec, tvec, camera_matrix, dist_coeffs)
+                reproj_error = float(np.mean(np.linalg.norm(projected.reshape(-1, 2) - marker_corners, axis=1)))
+                quality = self.compute_marker_quality(reproj_error, depth_value)
+
                 corrected_rvec, corrected_tvec = self.correct_marker_pose(rvec, tvec)
                 display_image = self.draw_axes(display_image, corrected_rvec.flatten(), corrected_tvec.flatten(), camera_matrix, dist_coeffs)
                 camera_pos = corrected_tvec.flatten()
@@ -240,15 +250,14 @@ class FastArucoWithDepth(Node):
                     pose.orientation = odom_pose.pose.orientation
                     odom_pose_array.poses.append(pose)
 
-                pose_array.append((marker_id, avg_pos, corrected_rvec))
+                    marker_poses_msg.ids.append(int(marker_id))
+                    marker_poses_msg.poses.append(pose)
+                    marker_poses_msg.quality.append(float(quality))
 
-            # odom_pose_array 발행
-            if len(odom_pose_array.poses) > 0:
+            # id/pose/quality를 한 메시지로 발행 (순서 맞추기 불필요)
+            if len(marker_poses_msg.ids) > 0:
                 self.odom_pose_array_pub.publish(odom_pose_array)
-                # 인식된 마커 ID들을 pose 순서와 동일하게 발행
-                detected_ids_msg = Int32MultiArray()
-                detected_ids_msg.data = [int(marker_id) for marker_id, _, _ in pose_array]
-                self.detected_ids_pub.publish(detected_ids_msg)
+                self.marker_poses_pub.publish(marker_poses_msg)
                 
             self.fps_counter += 1
             if time.time() - self.fps_start_time >= 1.0:
@@ -262,6 +271,14 @@ class FastArucoWithDepth(Node):
         except Exception as e:
             self.get_logger().error(f"Processing error: {e}")
 
+    def compute_marker_quality(self, reproj_error, depth_value):
+        """재투영 오차와 거리로 0~1 신뢰도 계산"""
+        reproj_score = max(0.0, 1.0 - reproj_error / MAX_REPROJ_ERROR)
+        # 멀수록 포즈 추정이 불안정하므로 MAX_DEPTH에서 0.3까지 선형 감소
+        depth_ratio = (depth_value - MIN_DEPTH) / (MAX_DEPTH - MIN_DEPTH)
+        depth_score = 1.0 - 0.7 * min(max(depth_ratio, 0.0), 1.0)
+        return reproj_score * depth_score
+
     def transform_to_odom(self, camera_pos, rvec):
         """
         카메라 좌표계에서 감지된 마커의 포즈를 odom 좌표계로 변환하고 2D 평면에 투영
@@ -0,0 +1,245 @@
+import json
+import math
+import os
+import time
+from collections import deque
+
+import numpy as np
+
+# 관측 노이즈 기본값 (거리 제곱에 비례해서 커짐)
+OBS_BASE_VAR = 0.0025      # (5cm)^2
+OBS_RANGE_VAR = 0.01       # 1m 당 추가 분산
+OBS_YAW_VAR = math.radians(5) ** 2
+# odom 드리프트 보정량의 시간당 변화 (프로세스 노이즈)
+DRIFT_VAR = np.diag([0.02 ** 2, 0.02 ** 2, math.radians(1) ** 2])
+# 재시작 직후 odom 원점 불확실성 (도킹 위치에서 시작한다고 가정)
+INITIAL_CORRECTION_VAR = np.diag([0.3 ** 2, 0.3 ** 2, math.radians(15) ** 2])
+MIN_LANDMARK_VAR = 1e-4
+# 보정 추정에 이미 쓴 관측은 정보를 보정과 랜드마크에 반씩 나눈다 (공분산 2배로 융합, 이중 계산 방지)
+REUSED_OBS_INFLATION = 2.0
+GN_ITERATIONS = 5
+
+
+def normalize_angle(angle):
+    return math.atan2(math.sin(angle), math.cos(angle))
+
+
+def rotation(theta):
+    c, s = math.cos(theta), math.sin(theta)
+    return np.array([[c, -s], [s, c]])
+
+
+def compose(transform, pose):
+    """SE(2) 변환 (tx, ty, theta)를 pose (x, y, yaw)에 적용"""
+    xy = rotation(transform[2]) @ np.asarray(pose[:2]) + np.asarray(transform[:2])
+    return np.array([xy[0], xy[1], normalize_angle(pose[2] + transform[2])])
+
+
+def invert(transform):
+    rot_t = rotation(transform[2]).T
+    xy = -rot_t @ np.asarray(transform[:2])
+    return np.array([xy[0], xy[1], -transform[2]])
+
+
+class LandmarkMap:
+    """
+    ArUco 마커 랜드마크 지도
+
+    랜드마크는 'map' 좌표계(처음 기록한 실행의 odom)에 (x, y, yaw) 평균과
+    3x3 공분산으로 저장한다. 현재 odom과 map 사이의 드리프트 보정량은
+    최근 관측 윈도우에 대한 작은 포즈 그래프(보정 노드 1개 + 랜드마크 노드)를
+    Gauss-Newton으로 풀어서 추정한다.
+    """
+
+    def __init__(self, path, window_size=40):
+        self.path = path
+        self.landmarks = {}  # {marker_id: {'mean', 'cov', 'count', 'last_seen'}}
+        self.correction = np.zeros(3)  # odom -> map
+        self.correction_cov = INITIAL_CORRECTION_VAR.copy()
+        self.observations = deque(maxlen=window_size)  # (marker_id, odom_pose, cov)
+        self.last_optimize_time = time.time()
+        self.dirty = False
+
+    # ---------- 저장 / 불러오기 ----------
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return 0
+        with open(self.path, 'r') as f:
+            data = json.load(f)
+        self.landmarks = {}
+        for key, entry in data.get('landmarks', {}).items():
+            self.landmarks[int(key)] = {
+                'mean': np.array(entry['mean'], dtype=float),
+                'cov': np.array(entry['cov'], dtype=float),
+                'count': int(entry.get('count', 1)),
+                'last_seen': float(entry.get('last_seen', 0.0)),
+            }
+        self.dirty = False
+        return len(self.landmarks)
+
+    def save(self):
+        if not self.path:
+            return False
+        data = {
+            'version': 1,
+            'frame': 'map',
+            'saved_at': time.time(),
+            'landmarks': {
+                str(marker_id): {
+                    'mean': entry['mean'].tolist(),
+                    'cov': entry['cov'].tolist(),
+                    'count': entry['count'],
+                    'last_seen': entry['last_seen'],
+                }
+                for marker_id, entry in self.landmarks.items()
+            },
+        }
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # 중간에 종료되어도 지도가 깨지지 않도록 임시 파일에 쓴 뒤 교체
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=1)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+        return True
+
+    # ---------- 조회 ----------
+
+    def __contains__(self, marker_id):
+        return marker_id in self.landmarks
+
+    def __len__(self):
+        return len(self.landmarks)
+
+    def get_pose_in_odom(self, marker_id):
+        """현재 odom 좌표계 기준 랜드마크 (x, y, yaw), 없으면 None"""
+        entry = self.landmarks.get(marker_id)
+        if entry is None:
+            return None
+        return compose(invert(self.correction), entry['mean'])
+
+    def get_covariance(self, marker_id):
+        entry = self.landmarks.get(marker_id)
+        return None if entry is None else entry['cov'].copy()
+
+    # ---------- 갱신 ----------
+
+    def observation_cov(self, odom_pose, robot_xy):
+        distance = math.hypot(odom_pose[0] - robot_xy[0], odom_pose[1] - robot_xy[1])
+        var_xy = OBS_BASE_VAR + OBS_RANGE_VAR * distance * distance
+        return np.diag([var_xy, var_xy, OBS_YAW_VAR])
+
+    def add_observations(self, observations, robot_xy):
+        """
+        observations: [(marker_id, x, y, yaw), ...] (odom 좌표계)
+        robot_xy: 관측 시점의 로봇 위치 (odom)
+        반환: 이미 알고 있던 마커 재관측 개수
+        """
+        now = time.time()
+        known = 0
+        parsed = []
+        for marker_id, x, y, yaw in observations:
+            odom_pose = np.array([x, y, normalize_angle(yaw)], dtype=float)
+            cov = self.observation_cov(odom_pose, robot_xy)
+            used = int(marker_id) in self.landmarks  # 보정 추정에 들어가는 관측
+            parsed.append((int(marker_id), odom_pose, cov, used))
+            if used:
+                self.observations.append((int(marker_id), odom_pose, cov))
+                known += 1
+
+        if known > 0:
+            self.optimize_correction(now)
+
+        for marker_id, odom_pose, cov, used in parsed:
+            self.fuse(marker_id, odom_pose, cov * REUSED_OBS_INFLATION if used else cov, now)
+        return known
+
+    def optimize_correction(self, now=None):
+        """
+        보정 노드 1개와 랜드마크들 사이의 포즈 그래프 최적화
+
+        잔차: compose(T, z_odom) - landmark, 가중치는 (관측 + 랜드마크) 공분산의 역행렬.
+        이전 추정값을 드리프트 노이즈만큼 넓힌 사전분포로 함께 넣는다.
+        """
+        now = time.time() if now is None else now
+        dt = max(0.0, now - self.last_optimize_time)
+        self.last_optimize_time = now
+
+        prior_mean = self.correction.copy()
+        prior_info = np.linalg.inv(self.correction_cov + DRIFT_VAR * max(dt, 1.0))
+        estimate = prior_mean.copy()
+
+        for _ in range(GN_ITERATIONS):
+            H = prior_info.copy()
+            r0 = estimate - prior_mean
+            r0[2] = normalize_angle(r0[2])
+            b = prior_info @ r0
+
+            rot = rotation(estimate[2])
+            d_rot = np.array([[-rot[1, 0], -rot[0, 0]], [rot[0, 0], -rot[1, 0]]])
+            for marker_id, odom_pose, cov in self.observations:
+                entry = self.landmarks.get(marker_id)
+                if entry is None:
+                    continue
+                predicted = compose(estimate, odom_pose)
+                residual = predicted - entry['mean']
+                residual[2] = normalize_angle(residual[2])
+
+                J = np.eye(3)
+                J[0:2, 2] = d_rot @ odom_pose[:2]
+
+                obs_cov = cov.copy()
+                obs_cov[0:2, 0:2] = rot @ cov[0:2, 0:2] @ rot.T
+                W = np.linalg.inv(obs_cov + entry['cov'])
+                H += J.T @ W @ J
+                b += J.T @ W @ residual
+
+            step = -np.linalg.solve(H, b)
+            estimate = estimate + step
+            estimate[2] = normalize_angle(estimate[2])
+            if np.linalg.norm(step) < 1e-6:
+                break
+
+        self.correction = estimate
+        self.correction_cov = np.linalg.inv(H)
+        return self.correction
+
+    def fuse(self, marker_id, odom_pose, cov, now):
+        """관측을 map 좌표계로 옮겨서 랜드마크에 칼만 융합 (없으면 새로 등록)"""
+        z = compose(self.correction, odom_pose)
+        rot = rotation(self.correction[2])
+        z_cov = cov.copy()
+        z_cov[0:2, 0:2] = rot @ cov[0:2, 0:2] @ rot.T
+        z_cov = z_cov + self.correction_cov
+
+        entry = self.landmarks.get(marker_id)
+        if entry is None:
+            self.landmarks[marker_id] = {
+                'mean': z,
+                'cov': z_cov,
+                'count': 1,
+                'last_seen': now,
+            }
+            self.dirty = True
+            return
+
+        P = entry['cov']
+        K = P @ np.linalg.inv(P + z_cov)
+        innovation = z - entry['mean']
+        innovation[2] = normalize_angle(innovation[2])
+        mean = entry['mean'] + K @ innovation
+        mean[2] = normalize_angle(mean[2])
+        P = (np.eye(3) - K) @ P
+        P = 0.5 * (P + P.T)
+        # 수치 안정용 하한
+        for i in range(3):
+            P[i, i] = max(P[i, i], MIN_LANDMARK_VAR)
+
+        entry['mean'] = mean
+        entry['cov'] = P
+        entry['count'] += 1
+        entry['last_seen'] = now
+        self.dirty = True
@@ -0,0 +1,45 @@
+class MarkerIndex:
+    """
+    마커 ID → 최신 관측 (pose, stamp, quality) 인덱스
+
+    stamp는 초 단위 float. stale_timeout보다 오래된 관측은 조회 시 무시되고
+    evict()에서 제거된다.
+    """
+
+    def __init__(self, stale_timeout=1.0, min_quality=0.0):
+        self.stale_timeout = stale_timeout
+        self.min_quality = min_quality
+        self.entries = {}  # {marker_id: (pose, stamp, quality)}
+
+    def update(self, ids, poses, qualities, stamp):
+        """한 프레임의 관측을 반영하고, 받아들인 (marker_id, pose) 목록을 반환"""
+        accepted = []
+        for marker_id, pose, quality in zip(ids, poses, qualities):
+            if quality < self.min_quality:
+                continue
+            previous = self.entries.get(marker_id)
+            # 순서가 뒤바뀌어 도착한 오래된 프레임은 덮어쓰지 않음
+            if previous is not None and previous[1] > stamp:
+                continue
+            self.entries[marker_id] = (pose, stamp, quality)
+            accepted.append((marker_id, pose))
+        return accepted
+
+    def get(self, marker_id, now):
+        entry = self.entries.get(marker_id)
+        if entry is None or now - entry[1] > self.stale_timeout:
+            return None
+        return entry[0]
+
+    def __contains__(self, marker_id):
+        return marker_id in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def evict(self, now):
+        stale = [marker_id for marker_id, entry in self.entries.items()
+                 if now - entry[1] > self.stale_timeout]
+        for marker_id in stale:
+            del self.entries[marker_id]
+        return len(stale)
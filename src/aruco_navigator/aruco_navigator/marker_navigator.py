@@ -1,9 +1,14 @@
 import rclpy
 from rclpy.node import Node
-from geometry_msgs.msg import Twist, PoseArray
+from geometry_msgs.msg import Twist, Pose
 from nav_msgs.msg import Odometry
-from std_msgs.msg import Int32, Int32MultiArray
+from std_msgs.msg import Int32
+from logistics_interfaces.msg import MarkerPoseArray
 import math
+import os
+
+from aruco_navigator.landmark_map import LandmarkMap
+from aruco_navigator.marker_index import MarkerIndex
 
 MAX_ANGULAR_VEL = 0.5
 MIN_ANGULAR_VEL = 0.3
@@ -20,23 +25,43 @@ def quaternion_to_yaw(q):
     cosy_cosp = 1.0 - 2.0 * (q.y * q.y + q.z * q.z)
     return math.atan2(siny_cosp, cosy_cosp)
 
+def yaw_to_pose(x, y, yaw):
+    pose = Pose()
+    pose.position.x = float(x)
+    pose.position.y = float(y)
+    pose.orientation.z = math.sin(yaw / 2.0)
+    pose.orientation.w = math.cos(yaw / 2.0)
+    return pose
+
 class MoveToArucoTarget(Node):
     def __init__(self):
         super().__init__('move_to_aruco_target')
+
+        # 랜드마크 지도 파라미터
+        self.declare_parameter('landmark_map_enabled', True)
+        self.declare_parameter('landmark_map_path', os.path.expanduser('~/.ros/aruco_landmark_map.json'))
+        self.declare_parameter('landmark_save_period', 5.0)
+        self.landmark_map_enabled = self.get_parameter('landmark_map_enabled').value
+        landmark_map_path = self.get_parameter('landmark_map_path').value
+        landmark_save_period = self.get_parameter('landmark_save_period').value
+
+        # 실시간 마커 인덱스 파라미터
+        self.declare_parameter('marker_stale_timeout', 1.0)
+        self.declare_parameter('min_marker_quality', 0.2)
+        marker_stale_timeout = self.get_parameter('marker_stale_timeout').value
+        min_marker_quality = self.get_parameter('min_marker_quality').value
         
         # Publishers
         self.cmd_pub = self.create_publisher(Twist, '/cmd_vel', 10)
         
         # Subscribers
         self.target_id_sub = self.create_subscription(Int32, '/aruco/target_id', self.target_id_callback, 1)
-        self.marker_pose_array_sub = self.create_subscription(PoseArray, '/aruco/marker_pose_array_odom', self.marker_pose_array_callback, 10)
-        self.marker_ids_sub = self.create_subscription(Int32MultiArray, '/aruco/detected_marker_ids', self.marker_ids_callback, 10)
+        self.marker_poses_sub = self.create_subscription(MarkerPoseArray, '/aruco/marker_poses', self.marker_poses_callback, 10)
         self.odom_sub = self.create_subscription(Odometry, '/odometry/filtered', self.odom_callback, 10)
 
         # State variables
         self.target_id = -1
-        self.marker_poses = []  # PoseArray의 poses
-        self.marker_ids = []    # 해당 poses와 순서가 일치하는 ID들
+        self.marker_index = MarkerIndex(marker_stale_timeout, min_marker_quality)  # {marker_id: 최신 pose}
         self.saved_target_poses = {}  # 마커별 저장된 위치 {marker_id: pose}
         self.robot_x = 0.0
         self.robot_y = 0.0
@@ -49,6 +74,16 @@ class MoveToArucoTarget(Node):
         self.control_loop_count = 0
         self.angle_diff_history = []
 
+        # 저장된 랜드마크 지도 불러오기
+        self.landmark_map = LandmarkMap(landmark_map_path)
+        if self.landmark_map_enabled:
+            try:
+                count = self.landmark_map.load()
+                self.get_logger().info(f"[랜드마크 지도] {count}개 로드: {landmark_map_path}")
+            except (OSError, ValueError, KeyError) as e:
+                self.get_logger().error(f"[랜드마크 지도] 로드 실패, 빈 지도로 시작: {e}")
+            self.map_save_timer = self.create_timer(landmark_save_period, self.save_landmark_map)
+
         self.timer = self.create_timer(0.1, self.control_loop)  # 10Hz
         self.get_logger().info("ArUco 배열 기반 회전+직진 제어 노드 시작 (5도 정밀도)")
 
@@ -65,29 +100,56 @@ class MoveToArucoTarget(Node):
         self.get_logger().info(f"[타겟 ID 수신] {self.target_id}")
         self.angle_diff_history.clear()
 
-    def marker_pose_array_callback(self, msg):
-        self.marker_poses = msg.poses
+        # 지도에 있는 마커면 탐색 없이 바로 출발
+        if self.landmark_map_enabled and self.target_id in self.landmark_map:
+            self.state = 'TURN_TO_TARGET'
+            self.get_logger().info(f"[상태 전환] TURN_TO_TARGET (랜드마크 지도에서 ID {self.target_id} 발견)")
+
+    def now_sec(self):
+        return self.get_clock().now().nanoseconds / 1e9
+
+    def marker_poses_callback(self, msg):
+        stamp = msg.header.stamp.sec + msg.header.stamp.nanosec / 1e9
+        accepted = self.marker_index.update(msg.ids, msg.poses, msg.quality, stamp)
         self.marker_update_count += 1
         self.last_marker_time = self.get_clock().now()
-        
-        self.get_logger().info(f"[마커 Pose 배열 수신 #{self.marker_update_count}] {len(self.marker_poses)}개 마커")
+        self.get_logger().info(f"[마커 수신 #{self.marker_update_count}] {[marker_id for marker_id, _ in accepted]}")
 
-    def marker_ids_callback(self, msg):
-        self.marker_ids = msg.data
-        self.get_logger().info(f"[마커 ID 배열 수신] {self.marker_ids}")
-        
         # 현재 인식된 마커들의 위치를 저장
-        for i, marker_id in enumerate(self.marker_ids):
-            if i < len(self.marker_poses):
-                self.saved_target_poses[marker_id] = self.marker_poses[i]
-                self.get_logger().info(f"[마커 저장] ID {marker_id} 위치 저장")
+        for marker_id, pose in accepted:
+            self.saved_target_poses[marker_id] = pose
+
+        # 랜드마크 지도 누적 및 드리프트 보정
+        if self.landmark_map_enabled:
+            self.update_landmark_map(accepted)
         
         # target_id가 있고 IDLE 상태에서만 시작
         if self.target_id != -1 and self.state == 'IDLE':
-            if (self.target_id in self.marker_ids or self.target_id in self.saved_target_poses):
+            if (self.target_id in self.marker_index or self.target_id in self.saved_target_poses):
                 self.state = 'TURN_TO_TARGET'
                 self.get_logger().info(f"[상태 전환] TURN_TO_TARGET (타겟 ID {self.target_id} 발견)")
 
+    def update_landmark_map(self, accepted):
+        observations = []
+        for marker_id, pose in accepted:
+            observations.append((marker_id, pose.position.x, pose.position.y,
+                                 quaternion_to_yaw(pose.orientation)))
+        if not observations:
+            return
+        known = self.landmark_map.add_observations(observations, (self.robot_x, self.robot_y))
+        if known > 0:
+            tx, ty, theta = self.landmark_map.correction
+            self.get_logger().info(f"[드리프트 보정] 재관측 {known}개 → 보정=({tx:.3f}, {ty:.3f}, {math.degrees(theta):.1f}°)")
+
+    def save_landmark_map(self):
+        if not self.landmark_map.dirty:
+            return
+        try:
+            self.landmark_map.save()
+            self.get_logger().debug(f"[랜드마크 지도] {len(self.landmark_map)}개 저장")
+        except OSError as e:
+            self.get_logger().error(f"[랜드마크 지도] 저장 실패: {e}")
+
     def odom_callback(self, msg):
         self.robot_x = msg.pose.pose.position.x
         self.robot_y = msg.pose.pose.position.y
@@ -98,13 +160,18 @@ class MoveToArucoTarget(Node):
         if self.target_id == -1:
             return None
         
-        # 1순위: 실시간 인식된 마커
-        if self.target_id in self.marker_ids:
-            target_index = self.marker_ids.index(self.target_id)
-            if target_index < len(self.marker_poses):
-                return self.marker_poses[target_index]
+        # 1순위: 실시간 인식된 마커 (오래된 관측은 제외)
+        live_pose = self.marker_index.get(self.target_id, self.now_sec())
+        if live_pose is not None:
+            return live_pose
         
-        # 2순위: 저장된 위치
+        # 2순위: 랜드마크 지도 (드리프트 보정 후 현재 odom 기준)
+        if self.landmark_map_enabled:
+            landmark = self.landmark_map.get_pose_in_odom(self.target_id)
+            if landmark is not None:
+                return yaw_to_pose(*landmark)
+
+        # 3순위: 저장된 위치
         if self.target_id in self.saved_target_poses:
             return self.saved_target_poses[self.target_id]
         
@@ -112,11 +179,14 @@ class MoveToArucoTarget(Node):
 
     def control_loop(self):
         self.control_loop_count += 1
+        self.marker_index.evict(self.now_sec())
         
         # 진행 가능 여부 확인
         can_proceed = False
         if self.target_id != -1:
-            if len(self.marker_poses) > 0 or self.target_id in self.saved_target_poses:
+            if len(self.marker_index) > 0 or self.target_id in self.saved_target_poses:
+                can_proceed = True
+            elif self.landmark_map_enabled and self.target_id in self.landmark_map:
                 can_proceed = True
         
         if not can_proceed:
@@ -249,6 +319,11 @@ class MoveToArucoTarget(Node):
         self.cmd_pub.publish(twist)
         self.get_logger().info("[로봇 정지]")
 
+    def destroy_node(self):
+        if self.landmark_map_enabled:
+            self.save_landmark_map()
+        super().destroy_node()
+
     def normalize_angle(self, angle):
         while angle > math.pi:
             angle -= 2 * math.pi
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+마커 id/pose 짝맞춤 벤치마크
+
+기존 방식(PoseArray + Int32MultiArray 두 토픽을 도착 순서로 짝맞춤)과
+MarkerPoseArray 단일 메시지 + MarkerIndex 방식을 같은 도착 지연 모델로
+시뮬레이션해서 잘못 짝지어진 (id, pose) 개수를 비교한다.
+
+사용 예: ros2 run aruco_navigator marker_pairing_benchmark --rate 30 --duration 60
+"""
+import argparse
+import heapq
+import random
+import time
+
+from aruco_navigator.marker_index import MarkerIndex
+
+
+class FakePose:
+    """벤치마크용 pose (실제 id와 프레임 번호를 품고 있음)"""
+
+    __slots__ = ('marker_id', 'frame')
+
+    def __init__(self, marker_id, frame):
+        self.marker_id = marker_id
+        self.frame = frame
+
+
+def generate_frames(rate, duration, marker_ids, rng):
+    frames = []
+    period = 1.0 / rate
+    for frame in range(int(rate * duration)):
+        visible = rng.sample(marker_ids, rng.randint(1, min(3, len(marker_ids))))
+        rng.shuffle(visible)
+        frames.append((frame * period, frame, visible))
+    return frames
+
+
+def delivery_delay(rng, base, jitter):
+    # 실행기 스케줄링 지연: 기본 지연 + 지수분포 꼬리
+    return base + rng.expovariate(1.0 / jitter)
+
+
+def run_legacy(frames, rng, base, jitter, drop_rate):
+    """두 토픽을 각각 독립 지연으로 전달하고 기존 콜백 로직으로 짝맞춤"""
+    events = []
+    seq = 0
+    for stamp, frame, visible in frames:
+        poses = [FakePose(marker_id, frame) for marker_id in visible]
+        # 각 퍼블리셔 depth=1 이라 느린 구독자에서는 한쪽만 버려질 수 있음
+        if rng.random() >= drop_rate:
+            heapq.heappush(events, (stamp + delivery_delay(rng, base, jitter), seq, 'poses', poses))
+            seq += 1
+        if rng.random() >= drop_rate:
+            heapq.heappush(events, (stamp + delivery_delay(rng, base, jitter), seq, 'ids', list(visible)))
+            seq += 1
+
+    latest_poses = []
+    pairs = 0
+    mismatched = 0
+    while events:
+        _, _, kind, payload = heapq.heappop(events)
+        if kind == 'poses':
+            latest_poses = payload
+            continue
+        for i, marker_id in enumerate(payload):
+            if i < len(latest_poses):
+                pairs += 1
+                if latest_poses[i].marker_id != marker_id:
+                    mismatched += 1
+    return pairs, mismatched
+
+
+def run_keyed(frames, rng, base, jitter, drop_rate):
+    """한 메시지에 id/pose/quality가 묶여서 전달되는 경우"""
+    events = []
+    for stamp, frame, visible in frames:
+        if rng.random() >= drop_rate:
+            poses = [FakePose(marker_id, frame) for marker_id in visible]
+            message = (stamp, list(visible), poses, [1.0] * len(visible))
+            heapq.heappush(events, (stamp + delivery_delay(rng, base, jitter), frame, message))
+
+    index = MarkerIndex(stale_timeout=1.0)
+    pairs = 0
+    mismatched = 0
+    while events:
+        _, _, (stamp, ids, poses, qualities) = heapq.heappop(events)
+        for marker_id, pose in index.update(ids, poses, qualities, stamp):
+            pairs += 1
+            if pose.marker_id != marker_id:
+                mismatched += 1
+    return pairs, mismatched
+
+
+def benchmark_lookup(marker_count, iterations):
+    """get_target_pose 조회 비용: list.index 선형 탐색 vs dict 조회"""
+    ids = list(range(marker_count))
+    poses = [FakePose(marker_id, 0) for marker_id in ids]
+    target = ids[-1]
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        _ = poses[ids.index(target)]
+    linear = (time.perf_counter() - start) / iterations
+
+    index = MarkerIndex(stale_timeout=1e9)
+    index.update(ids, poses, [1.0] * marker_count, 0.0)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        index.get(target, 0.0)
+    keyed = (time.perf_counter() - start) / iterations
+    return linear, keyed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ArUco id/pose 짝맞춤 벤치마크')
+    parser.add_argument('--rate', type=float, nargs='+', default=[10.0, 30.0, 60.0], help='검출 주기 (Hz)')
+    parser.add_argument('--duration', type=float, default=60.0, help='시뮬레이션 시간 (초)')
+    parser.add_argument('--markers', type=int, default=6, help='마커 개수')
+    parser.add_argument('--base-delay', type=float, default=0.002, help='기본 전달 지연 (초)')
+    parser.add_argument('--jitter', type=float, default=0.015, help='부하 시 평균 추가 지연 (초)')
+    parser.add_argument('--drop-rate', type=float, default=0.05, help='메시지 유실 확률')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    marker_ids = list(range(args.markers))
+    print(f"{'rate':>6} | {'legacy pairs':>12} {'mismatch':>9} {'rate':>7} | {'keyed pairs':>11} {'mismatch':>9}")
+    print('-' * 68)
+    for rate in args.rate:
+        frames = generate_frames(rate, args.duration, marker_ids, random.Random(args.seed))
+        legacy_pairs, legacy_bad = run_legacy(
+            frames, random.Random(args.seed + 1), args.base_delay, args.jitter, args.drop_rate)
+        keyed_pairs, keyed_bad = run_keyed(
+            frames, random.Random(args.seed + 1), args.base_delay, args.jitter, args.drop_rate)
+        legacy_ratio = legacy_bad / legacy_pairs if legacy_pairs else 0.0
+        print(f"{rate:6.1f} | {legacy_pairs:12d} {legacy_bad:9d} {legacy_ratio:7.2%} | "
+              f"{keyed_pairs:11d} {keyed_bad:9d}")
+
+    for count in (5, 50):
+        linear, keyed = benchmark_lookup(count, 100000)
+        print(f"lookup ({count} markers): list.index {linear * 1e9:.0f} ns, MarkerIndex {keyed * 1e9:.0f} ns")
+
+
+if __name__ == '__main__':
+    main()
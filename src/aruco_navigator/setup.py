@@ -29,6 +29,7 @@ setup(
             'aruco_marker_detector = aruco_navigator.aruco_marker_detector:main'    ,
             'marker_navigator = aruco_navigator.marker_navigator:main',
             'aruco_marker_navigation = aruco_navigator.aruco_marker_naviagtion:main',
+            'marker_pairing_benchmark = aruco_navigator.marker_pairing_benchmark:main',
         ],
     },
 )
\ No newline at end of file
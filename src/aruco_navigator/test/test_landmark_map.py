@@ -0,0 +1,65 @@
+import math
+
+import numpy as np
+
+from aruco_navigator.landmark_map import (
+    MIN_LANDMARK_VAR, REUSED_OBS_INFLATION, LandmarkMap, compose, invert)
+
+
+def test_compose_invert_roundtrip():
+    transform = np.array([0.5, -0.2, math.radians(30)])
+    pose = np.array([1.0, 2.0, 0.1])
+    back = compose(invert(transform), compose(transform, pose))
+    assert np.allclose(back, pose)
+
+
+def test_new_marker_registers_without_correction():
+    landmarks = LandmarkMap(None)
+    assert landmarks.add_observations([(7, 1.0, 2.0, 0.0)], (0.0, 0.0)) == 0
+    assert 7 in landmarks
+    assert np.allclose(landmarks.get_pose_in_odom(7), [1.0, 2.0, 0.0])
+
+
+def test_correction_recovers_odom_offset():
+    landmarks = LandmarkMap(None)
+    observations = [(1, 1.0, 0.0, 0.0), (2, 0.0, 1.0, 0.0), (3, -1.0, 0.0, 0.0)]
+    landmarks.add_observations(observations, (0.0, 0.0))
+    # odom 이 x 로 0.1 m 밀림: 같은 마커가 odom 에서 -0.1 m 에 보임
+    for _ in range(20):
+        landmarks.add_observations([(1, 0.9, 0.0, 0.0), (2, -0.1, 1.0, 0.0), (3, -1.1, 0.0, 0.0)],
+                                   (-0.1, 0.0))
+    assert abs(landmarks.correction[0] - 0.1) < 0.03
+    assert abs(landmarks.correction[1]) < 0.01
+
+
+def test_reused_observations_are_fused_with_inflated_variance():
+    landmarks = LandmarkMap(None)
+    landmarks.add_observations([(1, 1.0, 0.0, 0.0)], (0.0, 0.0))
+    before = landmarks.get_covariance(1)[0, 0]
+    landmarks.add_observations([(1, 1.0, 0.0, 0.0)], (0.0, 0.0))
+    after = landmarks.get_covariance(1)[0, 0]
+
+    # 융합에 쓰인 관측 분산 (보정 공분산 포함) 을 되짚어 REUSED_OBS_INFLATION 배인지 확인
+    obs_var = landmarks.observation_cov(np.array([1.0, 0.0, 0.0]), (0.0, 0.0))[0, 0]
+    z_var = before * after / (before - after)
+    assert z_var >= REUSED_OBS_INFLATION * obs_var * (1 - 1e-6)
+
+
+def test_variance_does_not_collapse_to_floor_quickly():
+    landmarks = LandmarkMap(None)
+    landmarks.add_observations([(1, 1.0, 0.0, 0.0), (2, 0.0, 1.0, 0.0)], (0.0, 0.0))
+    for _ in range(10):
+        landmarks.add_observations([(1, 1.0, 0.0, 0.0), (2, 0.0, 1.0, 0.0)], (0.0, 0.0))
+    assert landmarks.get_covariance(1)[0, 0] > MIN_LANDMARK_VAR
+
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / 'map.json')
+    landmarks = LandmarkMap(path)
+    landmarks.add_observations([(4, 2.0, 1.0, 0.5)], (0.0, 0.0))
+    assert landmarks.save()
+
+    reloaded = LandmarkMap(path)
+    assert reloaded.load() == 1
+    assert np.allclose(reloaded.get_pose_in_odom(4), landmarks.get_pose_in_odom(4))
+    assert np.allclose(reloaded.get_covariance(4), landmarks.get_covariance(4))
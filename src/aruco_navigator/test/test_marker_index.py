@@ -0,0 +1,21 @@
+from aruco_navigator.marker_index import MarkerIndex
+
+
+def test_update_skips_low_quality_and_out_of_order():
+    index = MarkerIndex(stale_timeout=1.0, min_quality=0.5)
+    accepted = index.update([1, 2], ['pose1', 'pose2'], [0.9, 0.1], stamp=10.0)
+    assert accepted == [(1, 'pose1')]
+    assert 2 not in index
+    # 더 오래된 프레임은 덮어쓰지 않음
+    assert index.update([1], ['old'], [0.9], stamp=9.5) == []
+    assert index.get(1, now=10.2) == 'pose1'
+
+
+def test_stale_entries():
+    index = MarkerIndex(stale_timeout=1.0)
+    index.update([1, 2], ['a', 'b'], [1.0, 1.0], stamp=0.0)
+    index.update([2], ['b2'], [1.0], stamp=1.5)
+    assert index.get(1, now=2.0) is None
+    assert index.get(2, now=2.0) == 'b2'
+    assert index.evict(now=2.0) == 1
+    assert len(index) == 1
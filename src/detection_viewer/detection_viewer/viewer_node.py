@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+검출 결과 뷰어 (HighGUI 는 이 프로세스에서만)
+
+- image_topic 의 결과 이미지를 표시 (compressed=true 면 <image_topic>/compressed 의 JPEG)
+- status_topic 의 JSON 상태를 정보 창에 한 줄씩 표시
+- 키 입력은 key_bindings 에 따라 <service_prefix>/<서비스> (std_srvs/Trigger) 호출로 넘김
+- 표시할 때 헤더 시각과의 차이로 카메라 → 화면 지연을 잰다
+ESC/Q 는 뷰어만 종료한다 (처리 노드는 계속 돈다).
+
+사용 예:
+    ros2 run detection_viewer detection_viewer --ros-args -p service_prefix:=/yolo_obb_node
+"""
+import json
+import time
+from collections import deque
+
+import rclpy
+from rclpy.node import Node
+from sensor_msgs.msg import CompressedImage, Image
+from std_msgs.msg import String
+from std_srvs.srv import Trigger
+from cv_bridge import CvBridge
+import cv2
+import numpy as np
+
+KEY_NAMES = {'space': ord(' ')}
+EXIT_KEYS = (27, ord('q'), ord('Q'))
+
+
+def parse_key_bindings(bindings):
+    """['space:trigger', 's:save'] → {키 코드: 서비스 이름}, 대문자도 같은 서비스"""
+    keys = {}
+    for binding in bindings:
+        key, _, service = binding.partition(':')
+        if not service:
+            raise ValueError(f'key binding {binding!r} (expected <key>:<service>)')
+        if key in KEY_NAMES:
+            keys[KEY_NAMES[key]] = service
+        elif len(key) == 1:
+            keys[ord(key.lower())] = service
+            keys[ord(key.upper())] = service
+        else:
+            raise ValueError(f'unknown key {key!r} in binding {binding!r}')
+    return keys
+
+
+class DetectionViewer(Node):
+    def __init__(self):
+        super().__init__('detection_viewer')
+
+        self.declare_parameter('image_topic', '/yolo_result')
+        self.declare_parameter('compressed', False)
+        self.declare_parameter('status_topic', '')
+        self.declare_parameter('service_prefix', '/yolo_obb_node')
+        self.declare_parameter('key_bindings', ['space:trigger', 's:save', 'r:reset'])
+        self.declare_parameter('window_name', 'Detection Viewer')
+        self.declare_parameter('crosshair', False)
+        self.declare_parameter('display_rate', 30.0)
+
+        image_topic = self.get_parameter('image_topic').value
+        self.compressed = self.get_parameter('compressed').value
+        status_topic = self.get_parameter('status_topic').value
+        self.service_prefix = self.get_parameter('service_prefix').value.rstrip('/')
+        self.keys = parse_key_bindings(self.get_parameter('key_bindings').value)
+        self.window_name = self.get_parameter('window_name').value
+        self.info_window = self.window_name + ' Info' if status_topic else None
+        self.crosshair = self.get_parameter('crosshair').value
+
+        self.bridge = CvBridge()
+        self.service_clients = {}
+        self.latest_msg = None
+        self.new_frame = False
+        self.status = None
+        self.new_status = False
+        # 지연/표시율 통계
+        self.latencies = deque(maxlen=100)
+        self.received = 0
+        self.shown = 0
+        self.shown_times = deque(maxlen=30)
+        self.last_report = time.time()
+
+        if self.compressed:
+            image_topic += '/compressed'
+            self.image_sub = self.create_subscription(CompressedImage, image_topic, self.image_callback, 1)
+        else:
+            self.image_sub = self.create_subscription(Image, image_topic, self.image_callback, 1)
+        if status_topic:
+            self.status_sub = self.create_subscription(String, status_topic, self.status_callback, 1)
+
+        cv2.namedWindow(self.window_name, cv2.WINDOW_NORMAL)
+        if self.info_window:
+            cv2.namedWindow(self.info_window, cv2.WINDOW_AUTOSIZE)
+        self.timer = self.create_timer(1.0 / self.get_parameter('display_rate').value, self.update_display)
+
+        controls = ', '.join(f"{'SPACE' if code == ord(' ') else chr(code)}={service}"
+                             for code, service in self.keys.items() if not chr(code).isupper())
+        self.get_logger().info(f'🖥️ 뷰어 시작: {image_topic} (상태 {status_topic or "없음"})')
+        self.get_logger().info(f'⌨️  {controls} → {self.service_prefix}/<서비스>, ESC/Q(뷰어 종료)')
+
+    def image_callback(self, msg):
+        # 디코딩은 표시할 때 최신 프레임만 (못 보여줄 프레임은 디코딩하지 않음)
+        self.latest_msg = msg
+        self.new_frame = True
+        self.received += 1
+
+    def status_callback(self, msg):
+        try:
+            self.status = json.loads(msg.data)
+            self.new_status = True
+        except ValueError as e:
+            self.get_logger().warn(f'⚠️ 상태 JSON 파싱 오류: {e}')
+
+    def decode(self, msg):
+        if self.compressed:
+            return cv2.imdecode(np.frombuffer(msg.data, np.uint8), cv2.IMREAD_COLOR)
+        return self.bridge.imgmsg_to_cv2(msg, 'bgr8')
+
+    def latency_ms(self, msg):
+        stamp = msg.header.stamp
+        if stamp.sec == 0 and stamp.nanosec == 0:
+            return None
+        now = self.get_clock().now().nanoseconds
+        return (now - (stamp.sec * 1_000_000_000 + stamp.nanosec)) / 1e6
+
+    def update_display(self):
+        try:
+            if self.new_frame:
+                self.new_frame = False
+                msg = self.latest_msg
+                image = self.decode(msg)
+                latency = self.latency_ms(msg)
+                if latency is not None:
+                    self.latencies.append(latency)
+                self.shown += 1
+                self.shown_times.append(time.time())
+                cv2.imshow(self.window_name, self.draw_overlay(image))
+
+            if self.info_window and self.new_status:
+                self.new_status = False
+                cv2.imshow(self.info_window, self.create_info_display())
+
+            key = cv2.waitKey(1) & 0xFF
+            if key in EXIT_KEYS:
+                self.get_logger().info('🛑 뷰어 종료')
+                rclpy.shutdown()
+                return
+            if key in self.keys:
+                self.call_service(self.keys[key])
+            self.report()
+        except Exception as e:
+            self.get_logger().error(f'디스플레이 업데이트 오류: {e}')
+
+    def draw_overlay(self, image):
+        fps = 0.0
+        if len(self.shown_times) > 1:
+            fps = (len(self.shown_times) - 1) / max(1e-3, self.shown_times[-1] - self.shown_times[0])
+        latency = f'{np.mean(self.latencies):.0f} ms' if self.latencies else '-'
+        cv2.putText(image, f'View FPS: {fps:.1f} | Latency: {latency}', (10, image.shape[0] - 10),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
+        if self.crosshair:
+            h, w = image.shape[:2]
+            cv2.line(image, (w//2 - 20, h//2), (w//2 + 20, h//2), (255, 255, 255), 2)
+            cv2.line(image, (w//2, h//2 - 20), (w//2, h//2 + 20), (255, 255, 255), 2)
+        return image
+
+    def create_info_display(self):
+        """상태 JSON 을 'key: value' 줄로"""
+        lines = [f'{key}: {value}' for key, value in self.status.items()]
+        lines.append('')
+        lines.append('Controls:')
+        for code, service in self.keys.items():
+            if not chr(code).isupper():
+                lines.append(f"{'SPACE' if code == ord(' ') else chr(code).upper()} - {service}")
+        lines.append('ESC/Q - Close viewer')
+
+        info_img = np.zeros((40 + 25 * len(lines), 500, 3), dtype=np.uint8)
+        cv2.putText(info_img, self.service_prefix or self.window_name, (10, 25),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+        cv2.line(info_img, (10, 35), (490, 35), (255, 255, 255), 1)
+        controls = lines.index('Controls:')
+        for i, line in enumerate(lines):
+            if i < controls:  # 상태 정보는 초록색
+                color = (0, 255, 0)
+            elif i == controls:  # 섹션 제목은 노란색
+                color = (0, 255, 255)
+            else:  # 설명은 흰색
+                color = (255, 255, 255)
+            cv2.putText(info_img, line, (10, 55 + i * 25), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
+        return info_img
+
+    def call_service(self, service):
+        """Trigger 서비스 비동기 호출 (응답은 로그로), 표시 타이머를 막지 않음"""
+        name = f'{self.service_prefix}/{service}'
+        client = self.service_clients.get(name)
+        if client is None:
+            client = self.service_clients[name] = self.create_client(Trigger, name)
+        if not client.service_is_ready():
+            self.get_logger().warn(f'⚠️ 서비스 없음: {name}')
+            return
+        started = time.perf_counter()
+        future = client.call_async(Trigger.Request())
+        future.add_done_callback(lambda done: self.service_done(name, done, started))
+
+    def service_done(self, name, future, started):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        try:
+            response = future.result()
+        except Exception as e:
+            self.get_logger().error(f'❌ {name} 호출 실패: {e}')
+            return
+        icon = '✅' if response.success else '⚠️'
+        self.get_logger().info(f'{icon} {name}: {response.message} ({elapsed_ms:.0f} ms)')
+
+    def report(self, period=5.0):
+        now = time.time()
+        if now - self.last_report < period or not self.received:
+            return
+        latencies = np.array(self.latencies)
+        latency = f'지연 평균 {latencies.mean():.0f} ms (p95 {np.percentile(latencies, 95):.0f})' if len(latencies) else '지연 -'
+        self.get_logger().info(f'📺 {latency}, 수신 {self.received / (now - self.last_report):.1f} fps, '
+                               f'표시 {self.shown}/{self.received}')
+        self.received = 0
+        self.shown = 0
+        self.last_report = now
+
+
+def main(args=None):
+    rclpy.init(args=args)
+    node = None
+    try:
+        node = DetectionViewer()
+        rclpy.spin(node)
+    except KeyboardInterrupt:
+        pass
+    except cv2.error as e:
+        print(f'❌ 창을 열 수 없습니다 (DISPLAY 확인): {e}')
+    finally:
+        if node is not None:
+            node.destroy_node()
+        cv2.destroyAllWindows()
+        if rclpy.ok():
+            rclpy.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,26 @@
+from setuptools import find_packages, setup
+
+package_name = 'detection_viewer'
+
+setup(
+    name=package_name,
+    version='0.0.0',
+    packages=find_packages(exclude=['test']),
+    data_files=[
+        ('share/ament_index/resource_index/packages',
+            ['resource/' + package_name]),
+        ('share/' + package_name, ['package.xml']),
+    ],
+    install_requires=['setuptools'],
+    zip_safe=True,
+    maintainer='xotn',
+    maintainer_email='james190414@gmail.com',
+    description='Standalone OpenCV viewer for annotated detection images that forwards key presses to the processing nodes as services',
+    license='TODO: License declaration',
+    tests_require=['pytest'],
+    entry_points={
+        'console_scripts': [
+            'detection_viewer = detection_viewer.viewer_node:main',
+        ],
+    },
+)
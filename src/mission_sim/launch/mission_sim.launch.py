@@ -0,0 +1,83 @@
+# mission_sim.launch.py
+# 실제 장치 없이 RobotControl 전체 미션을 돌리는 벤치마크
+# 예: ros2 launch mission_sim mission_sim.launch.py orders:=50 time_scale:=0.2 failure_rate:=0.02
+from launch import LaunchDescription
+from launch.actions import DeclareLaunchArgument, EmitEvent, RegisterEventHandler
+from launch.event_handlers import OnProcessExit
+from launch.events import Shutdown
+from launch.substitutions import LaunchConfiguration
+from launch_ros.actions import Node
+
+
+def generate_launch_description():
+    orders = LaunchConfiguration('orders')
+    order_interval = LaunchConfiguration('order_interval')
+    pickup_mode = LaunchConfiguration('pickup_mode')
+    batch_planning = LaunchConfiguration('batch_planning')
+    time_scale = LaunchConfiguration('time_scale')
+    failure_rate = LaunchConfiguration('failure_rate')
+    detections_path = LaunchConfiguration('detections_path')
+    report_path = LaunchConfiguration('report_path')
+    min_throughput = LaunchConfiguration('min_throughput')
+    seed = LaunchConfiguration('seed')
+
+    stand_in_params = {'time_scale': time_scale, 'failure_rate': failure_rate, 'seed': seed}
+
+    robot_control = Node(
+        package='robot_control',
+        executable='robot_control_node',
+        name='robot_control_node',
+        parameters=[{
+            'pickup_mode': pickup_mode,
+            'batch_planning': batch_planning,
+            # 벤치마크 실행끼리 상태가 섞이지 않도록 저장 끔
+            'order_queue_path': '',
+            'cost_model_path': '',
+            'telemetry_log_path': '',
+            'handshake_history_path': '',
+        }],
+        output='screen'
+    )
+    navigator = Node(package='mission_sim', executable='navigator_sim', name='navigator_sim',
+                     parameters=[stand_in_params], output='screen')
+    lift = Node(package='mission_sim', executable='lift_sim', name='lift_sim',
+                parameters=[stand_in_params], output='screen')
+    arm = Node(package='mission_sim', executable='arm_sim', name='arm_sim',
+               parameters=[stand_in_params], output='screen')
+    yolo = Node(package='mission_sim', executable='yolo_replay', name='yolo_replay',
+                parameters=[stand_in_params, {'detections_path': detections_path}], output='screen')
+    driver = Node(
+        package='mission_sim',
+        executable='order_driver',
+        name='order_driver',
+        parameters=[{
+            'orders': orders,
+            'order_interval': order_interval,
+            'report_path': report_path,
+            'min_throughput': min_throughput,
+            'seed': seed,
+        }],
+        output='screen'
+    )
+
+    return LaunchDescription([
+        DeclareLaunchArgument('orders', default_value='20'),
+        DeclareLaunchArgument('order_interval', default_value='0.0'),
+        DeclareLaunchArgument('pickup_mode', default_value='serial'),
+        DeclareLaunchArgument('batch_planning', default_value='true'),
+        DeclareLaunchArgument('time_scale', default_value='1.0'),
+        DeclareLaunchArgument('failure_rate', default_value='0.0'),
+        DeclareLaunchArgument('detections_path', default_value=''),
+        DeclareLaunchArgument('report_path', default_value=''),
+        DeclareLaunchArgument('min_throughput', default_value='0.0'),
+        DeclareLaunchArgument('seed', default_value='0'),
+
+        robot_control,
+        navigator,
+        lift,
+        arm,
+        yolo,
+        driver,
+        # 드라이버가 결과를 보고하고 끝나면 전체 종료 (CI 에서 종료 코드 확인)
+        RegisterEventHandler(OnProcessExit(target_action=driver, on_exit=[EmitEvent(event=Shutdown())])),
+    ])
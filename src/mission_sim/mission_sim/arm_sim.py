@@ -0,0 +1,61 @@
+import math
+
+import rclpy
+from geometry_msgs.msg import Point
+from std_msgs.msg import Bool, Int32
+
+from mission_sim.stand_in import LatencyModel, StandInNode
+
+
+class ArmSim(StandInNode):
+    """
+    로봇 팔 대역 (robot_arm_controll 과 같은 토픽)
+
+    - /robot_arm/target_position: 이동 거리에 비례한 시간 뒤 /robot_arm/mission_complete
+    - /robot_arm/gripper_control: gripper_completes 가 true 면 실제 팔처럼 그리퍼 완료도 발행
+    """
+
+    def __init__(self):
+        super().__init__('arm_sim', 'normal:0.5,0.05')
+        self.declare_parameter('per_unit', 0.05)  # 좌표 1 단위 이동당 추가 시간 (초)
+        self.declare_parameter('gripper_latency', 'normal:0.3,0.05')
+        self.declare_parameter('gripper_completes', True)
+        self.per_unit = self.get_parameter('per_unit').value
+        self.gripper_latency = LatencyModel.parse(self.get_parameter('gripper_latency').value)
+        self.gripper_completes = self.get_parameter('gripper_completes').value
+        self.position = (4.0, 0.0)
+
+        self.complete_pub = self.create_publisher(Int32, '/robot_arm/mission_complete', 10)
+        self.position_sub = self.create_subscription(Point, '/robot_arm/target_position', self.position_callback, 10)
+        self.gripper_sub = self.create_subscription(Bool, '/robot_arm/gripper_control', self.gripper_callback, 10)
+        self.get_logger().info(f'🦾 로봇 팔 대역 시작 (지연 {self.latency}, 실패율 {self.failure_rate}, 그리퍼 완료 {self.gripper_completes})')
+
+    def position_callback(self, msg):
+        distance = math.hypot(msg.x - self.position[0], msg.y - self.position[1])
+        self.position = (msg.x, msg.y)
+        complete_msg = Int32()
+        complete_msg.data = 1
+        self.respond_later(self.complete_pub, complete_msg, extra_delay=self.per_unit * distance)
+
+    def gripper_callback(self, msg):
+        if not self.gripper_completes:
+            return
+        complete_msg = Int32()
+        complete_msg.data = 1
+        self.respond_later(self.complete_pub, complete_msg, latency=self.gripper_latency)
+
+
+def main(args=None):
+    rclpy.init(args=args)
+    node = ArmSim()
+    try:
+        rclpy.spin(node)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        node.destroy_node()
+        rclpy.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+import rclpy
+from std_msgs.msg import Int32
+
+from mission_sim.stand_in import LatencyModel, StandInNode
+
+
+class LiftSim(StandInNode):
+    """
+    /lift/floor 명령을 받아 /lift_complete 발행 (serial_sender_pkg 리프트 대역)
+
+    1~3: 해당 층으로 올림, 4~6: (명령-3)층에서 반납, 9/10: 집기용 위/아래, 0: 초기화 (응답 없음)
+    """
+
+    def __init__(self):
+        super().__init__('lift_sim', 'normal:2.0,0.3')
+        self.declare_parameter('per_floor', 4.0)       # 층당 이동 시간 (초)
+        self.declare_parameter('pick_stroke', 'normal:2.5,0.3')  # 9/10번 동작 시간
+        self.per_floor = self.get_parameter('per_floor').value
+        self.pick_stroke = LatencyModel.parse(self.get_parameter('pick_stroke').value)
+
+        self.complete_pub = self.create_publisher(Int32, '/lift_complete', 10)
+        self.floor_sub = self.create_subscription(Int32, '/lift/floor', self.floor_callback, 10)
+        self.get_logger().info(f'🛗 리프트 대역 시작 (지연 {self.latency} + 층당 {self.per_floor}초, 실패율 {self.failure_rate})')
+
+    def floor_callback(self, msg):
+        command = msg.data
+        complete_msg = Int32()
+        complete_msg.data = command
+        if command == 0:
+            return
+        if command in (9, 10):
+            self.respond_later(self.complete_pub, complete_msg, latency=self.pick_stroke)
+            return
+        floors = command if command <= 3 else command - 3
+        self.respond_later(self.complete_pub, complete_msg, extra_delay=self.per_floor * floors)
+
+
+def main(args=None):
+    rclpy.init(args=args)
+    node = LiftSim()
+    try:
+        rclpy.spin(node)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        node.destroy_node()
+        rclpy.shutdown()
+
+
+if __name__ == '__main__':
+    main()
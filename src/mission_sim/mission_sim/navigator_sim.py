@@ -0,0 +1,43 @@
+import rclpy
+from std_msgs.msg import Int32
+
+from mission_sim.stand_in import StandInNode
+
+
+class NavigatorSim(StandInNode):
+    """/logistics/command 를 받아 주행 시간 뒤 /mission_complete 발행 (aruco 네비게이터 대역)"""
+
+    def __init__(self):
+        super().__init__('navigator_sim', 'lognormal:8.0,0.2')
+        self.declare_parameter('per_step', 3.0)  # 위치 한 칸당 추가 주행 시간 (초)
+        self.per_step = self.get_parameter('per_step').value
+        self.position = 0
+
+        self.complete_pub = self.create_publisher(Int32, '/mission_complete', 10)
+        self.command_sub = self.create_subscription(Int32, '/logistics/command', self.command_callback, 10)
+        self.get_logger().info(f'🚗 네비게이터 대역 시작 (지연 {self.latency} + 칸당 {self.per_step}초, 실패율 {self.failure_rate})')
+
+    def command_callback(self, msg):
+        target = msg.data
+        steps = abs(target - self.position)
+        self.get_logger().info(f'🚗 {self.position} → {target} 이동 명령')
+        self.position = target
+        complete_msg = Int32()
+        complete_msg.data = 1
+        self.respond_later(self.complete_pub, complete_msg, extra_delay=self.per_step * steps)
+
+
+def main(args=None):
+    rclpy.init(args=args)
+    node = NavigatorSim()
+    try:
+        rclpy.spin(node)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        node.destroy_node()
+        rclpy.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+import json
+import os
+import random
+import sys
+import time
+
+import rclpy
+from rclpy.node import Node
+from std_msgs.msg import String
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))]
+
+
+class OrderDriver(Node):
+    """
+    'order' 토픽으로 주문 N개를 보내고 /mission/events 의 order_complete 이벤트로
+    처리량(주문/시간)과 주문별 지연 분포를 측정
+    """
+
+    def __init__(self):
+        super().__init__('order_driver')
+        self.declare_parameter('orders', 20)
+        self.declare_parameter('order_interval', 0.0)  # 주문 간격 (초), 0이면 한꺼번에
+        self.declare_parameter('start_delay', 3.0)     # 다른 노드가 올라올 때까지 대기
+        self.declare_parameter('items_min', 1)
+        self.declare_parameter('items_max', 3)
+        self.declare_parameter('quantity_max', 2)
+        self.declare_parameter('positions', [1, 2, 3, 4, 5, 6])
+        self.declare_parameter('floors', [1, 2, 3])
+        self.declare_parameter('names', ['apple', 'banana', 'cup'])
+        self.declare_parameter('timeout', 3600.0)      # 전체 측정 제한 시간 (초)
+        self.declare_parameter('report_path', '')      # 결과 JSON 저장 경로
+        self.declare_parameter('min_throughput', 0.0)  # 주문/시간, 미달이면 종료 코드 1 (CI 회귀 검사)
+        self.declare_parameter('seed', 0)
+
+        self.order_count = self.get_parameter('orders').value
+        self.order_interval = self.get_parameter('order_interval').value
+        self.timeout = self.get_parameter('timeout').value
+        self.report_path = self.get_parameter('report_path').value
+        self.min_throughput = self.get_parameter('min_throughput').value
+        self.rng = random.Random(self.get_parameter('seed').value)
+        self.run_id = time.strftime('%Y%m%d%H%M%S')
+
+        self.sent_at = {}       # {order_id: 보낸 시각}
+        self.finished = {}      # {order_id: (지연 초, 결과)}
+        self.first_sent = None
+        self.last_finished = None
+        self.done = False
+        self.exit_code = 0
+
+        self.order_pub = self.create_publisher(String, 'order', 100)
+        self.events_sub = self.create_subscription(String, '/mission/events', self.events_callback, 100)
+        self.started = time.monotonic()
+        self.send_timer = self.create_timer(self.get_parameter('start_delay').value, self.start_sending)
+        self.check_timer = self.create_timer(1.0, self.check_finished)
+        self.get_logger().info(f'🧾 주문 드라이버 시작: {self.order_count}개, 간격 {self.order_interval}초')
+
+    def make_order(self, index):
+        items = []
+        for _ in range(self.rng.randint(self.get_parameter('items_min').value, self.get_parameter('items_max').value)):
+            items.append({
+                'name': self.rng.choice(self.get_parameter('names').value),
+                'quantity': self.rng.randint(1, self.get_parameter('quantity_max').value),
+                'position': self.rng.choice(self.get_parameter('positions').value),
+                'floor': self.rng.choice(self.get_parameter('floors').value),
+            })
+        return {'order_id': f'sim-{self.run_id}-{index:04d}', 'order': items}
+
+    def start_sending(self):
+        self.send_timer.cancel()
+        if self.order_interval <= 0.0:
+            for index in range(self.order_count):
+                self.send_order(index)
+            return
+        self.next_index = 0
+        self.send_order(0)
+        self.next_index = 1
+        self.send_timer = self.create_timer(self.order_interval, self.send_next)
+
+    def send_next(self):
+        if self.next_index >= self.order_count:
+            self.send_timer.cancel()
+            return
+        self.send_order(self.next_index)
+        self.next_index += 1
+
+    def send_order(self, index):
+        order = self.make_order(index)
+        msg = String()
+        msg.data = json.dumps(order)
+        now = time.monotonic()
+        self.sent_at[order['order_id']] = now
+        if self.first_sent is None:
+            self.first_sent = now
+        self.order_pub.publish(msg)
+        self.get_logger().info(f'📤 주문 {order["order_id"]}: {len(order["order"])}개 항목')
+
+    def events_callback(self, msg):
+        try:
+            event = json.loads(msg.data)
+        except json.JSONDecodeError:
+            return
+        if not isinstance(event, dict) or event.get('event') != 'order_complete':
+            return
+        order_id = event.get('order_id')
+        if order_id not in self.sent_at or order_id in self.finished:
+            return
+        now = time.monotonic()
+        latency = now - self.sent_at[order_id]
+        self.finished[order_id] = (latency, event.get('result', 'done'))
+        self.last_finished = now
+        self.get_logger().info(f'📥 주문 완료 {order_id} ({event.get("result")}): {latency:.1f}초 [{len(self.finished)}/{self.order_count}]')
+
+    def check_finished(self):
+        if self.done:
+            return
+        timed_out = time.monotonic() - self.started > self.timeout
+        if len(self.finished) < self.order_count and not timed_out:
+            return
+        if timed_out:
+            self.get_logger().warning(f'⏰ 제한 시간 {self.timeout:.0f}초 초과 - 완료 {len(self.finished)}/{self.order_count}')
+        self.report()
+        self.done = True
+
+    def report(self):
+        latencies = sorted(latency for latency, _ in self.finished.values())
+        completed = sum(1 for _, result in self.finished.values() if result == 'done')
+        aborted = len(self.finished) - completed
+        duration = (self.last_finished - self.first_sent) if self.last_finished and self.first_sent else 0.0
+        throughput = completed / duration * 3600.0 if duration > 0 else 0.0
+        report = {
+            'orders': self.order_count,
+            'completed': completed,
+            'aborted': aborted,
+            'lost': self.order_count - len(self.finished),
+            'duration_s': round(duration, 1),
+            'throughput_per_hour': round(throughput, 2),
+            'latency_s': {
+                'mean': round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+                'p50': round(percentile(latencies, 0.50), 2),
+                'p90': round(percentile(latencies, 0.90), 2),
+                'p99': round(percentile(latencies, 0.99), 2),
+                'max': round(latencies[-1], 2) if latencies else 0.0,
+            },
+        }
+        lat = report['latency_s']
+        self.get_logger().info(
+            f'📊 결과: 완료 {completed}/{self.order_count} (중단 {aborted}, 유실 {report["lost"]}), '
+            f'{duration:.0f}초 동안 {throughput:.1f} 주문/시간, '
+            f'지연 p50 {lat["p50"]:.1f}초 / p90 {lat["p90"]:.1f}초 / p99 {lat["p99"]:.1f}초 / 최대 {lat["max"]:.1f}초')
+        if self.report_path:
+            path = os.path.expanduser(self.report_path)
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(path, 'w') as f:
+                json.dump(report, f, indent=2)
+        if report['lost'] > 0 or throughput < self.min_throughput:
+            self.get_logger().error(f'❌ 회귀: 유실 {report["lost"]}개, 처리량 {throughput:.1f} < 기준 {self.min_throughput:.1f}')
+            self.exit_code = 1
+
+
+def main(args=None):
+    rclpy.init(args=args)
+    node = OrderDriver()
+    try:
+        while rclpy.ok() and not node.done:
+            rclpy.spin_once(node, timeout_sec=0.5)
+    except KeyboardInterrupt:
+        node.report()
+    finally:
+        exit_code = node.exit_code
+        node.destroy_node()
+        rclpy.shutdown()
+    sys.exit(exit_code)
+
+
+if __name__ == '__main__':
+    main()
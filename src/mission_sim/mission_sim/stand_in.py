@@ -0,0 +1,96 @@
+import math
+import random
+
+from rclpy.node import Node
+
+
+class LatencyModel:
+    """
+    응답 지연 분포
+
+    문자열 형식 '<분포>:<인자>' (초 단위)
+    - fixed:2.0
+    - uniform:1.0,3.0
+    - normal:5.0,0.5           (평균, 표준편차, 0 미만은 0)
+    - lognormal:5.0,0.3        (중앙값, 로그 표준편차 - 긴 꼬리)
+    """
+
+    def __init__(self, kind, args):
+        self.kind = kind
+        self.args = args
+
+    @classmethod
+    def parse(cls, spec):
+        kind, _, args = spec.partition(':')
+        kind = kind.strip().lower()
+        values = [float(v) for v in args.split(',') if v.strip()]
+        expected = {'fixed': 1, 'uniform': 2, 'normal': 2, 'lognormal': 2}
+        if kind not in expected:
+            raise ValueError(f'unknown latency distribution {kind!r} in {spec!r}')
+        if len(values) != expected[kind]:
+            raise ValueError(f'{kind} latency needs {expected[kind]} values, got {spec!r}')
+        return cls(kind, values)
+
+    def sample(self, rng):
+        if self.kind == 'fixed':
+            value = self.args[0]
+        elif self.kind == 'uniform':
+            value = rng.uniform(self.args[0], self.args[1])
+        elif self.kind == 'normal':
+            value = rng.gauss(self.args[0], self.args[1])
+        else:
+            value = self.args[0] * math.exp(rng.gauss(0.0, self.args[1]))
+        return max(0.0, value)
+
+    def __str__(self):
+        return f'{self.kind}:{",".join(f"{v:g}" for v in self.args)}'
+
+
+class StandInNode(Node):
+    """
+    실제 장치 대신 완료 신호를 보내는 노드의 공통 부분
+
+    파라미터
+    - latency:      응답 지연 분포 (LatencyModel 형식)
+    - failure_rate: 응답을 보내지 않을 확률 (RobotControl 타임아웃/재전송 확인용)
+    - time_scale:   모든 지연에 곱하는 배율 (CI 에서 빠르게 돌릴 때 < 1)
+    - seed:         난수 시드 (-1 이면 무작위)
+    """
+
+    def __init__(self, name, default_latency):
+        super().__init__(name)
+        self.declare_parameter('latency', default_latency)
+        self.declare_parameter('failure_rate', 0.0)
+        self.declare_parameter('time_scale', 1.0)
+        self.declare_parameter('seed', -1)
+        self.latency = LatencyModel.parse(self.get_parameter('latency').value)
+        self.failure_rate = self.get_parameter('failure_rate').value
+        self.time_scale = self.get_parameter('time_scale').value
+        seed = self.get_parameter('seed').value
+        self.rng = random.Random(None if seed < 0 else seed)
+        self.pending_timers = set()
+        self.request_count = 0
+        self.dropped_count = 0
+
+    def respond_later(self, publisher, msg, extra_delay=0.0, latency=None):
+        """지연 후 msg 발행, failure_rate 확률로 응답을 버림"""
+        self.request_count += 1
+        if self.rng.random() < self.failure_rate:
+            self.dropped_count += 1
+            self.get_logger().warning(f'💥 응답 누락 시뮬레이션 ({self.dropped_count}/{self.request_count})')
+            return
+        delay = ((latency or self.latency).sample(self.rng) + extra_delay) * self.time_scale
+
+        timer = None
+
+        def fire():
+            timer.cancel()
+            self.pending_timers.discard(timer)
+            self.destroy_timer(timer)
+            publisher.publish(msg)
+
+        if delay <= 0.0:
+            publisher.publish(msg)
+            return
+        timer = self.create_timer(delay, fire)
+        self.pending_timers.add(timer)
@@ -0,0 +1,87 @@
+import glob
+import json
+import os
+
+import rclpy
+from std_msgs.msg import String
+from logistics_interfaces.msg import OrientedDetectionArray
+
+from mission_sim.stand_in import StandInNode
+from yolo_obb_detection.detection_codec import DETECTIONS_TOPIC, dict_to_array
+
+
+class YoloReplay(StandInNode):
+    """
+    YoloObbNode 대역: /yolo/detection_trigger 를 받으면 기록된 검출 결과를 /yolo/detections 로 재생
+
+    detections_path: RobotControl detection_log_path 로 남긴 JSONL, {"objects": [...]} JSON 파일,
+                     또는 그런 파일이 든 디렉터리. 비어 있으면 무작위 물체를 만든다.
+    """
+
+    def __init__(self):
+        super().__init__('yolo_replay', 'normal:0.4,0.05')
+        self.declare_parameter('detections_path', '')
+        self.declare_parameter('objects_min', 3)
+        self.declare_parameter('objects_max', 6)
+        self.objects_min = self.get_parameter('objects_min').value
+        self.objects_max = self.get_parameter('objects_max').value
+        self.recordings = self.load_recordings(self.get_parameter('detections_path').value)
+        self.replay_index = 0
+
+        self.result_pub = self.create_publisher(OrientedDetectionArray, DETECTIONS_TOPIC, 10)
+        self.trigger_sub = self.create_subscription(String, '/yolo/detection_trigger', self.trigger_callback, 10)
+        source = f'기록 {len(self.recordings)}개 재생' if self.recordings else f'무작위 {self.objects_min}~{self.objects_max}개'
+        self.get_logger().info(f'📷 YOLO 대역 시작 ({source}, 지연 {self.latency}, 실패율 {self.failure_rate})')
+
+    def load_recordings(self, path):
+        if not path:
+            return []
+        path = os.path.expanduser(path)
+        files = sorted(glob.glob(os.path.join(path, '*.json*'))) if os.path.isdir(path) else [path]
+        recordings = []
+        for file_path in files:
+            with open(file_path, 'r') as f:
+                lines = [f.read()] if file_path.endswith('.json') else f.readlines()
+            for line in lines:
+                if line.strip():
+                    record = json.loads(line)
+                    recordings.append(record.get('result', record).get('objects') or [])
+        return recordings
+
+    def next_objects(self):
+        if self.recordings:
+            objects = self.recordings[self.replay_index % len(self.recordings)]
+            self.replay_index += 1
+            return objects
+        count = self.rng.randint(self.objects_min, self.objects_max)
+        return [{
+            'pixel_x': self.rng.uniform(120, 520),
+            'pixel_y': self.rng.uniform(140, 420),
+            'angle': self.rng.uniform(0, 180),
+            'depth_mm': self.rng.uniform(250, 400),
+        } for _ in range(count)]
+
+    def trigger_callback(self, msg):
+        try:
+            target = json.loads(msg.data).get('target', 'unknown')
+        except json.JSONDecodeError:
+            target = 'unknown'
+        result_msg = dict_to_array({'target': target, 'objects': self.next_objects()}, source='replay',
+                                   stamp=self.get_clock().now().to_msg())
+        self.respond_later(self.result_pub, result_msg)
+
+
+def main(args=None):
+    rclpy.init(args=args)
+    node = YoloReplay()
+    try:
+        rclpy.spin(node)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        node.destroy_node()
+        rclpy.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+from setuptools import find_packages, setup
+from glob import glob
+import os
+
+package_name = 'mission_sim'
+
+setup(
+    name=package_name,
+    version='0.0.0',
+    packages=find_packages(exclude=['test']),
+    data_files=[
+        ('share/ament_index/resource_index/packages',
+            ['resource/' + package_name]),
+        ('share/' + package_name, ['package.xml']),
+        (os.path.join('share', package_name, 'launch'), glob('launch/*.py')),
+    ],
+    install_requires=['setuptools'],
+    zip_safe=True,
+    maintainer='xotn',
+    maintainer_email='james190414@gmail.com',
+    description='Stand-in navigator/lift/arm/YOLO nodes and an order driver for hardware-free mission benchmarks',
+    license='TODO: License declaration',
+    tests_require=['pytest'],
+    entry_points={
+        'console_scripts': [
+            'navigator_sim = mission_sim.navigator_sim:main',
+            'lift_sim = mission_sim.lift_sim:main',
+            'arm_sim = mission_sim.arm_sim:main',
+            'yolo_replay = mission_sim.yolo_replay:main',
+            'order_driver = mission_sim.order_driver:main',
+        ],
+    },
+)
@@ -0,0 +1,246 @@
+import asyncio
+import random
+import threading
+
+import aiomqtt
+
+
+class Coalescer:
+    """
+    상태 토픽 합치기: 토픽마다 최신 값만 남기고 min_interval 에 한 번만 발행
+    직전에 보낸 값과 같으면 다시 보내지 않는다 (retained 로 이미 브로커에 남아 있음)
+    """
+
+    def __init__(self):
+        self.entries = {}  # {토픽: [payload, 보낸 payload, 보낸 시각, min_interval, qos, retain]}
+        self.offered = 0
+        self.sent = 0
+
+    def offer(self, topic, payload, min_interval, qos, retain):
+        self.offered += 1
+        entry = self.entries.get(topic)
+        if entry is None:
+            self.entries[topic] = [payload, None, None, min_interval, qos, retain]
+        else:
+            entry[0] = payload
+            entry[3:] = [min_interval, qos, retain]
+
+    def _ready_at(self, entry):
+        payload, sent_payload, sent_at, min_interval = entry[:4]
+        if payload == sent_payload:
+            return None
+        return sent_at + min_interval if sent_at is not None else 0.0
+
+    def due(self, now):
+        """지금 보낼 (topic, payload, qos, retain) 목록, 보낸 것으로 기록"""
+        ready = []
+        for topic, entry in self.entries.items():
+            ready_at = self._ready_at(entry)
+            if ready_at is not None and ready_at <= now:
+                ready.append((topic, entry[0], entry[4], entry[5]))
+                entry[1] = entry[0]
+                entry[2] = now
+        self.sent += len(ready)
+        return ready
+
+    def next_due(self, now):
+        """다음 발행까지 남은 초 (보낼 것이 없으면 None)"""
+        waits = [ready_at - now for ready_at in map(self._ready_at, self.entries.values()) if ready_at is not None]
+        return max(0.0, min(waits)) if waits else None
+
+    def invalidate(self):
+        """재연결 후 모든 최신 값을 다시 보냄 (브로커가 재시작됐으면 retained 도 사라졌음)"""
+        for entry in self.entries.values():
+            entry[1] = None
+            entry[2] = None
+
+
+class AsyncMqttBridge:
+    """
+    백그라운드 스레드의 asyncio 루프에서 MQTT 연결 유지
+
+    - start() 는 스레드만 띄우고 바로 반환 (노드 생성을 막지 않음)
+    - 연결이 끊기면 지수 백오프(+지터)로 재연결, 브로커 관리는 하지 않는다
+    - 고정 client_id + clean_session=False (영구 세션) + QoS 1 구독:
+      브리지가 잠시 끊겨도 브로커가 그동안 온 QoS 1 메시지를 보관했다가 다시 보내준다
+    - publish() 는 어느 스레드에서나 호출 가능 (연결이 끊긴 동안은 outbox 에 쌓아둠)
+    - publish_latest() 는 상태처럼 최신 값만 의미 있는 메시지용 (Coalescer 로 합치고 속도 제한)
+    - presence_topic 이 있으면 연결 시 'online', 종료/비정상 끊김(will) 시 'offline' 을 retained 로 발행
+    """
+
+    def __init__(self, host, port, client_id, subscriptions, on_message, logger,
+                 keepalive=30, reconnect_min=0.5, reconnect_max=30.0,
+                 username=None, password=None, outbox_size=1000, presence_topic=None):
+        self.host = host
+        self.port = port
+        self.client_id = client_id
+        self.subscriptions = list(subscriptions)  # [(토픽, QoS)]
+        self.on_message = on_message              # (topic, payload bytes) → None, 브리지 스레드에서 호출
+        self.logger = logger
+        self.keepalive = keepalive
+        self.reconnect_min = reconnect_min
+        self.reconnect_max = reconnect_max
+        self.username = username or None
+        self.password = password or None
+        self.outbox_size = outbox_size
+        self.presence_topic = presence_topic
+        self.coalescer = Coalescer()
+
+        self.connected = threading.Event()
+        self.loop = None
+        self.thread = None
+        self.stopping = None
+        self.outbox = None
+        self.wake = None
+        self.stats = {'connects': 0, 'disconnects': 0, 'received': 0, 'published': 0, 'dropped': 0}
+
+    # ---------- 스레드 ----------
+
+    def start(self):
+        self.loop = asyncio.new_event_loop()
+        self.stopping = asyncio.Event()
+        self.outbox = asyncio.Queue(maxsize=self.outbox_size)
+        self.wake = asyncio.Event()
+        self.thread = threading.Thread(target=self._thread_main, name='mqtt_bridge', daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout=2.0):
+        if self.thread is None:
+            return
+        self.loop.call_soon_threadsafe(self.stopping.set)
+        self.thread.join(timeout)
+        self.thread = None
+
+    def _thread_main(self):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self._run())
+        finally:
+            self.loop.close()
+
+    # ---------- 발행 ----------
+
+    def publish(self, topic, payload, qos=0, retain=False):
+        """스레드 안전한 발행 요청 (outbox 가 가득 차면 가장 오래된 요청을 버림)"""
+        if self.loop is None or self.loop.is_closed():
+            return
+        try:
+            self.loop.call_soon_threadsafe(self._enqueue, (topic, payload, qos, retain))
+        except RuntimeError:
+            # 종료 중 루프가 닫힘
+            pass
+
+    def publish_latest(self, topic, payload, min_interval=0.0, qos=0, retain=True):
+        """스레드 안전한 상태 발행 요청 (토픽별 최신 값만, min_interval 초에 한 번)"""
+        if self.loop is None or self.loop.is_closed():
+            return
+        try:
+            self.loop.call_soon_threadsafe(self._offer, topic, payload, min_interval, qos, retain)
+        except RuntimeError:
+            pass
+
+    def _offer(self, topic, payload, min_interval, qos, retain):
+        self.coalescer.offer(topic, payload, min_interval, qos, retain)
+        self.wake.set()
+
+    def _enqueue(self, item):
+        if self.outbox.full():
+            self.outbox.get_nowait()
+            self.stats['dropped'] += 1
+        self.outbox.put_nowait(item)
+
+    # ---------- 연결 ----------
+
+    async def _run(self):
+        delay = self.reconnect_min
+        while not self.stopping.is_set():
+            will = aiomqtt.Will(self.presence_topic, b'offline', qos=1, retain=True) if self.presence_topic else None
+            try:
+                async with aiomqtt.Client(
+                        self.host, self.port, identifier=self.client_id, clean_session=False,
+                        keepalive=self.keepalive, username=self.username, password=self.password,
+                        will=will) as client:
+                    self.stats['connects'] += 1
+                    self.connected.set()
+                    delay = self.reconnect_min
+                    self.coalescer.invalidate()
+                    for topic, qos in self.subscriptions:
+                        await client.subscribe(topic, qos=qos)
+                    if self.presence_topic:
+                        await client.publish(self.presence_topic, b'online', qos=1, retain=True)
+                    self.logger.info(f'✅ MQTT 브로커에 연결됨 ({self.host}:{self.port}), 구독: '
+                                     + ', '.join(f'{topic}(QoS {qos})' for topic, qos in self.subscriptions))
+                    await self._serve(client)
+                    if self.presence_topic:
+                        await client.publish(self.presence_topic, b'offline', qos=1, retain=True)
+            except aiomqtt.MqttError as e:
+                if self.connected.is_set():
+                    self.stats['disconnects'] += 1
+                    self.logger.warning(f'⚠️ MQTT 연결 끊김: {e}')
+                else:
+                    self.logger.warning(f'⚠️ MQTT 브로커 연결 실패 ({self.host}:{self.port}): {e}')
+            finally:
+                self.connected.clear()
+            if self.stopping.is_set():
+                break
+            wait = delay * random.uniform(0.8, 1.2)
+            self.logger.info(f'🔄 {wait:.1f}초 후 재연결')
+            try:
+                await asyncio.wait_for(self.stopping.wait(), wait)
+            except asyncio.TimeoutError:
+                pass
+            delay = min(self.reconnect_max, delay * 2.0)
+
+    async def _serve(self, client):
+        """수신/발행 작업을 돌리다가 둘 중 하나가 끝나면(연결 끊김, 종료) 반환"""
+        tasks = [asyncio.ensure_future(self._receive(client)),
+                 asyncio.ensure_future(self._send(client)),
+                 asyncio.ensure_future(self._send_latest(client)),
+                 asyncio.ensure_future(self.stopping.wait())]
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        for task in done:
+            task.result()  # MqttError 는 재연결 루프로 전달
+
+    async def _receive(self, client):
+        async for message in client.messages:
+            self.stats['received'] += 1
+            try:
+                self.on_message(message.topic.value, message.payload)
+            except Exception as e:
+                self.logger.error(f'메시지 처리 오류: {e}')
+
+    async def _send(self, client):
+        while True:
+            topic, payload, qos, retain = await self.outbox.get()
+            try:
+                await client.publish(topic, payload, qos=qos, retain=retain)
+            except (aiomqtt.MqttError, asyncio.CancelledError):
+                # 연결이 끊겼으면 재연결 뒤 다시 보내도록 되돌려 놓음
+                # (수신 쪽이 먼저 끊김을 알아채면 _serve 가 PUBACK 을 기다리던 이 작업을 취소함)
+                self._requeue((topic, payload, qos, retain))
+                raise
+            self.stats['published'] += 1
+
+    async def _send_latest(self, client):
+        while True:
+            wait = self.coalescer.next_due(self.loop.time())
+            if wait is None or wait > 0.0:
+                self.wake.clear()
+                try:
+                    await asyncio.wait_for(self.wake.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            for topic, payload, qos, retain in self.coalescer.due(self.loop.time()):
+                await client.publish(topic, payload, qos=qos, retain=retain)
+                self.stats['published'] += 1
+
+    def _requeue(self, item):
+        items = [item]
+        while not self.outbox.empty():
+            items.append(self.outbox.get_nowait())
+        for queued in items[:self.outbox_size]:
+            self.outbox.put_nowait(queued)
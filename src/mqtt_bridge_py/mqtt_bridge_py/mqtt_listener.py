@@ -1,97 +1,163 @@
 import rclpy
 from rclpy.node import Node
 from std_msgs.msg import String
-import paho.mqtt.client as mqtt
-import subprocess
-import time
-import socket
+from logistics_interfaces.msg import Order, OrderItem
+import json
 import os
+import time
+
+from mqtt_bridge_py.async_bridge import AsyncMqttBridge
+from mqtt_bridge_py.order_schema import DEFAULT_LIMITS, OrderIngest
 
 class MQTTListener(Node):
+    """
+    핸드폰(MQTT) ↔ ROS 브리지
+
+    - <order_topic> (MQTT) → orders (ROS, logistics_interfaces/Order)
+      검증/정규화, ID 부여, 중복 제거를 여기서 한 번만 하고 결과를 <prefix>/events 로 알려준다
+      (order_accepted / order_duplicate / order_rejected)
+    - /mission/status 의 상태 문자열 → <prefix>/status (retained, 합쳐서 속도 제한)
+    - /mission/events 의 JSON 이벤트 (order_complete 등) → <prefix>/events (QoS 1, 하나도 합치지 않음)
+    - /mission/queue_state → <prefix>/queue_state, /mission/telemetry → <prefix>/telemetry (retained, 속도 제한)
+    - 브리지 연결 상태 → <prefix>/bridge (online/offline, retained)
+
+    클라이언트가 늘어도 ROS 쪽은 브리지 하나만 구독하고, 나머지 분배는 브로커가 맡는다.
+    retained 덕분에 늦게 접속한 클라이언트도 바로 마지막 상태를 받는다.
+
+    브로커는 시스템 서비스(mosquitto) 또는 mqtt_stand_in_broker 로 따로 실행한다.
+    노드는 연결을 기다리지 않고 바로 올라오며, 연결/재연결은 백그라운드 스레드에서 처리한다.
+    """
+
     def __init__(self):
         super().__init__('mqtt_listener')
-        self.publisher_ = self.create_publisher(String, 'order', 10)
-        
-        # MQTT 브로커 자동 시작
-        self.ensure_broker_running()
-        
-        self.client = mqtt.Client()
-        self.client.on_connect = self.on_connect
-        self.client.on_message = self.on_message
-        
-        # 브로커 시작 대기
-        time.sleep(2)
-        
-        # 로컬 브로커에 연결
-        self.client.connect("localhost", 1883, 60)
-        self.client.loop_start()
-
-    def ensure_broker_running(self):
-        """MQTT 브로커가 실행 중인지 확인하고 필요시 시작"""
-        
-        # 브로커가 이미 실행 중인지 확인
-        if self.is_broker_running():
-            self.get_logger().info("MQTT 브로커가 이미 실행 중입니다.")
-            return
-        
-        # 브로커 시작
-        self.get_logger().info("MQTT 브로커를 시작합니다...")
-        try:
-            # 백그라운드에서 브로커 실행
-            subprocess.Popen([
-                'sudo', 'mosquitto', 
-                '-c', '/etc/mosquitto/mosquitto.conf', 
-                '-d'
-            ])
-            
-            # 브로커 시작 대기
-            for i in range(10):
-                time.sleep(1)
-                if self.is_broker_running():
-                    self.get_logger().info("✅ MQTT 브로커 시작 완료")
-                    return
-            
-            self.get_logger().error("MQTT 브로커 시작 실패")
-            
-        except Exception as e:
-            self.get_logger().error(f"브로커 시작 중 오류: {e}")
-
-    def is_broker_running(self):
-        """브로커가 실행 중인지 확인"""
+        started = time.monotonic()
+
+        self.declare_parameter('broker_host', 'localhost')
+        self.declare_parameter('broker_port', 1883)
+        self.declare_parameter('client_id', 'ros2_mqtt_bridge')  # 영구 세션 식별자 (브리지마다 고유해야 함)
+        self.declare_parameter('username', '')
+        self.declare_parameter('password', '')
+        self.declare_parameter('keepalive', 30)
+        self.declare_parameter('reconnect_min', 0.5)
+        self.declare_parameter('reconnect_max', 30.0)
+        self.declare_parameter('order_topic', 'ros2/order')
+        self.declare_parameter('status_topic_prefix', 'robot')
+        # 토픽별 최소 발행 간격 (초), 그 사이에 온 값은 마지막 값 하나로 합친다
+        self.declare_parameter('status_min_interval', 0.2)
+        self.declare_parameter('queue_state_min_interval', 1.0)
+        self.declare_parameter('telemetry_min_interval', 5.0)
+        # 주문 검증/중복 제거
+        self.declare_parameter('order_id_prefix', 'mqtt')
+        self.declare_parameter('dedupe_capacity', 10000)
+        self.declare_parameter('anonymous_dedupe_window', 10.0)
+        # 중복 판정 기록 (재시작 후 영구 세션이 다시 보낸 주문 걸러내기용, 빈 문자열이면 저장 안 함)
+        self.declare_parameter('order_dedupe_path', os.path.expanduser('~/.ros/mqtt_order_dedupe.json'))
+        self.declare_parameter('max_items', DEFAULT_LIMITS['max_items'])
+        self.declare_parameter('max_quantity', DEFAULT_LIMITS['max_quantity'])
+
+        limits = dict(DEFAULT_LIMITS,
+                      max_items=self.get_parameter('max_items').value,
+                      max_quantity=self.get_parameter('max_quantity').value)
+        self.ingest = OrderIngest(
+            self.get_parameter('order_id_prefix').value,
+            self.get_parameter('dedupe_capacity').value,
+            self.get_parameter('anonymous_dedupe_window').value,
+            limits,
+            self.get_parameter('order_dedupe_path').value)
         try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(1)
-            result = sock.connect_ex(('localhost', 1883))
-            sock.close()
-            return result == 0
-        except:
-            return False
-
-    def on_connect(self, client, userdata, flags, rc):
-        if rc == 0:
-            self.get_logger().info("✅ MQTT 브로커에 연결됨")
-            client.subscribe("ros2/order")
-            self.get_logger().info("📡 ros2/order 토픽 구독 시작")
-        else:
-            self.get_logger().error(f"연결 실패, 코드: {rc}")
-
-    def on_message(self, client, userdata, msg):
+            restored = self.ingest.load()
+            if restored:
+                self.get_logger().info(f'📋 주문 중복 판정 기록 {restored}개 복원')
+        except (OSError, ValueError) as e:
+            self.get_logger().error(f'❌ 주문 중복 판정 기록 복원 실패: {e}')
+        self.publisher_ = self.create_publisher(Order, 'orders', 100)
+
+        host = self.get_parameter('broker_host').value
+        port = self.get_parameter('broker_port').value
+        self.order_topic = self.get_parameter('order_topic').value
+        self.prefix = self.get_parameter('status_topic_prefix').value.rstrip('/')
+        self.min_intervals = {
+            'status': self.get_parameter('status_min_interval').value,
+            'queue_state': self.get_parameter('queue_state_min_interval').value,
+            'telemetry': self.get_parameter('telemetry_min_interval').value,
+        }
+        self.bridge = AsyncMqttBridge(
+            host, port,
+            self.get_parameter('client_id').value,
+            [(self.order_topic, 1)],
+            self.on_message,
+            self.get_logger(),
+            keepalive=self.get_parameter('keepalive').value,
+            reconnect_min=self.get_parameter('reconnect_min').value,
+            reconnect_max=self.get_parameter('reconnect_max').value,
+            username=self.get_parameter('username').value,
+            password=self.get_parameter('password').value,
+            presence_topic=f'{self.prefix}/bridge')
+        self.bridge.start()
+
+        # 미션 상태 → MQTT
+        self.status_sub = self.create_subscription(
+            String, '/mission/status', lambda msg: self.relay_latest('status', msg), 10)
+        self.events_sub = self.create_subscription(String, '/mission/events', self.events_callback, 100)
+        self.queue_state_sub = self.create_subscription(
+            String, '/mission/queue_state', lambda msg: self.relay_latest('queue_state', msg), 10)
+        self.telemetry_sub = self.create_subscription(
+            String, '/mission/telemetry', lambda msg: self.relay_latest('telemetry', msg), 10)
+
+        self.get_logger().info(f'📡 MQTT 브리지 시작 ({host}:{port}, {self.order_topic}) - {(time.monotonic() - started) * 1000:.0f} ms')
+
+    def on_message(self, topic, payload):
+        """브리지 스레드에서 호출됨"""
+        result, value = self.ingest.process(payload)
+        if result == 'rejected':
+            self.get_logger().warning(f'⚠️ 잘못된 주문 거부: {value}')
+            self.publish_event({'event': 'order_rejected', 'reason': value})
+            return
+        if result == 'duplicate':
+            self.get_logger().info(f'🔁 중복 주문 무시: {value}')
+            self.publish_event({'event': 'order_duplicate', 'order_id': value})
+            return
+
+        self.publisher_.publish(self.to_order_msg(value))
+        self.get_logger().info(f'📱 주문 {value["order_id"]} 수신 → 로봇으로 전송 ({len(value["items"])}개 항목)')
         try:
-            payload = msg.payload.decode()
-            self.get_logger().info(f"📱 핸드폰에서 수신: {payload}")
-            
-            ros_msg = String()
-            ros_msg.data = payload
-            self.publisher_.publish(ros_msg)
-            
-            self.get_logger().info(f"🤖 로봇으로 전송: {payload}")
-        except Exception as e:
-            self.get_logger().error(f"메시지 처리 오류: {e}")
+            self.ingest.save()
+        except OSError as e:
+            self.get_logger().error(f'❌ 주문 중복 판정 기록 저장 실패: {e}')
+        self.publish_event({'event': 'order_accepted', 'order_id': value['order_id'], 'items': len(value['items'])})
+
+    def to_order_msg(self, order):
+        order_msg = Order()
+        order_msg.header.stamp = self.get_clock().now().to_msg()
+        order_msg.order_id = order['order_id']
+        order_msg.anonymous = order['anonymous']
+        for item in order['items']:
+            item_msg = OrderItem()
+            item_msg.name = item['name']
+            item_msg.quantity = item['quantity']
+            item_msg.position = item['position']
+            item_msg.floor = item['floor']
+            order_msg.items.append(item_msg)
+        return order_msg
+
+    def publish_event(self, event):
+        self.bridge.publish(f'{self.prefix}/events', json.dumps(event, ensure_ascii=False).encode(), qos=1)
+
+    def events_callback(self, msg):
+        """이벤트는 합치지 않고 모두 전달"""
+        self.bridge.publish(f'{self.prefix}/events', msg.data.encode(), qos=1)
+
+    def relay_latest(self, name, msg):
+        self.bridge.publish_latest(f'{self.prefix}/{name}', msg.data.encode(), self.min_intervals[name], qos=1, retain=True)
+
+    def destroy_node(self):
+        self.bridge.stop()
+        super().destroy_node()
 
 def main(args=None):
     rclpy.init(args=args)
     node = MQTTListener()
-    
+
     try:
         rclpy.spin(node)
     except KeyboardInterrupt:
@@ -101,4 +167,4 @@ def main(args=None):
         rclpy.shutdown()
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
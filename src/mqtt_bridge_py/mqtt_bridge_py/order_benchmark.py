@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+주문 수신 처리량 벤치마크
+
+1) 검증/ID 부여/중복 제거 (OrderIngest) 만 돌렸을 때의 처리량
+2) --mqtt: MQTT 브로커를 거쳐 AsyncMqttBridge 로 받아서 같은 처리를 했을 때의 처리량
+   (--broker 를 주지 않으면 프로세스 안에서 stand-in 브로커를 띄운다)
+
+주문 흐름은 정상 주문, 재전송(중복), 형식 오류가 섞인 것으로 만든다.
+
+사용 예:
+  ros2 run mqtt_bridge_py order_ingest_benchmark --orders 20000
+  ros2 run mqtt_bridge_py order_ingest_benchmark --mqtt --broker localhost:1883
+"""
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+
+import aiomqtt
+
+from mqtt_bridge_py.async_bridge import AsyncMqttBridge
+from mqtt_bridge_py.order_schema import OrderIngest
+from mqtt_bridge_py.stand_in_broker import StandInBroker
+
+NAMES = ('apple', 'banana', 'orange', 'pear', 'lemon')
+
+
+def make_payloads(count, duplicate_ratio, invalid_ratio, rng):
+    payloads = []
+    for i in range(count):
+        roll = rng.random()
+        if payloads and roll < duplicate_ratio:
+            payloads.append(rng.choice(payloads[-20:]))  # 휴대폰 재전송
+            continue
+        if roll < duplicate_ratio + invalid_ratio:
+            payloads.append(rng.choice([
+                b'{"order": [',
+                b'{"order": []}',
+                json.dumps({'order': [{'name': 'apple', 'position': 12, 'floor': 1}]}).encode(),
+                json.dumps({'order': [{'quantity': 1, 'position': 2, 'floor': 1}]}).encode(),
+            ]))
+            continue
+        items = [{'name': rng.choice(NAMES), 'quantity': rng.randint(1, 5),
+                  'position': rng.randint(1, 6), 'floor': rng.randint(1, 3)}
+                 for _ in range(rng.randint(1, 3))]
+        order = {'order': items}
+        if rng.random() < 0.5:
+            order['order_id'] = f'bench-{i}'
+        payloads.append(json.dumps(order).encode())
+    return payloads
+
+
+def run_ingest(payloads):
+    ingest = OrderIngest('bench')
+    start = time.perf_counter()
+    for payload in payloads:
+        ingest.process(payload)
+    return time.perf_counter() - start, ingest.stats
+
+
+async def run_mqtt(payloads, host, port):
+    broker = None
+    if host is None:
+        broker = await StandInBroker(port=0).start()
+        host, port = '127.0.0.1', broker.port
+
+    ingest = OrderIngest('bench')
+    done = threading.Event()
+    timing = {}
+
+    def on_message(topic, payload):
+        timing.setdefault('first', time.perf_counter())
+        ingest.process(payload)
+        if sum(ingest.stats.values()) >= len(payloads):
+            timing['last'] = time.perf_counter()
+            done.set()
+
+    class Logger:
+        def info(self, message):
+            pass
+
+        warning = error = print
+
+    bridge = AsyncMqttBridge(host, port, f'order-bench-{random.randint(0, 1 << 30)}',
+                             [('bench/order', 1)], on_message, Logger())
+    bridge.start()
+    while not bridge.connected.is_set():
+        await asyncio.sleep(0.01)
+
+    async with aiomqtt.Client(host, port, identifier='order-bench-phone') as phone:
+        start = time.perf_counter()
+        for payload in payloads:
+            await phone.publish('bench/order', payload, qos=1)
+        sent = time.perf_counter()
+        await asyncio.get_running_loop().run_in_executor(None, done.wait, 60.0)
+    bridge.stop()
+    if broker is not None:
+        await broker.stop()
+    end = timing.get('last', time.perf_counter())
+    return end - start, sent - start, ingest.stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='주문 수신 처리량 벤치마크')
+    parser.add_argument('--orders', type=int, default=20000)
+    parser.add_argument('--duplicate-ratio', type=float, default=0.1)
+    parser.add_argument('--invalid-ratio', type=float, default=0.05)
+    parser.add_argument('--mqtt', action='store_true', help='MQTT 브로커를 거친 처리량도 측정')
+    parser.add_argument('--broker', default=None, help='host:port (없으면 stand-in 브로커)')
+    parser.add_argument('--seed', type=int, default=0)
+    args, _ = parser.parse_known_args()
+
+    payloads = make_payloads(args.orders, args.duplicate_ratio, args.invalid_ratio, random.Random(args.seed))
+    elapsed, stats = run_ingest(payloads)
+    print(f'검증/중복 제거: {len(payloads)}개 {elapsed * 1000:.0f} ms → {len(payloads) / elapsed:,.0f} 주문/초 '
+          f'(수락 {stats["accepted"]}, 중복 {stats["duplicates"]}, 거부 {stats["rejected"]})')
+
+    if args.mqtt:
+        host, port = None, None
+        if args.broker:
+            host, _, port = args.broker.partition(':')
+            port = int(port or 1883)
+        elapsed, publish_time, stats = asyncio.run(run_mqtt(payloads, host, port))
+        received = sum(stats.values())
+        print(f'MQTT 경유 ({args.broker or "stand-in 브로커"}): {received}/{len(payloads)}개 {elapsed:.2f}초 '
+              f'→ {received / elapsed:,.0f} 주문/초 (발행 {publish_time:.2f}초)')
+
+
+if __name__ == '__main__':
+    main()
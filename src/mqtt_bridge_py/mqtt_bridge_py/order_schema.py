@@ -0,0 +1,186 @@
+"""MQTT 주문 검증/정규화
+
+핸드폰에서 오는 주문 형식:
+    {"order_id": "선택", "order": [{"name": "apple", "quantity": 2, "position": 3, "floor": 1}, ...]}
+
+- 주문은 브리지에서 한 번만 검증하고, 이후 노드들은 정규화된 값(정수 필드, 공백 제거한 이름)만 본다
+- 주문 ID가 없으면 브리지가 고유 ID를 붙인다
+- 같은 주문 ID, 또는 ID 없이 같은 내용이 짧은 시간 안에 다시 오면 중복으로 버린다 (LRU)
+- 중복 판정 기록은 디스크에 저장한다: 브리지가 재시작하면 영구 세션(QoS 1)이 처리 중이던 주문을
+  다시 보내는데, 기억이 없으면 ID 없는 주문에 새 ID가 붙어 로봇 쪽에서도 새 주문으로 보이기 때문
+  (ID를 내용 해시로 만드는 방법은 시간 창이 지난 같은 내용의 새 주문과 ID가 겹쳐서 쓰지 않음)
+"""
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+
+DEFAULT_LIMITS = {
+    'max_payload_bytes': 8192,
+    'max_items': 20,
+    'max_quantity': 10,
+    'positions': (0, 7),   # 주행 위치 범위 (0, 7 은 적재/반납 위치)
+    'floors': (0, 3),      # 리프트 층 범위
+    'max_name_length': 64,
+}
+
+
+class OrderValidationError(ValueError):
+    """주문 형식 오류 (reason 은 클라이언트에 그대로 돌려준다)"""
+
+
+def _int_field(item, key, index, bounds, default=None):
+    value = item.get(key, default)
+    if value is None:
+        raise OrderValidationError(f'order[{index}].{key} is required')
+    if isinstance(value, bool):
+        raise OrderValidationError(f'order[{index}].{key} must be an integer')
+    if isinstance(value, str):
+        value = value.strip()
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise OrderValidationError(f'order[{index}].{key} must be an integer, got {value!r}')
+    if isinstance(value, float) and number != value:
+        raise OrderValidationError(f'order[{index}].{key} must be an integer, got {value!r}')
+    low, high = bounds
+    if not low <= number <= high:
+        raise OrderValidationError(f'order[{index}].{key}={number} is out of range [{low}, {high}]')
+    return number
+
+
+def parse_order(payload, limits=DEFAULT_LIMITS):
+    """
+    payload(bytes 또는 str) → {'order_id': str 또는 None, 'items': [정규화된 항목]}
+    형식이 틀리면 OrderValidationError
+    """
+    if isinstance(payload, (bytes, bytearray)):
+        if len(payload) > limits['max_payload_bytes']:
+            raise OrderValidationError(f'payload too large ({len(payload)} bytes)')
+        try:
+            payload = payload.decode('utf-8')
+        except UnicodeDecodeError:
+            raise OrderValidationError('payload is not valid UTF-8')
+    try:
+        data = json.loads(payload)
+    except ValueError as e:
+        raise OrderValidationError(f'invalid JSON: {e}')
+    if not isinstance(data, dict):
+        raise OrderValidationError('order must be a JSON object')
+
+    items = data.get('order')
+    if not isinstance(items, list) or not items:
+        raise OrderValidationError('"order" must be a non-empty list')
+    if len(items) > limits['max_items']:
+        raise OrderValidationError(f'too many items ({len(items)} > {limits["max_items"]})')
+
+    normalised = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            raise OrderValidationError(f'order[{index}] must be an object')
+        name = item.get('name')
+        if not isinstance(name, str) or not name.strip():
+            raise OrderValidationError(f'order[{index}].name is required')
+        name = name.strip()
+        if len(name) > limits['max_name_length']:
+            raise OrderValidationError(f'order[{index}].name is too long')
+        normalised.append({
+            'name': name,
+            'quantity': _int_field(item, 'quantity', index, (1, limits['max_quantity']), default=1),
+            'position': _int_field(item, 'position', index, limits['positions']),
+            'floor': _int_field(item, 'floor', index, limits['floors']),
+        })
+
+    order_id = None
+    for key in ('order_id', 'id'):
+        if data.get(key) not in (None, ''):
+            order_id = str(data[key]).strip()
+            break
+    return {'order_id': order_id, 'items': normalised}
+
+
+class OrderIngest:
+    """
+    검증 + 주문 ID 부여 + 중복 제거
+
+    - ID가 있는 주문: 같은 ID는 LRU 에 남아 있는 동안 항상 중복
+    - ID가 없는 주문: 내용이 같은 주문이 anonymous_window 초 안에 다시 오면 중복 (재전송),
+      그보다 늦게 온 같은 내용은 새 주문으로 보고 새 ID를 붙인다
+    - path 가 있으면 save()/load() 로 중복 판정 기록을 보존 (수신 시각은 벽시계라 재시작 뒤에도 비교 가능)
+    """
+
+    def __init__(self, prefix='mqtt', capacity=10000, anonymous_window=10.0, limits=DEFAULT_LIMITS, path=None):
+        self.path = path
+        self.prefix = prefix
+        self.capacity = capacity
+        self.anonymous_window = anonymous_window
+        self.limits = limits
+        self.seen = OrderedDict()  # {중복 판정 키: (주문 ID, 수신 시각)}
+        self.sequence = 1  # 다음에 붙일 일련번호 (저장 기록에 포함, 같은 초에 재시작해도 ID가 겹치지 않게)
+        self.session = time.strftime('%Y%m%d%H%M%S')
+        self.stats = {'accepted': 0, 'duplicates': 0, 'rejected': 0}
+
+    def process(self, payload, now=None):
+        """
+        반환: ('accepted', 주문) / ('duplicate', 기존 주문 ID) / ('rejected', 사유)
+        주문 = {'order_id', 'anonymous', 'items'}
+        """
+        now = time.time() if now is None else now
+        try:
+            order = parse_order(payload, self.limits)
+        except OrderValidationError as e:
+            self.stats['rejected'] += 1
+            return 'rejected', str(e)
+
+        anonymous = order['order_id'] is None
+        if anonymous:
+            canonical = json.dumps(order['items'], sort_keys=True, ensure_ascii=False)
+            key = 'anon:' + hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+        else:
+            key = 'id:' + order['order_id']
+
+        seen = self.seen.get(key)
+        if seen is not None and not (anonymous and now - seen[1] > self.anonymous_window):
+            self.seen.move_to_end(key)
+            self.stats['duplicates'] += 1
+            return 'duplicate', seen[0]
+
+        if anonymous:
+            order['order_id'] = f'{self.prefix}-{self.session}-{self.sequence:06d}'
+            self.sequence += 1
+        order['anonymous'] = anonymous
+        self.seen[key] = (order['order_id'], now)
+        self.seen.move_to_end(key)
+        while len(self.seen) > self.capacity:
+            self.seen.popitem(last=False)
+        self.stats['accepted'] += 1
+        return 'accepted', order
+
+    def save(self):
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'sequence': self.sequence,
+                'seen': [[key, order_id, seen_at] for key, (order_id, seen_at) in self.seen.items()],
+            }, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def load(self):
+        """저장된 중복 판정 기록 복원, 복원한 개수 반환"""
+        if not self.path or not os.path.exists(self.path):
+            return 0
+        with open(self.path, 'r') as f:
+            data = json.load(f)
+        self.seen = OrderedDict((key, (order_id, float(seen_at))) for key, order_id, seen_at in data.get('seen', []))
+        self.sequence = max(self.sequence, int(data.get('sequence', 1)))
+        while len(self.seen) > self.capacity:
+            self.seen.popitem(last=False)
+        return len(self.seen)
@@ -0,0 +1,271 @@
+"""테스트용 프로세스 내 MQTT 3.1.1 브로커
+
+mosquitto 를 설치/실행할 수 없는 환경(CI, 개발 PC)에서 브리지를 시험하기 위한 최소 구현.
+- CONNECT/SUBSCRIBE/UNSUBSCRIBE/PUBLISH/PINGREQ/DISCONNECT (클라이언트로는 최대 QoS 1 로 전달)
+- retained 메시지, 토픽 필터(+, #)
+- clean_session=False 세션: 끊긴 동안 온 QoS 1 이상 메시지를 보관했다가 재접속 시 전달
+인증, will 메시지, 전달 보장을 위한 재전송은 하지 않는다.
+
+사용:
+    ros2 run mqtt_bridge_py mqtt_stand_in_broker --port 1883
+또는 테스트 코드에서
+    broker = StandInBroker(port=0); await broker.start(); broker.port
+"""
+import argparse
+import asyncio
+import struct
+
+CONNECT = 1
+CONNACK = 2
+PUBLISH = 3
+PUBACK = 4
+PUBREC = 5
+PUBREL = 6
+PUBCOMP = 7
+SUBSCRIBE = 8
+SUBACK = 9
+UNSUBSCRIBE = 10
+UNSUBACK = 11
+PINGREQ = 12
+PINGRESP = 13
+DISCONNECT = 14
+
+
+def topic_matches(topic_filter, topic):
+    filter_levels = topic_filter.split('/')
+    topic_levels = topic.split('/')
+    for i, level in enumerate(filter_levels):
+        if level == '#':
+            return True
+        if i >= len(topic_levels):
+            return False
+        if level != '+' and level != topic_levels[i]:
+            return False
+    return len(filter_levels) == len(topic_levels)
+
+
+def encode_length(length):
+    encoded = bytearray()
+    while True:
+        byte = length % 128
+        length //= 128
+        if length:
+            byte |= 0x80
+        encoded.append(byte)
+        if not length:
+            return bytes(encoded)
+
+
+def encode_string(value):
+    data = value.encode('utf-8')
+    return struct.pack('!H', len(data)) + data
+
+
+def packet(packet_type, flags, body):
+    return bytes([(packet_type << 4) | flags]) + encode_length(len(body)) + body
+
+
+class Session:
+    def __init__(self, client_id):
+        self.client_id = client_id
+        self.subscriptions = {}  # {필터: QoS}
+        self.pending = []        # 끊긴 동안 보관한 (topic, payload, qos)
+        self.writer = None
+        self.clean = True
+        self.next_packet_id = 1
+
+    def packet_id(self):
+        packet_id = self.next_packet_id
+        self.next_packet_id = packet_id % 65535 + 1
+        return packet_id
+
+
+class StandInBroker:
+    def __init__(self, host='127.0.0.1', port=1883):
+        self.host = host
+        self.port = port
+        self.server = None
+        self.client_tasks = set()
+        self.sessions = {}   # {client_id: Session}
+        self.retained = {}   # {토픽: (payload, qos)}
+        self.stats = {'connects': 0, 'published': 0, 'delivered': 0, 'queued': 0}
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self.server is None:
+            return
+        self.server.close()
+        for task in list(self.client_tasks):
+            task.cancel()
+        await asyncio.gather(*self.client_tasks, return_exceptions=True)
+        await self.server.wait_closed()
+        self.server = None
+
+    # ---------- 패킷 입출력 ----------
+
+    @staticmethod
+    async def read_packet(reader):
+        header = await reader.readexactly(1)
+        multiplier, length = 1, 0
+        while True:
+            byte = (await reader.readexactly(1))[0]
+            length += (byte & 0x7F) * multiplier
+            if not byte & 0x80:
+                break
+            multiplier *= 128
+        body = await reader.readexactly(length) if length else b''
+        return header[0] >> 4, header[0] & 0x0F, body
+
+    def deliver(self, session, topic, payload, qos, retain=False):
+        qos = min(qos, 1)  # 브로커→클라이언트 QoS 2 흐름은 구현하지 않음
+        if session.writer is None:
+            if qos > 0:
+                session.pending.append((topic, payload, qos))
+                self.stats['queued'] += 1
+            return
+        body = encode_string(topic)
+        if qos > 0:
+            body += struct.pack('!H', session.packet_id())
+        body += payload
+        session.writer.write(packet(PUBLISH, (qos << 1) | (1 if retain else 0), body))
+        self.stats['delivered'] += 1
+
+    def route(self, topic, payload, qos):
+        self.stats['published'] += 1
+        for session in self.sessions.values():
+            granted = [sub_qos for topic_filter, sub_qos in session.subscriptions.items()
+                       if topic_matches(topic_filter, topic)]
+            if granted:
+                self.deliver(session, topic, payload, min(qos, max(granted)))
+
+    # ---------- 클라이언트 ----------
+
+    async def handle_client(self, reader, writer):
+        session = None
+        task = asyncio.current_task()
+        self.client_tasks.add(task)
+        try:
+            packet_type, _, body = await self.read_packet(reader)
+            if packet_type != CONNECT:
+                return
+            session, session_present = self.connect(body, writer)
+            writer.write(packet(CONNACK, 0, bytes([1 if session_present else 0, 0])))
+            for topic, payload, qos in session.pending:
+                self.deliver(session, topic, payload, qos)
+            session.pending = []
+            await writer.drain()
+            while True:
+                packet_type, flags, body = await self.read_packet(reader)
+                if packet_type == DISCONNECT:
+                    break
+                self.handle_packet(session, writer, packet_type, flags, body)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.client_tasks.discard(task)
+            if session is not None and session.writer is writer:
+                session.writer = None
+                if session.clean:
+                    self.sessions.pop(session.client_id, None)
+            writer.close()
+
+    def connect(self, body, writer):
+        offset = 2 + struct.unpack('!H', body[:2])[0]   # 프로토콜 이름
+        flags = body[offset + 1]
+        offset += 4                                     # 레벨, 플래그, keepalive
+        client_id, offset = self.read_string(body, offset)
+        clean = bool(flags & 0x02)
+        if not client_id:
+            client_id = f'anonymous-{id(writer)}'
+        self.stats['connects'] += 1
+
+        previous = self.sessions.get(client_id)
+        if previous is not None and previous.writer is not None:
+            # 같은 client_id 로 다시 접속하면 이전 연결을 끊는다
+            previous.writer.close()
+            previous.writer = None
+        session_present = previous is not None and not clean
+        if session_present:
+            session = previous
+        else:
+            session = Session(client_id)
+            self.sessions[client_id] = session
+        session.clean = clean
+        session.writer = writer
+        return session, session_present
+
+    @staticmethod
+    def read_string(body, offset):
+        length = struct.unpack('!H', body[offset:offset + 2])[0]
+        return body[offset + 2:offset + 2 + length].decode('utf-8'), offset + 2 + length
+
+    def handle_packet(self, session, writer, packet_type, flags, body):
+        if packet_type == PUBLISH:
+            qos = (flags >> 1) & 0x03
+            retain = bool(flags & 0x01)
+            topic, offset = self.read_string(body, 0)
+            if qos > 0:
+                packet_id = body[offset:offset + 2]
+                offset += 2
+                writer.write(packet(PUBACK if qos == 1 else PUBREC, 0, packet_id))
+            payload = body[offset:]
+            if retain:
+                if payload:
+                    self.retained[topic] = (payload, qos)
+                else:
+                    self.retained.pop(topic, None)
+            self.route(topic, payload, qos)
+        elif packet_type == PUBREL:
+            writer.write(packet(PUBCOMP, 0, body[:2]))
+        elif packet_type == SUBSCRIBE:
+            packet_id, offset = body[:2], 2
+            granted = []
+            new_filters = []
+            while offset < len(body):
+                topic_filter, offset = self.read_string(body, offset)
+                qos = min(body[offset], 2)
+                offset += 1
+                session.subscriptions[topic_filter] = qos
+                granted.append(qos)
+                new_filters.append((topic_filter, qos))
+            writer.write(packet(SUBACK, 0, packet_id + bytes(granted)))
+            for topic, (payload, qos) in self.retained.items():
+                for topic_filter, sub_qos in new_filters:
+                    if topic_matches(topic_filter, topic):
+                        self.deliver(session, topic, payload, min(qos, sub_qos), retain=True)
+                        break
+        elif packet_type == UNSUBSCRIBE:
+            offset = 2
+            while offset < len(body):
+                topic_filter, offset = self.read_string(body, offset)
+                session.subscriptions.pop(topic_filter, None)
+            writer.write(packet(UNSUBACK, 0, body[:2]))
+        elif packet_type == PINGREQ:
+            writer.write(packet(PINGRESP, 0, b''))
+        # PUBACK/PUBREC/PUBCOMP (브로커가 보낸 메시지에 대한 응답) 은 무시
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='테스트용 프로세스 내 MQTT 브로커')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=1883)
+    options, _ = parser.parse_known_args(args)  # ros2 run 이 붙이는 --ros-args 무시
+
+    async def serve():
+        broker = await StandInBroker(options.host, options.port).start()
+        print(f'🧪 stand-in MQTT 브로커 실행 중 ({options.host}:{broker.port})')
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
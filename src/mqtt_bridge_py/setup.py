@@ -11,7 +11,7 @@ setup(
             ['resource/' + package_name]),
         ('share/' + package_name, ['package.xml']),
     ],
-    install_requires=['setuptools'],
+    install_requires=['setuptools', 'aiomqtt>=2.0'],
     zip_safe=True,
     maintainer='xotn',
     maintainer_email='james190414@gmail.com',
@@ -20,7 +20,9 @@ setup(
     tests_require=['pytest'],
     entry_points={
         'console_scripts': [
-            'mqtt_listener = mqtt_bridge_py.mqtt_listener:main'
+            'mqtt_listener = mqtt_bridge_py.mqtt_listener:main',
+            'mqtt_stand_in_broker = mqtt_bridge_py.stand_in_broker:main',
+            'order_ingest_benchmark = mqtt_bridge_py.order_benchmark:main',
         ],
     },
 )
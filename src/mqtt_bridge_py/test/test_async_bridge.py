@@ -0,0 +1,43 @@
+import asyncio
+import logging
+
+from mqtt_bridge_py.async_bridge import AsyncMqttBridge
+
+
+class StuckClient:
+    """PUBACK 이 오지 않는 QoS 1 발행 흉내 (publish 가 끝나지 않음)"""
+
+    def __init__(self):
+        self.publishing = asyncio.Event()
+        self.published = []
+
+    async def publish(self, topic, payload, qos=0, retain=False):
+        self.published.append(topic)
+        self.publishing.set()
+        await asyncio.Event().wait()
+
+
+def make_bridge():
+    bridge = AsyncMqttBridge('localhost', 1883, 'test', [], None, logging.getLogger('test'))
+    bridge.outbox = asyncio.Queue(maxsize=bridge.outbox_size)
+    return bridge
+
+
+def test_send_cancelled_mid_publish_requeues_item():
+    async def scenario():
+        bridge = make_bridge()
+        client = StuckClient()
+        bridge._enqueue(('a', b'1', 1, False))
+        bridge._enqueue(('b', b'2', 1, False))
+        task = asyncio.ensure_future(bridge._send(client))
+        await client.publishing.wait()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        assert task.cancelled()
+        return bridge, client
+
+    bridge, client = asyncio.run(scenario())
+    assert client.published == ['a']
+    assert bridge.stats['published'] == 0
+    # 보내던 항목이 맨 앞으로 돌아가고 순서 유지
+    assert [bridge.outbox.get_nowait()[0] for _ in range(bridge.outbox.qsize())] == ['a', 'b']
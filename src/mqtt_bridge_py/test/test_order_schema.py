@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from mqtt_bridge_py.order_schema import OrderIngest, OrderValidationError, parse_order
+
+
+def payload(order_id=None, **item):
+    base = {'name': ' apple ', 'quantity': '2', 'position': 3, 'floor': 1}
+    data = {'order': [dict(base, **item)]}
+    if order_id is not None:
+        data['order_id'] = order_id
+    return json.dumps(data).encode('utf-8')
+
+
+def test_parse_normalises_fields():
+    order = parse_order(payload(order_id=7))
+    assert order == {'order_id': '7',
+                     'items': [{'name': 'apple', 'quantity': 2, 'position': 3, 'floor': 1}]}
+
+
+@pytest.mark.parametrize('item', [
+    {'position': 9}, {'floor': None}, {'quantity': 1.5}, {'quantity': True}, {'name': ''}])
+def test_parse_rejects_bad_items(item):
+    with pytest.raises(OrderValidationError):
+        parse_order(payload(**item))
+
+
+def test_parse_rejects_non_object():
+    with pytest.raises(OrderValidationError):
+        parse_order(b'[1, 2]')
+    with pytest.raises(OrderValidationError):
+        parse_order(b'{"order": []}')
+
+
+def test_ingest_dedupes_by_id():
+    ingest = OrderIngest()
+    assert ingest.process(payload(order_id='A'), now=0.0)[0] == 'accepted'
+    assert ingest.process(payload(order_id='A'), now=100.0) == ('duplicate', 'A')
+
+
+def test_ingest_anonymous_window():
+    ingest = OrderIngest(prefix='test', anonymous_window=10.0)
+    status, order = ingest.process(payload(), now=0.0)
+    assert status == 'accepted' and order['anonymous']
+    assert order['order_id'].startswith('test-')
+    assert ingest.process(payload(), now=5.0) == ('duplicate', order['order_id'])
+    status, again = ingest.process(payload(), now=20.0)
+    assert status == 'accepted' and again['order_id'] != order['order_id']
+    assert ingest.stats == {'accepted': 2, 'duplicates': 1, 'rejected': 0}
+
+
+def test_restarted_ingest_still_dedupes_redelivery(tmp_path):
+    path = str(tmp_path / 'dedupe.json')
+    ingest = OrderIngest(anonymous_window=10.0, path=path)
+    status, order = ingest.process(payload(), now=100.0)
+    assert status == 'accepted'
+    ingest.save()
+
+    # 브리지 재시작: 영구 세션이 같은 ID 없는 주문을 다시 보냄
+    restarted = OrderIngest(anonymous_window=10.0, path=path)
+    assert restarted.load() == 1
+    assert restarted.process(payload(), now=104.0) == ('duplicate', order['order_id'])
+    # 시간 창이 지난 같은 내용은 새 주문 (새 ID)
+    status, again = restarted.process(payload(), now=130.0)
+    assert status == 'accepted' and again['order_id'] != order['order_id']
@@ -1,9 +1,13 @@
 from launch import LaunchDescription
 from launch_ros.actions import Node
-from launch.actions import TimerAction
+from launch.actions import DeclareLaunchArgument
+from launch.conditions import IfCondition
+from launch.substitutions import LaunchConfiguration
 
 def generate_launch_description():
     return LaunchDescription([
+        # 수집기는 창 없이 돌고, 화면/키 입력은 detection_viewer (원격 수집이면 viewer:=false)
+        DeclareLaunchArgument('viewer', default_value='true'),
         Node(
             package='realsense2_camera',
             executable='realsense2_camera_node',
@@ -15,7 +19,12 @@ def generate_launch_description():
                 'camera_name': 'd415_camera',
                 'enable_color': True,
                 'color_width': 640,
-                'color_height': 480
+                'color_height': 480,
+                # RGB-D 기록(D 키)용: color 에 정렬된 depth
+                'enable_depth': True,
+                'depth_width': 640,
+                'depth_height': 480,
+                'align_depth': True
             }]
         ),
         Node(
@@ -23,5 +32,20 @@ def generate_launch_description():
                 executable='rgb_display_node',
                 name='realsense_rgb_display_node',
                 output='screen'
+            ),
+        Node(
+                package='detection_viewer',
+                executable='detection_viewer',
+                name='realsense_viewer',
+                output='screen',
+                condition=IfCondition(LaunchConfiguration('viewer')),
+                parameters=[{
+                    'image_topic': '/d415/realsense_d415/color/image_raw',
+                    'status_topic': '/realsense_rgb_display_node/status',
+                    'service_prefix': '/realsense_rgb_display_node',
+                    'key_bindings': ['space:save', 'b:burst', 'd:record', 'r:reset'],
+                    'window_name': 'RealSense Data Collector',
+                    'crosshair': True,
+                }]
             )
     ])
\ No newline at end of file
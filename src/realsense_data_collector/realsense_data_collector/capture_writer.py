@@ -0,0 +1,135 @@
+import os
+import queue
+import threading
+import time
+from collections import deque
+
+import cv2
+
+# 형식 → (확장자, 품질 파라미터 이름, OpenCV 플래그)
+FORMATS = {
+    'jpg': ('.jpg', 'quality', cv2.IMWRITE_JPEG_QUALITY),
+    'png': ('.png', 'compression', cv2.IMWRITE_PNG_COMPRESSION),
+    'webp': ('.webp', 'quality', cv2.IMWRITE_WEBP_QUALITY),
+    'bmp': ('.bmp', None, None),
+}
+
+
+class CaptureWriter:
+    """
+    이미지 인코딩/저장 스레드 풀
+
+    - submit() 은 큐에 넣고 바로 반환 (디스플레이 타이머를 막지 않음)
+    - 큐가 가득 차면 새 프레임을 버리고 dropped 로 센다 (메모리 상한)
+    - cv2.imencode 는 GIL 을 놓기 때문에 스레드 여러 개로 인코딩이 병렬로 돈다
+    """
+
+    def __init__(self, save_path, workers=2, queue_size=64, image_format='jpg',
+                 jpeg_quality=95, png_compression=3, prefix='rgb'):
+        if image_format not in FORMATS:
+            raise ValueError(f'unknown image format {image_format!r} (expected one of {sorted(FORMATS)})')
+        self.save_path = save_path
+        self.prefix = prefix
+        self.extension, option, flag = FORMATS[image_format]
+        if option == 'quality':
+            self.params = [flag, int(jpeg_quality)]
+        elif option == 'compression':
+            self.params = [flag, int(png_compression)]
+        else:
+            self.params = []
+
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.lock = threading.Lock()
+        self.sequence = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.bytes_written = 0
+        self.encode_seconds = 0.0
+        self.last_file = None
+        self.recent = deque()  # (완료 시각, 바이트) - 처리량 계산용
+        self.threads = [threading.Thread(target=self._worker, name=f'capture_writer_{i}', daemon=True)
+                        for i in range(max(1, workers))]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, image, stamp=None):
+        """저장 요청, 큐가 가득 찼으면 False (프레임은 버려짐)"""
+        stamp = time.time() if stamp is None else stamp
+        with self.lock:
+            index = self.sequence
+            self.sequence += 1
+        try:
+            self.queue.put_nowait((image, stamp, index))
+            return True
+        except queue.Full:
+            with self.lock:
+                self.dropped += 1
+            return False
+
+    def filename(self, stamp, index):
+        timestamp = time.strftime('%Y%m%d_%H%M%S', time.localtime(stamp)) + f'_{int(stamp * 1000) % 1000:03d}'
+        return f'{self.prefix}_{timestamp}_{index:04d}{self.extension}'
+
+    def _worker(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                self.queue.task_done()
+                return
+            image, stamp, index = item
+            name = self.filename(stamp, index)
+            try:
+                started = time.perf_counter()
+                ok, encoded = cv2.imencode(self.extension, image, self.params)
+                elapsed = time.perf_counter() - started
+                if not ok:
+                    raise ValueError('encode failed')
+                with open(os.path.join(self.save_path, name), 'wb') as f:
+                    f.write(encoded.tobytes())
+                with self.lock:
+                    self.written += 1
+                    self.bytes_written += encoded.nbytes
+                    self.encode_seconds += elapsed
+                    self.last_file = name
+                    self.recent.append((time.monotonic(), encoded.nbytes))
+            except (OSError, ValueError, cv2.error):
+                with self.lock:
+                    self.failed += 1
+            finally:
+                self.queue.task_done()
+
+    def stats(self, window=5.0):
+        """저장 통계 (처리량은 최근 window 초 기준)"""
+        now = time.monotonic()
+        with self.lock:
+            while self.recent and now - self.recent[0][0] > window:
+                self.recent.popleft()
+            recent_count = len(self.recent)
+            recent_bytes = sum(size for _, size in self.recent)
+            return {
+                'written': self.written,
+                'dropped': self.dropped,
+                'failed': self.failed,
+                'backlog': self.queue.qsize(),
+                'capacity': self.queue.maxsize,
+                'images_per_s': recent_count / window,
+                'mb_per_s': recent_bytes / window / 1e6,
+                'mean_encode_ms': self.encode_seconds / self.written * 1000.0 if self.written else 0.0,
+                'last_file': self.last_file,
+            }
+
+    def close(self, timeout=10.0):
+        """남은 요청을 모두 저장하고 스레드 종료"""
+        deadline = time.monotonic() + timeout
+        for _ in self.threads:
+            while True:
+                try:
+                    self.queue.put(None, timeout=max(0.01, deadline - time.monotonic()))
+                    break
+                except queue.Full:
+                    if time.monotonic() > deadline:
+                        return False
+        for thread in self.threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        return not any(thread.is_alive() for thread in self.threads)
@@ -2,31 +2,84 @@
 
 import rclpy
 from rclpy.node import Node
-from sensor_msgs.msg import Image
+from sensor_msgs.msg import CameraInfo, Image
+from std_msgs.msg import String
+from std_srvs.srv import Trigger
 from cv_bridge import CvBridge
-import cv2
-import numpy as np
+import message_filters
+import json
 import os
-from datetime import datetime
 import time
 
+from realsense_data_collector.capture_writer import FORMATS, CaptureWriter
+from realsense_data_collector.frame_dedup import HASH_METHODS, FrameDeduplicator
+from realsense_data_collector.rgbd_dataset import RgbdRecorder, camera_info_to_dict
+
 class RealSenseDataCollector(Node):
     def __init__(self):
         super().__init__('realsense_data_collector')
         
         # 파라미터 선언
         self.declare_parameter('save_path', '/home/xotn/segmentation_project/data/image')
-        self.declare_parameter('display_enabled', True)
         self.declare_parameter('image_topic', '/d415/realsense_d415/color/image_raw')
+        # 저장 (인코딩은 스레드 풀에서)
+        self.declare_parameter('image_format', 'jpg')
+        self.declare_parameter('jpeg_quality', 95)      # jpg/webp 품질 (0~100)
+        self.declare_parameter('png_compression', 3)    # png 압축 (0~9, 클수록 느림)
+        self.declare_parameter('writer_threads', 2)
+        self.declare_parameter('writer_queue_size', 64)
+        # 연속 촬영 (B 키): burst_rate fps 로 burst_duration 초 동안
+        self.declare_parameter('burst_rate', 5.0)
+        self.declare_parameter('burst_duration', 60.0)
+        # 거의 같은 프레임 건너뛰기 (지각 해시 64비트, 다른 비트 수가 dedup_threshold 이하면 중복)
+        self.declare_parameter('dedup_enabled', True)
+        self.declare_parameter('dedup_threshold', 6)
+        self.declare_parameter('dedup_method', 'phash')    # phash / dhash
+        # RGB-D 기록 (D 키): color + 정렬된 depth + CameraInfo 를 청크 단위 .npy 로
+        self.declare_parameter('depth_topic', '/d415/realsense_d415/aligned_depth_to_color/image_raw')
+        self.declare_parameter('camera_info_topic', '/d415/realsense_d415/color/camera_info')
+        self.declare_parameter('dataset_path', '/home/xotn/segmentation_project/data/rgbd')
+        self.declare_parameter('record_chunk_size', 256)   # 청크당 프레임 수 (640x480 기준 약 1.8 MB/프레임)
+        self.declare_parameter('sync_slop', 0.02)          # color/depth 시각 차 허용 (초)
+        self.declare_parameter('depth_scale', 0.001)       # depth 1 단위 = 1 mm (D415 기본값)
         
         # 파라미터 가져오기
         self.save_path = self.get_parameter('save_path').get_parameter_value().string_value
-        self.display_enabled = self.get_parameter('display_enabled').get_parameter_value().bool_value
         self.image_topic = self.get_parameter('image_topic').get_parameter_value().string_value
         
         # 저장 폴더 생성
         os.makedirs(self.save_path, exist_ok=True)
         self.get_logger().info(f"📁 이미지 저장 경로: {self.save_path}")
+
+        image_format = self.get_parameter('image_format').value
+        if image_format not in FORMATS:
+            self.get_logger().warn(f"⚠️ 알 수 없는 image_format: {image_format} - jpg 사용")
+            image_format = 'jpg'
+        self.image_format = image_format
+        self.writer = CaptureWriter(
+            self.save_path,
+            workers=self.get_parameter('writer_threads').value,
+            queue_size=self.get_parameter('writer_queue_size').value,
+            image_format=image_format,
+            jpeg_quality=self.get_parameter('jpeg_quality').value,
+            png_compression=self.get_parameter('png_compression').value)
+        self.burst_rate = self.get_parameter('burst_rate').value
+        self.burst_duration = self.get_parameter('burst_duration').value
+        self.burst_timer = None
+        self.burst_ends = None
+        self.burst_last_frame = None
+        self.dedup = None
+        if self.get_parameter('dedup_enabled').value:
+            dedup_method = self.get_parameter('dedup_method').value
+            if dedup_method not in HASH_METHODS:
+                self.get_logger().warn(f"⚠️ 알 수 없는 dedup_method: {dedup_method} - phash 사용")
+                dedup_method = 'phash'
+            self.dedup = FrameDeduplicator(self.get_parameter('dedup_threshold').value, dedup_method)
+        self.dataset_path = self.get_parameter('dataset_path').value
+        self.recorder = None
+        self.record_subs = None
+        self.record_sync = None
+        self.record_started = None
         
         # CV Bridge 초기화
         self.bridge = CvBridge()
@@ -34,6 +87,8 @@ class RealSenseDataCollector(Node):
         # 이미지 카운터 및 상태
         self.image_counter = 0
         self.latest_image = None
+        self.latest_stamp = None
+        self.frame_index = 0  # 수신 프레임 번호 (연속 촬영에서 같은 프레임 중복 저장 방지)
         self.save_requested = False
         
         # 성능 모니터링
@@ -49,28 +104,29 @@ class RealSenseDataCollector(Node):
             10
         )
         
-        # OpenCV 윈도우 설정
-        if self.display_enabled:
-            cv2.namedWindow('RealSense Data Collector', cv2.WINDOW_AUTOSIZE)
-            cv2.namedWindow('Collection Info', cv2.WINDOW_AUTOSIZE)
-            self.get_logger().info('🖥️ OpenCV 디스플레이가 활성화되었습니다.')
-        else:
-            self.get_logger().info('🚫 OpenCV 디스플레이가 비활성화되었습니다.')
-        
-        # 타이머로 디스플레이 업데이트 (30Hz)
-        if self.display_enabled:
-            self.timer = self.create_timer(0.033, self.update_display)
+        # 창은 detection_viewer 가 띄움: 상태는 ~/status, 키 입력은 서비스로 받음
+        self.status_pub = self.create_publisher(String, '~/status', 1)
+        self.status_timer = self.create_timer(0.5, self.publish_status)
+        self.key_services = [
+            self.create_service(Trigger, '~/save', self.save_service),
+            self.create_service(Trigger, '~/burst', self.burst_service),
+            self.create_service(Trigger, '~/record', self.record_service),
+            self.create_service(Trigger, '~/reset', self.reset_service),
+        ]
         
         self.get_logger().info(f"📷 토픽 구독: {self.image_topic}")
         self.get_logger().info("🎯 RealSense 데이터 수집기가 시작되었습니다!")
-        self.get_logger().info("⌨️  조작법: 스페이스바(저장), ESC/Q(종료)")
+        self.get_logger().info("⌨️  detection_viewer 조작법: 스페이스바(저장), B(연속 촬영 시작/중지), D(RGB-D 기록 시작/중지), R(카운터 리셋)")
         
     def color_callback(self, msg):
         """ROS2 이미지 메시지를 받아서 OpenCV 이미지로 변환"""
         try:
             # ROS2 이미지를 OpenCV 이미지로 변환
             cv_image = self.bridge.imgmsg_to_cv2(msg, desired_encoding='bgr8')
+            # 저장 큐가 이 배열을 그대로 참조하므로 프레임마다 새 배열이어야 함
             self.latest_image = cv_image.copy()
+            self.latest_stamp = time.time()
+            self.frame_index += 1
             
             # FPS 계산
             self.calculate_fps()
@@ -87,125 +143,182 @@ class RealSenseDataCollector(Node):
             self.frame_count = 0
             self.last_fps_time = current_time
     
-    def create_info_display(self):
-        """정보 디스플레이 창 생성"""
-        info_img = np.zeros((400, 500, 3), dtype=np.uint8)
-        
-        # 제목
-        cv2.putText(info_img, 'RealSense Data Collector', (10, 30), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
-        
-        # 구분선
-        cv2.line(info_img, (10, 40), (490, 40), (255, 255, 255), 1)
-        
-        # 정보 표시
-        y_pos = 70
-        info_lines = [
-            f"Topic: {self.image_topic}",
-            f"Save Path: {self.save_path}",
-            f"Images Saved: {self.image_counter}",
-            f"FPS: {self.fps:.1f}",
-            f"Camera Status: {'Connected' if self.latest_image is not None else 'Disconnected'}",
-            "",
-            "Controls:",
-            "SPACE - Save current image",
-            "ESC/Q - Exit program",
-            "R - Reset counter",
-            "",
-            "Status:",
-            f"Display: {'Enabled' if self.display_enabled else 'Disabled'}",
-            f"Last Save: {datetime.now().strftime('%H:%M:%S') if self.image_counter > 0 else 'None'}"
-        ]
-        
-        for i, line in enumerate(info_lines):
-            if i < 5:  # 상태 정보는 초록색
-                color = (0, 255, 0)
-            elif "Controls:" in line or "Status:" in line:  # 섹션 제목은 노란색
-                color = (0, 255, 255)
-            else:  # 설명은 흰색
-                color = (255, 255, 255)
-                
-            cv2.putText(info_img, line, (10, y_pos + i * 25), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
-        
-        return info_img
-    
-    def update_display(self):
-        """디스플레이 업데이트"""
-        if not self.display_enabled:
-            return
-            
-        try:
-            # 메인 이미지 표시
-            if self.latest_image is not None:
-                # 이미지에 오버레이 정보 추가
-                display_image = self.latest_image.copy()
-                
-                # 상단 정보 오버레이
-                overlay = display_image.copy()
-                cv2.rectangle(overlay, (0, 0), (display_image.shape[1], 60), (0, 0, 0), -1)
-                cv2.addWeighted(overlay, 0.7, display_image, 0.3, 0, display_image)
-                
-                # 정보 텍스트
-                cv2.putText(display_image, f"Images: {self.image_counter} | FPS: {self.fps:.1f}", 
-                           (10, 25), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-                cv2.putText(display_image, "SPACE: Save | ESC/Q: Exit", 
-                           (10, 50), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-                
-                # 중앙 십자선
-                h, w = display_image.shape[:2]
-                cv2.line(display_image, (w//2 - 20, h//2), (w//2 + 20, h//2), (255, 255, 255), 2)
-                cv2.line(display_image, (w//2, h//2 - 20), (w//2, h//2 + 20), (255, 255, 255), 2)
-                
-                cv2.imshow('RealSense Data Collector', display_image)
-            
-            # 정보 창 표시
-            info_display = self.create_info_display()
-            cv2.imshow('Collection Info', info_display)
-            
-            # 키 입력 처리
-            key = cv2.waitKey(1) & 0xFF
-            if key == 27 or key == ord('q') or key == ord('Q'):  # ESC 또는 Q
-                self.get_logger().info('🛑 종료 요청')
-                rclpy.shutdown()
-            elif key == ord(' '):  # 스페이스바
-                self.save_current_image()
-            elif key == ord('r') or key == ord('R'):  # R - 카운터 리셋
-                self.image_counter = 0
-                self.get_logger().info('🔄 이미지 카운터 리셋')
-                
-        except Exception as e:
-            self.get_logger().error(f'디스플레이 업데이트 오류: {e}')
-    
-    def save_current_image(self):
-        """현재 이미지를 저장"""
+    def publish_status(self):
+        """수집 상태 (viewer 정보 창에 줄 단위로 표시)"""
+        writer = self.writer.stats()
+        status = {
+            'Topic': self.image_topic,
+            'Save Path': self.save_path,
+            'Images Saved': self.image_counter,
+            'FPS': round(self.fps, 1),
+            'Camera Status': 'Connected' if self.latest_image is not None else 'Disconnected',
+            'Writer': f"{writer['images_per_s']:.1f} img/s, {writer['mb_per_s']:.1f} MB/s ({self.image_format})",
+            'Backlog': f"{writer['backlog']}/{writer['capacity']} | Dropped: {writer['dropped']} | Failed: {writer['failed']}",
+            'Burst': self.burst_status(),
+            'RGB-D': self.record_status(),
+            'Dedup': self.dedup_status(),
+            'Last Save': writer['last_file'] or 'None',
+        }
+        msg = String()
+        msg.data = json.dumps(status)
+        self.status_pub.publish(msg)
+
+    def save_service(self, request, response):
+        before = self.image_counter
+        self.save_current_image()
+        response.success = self.image_counter > before
+        response.message = f'queued #{self.image_counter}' if response.success else 'not saved (no image, duplicate or queue full)'
+        return response
+
+    def burst_service(self, request, response):
+        self.toggle_burst()
+        response.success = True
+        response.message = self.burst_status()
+        return response
+
+    def record_service(self, request, response):
+        self.toggle_recording()
+        response.success = True
+        response.message = self.record_status()
+        return response
+
+    def reset_service(self, request, response):
+        self.image_counter = 0
+        if self.dedup is not None:
+            self.dedup.reset()
+        self.get_logger().info('🔄 이미지 카운터 리셋')
+        response.success = True
+        response.message = 'reset'
+        return response
+
+    def save_current_image(self, quiet=False):
+        """현재 이미지를 저장 큐에 넣음 (인코딩/쓰기는 CaptureWriter 스레드에서)"""
         if self.latest_image is not None:
-            # 타임스탬프 생성
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
-            filename = f"rgb_{timestamp}_{self.image_counter:04d}.jpg"
-            filepath = os.path.join(self.save_path, filename)
-            
-            # 이미지 저장
-            success = cv2.imwrite(filepath, self.latest_image)
-            
-            if success:
+            value = None
+            if self.dedup is not None:
+                keep, value, distance = self.dedup.check(self.latest_image)
+                if not keep:
+                    self.dedup.skip()
+                    if not quiet:
+                        self.get_logger().info(f"⏭️ 이미 저장한 프레임과 거의 같음 (해시 거리 {distance}) - 건너뜀")
+                    return
+            if self.writer.submit(self.latest_image, self.latest_stamp):
+                if value is not None:
+                    self.dedup.keep(value)
                 self.image_counter += 1
-                self.get_logger().info(f"💾 이미지 저장 완료 ({self.image_counter}): {filename}")
-                
-                # 콘솔에도 간단한 피드백
-                print(f"📸 #{self.image_counter:04d} 저장됨: {filename}")
+                if not quiet:
+                    self.get_logger().info(f"💾 이미지 저장 요청 ({self.image_counter})")
+                    # 콘솔에도 간단한 피드백
+                    print(f"📸 #{self.image_counter:04d} 저장 요청")
             else:
-                self.get_logger().error(f"❌ 이미지 저장 실패: {filename}")
+                self.get_logger().warn(f"⚠️ 저장 큐가 가득 참 - 프레임 버림 (대기 {self.writer.queue.qsize()}개)")
         else:
             self.get_logger().warn("⚠️ 저장할 이미지가 없습니다. 카메라 연결을 확인하세요.")
-    
+
+    def toggle_burst(self):
+        if self.burst_timer is not None:
+            self.stop_burst('중지')
+            return
+        self.burst_ends = time.time() + self.burst_duration
+        self.burst_last_frame = None
+        self.burst_timer = self.create_timer(1.0 / self.burst_rate, self.burst_tick)
+        self.get_logger().info(f"🎞️ 연속 촬영 시작: {self.burst_rate:.1f} fps, {self.burst_duration:.0f}초")
+
+    def burst_tick(self):
+        if time.time() >= self.burst_ends:
+            self.stop_burst('완료')
+            return
+        # 카메라가 burst_rate 보다 느리면 같은 프레임을 다시 저장하지 않음
+        if self.latest_image is None or self.frame_index == self.burst_last_frame:
+            return
+        self.burst_last_frame = self.frame_index
+        self.save_current_image(quiet=True)
+
+    def stop_burst(self, reason):
+        self.burst_timer.cancel()
+        self.destroy_timer(self.burst_timer)
+        self.burst_timer = None
+        self.burst_ends = None
+        skipped = f", 중복 건너뜀 {self.dedup.skipped}개" if self.dedup is not None else ""
+        self.get_logger().info(f"🎞️ 연속 촬영 {reason} (누적 저장 요청 {self.image_counter}개{skipped})")
+
+    def burst_status(self):
+        if self.burst_timer is None:
+            return 'Off (B)'
+        return f"{self.burst_rate:.1f} fps, {max(0.0, self.burst_ends - time.time()):.0f}s left"
+
+    def dedup_status(self):
+        if self.dedup is None:
+            return 'Off'
+        return f"kept {self.dedup.kept}, skipped {self.dedup.skipped} ({self.dedup.method} <= {self.dedup.threshold})"
+
+    def toggle_recording(self):
+        if self.recorder is not None:
+            self.stop_recording()
+            return
+        session = os.path.join(self.dataset_path, time.strftime('%Y%m%d_%H%M%S'))
+        self.recorder = RgbdRecorder(session,
+                                     chunk_size=self.get_parameter('record_chunk_size').value,
+                                     depth_scale=self.get_parameter('depth_scale').value)
+        # 기록하는 동안만 구독 (평소에는 depth 를 받지 않음)
+        self.record_subs = [
+            message_filters.Subscriber(self, Image, self.image_topic),
+            message_filters.Subscriber(self, Image, self.get_parameter('depth_topic').value),
+            message_filters.Subscriber(self, CameraInfo, self.get_parameter('camera_info_topic').value),
+        ]
+        self.record_sync = message_filters.ApproximateTimeSynchronizer(
+            self.record_subs, queue_size=10, slop=self.get_parameter('sync_slop').value)
+        self.record_sync.registerCallback(self.rgbd_callback)
+        self.record_started = time.time()
+        self.get_logger().info(f"🔴 RGB-D 기록 시작: {session}")
+
+    def rgbd_callback(self, color_msg, depth_msg, info_msg):
+        """동기화된 color/depth/CameraInfo 한 묶음을 기록 (변환 후 메모리 맵에 복사만 함)"""
+        if self.recorder is None:
+            return
+        try:
+            color = self.bridge.imgmsg_to_cv2(color_msg, desired_encoding='bgr8')
+            depth = self.bridge.imgmsg_to_cv2(depth_msg, desired_encoding='passthrough')
+            self.recorder.add(color, depth,
+                              stamp_seconds(color_msg.header.stamp),
+                              stamp_seconds(depth_msg.header.stamp),
+                              camera_info_to_dict(info_msg))
+        except Exception as e:
+            self.get_logger().error(f"RGB-D 기록 오류: {e}")
+            self.stop_recording()
+
+    def stop_recording(self):
+        for sub in self.record_subs:
+            self.destroy_subscription(sub.sub)
+        self.record_subs = None
+        self.record_sync = None
+        recorder, self.recorder = self.recorder, None
+        recorder.close()
+        elapsed = time.time() - self.record_started
+        self.get_logger().info(f"⏹️ RGB-D 기록 종료: {recorder.count}프레임, {elapsed:.0f}초 → {recorder.root}")
+
+    def record_status(self):
+        if self.recorder is None:
+            return 'Off (D)'
+        elapsed = max(1e-3, time.time() - self.record_started)
+        return f"{self.recorder.count} frames ({self.recorder.count / elapsed:.1f} fps), chunk {self.recorder.chunk}"
+
     def destroy_node(self):
         """노드 종료시 정리"""
-        if self.display_enabled:
-            cv2.destroyAllWindows()
-        self.get_logger().info(f"✅ 총 {self.image_counter}개의 이미지가 저장되었습니다.")
+        if self.burst_timer is not None:
+            self.stop_burst('중지')
+        if self.recorder is not None:
+            self.stop_recording()
+        # 큐에 남은 이미지까지 저장
+        self.writer.close()
+        stats = self.writer.stats()
+        skipped = self.dedup.skipped if self.dedup is not None else 0
+        self.get_logger().info(f"✅ 총 {stats['written']}개의 이미지가 저장되었습니다. (중복 건너뜀 {skipped}, 버림 {stats['dropped']}, 실패 {stats['failed']})")
         super().destroy_node()
 
+def stamp_seconds(stamp):
+    return stamp.sec + stamp.nanosec * 1e-9
+
 def main():
     # ROS2 초기화
     rclpy.init()
@@ -236,7 +349,6 @@ def main():
         except:
             pass
         
-        cv2.destroyAllWindows()
         print("🔚 프로그램이 정상적으로 종료되었습니다.")
 
 if __name__ == '__main__':
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+동기화된 RGB-D + CameraInfo 데이터셋 (청크 단위 .npy, 메모리 맵으로 읽기)
+
+세션 디렉터리 구조:
+    meta.json                 형상/자료형, 청크 크기, depth_scale, 카메라 내부 파라미터 목록
+    index.npy                 프레임별 (chunk, offset, color_stamp, depth_stamp, info_id)
+    chunk_00000.color.npy     (N, H, W, 3) uint8 BGR
+    chunk_00000.depth.npy     (N, H, W) uint16 (color 에 정렬된 depth, 단위 depth_scale m)
+    ...
+
+- 기록: 청크 파일을 open_memmap 으로 미리 만들고 프레임을 그대로 복사 (인코딩 없음)
+- index.npy 는 청크가 찰 때마다 원자적으로 다시 써서, 중간에 끊겨도 그때까지의 청크는 읽을 수 있다
+- 읽기: np.load(mmap_mode='r') 로 필요한 프레임만 페이지 단위로 읽음 (임의 접근, 청크 단위 순차 읽기)
+
+사용 예:
+    dataset = RgbdDataset('~/datasets/rgbd/20250101_120000')
+    frame = dataset[123]                     # {'color', 'depth', 'camera_info', 'color_stamp', 'depth_stamp'}
+    for chunk in dataset.iter_chunks():      # 청크별 color/depth 배열 (메모리 맵)
+        ...
+    ros2 run realsense_data_collector rgbd_dataset_info ~/datasets/rgbd/20250101_120000
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+INDEX_DTYPE = np.dtype([
+    ('chunk', np.int32),
+    ('offset', np.int32),
+    ('color_stamp', np.float64),
+    ('depth_stamp', np.float64),
+    ('info_id', np.int16),
+])
+
+FORMAT_VERSION = 1
+
+
+def camera_info_to_dict(msg):
+    """sensor_msgs/CameraInfo → JSON 으로 저장할 dict"""
+    return {
+        'width': int(msg.width),
+        'height': int(msg.height),
+        'distortion_model': msg.distortion_model,
+        'd': [float(v) for v in msg.d],
+        'k': [float(v) for v in msg.k],
+        'r': [float(v) for v in msg.r],
+        'p': [float(v) for v in msg.p],
+        'frame_id': msg.header.frame_id,
+    }
+
+
+def chunk_path(root, chunk, stream):
+    return os.path.join(root, f'chunk_{chunk:05d}.{stream}.npy')
+
+
+def _atomic_save(path, array):
+    tmp_path = path + '.tmp.npy'
+    np.save(tmp_path, array)
+    os.replace(tmp_path, path)
+
+
+def _atomic_json(path, data):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, path)
+
+
+class RgbdRecorder:
+    def __init__(self, root, chunk_size=256, depth_scale=0.001):
+        self.root = os.path.expanduser(root)
+        os.makedirs(self.root, exist_ok=True)
+        self.chunk_size = chunk_size
+        self.depth_scale = depth_scale
+        self.color_shape = None
+        self.depth_shape = None
+        self.camera_infos = []     # 서로 다른 CameraInfo 목록 (보통 하나)
+        self.index = np.zeros(1024, dtype=INDEX_DTYPE)
+        self.count = 0
+        self.chunk = -1
+        self.offset = 0
+        self.color_chunk = None
+        self.depth_chunk = None
+
+    def _info_id(self, camera_info):
+        if camera_info is None:
+            return -1
+        for i, known in enumerate(self.camera_infos):
+            if known == camera_info:
+                return i
+        self.camera_infos.append(camera_info)
+        self._write_meta()
+        return len(self.camera_infos) - 1
+
+    def _open_chunk(self):
+        self._close_chunk()
+        self.chunk += 1
+        self.offset = 0
+        self.color_chunk = np.lib.format.open_memmap(
+            chunk_path(self.root, self.chunk, 'color'), mode='w+', dtype=np.uint8,
+            shape=(self.chunk_size,) + self.color_shape)
+        self.depth_chunk = np.lib.format.open_memmap(
+            chunk_path(self.root, self.chunk, 'depth'), mode='w+', dtype=np.uint16,
+            shape=(self.chunk_size,) + self.depth_shape)
+
+    def _close_chunk(self):
+        if self.color_chunk is None:
+            return
+        self.color_chunk.flush()
+        self.depth_chunk.flush()
+        self.color_chunk = None
+        self.depth_chunk = None
+        self._write_index()
+
+    def add(self, color, depth, color_stamp, depth_stamp, camera_info=None):
+        """프레임 하나 추가, 프레임 번호 반환"""
+        if self.color_shape is None:
+            self.color_shape = tuple(color.shape)
+            self.depth_shape = tuple(depth.shape)
+            self._write_meta()
+        if tuple(color.shape) != self.color_shape or tuple(depth.shape) != self.depth_shape:
+            raise ValueError(f'frame shape changed: color {color.shape}, depth {depth.shape} '
+                             f'(expected {self.color_shape}, {self.depth_shape})')
+        if self.color_chunk is None or self.offset >= self.chunk_size:
+            self._open_chunk()
+
+        self.color_chunk[self.offset] = color
+        self.depth_chunk[self.offset] = depth
+        if self.count >= len(self.index):
+            self.index = np.resize(self.index, len(self.index) * 2)
+        self.index[self.count] = (self.chunk, self.offset, color_stamp, depth_stamp, self._info_id(camera_info))
+        self.count += 1
+        self.offset += 1
+        if self.offset >= self.chunk_size:
+            self._close_chunk()
+        return self.count - 1
+
+    def _write_index(self):
+        _atomic_save(os.path.join(self.root, 'index.npy'), self.index[:self.count])
+
+    def _write_meta(self):
+        _atomic_json(os.path.join(self.root, 'meta.json'), {
+            'version': FORMAT_VERSION,
+            'chunk_size': self.chunk_size,
+            'color_shape': list(self.color_shape) if self.color_shape else None,
+            'depth_shape': list(self.depth_shape) if self.depth_shape else None,
+            'color_encoding': 'bgr8',
+            'depth_encoding': '16UC1',
+            'depth_scale': self.depth_scale,
+            'camera_infos': self.camera_infos,
+        })
+
+    def close(self):
+        """마지막 청크를 실제 프레임 수로 줄이고 인덱스 기록"""
+        if self.color_chunk is not None and self.offset < self.chunk_size:
+            used = self.offset
+            for stream, array in (('color', self.color_chunk), ('depth', self.depth_chunk)):
+                _atomic_save(chunk_path(self.root, self.chunk, stream), np.asarray(array[:used]))
+            self.color_chunk = None
+            self.depth_chunk = None
+        self._close_chunk()
+        self._write_index()
+
+
+class RgbdDataset:
+    """기록된 세션 읽기 (모든 배열은 읽기 전용 메모리 맵)"""
+
+    def __init__(self, root):
+        self.root = os.path.expanduser(root)
+        with open(os.path.join(self.root, 'meta.json'), 'r') as f:
+            self.meta = json.load(f)
+        index_path = os.path.join(self.root, 'index.npy')
+        self.index = np.load(index_path) if os.path.exists(index_path) else np.zeros(0, dtype=INDEX_DTYPE)
+        self.camera_infos = self.meta.get('camera_infos', [])
+        self.depth_scale = self.meta.get('depth_scale', 0.001)
+        self._chunks = {}
+
+    def __len__(self):
+        return len(self.index)
+
+    def chunk_arrays(self, chunk):
+        if chunk not in self._chunks:
+            self._chunks[chunk] = (np.load(chunk_path(self.root, chunk, 'color'), mmap_mode='r'),
+                                   np.load(chunk_path(self.root, chunk, 'depth'), mmap_mode='r'))
+        return self._chunks[chunk]
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(f'frame {i} out of range (0..{len(self) - 1})')
+        entry = self.index[i]
+        color, depth = self.chunk_arrays(int(entry['chunk']))
+        info_id = int(entry['info_id'])
+        return {
+            'color': color[entry['offset']],
+            'depth': depth[entry['offset']],
+            'camera_info': self.camera_infos[info_id] if info_id >= 0 else None,
+            'color_stamp': float(entry['color_stamp']),
+            'depth_stamp': float(entry['depth_stamp']),
+        }
+
+    def depth_meters(self, i):
+        return self[i]['depth'].astype(np.float32) * self.depth_scale
+
+    def iter_chunks(self):
+        """청크 단위 순차 읽기: {'color': (n,H,W,3), 'depth': (n,H,W), 'index': 구조체 배열}"""
+        if len(self) == 0:
+            return
+        chunks = self.index['chunk']
+        for chunk in np.unique(chunks):
+            rows = self.index[chunks == chunk]
+            color, depth = self.chunk_arrays(int(chunk))
+            count = int(rows['offset'].max()) + 1
+            yield {'color': color[:count], 'depth': depth[:count], 'index': rows}
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='RGB-D 데이터셋 정보와 읽기 속도')
+    parser.add_argument('path', help='세션 디렉터리')
+    parser.add_argument('--samples', type=int, default=500, help='임의 접근으로 읽을 프레임 수')
+    args, _ = parser.parse_known_args()
+
+    dataset = RgbdDataset(args.path)
+    meta = dataset.meta
+    print(f'📂 {dataset.root}: 프레임 {len(dataset)}개, 청크 크기 {meta["chunk_size"]}, '
+          f'color {meta["color_shape"]}, depth {meta["depth_shape"]}, 카메라 정보 {len(dataset.camera_infos)}개')
+    if len(dataset) == 0:
+        return
+    stamps = dataset.index['color_stamp']
+    skew = np.abs(dataset.index['color_stamp'] - dataset.index['depth_stamp'])
+    duration = stamps[-1] - stamps[0]
+    print(f'⏱️ 기록 {duration:.1f}초 ({len(dataset) / duration if duration > 0 else 0:.1f} fps), '
+          f'color-depth 시각 차 평균 {skew.mean() * 1000:.1f} ms / 최대 {skew.max() * 1000:.1f} ms')
+
+    start = time.perf_counter()
+    total = 0
+    for chunk in dataset.iter_chunks():
+        # 실제로 디스크에서 읽히도록 값을 한 번씩 사용
+        chunk['color'].mean()
+        chunk['depth'].mean()
+        total += len(chunk['index'])
+    elapsed = time.perf_counter() - start
+    print(f'📖 순차 읽기: {total}프레임 {elapsed:.2f}초 ({total / elapsed if elapsed > 0 else 0:.0f} fps)')
+
+    rng = np.random.default_rng(0)
+    picks = rng.integers(0, len(dataset), size=min(args.samples, len(dataset)))
+    start = time.perf_counter()
+    for i in picks:
+        frame = dataset[int(i)]
+        np.asarray(frame['color']).mean()
+        np.asarray(frame['depth']).mean()
+    elapsed = time.perf_counter() - start
+    print(f'🎯 임의 접근: {len(picks)}프레임 {elapsed:.2f}초 ({len(picks) / elapsed if elapsed > 0 else 0:.0f} fps)')
+
+
+if __name__ == '__main__':
+    main()
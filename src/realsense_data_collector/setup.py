@@ -22,6 +22,7 @@ setup(
     entry_points={
         'console_scripts': [
             'rgb_display_node = realsense_data_collector.rgb_display_node:main',
+            'rgbd_dataset_info = realsense_data_collector.rgbd_dataset:main',
         ],
     },
 )
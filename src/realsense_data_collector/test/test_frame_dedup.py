@@ -0,0 +1,47 @@
+import random
+
+import numpy as np
+import pytest
+
+from realsense_data_collector.frame_dedup import BKTree, FrameDeduplicator, hamming
+
+
+def test_bktree_matches_linear_search():
+    rng = random.Random(0)
+    values = [rng.getrandbits(64) for _ in range(300)]
+    tree = BKTree()
+    for value in values:
+        tree.add(value)
+    for _ in range(50):
+        query = values[rng.randrange(len(values))] ^ (1 << rng.randrange(64))
+        for threshold in (0, 1, 6):
+            distances = [hamming(query, value) for value in values]
+            expected = min(distances)
+            match = tree.nearest_within(query, threshold)
+            if expected <= threshold:
+                assert match is not None and match[0] == expected
+            else:
+                assert match is None
+
+
+def test_deduplicator_skips_near_copies():
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 255, size=(120, 160, 3), dtype=np.uint8)
+    other = rng.integers(0, 255, size=(120, 160, 3), dtype=np.uint8)
+    dedup = FrameDeduplicator(threshold=6)
+
+    keep, value, distance = dedup.check(image)
+    assert keep and distance is None
+    dedup.keep(value)
+    noisy = np.clip(image.astype(np.int16) + rng.integers(-2, 3, image.shape), 0, 255)
+    keep, _, distance = dedup.check(noisy.astype(np.uint8))
+    assert not keep and distance <= 6
+    assert dedup.check(other)[0]
+
+    dedup.reset()
+    assert dedup.check(image)[0]
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        FrameDeduplicator(method='ahash')
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from realsense_data_collector.rgbd_dataset import RgbdDataset, RgbdRecorder
+
+
+def frame(i):
+    color = np.full((4, 6, 3), i, dtype=np.uint8)
+    depth = np.full((4, 6), 100 + i, dtype=np.uint16)
+    return color, depth
+
+
+def test_record_and_read_back(tmp_path):
+    recorder = RgbdRecorder(str(tmp_path), chunk_size=3)
+    info = {'width': 6, 'height': 4}
+    for i in range(7):
+        color, depth = frame(i)
+        assert recorder.add(color, depth, float(i), float(i) + 0.01, info) == i
+    recorder.close()
+
+    dataset = RgbdDataset(str(tmp_path))
+    assert len(dataset) == 7
+    for i in range(7):
+        sample = dataset[i]
+        assert sample['color'][0, 0, 0] == i
+        assert sample['depth'][0, 0] == 100 + i
+        assert sample['color_stamp'] == float(i)
+        assert sample['camera_info'] == info
+    assert dataset[-1]['color'][0, 0, 0] == 6
+    assert abs(dataset.depth_meters(0)[0, 0] - 0.1) < 1e-6
+    assert [len(chunk['color']) for chunk in dataset.iter_chunks()] == [3, 3, 1]
+    with pytest.raises(IndexError):
+        dataset[7]
+
+
+def test_shape_change_is_rejected(tmp_path):
+    recorder = RgbdRecorder(str(tmp_path))
+    recorder.add(*frame(0), 0.0, 0.0)
+    with pytest.raises(ValueError):
+        recorder.add(np.zeros((2, 2, 3), np.uint8), np.zeros((2, 2), np.uint16), 1.0, 1.0)
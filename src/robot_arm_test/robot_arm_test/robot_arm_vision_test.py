@@ -4,11 +4,14 @@ import rclpy
 from rclpy.node import Node
 from std_msgs.msg import String, Int32, Bool
 from geometry_msgs.msg import Point
+from logistics_interfaces.msg import OrientedDetectionArray
 import json
 import time
 import math
 from enum import Enum
 
+from yolo_obb_detection.detection_codec import DETECTIONS_TOPIC, array_to_dict
+
 class TestState(Enum):
     IDLE = 0
     YOLO_DETECTING = 1
@@ -49,8 +52,8 @@ class RobotArmVisionTest(Node):
         )
         
         self.yolo_result_sub = self.create_subscription(
-            String,
-            '/yolo/detection_result',
+            OrientedDetectionArray,
+            DETECTIONS_TOPIC,
             self.yolo_result_callback,
             10
         )
@@ -152,8 +155,8 @@ class RobotArmVisionTest(Node):
         """YOLO 검출 결과 수신"""
         if self.current_state == TestState.WAITING_YOLO_COMPLETE:
             try:
-                result_data = json.loads(msg.data)
-                self.get_logger().info(f'✅ YOLO 검출 완료: {result_data.get("target", "unknown")}')
+                result_data = array_to_dict(msg)
+                self.get_logger().info(f'✅ YOLO 검출 완료: {result_data["target"] or "unknown"} ({result_data["source"]})')
                 
                 if 'objects' in result_data and result_data['objects']:
                     objects = result_data['objects']
@@ -219,9 +222,6 @@ class RobotArmVisionTest(Node):
                     self.get_logger().warning('⚠️ 검출된 물체가 없습니다.')
                     self.complete_test()
                     
-            except json.JSONDecodeError as e:
-                self.get_logger().error(f'❌ YOLO 결과 파싱 오류: {e}')
-                self.complete_test()
             except Exception as e:
                 self.get_logger().error(f'❌ YOLO 결과 처리 오류: {e}')
                 self.complete_test()
@@ -11,13 +11,18 @@ import os
 def generate_launch_description():
     # Launch 인자 선언
     use_sim_time = LaunchConfiguration('use_sim_time')
+    pickup_mode = LaunchConfiguration('pickup_mode')
+    broker_host = LaunchConfiguration('broker_host')
+    broker_port = LaunchConfiguration('broker_port')
     
     mqtt_bridge = Node(
         package='mqtt_bridge_py',
         executable='mqtt_listener',
         name='mqtt_listener',
         parameters=[{
-            'use_sim_time': use_sim_time
+            'use_sim_time': use_sim_time,
+            'broker_host': broker_host,
+            'broker_port': broker_port
         }],
         output='screen'
     )
@@ -26,7 +31,8 @@ def generate_launch_description():
         executable='robot_control_node',
         name='robot_control_node',
         parameters=[{
-            'use_sim_time': use_sim_time
+            'use_sim_time': use_sim_time,
+            'pickup_mode': pickup_mode
         }],
         output='screen'
     )
@@ -59,6 +65,9 @@ def generate_launch_description():
     return LaunchDescription([
         # Launch 인자
         DeclareLaunchArgument('use_sim_time', default_value='false'),
+        DeclareLaunchArgument('pickup_mode', default_value='serial'),
+        DeclareLaunchArgument('broker_host', default_value='localhost'),
+        DeclareLaunchArgument('broker_port', default_value='1883'),
         
         # 노드들
         mqtt_bridge,
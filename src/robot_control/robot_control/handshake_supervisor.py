@@ -0,0 +1,211 @@
+import json
+import os
+from collections import deque
+
+from robot_control.mission_telemetry import percentile
+
+# 완료 신호를 보내는 쪽 (같은 쪽에서 온 늦은 중복 응답을 거르기 위해 구분)
+SOURCE_OF_HANDSHAKE = {
+    'WAITING_ROBOT_COMPLETE': 'robot',
+    'WAITING_LIFT_COMPLETE': 'lift',
+    'WATING_LIFT_RETURN_COMPLETE': 'lift',
+    'WAITING_LIFT_UP_COMPLETE': 'lift',
+    'WAITING_LIFT_DOWN_COMPLETE': 'lift',
+    'WAITING_YOLO_COMPLETE': 'camera',
+    'WAITING_ROBOT_ARM_COMPLETE': 'arm',
+    'WAITING_ROBOT_ARM_DELIVERY_COMPLETE': 'arm',
+}
+
+
+class Handshake:
+    """명령 하나와 그 완료 신호"""
+
+    __slots__ = ('key', 'detail', 'source', 'command', 'issued_at', 'first_issued_at',
+                 'deadline', 'timeout', 'retries_left', 'reissues')
+
+    def __init__(self, key, detail, command, now, timeout, retries):
+        self.key = key
+        self.detail = detail
+        self.source = SOURCE_OF_HANDSHAKE.get(key, key)
+        self.command = command  # (publisher, msg), 재전송용
+        self.issued_at = now
+        self.first_issued_at = now
+        self.timeout = timeout
+        self.deadline = now + timeout
+        self.retries_left = retries
+        self.reissues = 0
+
+    @property
+    def name(self):
+        return f'{self.key}:{self.detail}' if self.detail is not None else self.key
+
+
+class HandshakeSupervisor:
+    """
+    완료 신호 감시
+
+    - 기한: 같은 명령(key:detail, 없으면 key)의 과거 소요 시간 p99 x margin + slack,
+      표본이 min_samples 보다 적으면 기본 정책(WAIT_POLICIES) 사용
+    - 기한을 넘기면 명령 재전송, 재전송도 실패하면 'lost' 로 보고 (상위에서 안전 상태로 전환)
+    - 재전송 뒤에는 원래 응답과 재전송 응답이 둘 다 올 수 있으므로, 다음 명령이 끝났다고 보기에
+      너무 이른 같은 쪽 응답은 중복으로 버린다
+    - 명령별 발행/완료/재전송/복구/유실 횟수와 멈춰 있던 시간을 집계
+    """
+
+    def __init__(self, defaults, path=None, margin=1.5, slack=2.0, min_samples=10,
+                 min_timeout=2.0, window=200):
+        self.defaults = defaults  # {key: (timeout, retries)}
+        self.path = path
+        self.margin = margin
+        self.slack = slack
+        self.min_samples = min_samples
+        self.min_timeout = min_timeout
+        self.window = window
+        self.history = {}           # {이름: deque[초]}
+        self.counters = {}          # {key: {...}}
+        self.expected_duplicates = {}  # {source: (개수, 만료 시각)}
+        self.consecutive_lost = 0
+        self.stalled_total = 0.0
+        self.stalled_events = 0
+
+    # ---------- 기한 ----------
+
+    def _samples(self, name):
+        return self.history.get(name, ())
+
+    def typical(self, key, detail=None):
+        """과거 소요 시간 중앙값 (표본 없으면 None)"""
+        for name in self._names(key, detail):
+            samples = self._samples(name)
+            if samples:
+                return percentile(sorted(samples), 0.5)
+        return None
+
+    @staticmethod
+    def _names(key, detail):
+        return ([f'{key}:{detail}'] if detail is not None else []) + [key]
+
+    def timeout_for(self, key, detail=None):
+        default_timeout, _ = self.defaults[key]
+        for name in self._names(key, detail):
+            samples = self._samples(name)
+            if len(samples) >= self.min_samples:
+                learned = percentile(sorted(samples), 0.99) * self.margin + self.slack
+                # 학습한 기한이 기본 정책보다 길어지지는 않게
+                return min(default_timeout, max(self.min_timeout, learned))
+        return default_timeout
+
+    # ---------- 명령 / 완료 ----------
+
+    def _count(self, key, field, amount=1):
+        counters = self.counters.setdefault(key, {
+            'issued': 0, 'completed': 0, 'reissued': 0, 'recovered': 0,
+            'lost': 0, 'duplicates_ignored': 0, 'stalled_s': 0.0})
+        counters[field] += amount
+
+    def issue(self, key, command, now, detail=None):
+        _, retries = self.defaults[key]
+        handshake = Handshake(key, detail, command, now, self.timeout_for(key, detail), retries)
+        self._count(key, 'issued')
+        return handshake
+
+    def check(self, handshake, now):
+        """'wait' / 'reissue' (command 를 다시 발행해야 함) / 'lost'"""
+        if now < handshake.deadline:
+            return 'wait'
+        if handshake.retries_left > 0:
+            handshake.retries_left -= 1
+            handshake.reissues += 1
+            handshake.issued_at = now
+            handshake.deadline = now + handshake.timeout
+            self._count(handshake.key, 'reissued')
+            return 'reissue'
+        return 'lost'
+
+    def accept(self, handshake, now):
+        """
+        완료 신호가 handshake 의 응답으로 볼 만한지 확인
+        재전송 뒤 남은 중복 응답이 새 명령 직후에 도착하면 False
+        """
+        pending = self.expected_duplicates.get(handshake.source)
+        if pending is None:
+            return True
+        count, expires = pending
+        if now > expires:
+            del self.expected_duplicates[handshake.source]
+            return True
+        typical = self.typical(handshake.key, handshake.detail)
+        plausible = 0.3 * typical if typical is not None else 0.0
+        if now - handshake.issued_at >= plausible:
+            return True
+        if count <= 1:
+            del self.expected_duplicates[handshake.source]
+        else:
+            self.expected_duplicates[handshake.source] = (count - 1, expires)
+        self._count(handshake.key, 'duplicates_ignored')
+        return False
+
+    def complete(self, handshake, now):
+        self._count(handshake.key, 'completed')
+        self.consecutive_lost = 0
+        if handshake.reissues == 0:
+            # 재전송 없이 끝난 경우만 기한 학습에 사용
+            duration = now - handshake.issued_at
+            for name in self._names(handshake.key, handshake.detail):
+                self.history.setdefault(name, deque(maxlen=self.window)).append(duration)
+            return
+        self._count(handshake.key, 'recovered')
+        self._record_stall(handshake, now)
+        # 원래 명령의 응답이 늦게 올 수 있음
+        self.expected_duplicates[handshake.source] = (handshake.reissues, now + 2.0 * handshake.timeout)
+
+    def lost(self, handshake, now, escalate=True):
+        """escalate=False: 사이클을 계속하는 선택 작업 (재인식) 유실, 안전 정지 연속 횟수에 세지 않음"""
+        self._count(handshake.key, 'lost')
+        if escalate:
+            self.consecutive_lost += 1
+        self._record_stall(handshake, now)
+
+    def _record_stall(self, handshake, now):
+        """평소 소요 시간을 넘겨서 기다린 시간"""
+        typical = self.typical(handshake.key, handshake.detail) or 0.0
+        stalled = max(0.0, now - handshake.first_issued_at - typical)
+        self._count(handshake.key, 'stalled_s', stalled)
+        self.stalled_total += stalled
+        self.stalled_events += 1
+
+    # ---------- 보고 / 저장 ----------
+
+    def snapshot(self):
+        counters = {key: dict(values, stalled_s=round(values['stalled_s'], 1))
+                    for key, values in self.counters.items()}
+        timeouts = {key: round(self.timeout_for(key), 1) for key in self.defaults}
+        return {
+            'counters': counters,
+            'timeouts_s': timeouts,
+            'lost_total': sum(c['lost'] for c in self.counters.values()),
+            'stalled_events': self.stalled_events,
+            'stalled_total_s': round(self.stalled_total, 1),
+            'mean_stall_s': round(self.stalled_total / self.stalled_events, 1) if self.stalled_events else 0.0,
+            'consecutive_lost': self.consecutive_lost,
+        }
+
+    def save(self):
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({name: [round(v, 3) for v in samples] for name, samples in self.history.items()}, f)
+        os.replace(tmp_path, self.path)
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return False
+        with open(self.path, 'r') as f:
+            data = json.load(f)
+        self.history = {name: deque((float(v) for v in samples), maxlen=self.window)
+                        for name, samples in data.items()}
+        return True
@@ -0,0 +1,209 @@
+import json
+import os
+
+from robot_control.order_scheduler import OrderScheduler
+from robot_control.route_solver import solve_order
+
+# 적재/반납 위치: 순서를 바꾸거나 합치지 않는 경계 미션
+BARRIER_POSITIONS = (0, 7)
+
+# 로그가 없을 때 쓰는 기본 소요 시간 (초)
+DEFAULT_DRIVE_BASE = 10.0
+DEFAULT_DRIVE_PER_STEP = 5.0
+DEFAULT_LIFT_PER_FLOOR = 6.0
+DEFAULT_PICK_TIME = 30.0
+
+
+class CostModel:
+    """
+    미션 로그에서 학습하는 소요 시간 모델
+
+    - drive[(a, b)]: 위치 a → b 주행 시간
+    - lift[floor]:   리프트 명령(1~6) 완료까지 걸린 시간
+    - pick:          물체 하나 집기~배송 사이클 시간
+    관측값은 누적 평균으로 저장하고 JSON 파일로 보존한다.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.drive = {}  # {(a, b): [합, 횟수]}
+        self.lift = {}   # {floor: [합, 횟수]}
+        self.pick = [0.0, 0]
+
+    @staticmethod
+    def _mean(entry):
+        return entry[0] / entry[1] if entry and entry[1] > 0 else None
+
+    @staticmethod
+    def _add(table, key, value):
+        entry = table.setdefault(key, [0.0, 0])
+        entry[0] += value
+        entry[1] += 1
+
+    def observe_drive(self, from_position, to_position, seconds):
+        self._add(self.drive, (int(from_position), int(to_position)), float(seconds))
+
+    def observe_lift(self, floor, seconds):
+        self._add(self.lift, int(floor), float(seconds))
+
+    def observe_pick(self, seconds):
+        self.pick[0] += float(seconds)
+        self.pick[1] += 1
+
+    def drive_time(self, from_position, to_position):
+        if from_position == to_position:
+            return 0.0
+        learned = self._mean(self.drive.get((from_position, to_position)))
+        if learned is None:
+            learned = self._mean(self.drive.get((to_position, from_position)))
+        if learned is not None:
+            return learned
+        return DEFAULT_DRIVE_BASE + DEFAULT_DRIVE_PER_STEP * abs(to_position - from_position)
+
+    def lift_time(self, floor):
+        learned = self._mean(self.lift.get(int(floor)))
+        if learned is not None:
+            return learned
+        return DEFAULT_LIFT_PER_FLOOR * (floor if floor <= 3 else floor - 3)
+
+    def pick_time(self):
+        learned = self._mean(self.pick)
+        return learned if learned is not None else DEFAULT_PICK_TIME
+
+    def save(self):
+        if not self.path:
+            return
+        data = {
+            'drive': [[a, b, total, count] for (a, b), (total, count) in self.drive.items()],
+            'lift': [[floor, total, count] for floor, (total, count) in self.lift.items()],
+            'pick': self.pick,
+        }
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return False
+        with open(self.path, 'r') as f:
+            data = json.load(f)
+        self.drive = {(int(a), int(b)): [float(total), int(count)] for a, b, total, count in data.get('drive', [])}
+        self.lift = {int(floor): [float(total), int(count)] for floor, total, count in data.get('lift', [])}
+        pick = data.get('pick', [0.0, 0])
+        self.pick = [float(pick[0]), int(pick[1])]
+        return True
+
+
+class BatchPlanner:
+    """
+    대기 중인 미션을 합치고 순서를 바꿔서 주행/리프트 이동을 최소화
+
+    - 같은 상품/위치/층 미션은 수량을 합쳐서 한 번에 처리
+    - 같은 위치+층이 연달아 오면 주행과 리프트 왕복을 생략할 수 있으므로 비용에서 뺀다
+    - 적재/반납 위치(0, 7) 미션은 경계로 두고 그 사이 구간만 재배열
+    """
+
+    def __init__(self, cost_model, exact_limit=9):
+        self.cost_model = cost_model
+        self.exact_limit = exact_limit
+
+    def merge(self, missions):
+        merged = []
+        index = {}
+        for mission in missions:
+            if mission['position'] in BARRIER_POSITIONS:
+                merged.append(dict(mission))
+                index = {}  # 경계 너머로는 합치지 않음
+                continue
+            key = (mission['name'], mission['position'], mission['floor'])
+            if key in index:
+                target = index[key]
+                target['quantity'] += mission['quantity']
+                # 이미 합쳐진 미션끼리 합쳐도 주문 ID 가 빠지지 않도록 양쪽 전체를 이어붙임
+                target['order_ids'] = list(dict.fromkeys(
+                    OrderScheduler.order_ids_of(target) + OrderScheduler.order_ids_of(mission)))
+                target['enqueued_at'] = min(target['enqueued_at'], mission['enqueued_at'])
+            else:
+                target = dict(mission)
+                merged.append(target)
+                index[key] = target
+        return merged
+
+    def service_time(self, mission, lift_shared=False):
+        """위치 도착 후 미션 처리 시간 (리프트 왕복 + 집기)"""
+        if mission['position'] in BARRIER_POSITIONS:
+            return self.cost_model.lift_time(mission['floor'])
+        pick = self.cost_model.pick_time() * mission['quantity']
+        if lift_shared:
+            return pick
+        floor = mission['floor']
+        return self.cost_model.lift_time(floor) + self.cost_model.lift_time(floor + 3) + pick
+
+    def transition_cost(self, previous, mission):
+        shared = (previous is not None
+                  and previous['position'] == mission['position']
+                  and previous['floor'] == mission['floor']
+                  and mission['position'] not in BARRIER_POSITIONS)
+        drive = 0.0 if previous is None else self.cost_model.drive_time(previous['position'], mission['position'])
+        return drive + self.service_time(mission, lift_shared=shared)
+
+    def plan_segment(self, segment, start_position):
+        if len(segment) <= 1:
+            cost = sum(self.transition_cost(None, m) + self.cost_model.drive_time(start_position, m['position'])
+                       for m in segment)
+            return list(segment), cost, True
+        start_cost = [self.cost_model.drive_time(start_position, m['position']) + self.transition_cost(None, m)
+                      for m in segment]
+        # 비용이 같으면 먼저 들어온 주문이 앞서도록 아주 작은 역순 벌점
+        cost = [[self.transition_cost(a, b) + (1e-3 if j < i else 0.0) for j, b in enumerate(segment)]
+                for i, a in enumerate(segment)]
+        order, value, exact = solve_order(start_cost, cost, self.exact_limit)
+        return [segment[i] for i in order], value, exact
+
+    def plan(self, missions, start_position):
+        """
+        반환: (계획된 미션 목록, 예상 총 소요 시간, 정확해 여부)
+        각 미션에는 'predicted_s' (직전 미션 이후 예상 소요 시간)를 기록한다.
+        """
+        merged = self.merge(missions)
+        planned = []
+        total = 0.0
+        all_exact = True
+        segment = []
+        position = start_position
+
+        def flush(segment, position):
+            nonlocal total, all_exact
+            ordered, value, exact = self.plan_segment(segment, position)
+            all_exact = all_exact and exact
+            total += value
+            planned.extend(ordered)
+            return ordered[-1]['position'] if ordered else position
+
+        for mission in merged:
+            if mission['position'] in BARRIER_POSITIONS:
+                position = flush(segment, position)
+                segment = []
+                planned.append(mission)
+                total += self.cost_model.drive_time(position, mission['position']) + self.service_time(mission)
+                position = mission['position']
+            else:
+                segment.append(mission)
+        flush(segment, position)
+
+        # 미션별 예상 시간 기록 (예측 vs 실제 비교용)
+        previous = None
+        position = start_position
+        for mission in planned:
+            drive = self.cost_model.drive_time(position, mission['position'])
+            shared = (previous is not None and previous['position'] == mission['position']
+                      and previous['floor'] == mission['floor']
+                      and mission['position'] not in BARRIER_POSITIONS)
+            mission['predicted_s'] = round(drive + self.service_time(mission, lift_shared=shared), 2)
+            previous = mission
+            position = mission['position']
+        return planned, total, all_exact
@@ -0,0 +1,187 @@
+import json
+import os
+from collections import deque
+
+# MissionState 이름 → 단계 (같은 단계의 연속 상태는 하나의 구간으로 묶는다)
+STAGE_OF_STATE = {
+    'IDLE': 'idle',
+    'ROBOT_MOVING': 'robot_move',
+    'WAITING_ROBOT_COMPLETE': 'robot_move',
+    'LIFT_OPERATING': 'lift',
+    'WAITING_LIFT_COMPLETE': 'lift',
+    'YOLO_DETECTING': 'yolo',
+    'WAITING_YOLO_COMPLETE': 'yolo',
+    'ROBOT_ARM_MOVING': 'arm_pickup',
+    'WAITING_ROBOT_ARM_COMPLETE': 'arm_pickup',
+    'LIFT_UP_OPERATING': 'arm_pickup',
+    'WAITING_LIFT_UP_COMPLETE': 'arm_pickup',
+    'LIFT_DOWN_OPERATING': 'arm_pickup',
+    'WAITING_LIFT_DOWN_COMPLETE': 'arm_pickup',
+    'ROBOT_ARM_DELIVERY': 'delivery',
+    'WAITING_ROBOT_ARM_DELIVERY_COMPLETE': 'delivery',
+    'WATING_LIFT_RETURN_COMPLETE': 'return',
+    'MISSION_COMPLETE': 'complete',
+    'SAFE_STOP': 'safe_stop',
+}
+
+# 작업 시간 비율/병목 계산에서 빼는 단계
+IDLE_STAGES = ('idle', 'complete', 'safe_stop')
+
+# 히스토그램 구간 경계 (초)
+HISTOGRAM_EDGES = (0.5, 1, 2, 3, 5, 8, 13, 20, 30, 45, 60, 90, 120, 180, 300)
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+def histogram(values, edges=HISTOGRAM_EDGES):
+    """구간별 개수, 마지막 칸은 edges[-1] 초과"""
+    counts = [0] * (len(edges) + 1)
+    for value in values:
+        for i, edge in enumerate(edges):
+            if value <= edge:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+    return counts
+
+
+class RollingStats:
+    """최근 window개 표본의 분포 + 전체 누적 합계"""
+
+    def __init__(self, window=500):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, value):
+        self.samples.append(value)
+        self.count += 1
+        self.total += value
+
+    def summary(self, with_histogram=True):
+        values = sorted(self.samples)
+        summary = {
+            'count': self.count,
+            'total_s': round(self.total, 2),
+            'mean_s': round(sum(values) / len(values), 3) if values else 0.0,
+            'p50_s': round(percentile(values, 0.50), 3),
+            'p90_s': round(percentile(values, 0.90), 3),
+            'p99_s': round(percentile(values, 0.99), 3),
+            'max_s': round(values[-1], 3) if values else 0.0,
+        }
+        if with_histogram:
+            summary['histogram'] = histogram(values)
+        return summary
+
+
+class MissionTelemetry:
+    """
+    상태 전환마다 상태/단계별 소요 시간을 기록
+
+    - 상태(MissionState)별, 단계(robot_move/lift/yolo/arm_pickup/delivery/return)별 분포
+    - 표본은 log_path 에 한 줄짜리 JSON 배열로 추가 (flush() 때 한꺼번에 기록)
+      [시각, 미션, 단계, 상태, 초]
+    """
+
+    def __init__(self, log_path=None, window=500):
+        self.log_path = log_path
+        self.window = window
+        self.states = {}
+        self.stages = {}
+        self.missions = RollingStats(window)
+        self.current_state = None
+        self.state_entered = None
+        self.current_stage = None
+        self.stage_entered = None
+        self.pending_lines = []
+        self.started_at = None
+
+    def _stats(self, table, key):
+        if key not in table:
+            table[key] = RollingStats(self.window)
+        return table[key]
+
+    def transition(self, state_name, now, mission=None):
+        """새 상태 진입 (같은 상태면 무시)"""
+        if self.started_at is None:
+            self.started_at = now
+        if state_name == self.current_state:
+            return
+        if self.current_state is not None:
+            self._stats(self.states, self.current_state).add(now - self.state_entered)
+        stage = STAGE_OF_STATE.get(state_name, state_name.lower())
+        if stage != self.current_stage:
+            duration = now - self.stage_entered if self.current_stage is not None else 0.0
+            # 같은 콜백 안에서 바로 지나가는 상태(0초)는 표본으로 남기지 않음
+            if duration > 0.0:
+                self._stats(self.stages, self.current_stage).add(duration)
+                self.pending_lines.append(
+                    [round(now, 3), mission, self.current_stage, self.current_state, round(duration, 3)])
+            self.current_stage = stage
+            self.stage_entered = now
+        self.current_state = state_name
+        self.state_entered = now
+
+    def observe_mission(self, duration, now, mission=None):
+        self.missions.add(duration)
+        self.pending_lines.append([round(now, 3), mission, 'mission', None, round(duration, 3)])
+
+    def bottleneck(self):
+        """누적 시간이 가장 긴 작업 단계 (대기/완료 단계 제외)"""
+        busy = {stage: stats.total for stage, stats in self.stages.items() if stage not in IDLE_STAGES}
+        if not busy:
+            return None
+        return max(busy, key=busy.get)
+
+    def snapshot(self, now):
+        busy_total = sum(stats.total for stage, stats in self.stages.items() if stage not in IDLE_STAGES)
+        stages = {}
+        for stage, stats in self.stages.items():
+            summary = stats.summary()
+            busy = busy_total > 0 and stage not in IDLE_STAGES
+            summary['share'] = round(stats.total / busy_total, 3) if busy else 0.0
+            stages[stage] = summary
+        return {
+            'stamp': round(now, 3),
+            'uptime_s': round(now - self.started_at, 1) if self.started_at is not None else 0.0,
+            'current_state': self.current_state,
+            'current_stage_s': round(now - self.stage_entered, 2) if self.stage_entered is not None else 0.0,
+            'histogram_edges_s': list(HISTOGRAM_EDGES),
+            'stages': stages,
+            'states': {state: stats.summary(with_histogram=False) for state, stats in self.states.items()},
+            'missions': self.missions.summary(),
+            'bottleneck': self.bottleneck(),
+        }
+
+    def flush(self):
+        """쌓인 표본을 로그 파일에 추가"""
+        if not self.log_path or not self.pending_lines:
+            self.pending_lines = []
+            return
+        directory = os.path.dirname(self.log_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.log_path, 'a') as f:
+            for line in self.pending_lines:
+                f.write(json.dumps(line, ensure_ascii=False, separators=(',', ':')) + '\n')
+        self.pending_lines = []
+
+
+def load_log(path):
+    """텔레메트리 로그 → 단계별 RollingStats (전체 표본)"""
+    stages = {}
+    with open(path, 'r') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            _, _, stage, _, duration = json.loads(line)
+            if stage not in stages:
+                stages[stage] = RollingStats(window=None)
+            stages[stage].add(duration)
+    return stages
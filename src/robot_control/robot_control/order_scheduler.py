@@ -0,0 +1,174 @@
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict, deque
+
+
+class OrderScheduler:
+    """
+    주문 미션 대기열
+
+    - 미션 중이어도 주문을 받아서 쌓아둔다
+    - 주문 ID로 중복 제거 (ID가 없으면 내용 해시 + 시간 창)
+    - 대기열/진행 중 미션을 디스크에 저장해서 재시작해도 잃어버리지 않는다
+    - 대기열 길이와 대기 시간 통계 제공
+    """
+
+    def __init__(self, path, seen_capacity=1000, anonymous_dedupe_window=10.0):
+        self.path = path
+        self.seen_capacity = seen_capacity
+        self.anonymous_dedupe_window = anonymous_dedupe_window
+        self.pending = deque()        # 실행 대기 미션
+        self.in_progress = []         # 실행 중 미션 (완료 시 제거)
+        self.seen_order_ids = OrderedDict()  # {order_id: 수신 시각} LRU
+        self.wait_times = deque(maxlen=500)  # 큐 대기 시간 (초)
+        self.accepted_count = 0
+        self.duplicate_count = 0
+        self.completed_count = 0
+
+    # ---------- 주문 ----------
+
+    def make_order_id(self, order_data):
+        """주문 ID 결정: 명시된 ID 우선, 없으면 주문 내용 해시"""
+        for key in ('order_id', 'id'):
+            if order_data.get(key) not in (None, ''):
+                return str(order_data[key]), False
+        canonical = json.dumps(order_data.get('order', []), sort_keys=True, ensure_ascii=False)
+        return 'anon-' + hashlib.sha1(canonical.encode('utf-8')).hexdigest()[:12], True
+
+    def is_duplicate(self, order_id, anonymous, now):
+        seen_at = self.seen_order_ids.get(order_id)
+        if seen_at is None:
+            return False
+        # ID 없는 주문은 짧은 시간 안의 재전송만 중복으로 본다
+        if anonymous and now - seen_at > self.anonymous_dedupe_window:
+            return False
+        return True
+
+    def submit(self, order_id, missions, anonymous=False, now=None):
+        """주문의 미션들을 대기열에 추가, 중복이면 False"""
+        now = time.time() if now is None else now
+        if self.is_duplicate(order_id, anonymous, now):
+            self.duplicate_count += 1
+            self.seen_order_ids.move_to_end(order_id)
+            return False
+
+        self.seen_order_ids[order_id] = now
+        self.seen_order_ids.move_to_end(order_id)
+        while len(self.seen_order_ids) > self.seen_capacity:
+            self.seen_order_ids.popitem(last=False)
+
+        for index, mission in enumerate(missions):
+            mission = dict(mission)
+            mission['order_id'] = order_id
+            mission['item_index'] = index
+            mission['enqueued_at'] = now
+            self.pending.append(mission)
+        self.accepted_count += 1
+        self.save()
+        return True
+
+    def pop(self, now=None):
+        """다음 미션 꺼내기 (진행 중 목록으로 이동)"""
+        if not self.pending:
+            return None
+        now = time.time() if now is None else now
+        mission = self.pending.popleft()
+        mission['started_at'] = now
+        self.wait_times.append(now - mission['enqueued_at'])
+        self.in_progress.append(mission)
+        self.save()
+        return mission
+
+    def peek(self):
+        return self.pending[0] if self.pending else None
+
+    def snapshot(self):
+        return list(self.pending)
+
+    def replace_pending(self, missions):
+        """계획기가 합치거나 순서를 바꾼 대기열로 교체"""
+        self.pending = deque(missions)
+        self.save()
+
+    def complete(self, mission):
+        """미션 완료 (성공/중단 모두) 처리, 이 미션으로 모든 항목이 끝난 주문 ID 목록 반환"""
+        if mission not in self.in_progress:
+            return []
+        self.in_progress.remove(mission)
+        self.completed_count += 1
+        self.save()
+        remaining = {order_id for m in list(self.pending) + self.in_progress for order_id in self.order_ids_of(m)}
+        return [order_id for order_id in self.order_ids_of(mission) if order_id not in remaining]
+
+    def requeue(self, mission):
+        """진행 중 미션을 처음부터 다시 하도록 대기열 맨 앞에 되돌림 (안전 정지)"""
+        if mission in self.in_progress:
+            self.in_progress.remove(mission)
+        mission.pop('started_at', None)
+        self.pending.appendleft(mission)
+        self.save()
+
+    @staticmethod
+    def order_ids_of(mission):
+        """미션에 포함된 주문 ID (합쳐진 미션은 여러 개)"""
+        order_ids = mission.get('order_ids') or [mission.get('order_id')]
+        return list(dict.fromkeys(order_id for order_id in order_ids if order_id is not None))
+
+    def __len__(self):
+        return len(self.pending)
+
+    def __bool__(self):
+        return len(self.pending) > 0
+
+    # ---------- 통계 ----------
+
+    def metrics(self, now=None):
+        now = time.time() if now is None else now
+        waits = sorted(self.wait_times)
+        oldest = now - self.pending[0]['enqueued_at'] if self.pending else 0.0
+        return {
+            'depth': len(self.pending),
+            'in_progress': len(self.in_progress),
+            'oldest_wait_s': round(oldest, 2),
+            'mean_wait_s': round(sum(waits) / len(waits), 2) if waits else 0.0,
+            'p95_wait_s': round(waits[min(len(waits) - 1, int(0.95 * len(waits)))], 2) if waits else 0.0,
+            'accepted': self.accepted_count,
+            'duplicates': self.duplicate_count,
+            'completed': self.completed_count,
+        }
+
+    # ---------- 저장 / 불러오기 ----------
+
+    def save(self):
+        if not self.path:
+            return
+        data = {
+            'pending': list(self.pending),
+            'in_progress': self.in_progress,
+            'seen_order_ids': list(self.seen_order_ids.items()),
+        }
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def load(self):
+        """저장된 대기열 복원, 중간에 끊긴 미션은 맨 앞에 다시 넣는다"""
+        if not self.path or not os.path.exists(self.path):
+            return 0
+        with open(self.path, 'r') as f:
+            data = json.load(f)
+        interrupted = data.get('in_progress', [])
+        for mission in interrupted:
+            mission.pop('started_at', None)
+        self.pending = deque(interrupted + data.get('pending', []))
+        self.in_progress = []
+        self.seen_order_ids = OrderedDict((order_id, seen_at) for order_id, seen_at in data.get('seen_order_ids', []))
+        return len(self.pending)
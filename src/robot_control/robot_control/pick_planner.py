@@ -0,0 +1,143 @@
+"""검출된 물체 집기 순서 계획
+
+물체마다 다음 비용을 매기고 집는 순서를 최적화한다.
+- 도달성: 팔 기준 반경이 [reach_min, reach_max] 밖이면 벗어난 거리만큼 벌점
+- 이동: 집기 직전 팔 위치(홈 또는 직전 배송 칸)에서 물체까지 거리
+- 손목 회전: 직전 그리퍼 각도에서 물체 각도까지 회전량 (그리퍼는 180° 대칭)
+- 간섭: 아직 남아 있는 이웃이 clearance 안에 있으면 가까울수록 벌점
+  (먼저 집은 이웃은 사라지므로 비용이 방문 순서에 따라 달라진다)
+
+좌표는 robot_control_node 의 로봇 좌표 (robot_x, robot_y, robot_angle) 를 그대로 쓴다.
+"""
+import math
+
+from robot_control.route_solver import solve_order
+
+DEFAULT_REACH_MIN = 3.0
+DEFAULT_REACH_MAX = 35.0
+DEFAULT_CLEARANCE = 4.0
+
+# 비용 가중치 (이동 거리 1 단위 기준)
+WEIGHT_TRAVEL = 1.0
+WEIGHT_ROTATION = 0.1   # 10° 회전 ≈ 이동 1
+WEIGHT_BLOCKING = 20.0  # 바로 붙어 있는 이웃 하나
+WEIGHT_REACH = 10.0     # 작업 반경 밖 1 단위
+
+
+def rotation_delta(a, b):
+    """그리퍼 각도 차이 (도), 180° 대칭이므로 0~90"""
+    delta = abs(a - b) % 180.0
+    return min(delta, 180.0 - delta)
+
+
+class PickPlanner:
+    def __init__(self, reach_min=DEFAULT_REACH_MIN, reach_max=DEFAULT_REACH_MAX,
+                 clearance=DEFAULT_CLEARANCE, exact_limit=9):
+        self.reach_min = reach_min
+        self.reach_max = reach_max
+        self.clearance = clearance
+        self.exact_limit = exact_limit
+
+    def reach_penalty(self, obj):
+        radius = math.hypot(obj['robot_x'], obj['robot_y'])
+        if radius < self.reach_min:
+            return self.reach_min - radius
+        if radius > self.reach_max:
+            return radius - self.reach_max
+        return 0.0
+
+    def is_reachable(self, obj):
+        return self.reach_penalty(obj) == 0.0
+
+    def blocking_weights(self, objects):
+        """blocking[i][k]: k가 남아 있을 때 i 집기를 방해하는 정도 (0~1)"""
+        n = len(objects)
+        blocking = [[0.0] * n for _ in range(n)]
+        for i in range(n):
+            for k in range(n):
+                if i == k:
+                    continue
+                distance = math.hypot(objects[i]['robot_x'] - objects[k]['robot_x'],
+                                      objects[i]['robot_y'] - objects[k]['robot_y'])
+                if distance < self.clearance:
+                    blocking[i][k] = 1.0 - distance / self.clearance
+        return blocking
+
+    def visit_costs(self, obj, origin, blockers):
+        """물체 하나 집기 비용 항목 (이동, 회전, 간섭, 도달성)"""
+        return {
+            'travel': math.hypot(obj['robot_x'] - origin[0], obj['robot_y'] - origin[1]),
+            'rotation': rotation_delta(obj['robot_angle'], origin[2]),
+            'blocking': blockers,
+            'reach': self.reach_penalty(obj),
+        }
+
+    @staticmethod
+    def weighted(costs):
+        return (WEIGHT_TRAVEL * costs['travel'] + WEIGHT_ROTATION * costs['rotation']
+                + WEIGHT_BLOCKING * costs['blocking'] + WEIGHT_REACH * costs['reach'])
+
+    def evaluate(self, order, objects, origins):
+        """
+        objects 중 order(인덱스 목록) 순서로 집을 때 비용 항목 합계
+        origins[k]: k번째 집기 직전 팔 위치 (x, y, 그리퍼 각도), 부족하면 마지막 값 사용
+        """
+        blocking = self.blocking_weights(objects)
+        remaining = set(range(len(objects)))
+        totals = {'travel': 0.0, 'rotation': 0.0, 'blocking': 0.0, 'reach': 0.0}
+        blocked_picks = 0
+        for step, i in enumerate(order):
+            remaining.discard(i)
+            blockers = sum(blocking[i][k] for k in remaining)
+            costs = self.visit_costs(objects[i], origins[min(step, len(origins) - 1)], blockers)
+            for key, value in costs.items():
+                totals[key] += value
+            if blockers > 0.0:
+                blocked_picks += 1
+        totals['cost'] = self.weighted(totals)
+        totals['blocked_picks'] = blocked_picks
+        totals['unreachable_picks'] = sum(1 for i in order if not self.is_reachable(objects[i]))
+        return totals
+
+    def select(self, objects, count, origin):
+        """집을 물체 count개 선택 (도달 가능하고 덜 막힌 물체 우선)"""
+        if count >= len(objects):
+            return list(range(len(objects)))
+        blocking = self.blocking_weights(objects)
+
+        def standalone(i):
+            blockers = sum(blocking[i])
+            return self.weighted(self.visit_costs(objects[i], origin, blockers))
+
+        return sorted(range(len(objects)), key=standalone)[:count]
+
+    def plan(self, objects, count, origins):
+        """
+        반환: (집는 순서대로 정렬한 물체 목록, 예상 비용, 정확해 여부)
+        선택되지 않은 물체는 목록 뒤에 원래 순서대로 붙인다 (부족할 때 예비용).
+        """
+        if not objects or count <= 0:
+            return list(objects), 0.0, True
+        chosen = self.select(objects, count, origins[0])
+        others = [i for i in range(len(objects)) if i not in chosen]
+        blocking = self.blocking_weights(objects)
+        # 선택되지 않은 물체는 끝까지 남아서 계속 방해한다
+        fixed_blockers = [sum(blocking[i][k] for k in others) for i in chosen]
+        n = len(chosen)
+        neighbours = [[(k, blocking[chosen[j]][chosen[k]]) for k in range(n)
+                       if k != j and blocking[chosen[j]][chosen[k]] > 0.0] for j in range(n)]
+        memo = {}
+
+        def visit_cost(j, mask):
+            key = (j, mask)
+            if key not in memo:
+                step = bin(mask).count('1')
+                blockers = fixed_blockers[j] + sum(w for k, w in neighbours[j] if not mask & (1 << k))
+                origin = origins[min(step, len(origins) - 1)]
+                memo[key] = self.weighted(self.visit_costs(objects[chosen[j]], origin, blockers))
+            return memo[key]
+
+        zeros = [0.0] * n
+        order, value, exact = solve_order(zeros, [zeros] * n, self.exact_limit, visit_cost)
+        planned = [objects[chosen[j]] for j in order] + [objects[i] for i in others]
+        return planned, value, exact
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+집기 순서 계획 벤치마크
+
+기존 순서(카메라 중앙에서 가까운 순)와 PickPlanner 순서를 같은 비용 모델로 비교한다.
+입력은 detection_log_path 로 기록한 YOLO 결과 JSONL 또는 {"objects": [...]} JSON 파일이고,
+입력이 없으면 물체 1~30개짜리 장면을 무작위로 만든다 (물체가 몰려 있는 장면 포함).
+
+사용 예:
+  ros2 run robot_control pick_planner_benchmark --input ~/.ros/detections.jsonl --mode overlap
+  ros2 run robot_control pick_planner_benchmark --counts 1 5 10 20 30
+"""
+import argparse
+import glob
+import json
+import math
+import os
+import random
+import time
+
+from robot_control.pick_planner import PickPlanner
+from robot_control.robot_control_node import RobotControl
+
+
+def to_robot_objects(result):
+    """YOLO 결과 → 로봇 좌표 물체 목록 (노드와 같은 변환, 카메라 중앙에 가까운 순)"""
+    objects = []
+    for i, obj in enumerate(result.get('objects') or []):
+        robot_x, robot_y, robot_angle = RobotControl.camera_to_robot_coordinates(
+            obj['pixel_x'], obj['pixel_y'], obj['angle'])
+        objects.append({
+            'id': i,
+            'robot_x': robot_x,
+            'robot_y': robot_y,
+            'robot_angle': robot_angle,
+            'distance_from_center': math.hypot(obj['pixel_x'] - 320.0, obj['pixel_y'] - 240.0),
+        })
+    objects.sort(key=lambda o: o['distance_from_center'])
+    return objects
+
+
+def load_scenes(paths):
+    """(물체 목록, 집을 수량) 목록"""
+    files = []
+    for path in paths:
+        path = os.path.expanduser(path)
+        files.extend(sorted(glob.glob(os.path.join(path, '*.json*'))) if os.path.isdir(path) else [path])
+    scenes = []
+    for path in files:
+        with open(path, 'r') as f:
+            lines = [f.read()] if path.endswith('.json') else f.readlines()
+        for line in lines:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            result = record.get('result', record)
+            objects = to_robot_objects(result)
+            if objects:
+                quantity = record.get('quantity') or len(objects)
+                scenes.append((objects, min(int(quantity), len(objects))))
+    return scenes
+
+
+def random_scene(count, rng):
+    """무작위 장면: 절반은 흩어진 물체, 절반은 몇 개의 덩어리로 몰린 물체"""
+    clusters = [(rng.uniform(80, 560), rng.uniform(60, 420)) for _ in range(max(1, count // 4))]
+    objects = []
+    for i in range(count):
+        if i % 2 == 0:
+            x, y = rng.uniform(20, 620), rng.uniform(20, 460)
+        else:
+            cx, cy = rng.choice(clusters)
+            x, y = rng.gauss(cx, 35.0), rng.gauss(cy, 35.0)
+        objects.append({'pixel_x': x, 'pixel_y': y, 'angle': rng.uniform(0, 180)})
+    return to_robot_objects({'objects': objects})
+
+
+def origins_for(mode, count):
+    home = (4.0, 0.0, 0.0)
+    if mode != 'overlap':
+        return [home]
+    origins = [home]
+    row, column = 0, 0
+    for _ in range(max(0, count - 1)):
+        origins.append(RobotControl.delivery_slot(row, column))
+        row, column = RobotControl.advance_slot(row, column)
+    return origins
+
+
+def main():
+    parser = argparse.ArgumentParser(description='집기 순서 계획 벤치마크')
+    parser.add_argument('--input', nargs='*', default=[], help='검출 결과 JSONL/JSON 파일 또는 디렉터리')
+    parser.add_argument('--counts', type=int, nargs='+', default=list(range(1, 31)), help='무작위 장면 물체 수')
+    parser.add_argument('--scenes', type=int, default=20, help='물체 수별 무작위 장면 개수')
+    parser.add_argument('--quantity-ratio', type=float, default=1.0, help='무작위 장면에서 집을 비율 (0~1)')
+    parser.add_argument('--mode', choices=['serial', 'overlap'], default='overlap', help='집기 사이클 모드 (팔 출발 위치)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    planner = PickPlanner()
+    if args.input:
+        scenes = load_scenes(args.input)
+    else:
+        rng = random.Random(args.seed)
+        scenes = []
+        for count in args.counts:
+            for _ in range(args.scenes):
+                objects = random_scene(count, rng)
+                scenes.append((objects, max(1, round(len(objects) * args.quantity_ratio))))
+
+    # 물체 수별 집계
+    rows = {}
+    for objects, quantity in scenes:
+        origins = origins_for(args.mode, quantity)
+        baseline = planner.evaluate(list(range(quantity)), objects, origins)
+        start = time.perf_counter()
+        planned, _, exact = planner.plan(objects, quantity, origins)
+        elapsed = time.perf_counter() - start
+        index = {id(obj): i for i, obj in enumerate(objects)}
+        result = planner.evaluate([index[id(obj)] for obj in planned[:quantity]], objects, origins)
+
+        row = rows.setdefault(len(objects), {'scenes': 0, 'base': 0.0, 'plan': 0.0, 'base_blocked': 0,
+                                             'plan_blocked': 0, 'base_rotation': 0.0, 'plan_rotation': 0.0,
+                                             'ms': 0.0, 'exact': 0})
+        row['scenes'] += 1
+        row['base'] += baseline['cost']
+        row['plan'] += result['cost']
+        row['base_blocked'] += baseline['blocked_picks']
+        row['plan_blocked'] += result['blocked_picks']
+        row['base_rotation'] += baseline['rotation']
+        row['plan_rotation'] += result['rotation']
+        row['ms'] += elapsed * 1000.0
+        row['exact'] += int(exact)
+
+    print(f'모드: {args.mode}, 장면 {len(scenes)}개')
+    print(f"{'objs':>4} {'scenes':>6} | {'base cost':>9} {'plan cost':>9} {'gain':>6} | "
+          f"{'blocked b/p':>11} | {'rot° b/p':>13} | {'plan ms':>7} {'exact':>5}")
+    print('-' * 90)
+    for count in sorted(rows):
+        row = rows[count]
+        n = row['scenes']
+        gain = 1.0 - row['plan'] / row['base'] if row['base'] > 0 else 0.0
+        print(f"{count:4d} {n:6d} | {row['base'] / n:9.1f} {row['plan'] / n:9.1f} {gain:6.1%} | "
+              f"{row['base_blocked'] / n:5.2f}/{row['plan_blocked'] / n:<5.2f} | "
+              f"{row['base_rotation'] / n:6.0f}/{row['plan_rotation'] / n:<6.0f} | "
+              f"{row['ms'] / n:7.2f} {row['exact']:3d}/{n}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,233 @@
+"""물체 집기 사이클 작업 그래프
+
+집기 → 리프트 위(9) → 그리퍼 → 리프트 아래(10) → 배송 → 놓기 → 홈 순서를
+의존성 그래프로 표현한다. 각 작업은 자원(arm/lift/camera)을 하나 점유하고,
+선행 작업이 모두 끝나고 자원이 비어 있으면 시작할 수 있다.
+
+- 명령 작업 (duration=None): 완료 신호가 와야 끝남
+- 시간 작업 (duration=초): 동작 후 정해진 시간이 지나면 끝남
+
+serial 모드는 모든 작업이 한 줄로 이어진 기존 순서와 같고,
+overlap 모드는 다음 의존성만 바꾼다.
+- 배송 중에 카메라로 재인식해서 다음 물체 좌표를 갱신
+- 놓기가 끝나면 홈을 거치지 않고 바로 다음 물체로 이동 (그리퍼는 이미 열려 있음)
+"""
+from collections import OrderedDict
+
+MODES = ('serial', 'overlap')
+
+# 작업 종류: (자원, 대기 시간 이름 또는 None=명령)
+TASK_KINDS = OrderedDict([
+    ('gripper_open', ('arm', 'gripper_open')),
+    ('pick', ('arm', None)),
+    ('pickup_settle', ('arm', 'pickup_settle')),
+    ('lift_up', ('lift', None)),
+    ('lift_up_settle', ('lift', 'lift_up_settle')),
+    ('gripper_close', ('arm', 'gripper_close')),
+    ('lift_down', ('lift', None)),
+    ('lift_down_settle', ('lift', 'lift_down_settle')),
+    ('deliver', ('arm', None)),
+    ('delivery_settle', ('arm', 'delivery_settle')),
+    ('release', ('arm', 'release')),
+    ('home', ('arm', 'home')),
+    ('redetect', ('camera', None)),
+])
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+SKIPPED = 'skipped'
+
+
+class Task:
+    __slots__ = ('name', 'kind', 'obj', 'resource', 'after', 'duration', 'optional',
+                 'status', 'started_at', 'finished_at', 'handshake')
+
+    def __init__(self, name, kind, obj, resource, after, duration, optional=False):
+        self.name = name
+        self.kind = kind
+        self.obj = obj
+        self.resource = resource
+        self.after = tuple(after)
+        self.duration = duration
+        self.optional = optional  # 실패해도 사이클을 멈추지 않는 작업 (재인식)
+        self.status = PENDING
+        self.started_at = None
+        self.finished_at = None
+        self.handshake = None  # 명령 작업의 완료 신호 감시 (HandshakeSupervisor)
+
+    @property
+    def is_command(self):
+        return self.duration is None
+
+
+class TaskGraph:
+    """자원 제약이 있는 작업 의존성 그래프 (ROS와 무관한 순수 스케줄러)"""
+
+    def __init__(self):
+        self.tasks = OrderedDict()
+        self.started_at = None
+
+    def add(self, name, kind, obj, after=(), duration=None, optional=False):
+        resource, _ = TASK_KINDS[kind]
+        for dependency in after:
+            if dependency not in self.tasks:
+                raise ValueError(f'unknown dependency {dependency!r} for task {name!r}')
+        task = Task(name, kind, obj, resource, after, duration, optional)
+        self.tasks[name] = task
+        return task
+
+    def __getitem__(self, name):
+        return self.tasks[name]
+
+    def __iter__(self):
+        return iter(self.tasks.values())
+
+    def running_on(self, resource):
+        for task in self.tasks.values():
+            if task.status == RUNNING and task.resource == resource:
+                return task
+        return None
+
+    def start_ready(self, now):
+        """시작 가능한 작업을 추가 순서대로 RUNNING 으로 바꾸고 반환"""
+        busy = {task.resource for task in self.tasks.values() if task.status == RUNNING}
+        started = []
+        for task in self.tasks.values():
+            if task.status != PENDING or task.resource in busy:
+                continue
+            if all(self.tasks[d].status in (DONE, SKIPPED) for d in task.after):
+                task.status = RUNNING
+                task.started_at = now
+                busy.add(task.resource)
+                started.append(task)
+        return started
+
+    def complete(self, name, now):
+        task = self.tasks[name]
+        if task.status != RUNNING:
+            return False
+        task.status = DONE
+        task.finished_at = now
+        return True
+
+    def cancel(self, now):
+        """남은 작업을 모두 건너뛰기 (물체 부족, 중단)"""
+        for task in self.tasks.values():
+            if task.status in (PENDING, RUNNING):
+                task.status = SKIPPED
+                task.finished_at = now
+
+    def finished(self):
+        return all(task.status in (DONE, SKIPPED) for task in self.tasks.values())
+
+    def object_finish_times(self):
+        """물체별 마지막 작업 완료 시각 {obj: 시각}"""
+        finish = {}
+        for task in self.tasks.values():
+            if task.status == DONE and task.obj is not None:
+                finish[task.obj] = max(finish.get(task.obj, task.finished_at), task.finished_at)
+        return finish
+
+    def simulate(self, durations=None):
+        """
+        작업 시간을 알고 있을 때 이 그래프의 실행을 시뮬레이션
+        durations: {작업 이름: 초}, 없으면 task.duration (명령 작업은 0)
+        반환: {작업 이름: 완료 시각}
+        """
+        durations = durations or {}
+        status = {name: PENDING for name in self.tasks}
+        finish = {}
+        running = {}  # name -> 완료 시각
+        now = 0.0
+        while len(finish) < len(self.tasks):
+            busy = {self.tasks[name].resource for name in running}
+            for name, task in self.tasks.items():
+                if status[name] != PENDING or task.resource in busy:
+                    continue
+                if all(status[d] == DONE for d in task.after):
+                    status[name] = RUNNING
+                    running[name] = now + durations.get(name, task.duration or 0.0)
+                    busy.add(task.resource)
+            if not running:
+                raise ValueError('task graph has a cycle or unsatisfiable dependency')
+            now = min(running.values())
+            for name in [n for n, t in running.items() if t <= now]:
+                del running[name]
+                status[name] = DONE
+                finish[name] = now
+        return finish
+
+
+def task_name(kind, obj):
+    return f'{kind}:{obj}'
+
+
+def build_pickup_graph(count, mode, dwells):
+    """
+    물체 count 개를 처리하는 작업 그래프 생성
+    dwells: 대기 시간 이름 → 초 (DEFAULT_DWELLS 와 같은 키)
+    """
+    if mode not in MODES:
+        raise ValueError(f'unknown pickup mode {mode!r} (expected one of {MODES})')
+    graph = TaskGraph()
+    overlap = mode == 'overlap'
+    previous = ()  # 직전 물체의 마지막 작업 (다음 물체의 선행 조건)
+
+    def add(kind, obj, after, optional=False):
+        _, dwell = TASK_KINDS[kind]
+        duration = dwells[dwell] if dwell is not None else None
+        graph.add(task_name(kind, obj), kind, obj, after, duration, optional)
+        return (task_name(kind, obj),)
+
+    for obj in range(count):
+        last = obj == count - 1
+        if overlap and obj > 0:
+            # 직전 놓기에서 그리퍼가 이미 열렸으므로 바로 다음 물체로 이동
+            step = add('pick', obj, previous)
+        else:
+            step = add('gripper_open', obj, previous)
+            step = add('pick', obj, step)
+        step = add('pickup_settle', obj, step)
+        step = add('lift_up', obj, step)
+        step = add('lift_up_settle', obj, step)
+        step = add('gripper_close', obj, step)
+        lift_down = add('lift_down', obj, step)
+        step = add('lift_down_settle', obj, lift_down)
+        step = add('deliver', obj, step)
+        step = add('delivery_settle', obj, step)
+        step = add('release', obj, step)
+        if overlap and not last:
+            # 배송하는 동안 남은 물체를 다시 인식
+            redetect = add('redetect', obj, lift_down, optional=True)
+            previous = step + redetect
+        else:
+            previous = add('home', obj, step)
+    return graph
+
+
+def cycle_times(finish_times, count, start=0.0):
+    """물체별 완료 시각 → 물체별 사이클 시간 목록"""
+    cycles = []
+    previous = start
+    for obj in range(count):
+        if obj not in finish_times:
+            break
+        cycles.append(finish_times[obj] - previous)
+        previous = finish_times[obj]
+    return cycles
+
+
+def serial_baseline(graph, count, dwells):
+    """
+    실행된 그래프에서 측정한 작업 시간으로 같은 물체 수의 serial 그래프를 시뮬레이션해서
+    물체별 기준 사이클 시간을 구한다 (측정되지 않은 작업은 설정된 대기 시간 사용)
+    """
+    measured = {task.name: task.finished_at - task.started_at
+                for task in graph if task.status == DONE}
+    serial = build_pickup_graph(count, 'serial', dwells)
+    finish = serial.simulate(measured)
+    per_object = {}
+    for task in serial:
+        per_object[task.obj] = max(per_object.get(task.obj, 0.0), finish[task.name])
+    return cycle_times(per_object, count)
@@ -2,13 +2,24 @@ import rclpy
 from rclpy.node import Node
 from std_msgs.msg import String, Int32, Bool
 from geometry_msgs.msg import Point
+from logistics_interfaces.msg import Order, OrientedDetectionArray
 import json
+import os
 import time
 import random
 import math
 import numpy as np
 from enum import Enum
 
+from robot_control.handshake_supervisor import HandshakeSupervisor
+from robot_control.order_scheduler import OrderScheduler
+from robot_control.mission_planner import BatchPlanner, CostModel, BARRIER_POSITIONS
+from robot_control.mission_telemetry import MissionTelemetry
+from robot_control.pick_planner import PickPlanner
+from robot_control.pickup_pipeline import (
+    MODES as PICKUP_MODES, DONE, RUNNING, build_pickup_graph, cycle_times, serial_baseline, task_name)
+from yolo_obb_detection.detection_codec import DETECTIONS_TOPIC, array_to_dict
+
 class MissionState(Enum):
     IDLE = 0
     ROBOT_MOVING = 1
@@ -27,6 +38,50 @@ class MissionState(Enum):
     WAITING_ROBOT_ARM_DELIVERY_COMPLETE = 14
     MISSION_COMPLETE = 15
     WATING_LIFT_RETURN_COMPLETE = 16
+    SAFE_STOP = 17  # 완료 신호 유실이 연달아 발생 - /mission/resume 전까지 정지
+
+# 완료 신호 대기 정책: {상태: (타임아웃 초, 재전송 횟수)}
+# 타임아웃은 기록이 쌓이기 전의 기본값이자 상한 (이후에는 HandshakeSupervisor 가 학습한 기한 사용)
+WAIT_POLICIES = {
+    MissionState.WAITING_ROBOT_COMPLETE: (90.0, 1),
+    MissionState.WAITING_LIFT_COMPLETE: (30.0, 1),
+    MissionState.WAITING_YOLO_COMPLETE: (5.0, 2),
+    MissionState.WAITING_ROBOT_ARM_COMPLETE: (20.0, 1),
+    MissionState.WAITING_LIFT_UP_COMPLETE: (30.0, 1),
+    MissionState.WAITING_LIFT_DOWN_COMPLETE: (30.0, 1),
+    MissionState.WAITING_ROBOT_ARM_DELIVERY_COMPLETE: (20.0, 1),
+    MissionState.WATING_LIFT_RETURN_COMPLETE: (30.0, 1),
+}
+
+# 단계 사이 대기 시간 기본값 (초), 파라미터 dwell.<이름> 으로 조정
+DEFAULT_DWELLS = {
+    'gripper_open': 0.5,        # 집기 전 그리퍼 열림 대기
+    'pickup_settle': 1.5,       # 집기 완료 후 리프트 올리기 전
+    'lift_up_settle': 3.3,      # 리프트 위 도착 후 그리퍼 닫기 전
+    'gripper_close': 1.5,       # 그리퍼 닫은 후 리프트 내리기 전
+    'lift_down_settle': 4.0,    # 리프트 아래 도착 후 배송 전
+    'delivery_settle': 1.5,     # 배송 위치 도착 후 그리퍼 열기 전
+    'release': 1.5,             # 그리퍼 열고 홈 이동 전
+    'home': 1.5,                # 홈 이동 후 다음 물체 전
+    'lift_return_home': 3.0,    # 리프트 반납 후 미션 완료 전
+    'mission_complete': 1.5,    # 미션 완료 전후 홈 이동 대기
+}
+
+# 집기 사이클 작업 종류 → 작업 시작 시 상태 (재인식은 다른 작업과 겹치므로 상태를 바꾸지 않음)
+PICKUP_TASK_STATES = {
+    'gripper_open': MissionState.ROBOT_ARM_MOVING,
+    'pick': MissionState.WAITING_ROBOT_ARM_COMPLETE,
+    'pickup_settle': MissionState.LIFT_UP_OPERATING,
+    'lift_up': MissionState.WAITING_LIFT_UP_COMPLETE,
+    'lift_up_settle': MissionState.LIFT_DOWN_OPERATING,
+    'gripper_close': MissionState.LIFT_DOWN_OPERATING,
+    'lift_down': MissionState.WAITING_LIFT_DOWN_COMPLETE,
+    'lift_down_settle': MissionState.ROBOT_ARM_DELIVERY,
+    'deliver': MissionState.WAITING_ROBOT_ARM_DELIVERY_COMPLETE,
+    'delivery_settle': MissionState.ROBOT_ARM_DELIVERY,
+    'release': MissionState.ROBOT_ARM_DELIVERY,
+    'home': MissionState.ROBOT_ARM_DELIVERY,
+}
 
 class RobotControl(Node):
     def __init__(self):
@@ -35,7 +90,6 @@ class RobotControl(Node):
         # 상태 관리
         self.current_state = MissionState.IDLE
         self.current_mission = None
-        self.mission_queue = []
         self.current_step = 0
         self.current_quantity_processed = 0
         self.detected_objects = []
@@ -43,11 +97,103 @@ class RobotControl(Node):
         self.index = 0
         self.row = 0
         self.column = 0
+
+        # 단계 사이 대기 시간 (time.sleep 대신 타이머로 예약)
+        self.dwells = {}
+        for name, default in DEFAULT_DWELLS.items():
+            self.declare_parameter(f'dwell.{name}', default)
+            self.dwells[name] = self.get_parameter(f'dwell.{name}').value
+        self.scheduled_timers = set()
+
+        # 집기 사이클 모드: serial(기존 순서) / overlap(배송 중 재인식, 홈 경유 생략)
+        self.declare_parameter('pickup_mode', 'serial')
+        self.pickup_mode = self.get_parameter('pickup_mode').value
+        if self.pickup_mode not in PICKUP_MODES:
+            self.get_logger().warning(f'⚠️ 알 수 없는 pickup_mode: {self.pickup_mode} - serial 사용')
+            self.pickup_mode = 'serial'
+        self.pickup_graph = None   # 실행 중인 집기 사이클 작업 그래프
+        self.fresh_objects = None  # 배송 중 재인식한 물체 목록
+
+        # 집기 순서 계획 (도달성, 손목 회전, 이웃 간섭, 팔 이동 거리)
+        self.declare_parameter('pick_planning', True)
+        self.declare_parameter('pick_reach_min', 3.0)
+        self.declare_parameter('pick_reach_max', 35.0)
+        self.declare_parameter('pick_clearance', 4.0)
+        self.pick_planning = self.get_parameter('pick_planning').value
+        self.pick_planner = PickPlanner(
+            self.get_parameter('pick_reach_min').value,
+            self.get_parameter('pick_reach_max').value,
+            self.get_parameter('pick_clearance').value)
+        # YOLO 결과 기록 (pick_planner_benchmark 입력용 JSONL, 빈 문자열이면 기록 안 함)
+        self.declare_parameter('detection_log_path', '')
+        self.detection_log_path = self.get_parameter('detection_log_path').value
+
+        # 주문 대기열 (디스크에 저장, 재시작 시 복원)
+        self.declare_parameter('order_queue_path', os.path.expanduser('~/.ros/robot_control_orders.json'))
+        self.mission_queue = OrderScheduler(self.get_parameter('order_queue_path').value)
+        try:
+            restored = self.mission_queue.load()
+        except (OSError, ValueError) as e:
+            restored = 0
+            self.get_logger().error(f'❌ 주문 대기열 복원 실패: {e}')
+
+        # 배치 계획기 (미션 로그에서 학습한 주행/리프트 시간으로 순서 최적화)
+        self.declare_parameter('batch_planning', True)
+        self.declare_parameter('cost_model_path', os.path.expanduser('~/.ros/robot_control_cost_model.json'))
+        self.batch_planning = self.get_parameter('batch_planning').value
+        self.cost_model = CostModel(self.get_parameter('cost_model_path').value)
+        try:
+            self.cost_model.load()
+        except (OSError, ValueError) as e:
+            self.get_logger().error(f'❌ 비용 모델 로드 실패: {e}')
+        self.batch_planner = BatchPlanner(self.cost_model)
+        self.current_position = 0      # 로봇 현재 위치 (초기 위치 0, 중단 뒤 모르면 None)
+        self.last_position = 0         # 마지막으로 도착한 위치 (현재 위치를 모를 때 계획용)
+        self.lift_floor_ready = None   # 리프트를 반납하지 않고 남겨둔 층
+        self.lift_raised = None        # 올라가 있을 수 있는 리프트 층 (반납 완료 전까지)
+        self.lift_return_next = None   # 리프트 반납 완료 후 이어서 실행할 단계 (없으면 미션 완료)
+        self.drive_started = None      # (출발 위치, 도착 위치, 시작 시각)
+        self.lift_started = None       # (리프트 명령, 시작 시각)
+        self.object_started = None
+        self.mission_started = None
+        self.batch_predicted = 0.0
+        self.batch_actual = 0.0
+        self.batch_missions = 0
+
+        # 단계별 소요 시간 텔레메트리
+        self.declare_parameter('telemetry_log_path', os.path.expanduser('~/.ros/robot_control_telemetry.jsonl'))
+        self.declare_parameter('telemetry_period', 10.0)
+        self.telemetry = MissionTelemetry(self.get_parameter('telemetry_log_path').value)
+        self.telemetry.transition(self.current_state.name, self.now_sec())
+
+        self.aborted_orders = set()  # 항목이 중단된 주문 (완료 보고용)
+
+        # 완료 신호 감시 (과거 소요 시간으로 기한 학습, 타임아웃 시 재전송 → 미션 중단 → 안전 정지)
+        self.declare_parameter('handshake_history_path', os.path.expanduser('~/.ros/robot_control_handshakes.json'))
+        self.declare_parameter('handshake_margin', 1.5)
+        self.declare_parameter('handshake_slack', 2.0)
+        self.declare_parameter('handshake_min_samples', 10)
+        self.declare_parameter('safe_stop_after_lost', 3)
+        self.handshakes = HandshakeSupervisor(
+            {state.name: policy for state, policy in WAIT_POLICIES.items()},
+            self.get_parameter('handshake_history_path').value,
+            margin=self.get_parameter('handshake_margin').value,
+            slack=self.get_parameter('handshake_slack').value,
+            min_samples=self.get_parameter('handshake_min_samples').value)
+        self.safe_stop_after_lost = self.get_parameter('safe_stop_after_lost').value
+        try:
+            self.handshakes.load()
+        except (OSError, ValueError) as e:
+            self.get_logger().error(f'❌ 완료 신호 기록 로드 실패: {e}')
+        self.wait_handshake = None  # 상태 머신이 기다리는 완료 신호 (집기 사이클 밖)
         
         # Publishers
         self.robot_command_pub = self.create_publisher(Int32, '/logistics/command', 10)
         self.lift_command_pub = self.create_publisher(Int32, '/lift/floor', 10)
-        self.status_pub = self.create_publisher(String, '/mission/status', 10)
+        self.status_pub = self.create_publisher(String, '/mission/status', 10)  # 사람이 읽는 상태 문자열
+        self.events_pub = self.create_publisher(String, '/mission/events', 100)  # JSON 이벤트 (order_complete 등)
+        self.queue_state_pub = self.create_publisher(String, '/mission/queue_state', 10)
+        self.telemetry_pub = self.create_publisher(String, '/mission/telemetry', 10)
         self.robot_arm_position_pub = self.create_publisher(Point, '/robot_arm/target_position', 10)
         self.yolo_trigger_pub = self.create_publisher(String, '/yolo/detection_trigger', 10)
         self.gripper_control_pub = self.create_publisher(Bool, '/robot_arm/gripper_control', 10)
@@ -57,7 +203,15 @@ class RobotControl(Node):
             String,
             'order',
             self.order_callback,
-            10
+            100  # 주문이 몰려도 DDS 큐에서 버려지지 않도록 여유 있게
+        )
+
+        # MQTT 브리지에서 검증/정규화한 주문
+        self.typed_order_sub = self.create_subscription(
+            Order,
+            'orders',
+            self.typed_order_callback,
+            100
         )
         
         self.robot_complete_sub = self.create_subscription(
@@ -80,53 +234,230 @@ class RobotControl(Node):
             self.robot_arm_complete_callback,
             10
         )
+
+        # 안전 정지 해제
+        self.resume_sub = self.create_subscription(
+            Bool,
+            '/mission/resume',
+            self.resume_callback,
+            10
+        )
         
         # YOLO 검출 결과 구독
         self.yolo_result_sub = self.create_subscription(
-            String,
-            '/yolo/detection_result',
+            OrientedDetectionArray,
+            DETECTIONS_TOPIC,
             self.yolo_result_callback,
             10
         )
         
         # 상태 모니터링 타이머
         self.status_timer = self.create_timer(2.0, self.status_monitor)
+        # 완료 신호 타임아웃 감시 타이머
+        self.wait_timer = self.create_timer(0.2, self.check_wait_timeout)
+        # 텔레메트리 발행/기록 타이머
+        self.telemetry_timer = self.create_timer(self.get_parameter('telemetry_period').value, self.publish_telemetry)
         
         self.get_logger().info('🤖 YOLO 물체 인식 및 로봇 팔 제어 시스템이 시작되었습니다.')
         self.message_count = 0
 
-    def order_callback(self, msg):
-        """주문 수신 및 처리"""
-        # 이미 처리 중인 상태면 새로운 주문 무시
-        if self.current_state != MissionState.IDLE:
-            self.get_logger().warning('⚠️ 현재 처리 중인 미션이 있어 새로운 주문을 무시합니다.')
+        # 재시작 전 남아 있던 주문은 다른 노드가 올라올 시간을 두고 재개
+        if restored > 0:
+            self.get_logger().info(f'📋 저장된 미션 {restored}개 복원 - 잠시 후 재개합니다.')
+            self.schedule(3.0, self.resume_if_idle)
+
+    def set_state(self, state):
+        """미션 상태 전환"""
+        if state != self.current_state:
+            self.get_logger().debug(f'상태 전환: {self.current_state.name} → {state.name}')
+            self.telemetry.transition(state.name, self.now_sec(), self.mission_label())
+        self.current_state = state
+
+    def mission_label(self):
+        if not self.current_mission:
+            return None
+        return f'{self.current_mission.get("order_id")}/{self.current_mission["name"]}'
+
+    def publish_telemetry(self):
+        """단계별 소요 시간 분포 발행 및 로그 기록"""
+        telemetry_msg = String()
+        snapshot = self.telemetry.snapshot(self.now_sec())
+        snapshot['handshakes'] = self.handshakes.snapshot()
+        telemetry_msg.data = json.dumps(snapshot, ensure_ascii=False)
+        self.telemetry_pub.publish(telemetry_msg)
+        try:
+            self.telemetry.flush()
+        except OSError as e:
+            self.get_logger().error(f'❌ 텔레메트리 기록 실패: {e}')
+
+    def now_sec(self):
+        return self.get_clock().now().nanoseconds / 1e9
+
+    def schedule(self, delay, callback):
+        """delay초 뒤에 callback을 한 번 실행 (콜백 안에서 time.sleep 대신 사용)"""
+        if delay <= 0.0:
+            callback()
+            return None
+
+        timer = None
+
+        def fire():
+            timer.cancel()
+            self.scheduled_timers.discard(timer)
+            self.destroy_timer(timer)
+            callback()
+
+        timer = self.create_timer(delay, fire)
+        self.scheduled_timers.add(timer)
+        return timer
+
+    def cancel_scheduled(self):
+        """예약된 단계 전환 모두 취소"""
+        for timer in list(self.scheduled_timers):
+            timer.cancel()
+            self.destroy_timer(timer)
+        self.scheduled_timers.clear()
+
+    def enter_wait(self, state, publisher, msg, detail=None):
+        """명령을 발행하고 완료 신호 대기 상태로 전환 (detail: 기한을 따로 학습할 세부 구분, 예: 층)"""
+        publisher.publish(msg)
+        self.wait_handshake = self.handshakes.issue(state.name, (publisher, msg), self.now_sec(), detail)
+        self.set_state(state)
+
+    def check_wait_timeout(self):
+        """대기 중인 완료 신호가 타임아웃되면 명령 재전송, 재전송도 실패하면 유실 처리"""
+        if self.pickup_graph is not None:
+            self.check_pickup_timeouts()
             return
-            
+        handshake = self.wait_handshake
+        if handshake is None or self.current_state.name != handshake.key:
+            return
+        result = self.handshakes.check(handshake, self.now_sec())
+        if result == 'reissue':
+            self.reissue(handshake)
+        elif result == 'lost':
+            self.wait_handshake = None
+            self.handshake_lost(handshake)
+
+    def reissue(self, handshake):
+        publisher, msg = handshake.command
+        publisher.publish(msg)
+        self.get_logger().warning(f'⏰ {handshake.name} 타임아웃 ({handshake.timeout:.0f}초) - 명령 재전송 (남은 재시도: {handshake.retries_left})')
+
+    def accept_completion(self, handshake):
+        """완료 신호를 handshake 의 응답으로 받아들이고 기록, 재전송 뒤 늦게 온 중복 응답이면 False"""
+        if handshake is None:
+            return True
+        now = self.now_sec()
+        if not self.handshakes.accept(handshake, now):
+            self.get_logger().warning(f'🔁 {handshake.name} 직전 재전송의 중복 완료 신호 무시')
+            return False
+        self.handshakes.complete(handshake, now)
+        return True
+
+    def handshake_lost(self, handshake, escalate=True):
+        """재전송해도 완료 신호가 없음: 미션 중단, 연달아 유실되면 안전 정지"""
+        self.handshakes.lost(handshake, self.now_sec(), escalate)
+        consecutive = self.handshakes.consecutive_lost
+        event_msg = String()
+        event_msg.data = json.dumps({
+            'event': 'handshake_lost',
+            'handshake': handshake.name,
+            'mission': self.mission_label(),
+            'waited_s': round(self.now_sec() - handshake.first_issued_at, 1),
+            'reissues': handshake.reissues,
+            'consecutive_lost': consecutive,
+        }, ensure_ascii=False)
+        self.events_pub.publish(event_msg)
+        if not escalate:
+            return
+        if consecutive >= self.safe_stop_after_lost:
+            self.get_logger().error(f'🚨 {handshake.name} 응답 없음 - 완료 신호 유실 {consecutive}회 연속, 안전 정지')
+            self.enter_safe_stop(handshake)
+        else:
+            self.get_logger().error(f'❌ {handshake.name} 응답 없음 - 미션 중단')
+            self.abort_mission()
+
+    def enter_safe_stop(self, handshake):
+        """
+        장치가 응답하지 않는 상태로 보고 정지
+        - 예약된 단계와 집기 사이클 취소, 팔은 홈으로 (물체를 들고 있을 수 있으므로 그리퍼는 열지 않음)
+        - 진행 중 미션은 대기열 맨 앞으로 되돌리고 /mission/resume 을 기다린다
+        - 위치는 모르는 것으로 두고 (재개 후 항상 주행), 리프트가 올라가 있을 수 있으면 재개할 때 먼저 반납
+        """
+        self.cancel_scheduled()
+        self.wait_handshake = None
+        self.pickup_graph = None
+        self.fresh_objects = None
+        self.lift_floor_ready = None
+        self.lift_return_next = None
+        self.current_position = None
+        self.drive_started = None
+        self.lift_started = None
+        self.object_started = None
+        self.mission_started = None
+        mission = self.current_mission
+        if mission:
+            self.mission_queue.requeue(mission)
+            self.publish_queue_state()
+        self.current_mission = None
+        self.current_quantity_processed = 0
+        self.detected_objects = []
+        self.current_object_index = 0
+        self.set_state(MissionState.SAFE_STOP)
+
+        arm_msg = Point()
+        arm_msg.x = 4.0
+        arm_msg.y = 0.0
+        self.robot_arm_position_pub.publish(arm_msg)
+
+        event_msg = String()
+        event_msg.data = json.dumps({
+            'event': 'safe_stop',
+            'handshake': handshake.name,
+            'consecutive_lost': self.handshakes.consecutive_lost,
+            'requeued_mission': mission['name'] if mission else None,
+            'queue_depth': len(self.mission_queue),
+        }, ensure_ascii=False)
+        self.events_pub.publish(event_msg)
+        self.publish_telemetry()
+
+    def resume_callback(self, msg):
+        """안전 정지 해제 후 대기열 재개"""
+        if not msg.data or self.current_state != MissionState.SAFE_STOP:
+            return
+        self.get_logger().info('▶️ 안전 정지 해제 - 대기열 재개')
+        self.handshakes.consecutive_lost = 0
+        self.set_state(MissionState.IDLE)
+        if self.lift_raised is not None:
+            # 반납 완료 → complete_mission → 다음 미션 (리프트가 올라간 채로 주행하지 않도록)
+            self.get_logger().info(f'🔄 리프트 반납 후 재개 ({self.lift_raised}층)')
+            self.execute_lift_operation(self.lift_raised + 3)
+            return
+        self.resume_if_idle()
+
+    def resume_if_idle(self):
+        if self.current_state == MissionState.IDLE and self.mission_queue:
+            self.execute_next_mission()
+
+    def order_callback(self, msg):
+        """주문 수신 및 처리 (미션 중이어도 대기열에 추가)"""
         self.message_count += 1
         
         try:
             # JSON 파싱
             order_data = json.loads(msg.data)
-            self.get_logger().info('✅ JSON 파싱 성공')
-            self.get_logger().info(f'📊 데이터 타입: {type(order_data)}')
             
             # 주문 데이터 처리
             if 'order' in order_data:
                 orders = order_data['order']
-                self.get_logger().info(f'📦 주문 개수: {len(orders)}개')
+                order_id, anonymous = self.mission_queue.make_order_id(order_data)
                 
+                missions = []
                 for i, item in enumerate(orders, 1):
-                    self.get_logger().info(f'주문 {i}:')
-                    self.get_logger().info(f'  - 상품명: {item.get("name", "없음")}')
-                    self.get_logger().info(f'  - 수량: {item.get("quantity", "없음")}')
-                    self.get_logger().info(f'  - 위치: {item.get("position", "없음")}')
-                    self.get_logger().info(f'  - 층: {item.get("floor", "없음")}')
-                    
-                    # 미션 큐에 추가
-                    self.add_mission_to_queue(item)
-                    
-                # 첫 번째 미션 실행
-                self.execute_next_mission()
+                    self.get_logger().debug(f'주문 {i}: {item}')
+                    missions.append(self.build_mission(item))
+                self.enqueue_order(order_id, missions, anonymous)
             else:
                 self.get_logger().warning('⚠️ "order" 키가 없습니다.')
                 
@@ -136,8 +467,34 @@ class RobotControl(Node):
         except Exception as e:
             self.get_logger().error(f'❌ 메시지 처리 중 오류: {e}')
 
-    def add_mission_to_queue(self, item):
-        """미션을 큐에 추가"""
+    def typed_order_callback(self, msg):
+        """검증된 주문 수신 (필드 변환/중복 제거는 브리지에서 끝남)"""
+        self.message_count += 1
+        missions = [self.build_mission({
+            'name': item.name,
+            'quantity': item.quantity,
+            'position': item.position,
+            'floor': item.floor,
+        }) for item in msg.items]
+        # 브리지가 ID 없는 주문에도 고유 ID를 붙이고, 재시작 뒤 영구 세션이 다시 보낸 주문도
+        # (저장된 중복 판정 기록으로) 브리지에서 걸러내므로 여기서는 ID 기준 중복 제거만 적용
+        self.enqueue_order(msg.order_id, missions, False)
+
+    def enqueue_order(self, order_id, missions, anonymous):
+        """미션 큐에 추가 (중복 주문은 무시), 대기 중이면 바로 실행"""
+        self.get_logger().info(f'📦 주문 {order_id}: {len(missions)}개 항목')
+        if not self.mission_queue.submit(order_id, missions, anonymous):
+            self.get_logger().warning(f'⚠️ 중복 주문 무시: {order_id}')
+            return
+        self.get_logger().info(f'📋 미션 큐에 추가: {[m["name"] for m in missions]} (큐 크기: {len(self.mission_queue)})')
+        self.publish_queue_state()
+
+        # 대기 중이면 바로 첫 번째 미션 실행
+        if self.current_state == MissionState.IDLE:
+            self.execute_next_mission()
+
+    def build_mission(self, item):
+        """주문 항목을 미션 dict로 변환"""
         # 문자열을 정수로 안전하게 변환
         try:
             position = int(item.get("position", 1))
@@ -161,23 +518,72 @@ class RobotControl(Node):
             'floor': floor,
             'target_name': item.get("name", "unknown")  # YOLO 검출 대상
         }
-        
-        self.mission_queue.append(mission)
-        self.get_logger().info(f'📋 미션 큐에 추가: {mission["name"]} (큐 크기: {len(self.mission_queue)})')
+        return mission
+
+    def publish_queue_state(self):
+        """대기열 길이/대기 시간 통계 발행"""
+        state_msg = String()
+        state_msg.data = json.dumps(self.mission_queue.metrics())
+        self.queue_state_pub.publish(state_msg)
+
+    def plan_pending_missions(self):
+        """대기 미션을 합치고 주행/리프트 이동이 최소가 되도록 재배열"""
+        pending = self.mission_queue.snapshot()
+        if not pending:
+            return
+        start = self.current_position if self.current_position is not None else self.last_position
+        planned, predicted, exact = self.batch_planner.plan(pending, start)
+        self.mission_queue.replace_pending(planned)
+        def keys(missions):
+            return [(m.get('order_id'), m.get('item_index'), m['quantity']) for m in missions]
+
+        if keys(planned) != keys(pending):
+            route = ' → '.join(f'{m["name"]}@{m["position"]}/{m["floor"]}' for m in planned)
+            method = '정확해' if exact else '근사해'
+            self.get_logger().info(f'🧭 배치 계획 ({method}, {len(pending)}→{len(planned)}개, 예상 {predicted:.0f}초): {route}')
 
     def execute_next_mission(self):
         """큐에서 다음 미션 실행"""
         if not self.mission_queue:
             self.get_logger().info('📭 미션 큐가 비어있습니다.')
             return
+
+        # 리프트를 남겨둔 경우에는 이미 정해진 다음 미션을 그대로 실행
+        if self.batch_planning and self.lift_floor_ready is None:
+            self.plan_pending_missions()
         
-        self.current_mission = self.mission_queue.pop(0)
+        self.current_mission = self.mission_queue.pop()
+        self.publish_queue_state()
         self.current_step = 0
         self.current_quantity_processed = 0
         self.detected_objects = []
         self.current_object_index = 0  # 추가: 객체 인덱스 초기화
+        self.mission_started = self.now_sec()
         
         self.get_logger().info(f'🎯 새 미션 시작: {self.current_mission["name"]} (수량: {self.current_mission["quantity"]})')
+
+        position = self.current_mission['position']
+        floor = self.current_mission['floor']
+        if position not in BARRIER_POSITIONS and position == self.current_position:
+            if self.lift_floor_ready == floor:
+                # 같은 위치/층: 주행과 리프트 생략하고 바로 인식
+                self.get_logger().info('⏩ 같은 위치/층 - 주행과 리프트 생략')
+                self.lift_floor_ready = None
+                self.execute_yolo_detection()
+                return
+            if self.lift_floor_ready is None:
+                self.get_logger().info('⏩ 같은 위치 - 주행 생략')
+                self.execute_lift_operation(floor)
+                return
+        if self.lift_floor_ready is not None:
+            # 남겨둔 리프트와 다음 미션이 다름 (바쁜 동안 들어온 주문 등으로 계획이 바뀜):
+            # 리프트가 올라간 채로 주행하지 않도록 반납 완료 신호를 받은 뒤 이동
+            self.get_logger().warning(f'🔄 남겨둔 리프트 반납 후 이동 ({self.lift_floor_ready}층)')
+            floor_ready = self.lift_floor_ready
+            self.lift_floor_ready = None
+            self.lift_return_next = self.execute_robot_movement
+            self.execute_lift_operation(floor_ready + 3)
+            return
         
         # 1단계: 로봇 이동
         self.execute_robot_movement()
@@ -187,15 +593,15 @@ class RobotControl(Node):
         position = self.current_mission['position']
         
         self.get_logger().info(f'🤖 로봇 이동 시작: position {position}')
-        self.current_state = MissionState.ROBOT_MOVING
+        self.set_state(MissionState.ROBOT_MOVING)
+        self.drive_started = (self.current_position, position, self.now_sec())
         
-        # 로봇에게 명령 전송
+        # 로봇에게 명령 전송 후 완료 대기
         cmd_msg = Int32()
         cmd_msg.data = position
-        self.robot_command_pub.publish(cmd_msg)
-        
-        # 상태 업데이트
-        self.current_state = MissionState.WAITING_ROBOT_COMPLETE
+        # 출발 위치를 모르면 구간별 기한 대신 주행 전체 기한 사용
+        detail = f'{self.current_position}->{position}' if self.current_position is not None else None
+        self.enter_wait(MissionState.WAITING_ROBOT_COMPLETE, self.robot_command_pub, cmd_msg, detail)
         
         # 상태 발행
         status_msg = String()
@@ -212,26 +618,29 @@ class RobotControl(Node):
         else:
             self.get_logger().info(f'🛗 리프트 반납 동작 시작: {floor - 3}층으로 이동')
             
-        self.current_state = MissionState.LIFT_OPERATING
+        self.set_state(MissionState.LIFT_OPERATING)
+        self.lift_started = (floor, self.now_sec())
+        if 1 <= floor <= 3 and self.current_mission and self.current_mission['position'] not in BARRIER_POSITIONS:
+            self.lift_raised = floor
         # 리프트에게 명령 전송
         lift_msg = Int32()
         lift_msg.data = floor
-        self.lift_command_pub.publish(lift_msg)
         
         if floor == 0:
+            self.lift_command_pub.publish(lift_msg)
             self.complete_mission()
         elif floor == 4 or floor == 5 or floor == 6:
-            self.current_state = MissionState.WATING_LIFT_RETURN_COMPLETE
+            self.enter_wait(MissionState.WATING_LIFT_RETURN_COMPLETE, self.lift_command_pub, lift_msg, floor)
         else:
-            # 상태 업데이트
-            self.current_state = MissionState.WAITING_LIFT_COMPLETE
+            self.enter_wait(MissionState.WAITING_LIFT_COMPLETE, self.lift_command_pub, lift_msg, floor)
         
         # 상태 발행
         status_msg = String()
         status_msg.data = f"리프트 {floor}층 이동 중"
         self.status_pub.publish(status_msg)
 
-    def camera_to_robot_coordinates(self, pixel_x, pixel_y, angle_deg):
+    @staticmethod
+    def camera_to_robot_coordinates(pixel_x, pixel_y, angle_deg):
         # Bilinear 보간
         # robot_x = (1 / 15) * pixel_y - (113 / 15) - 0.5
         # robot_y = (-19 / 286) * pixel_x + (12697 / 286) + 0.3
@@ -248,7 +657,7 @@ class RobotControl(Node):
         target_name = self.current_mission['target_name']
         
         self.get_logger().info(f'📷 YOLO 물체 인식 시작: {target_name} 검출')
-        self.current_state = MissionState.YOLO_DETECTING
+        self.set_state(MissionState.YOLO_DETECTING)
         
         # 상태 발행
         status_msg = String()
@@ -256,48 +665,21 @@ class RobotControl(Node):
         self.status_pub.publish(status_msg)
         
         # YOLO 검출 트리거 전송
+        self.enter_wait(MissionState.WAITING_YOLO_COMPLETE, self.yolo_trigger_pub, self.detection_trigger())
+        
+        self.get_logger().info(f'🔍 YOLO 검출 트리거 전송: {target_name}')
+
+    def detection_trigger(self):
         trigger_msg = String()
         trigger_data = {
-            'target': target_name,
+            'target': self.current_mission['target_name'],
+            'floor': self.current_mission['floor'],  # YoloObbNode 가 층별 선반 ROI 선택
             'action': 'detect',
             'timestamp': time.time()
         }
         trigger_msg.data = json.dumps(trigger_data)
-        self.yolo_trigger_pub.publish(trigger_msg)
-        
-        # 상태 업데이트
-        self.current_state = MissionState.WAITING_YOLO_COMPLETE
-        
-        self.get_logger().info(f'🔍 YOLO 검출 트리거 전송: {target_name}')
+        return trigger_msg
 
-    def execute_robot_arm_pickup(self, detected_object):
-        """로봇 팔 물체 집기 단계"""
-        x = detected_object['robot_x']
-        y = detected_object['robot_y']
-        z = detected_object['robot_angle']
-        
-        self.get_logger().info(f'🦾 로봇 팔 물체 집기 시작: ({x:.2f}, {y:.2f}, {z:.1f}°)')
-        self.current_state = MissionState.ROBOT_ARM_MOVING
-        
-        # 1. 그리퍼 열기
-        self.control_gripper(False)  # False = 열기
-        time.sleep(0.5)  # 그리퍼 동작 대기
-        
-        # 2. 물체 위치로 이동 (위치 + 회전)
-        arm_msg = Point()
-        arm_msg.x = float(x)
-        arm_msg.y = float(y)
-        arm_msg.z = float(z)
-        self.robot_arm_position_pub.publish(arm_msg)
-        
-        # 상태 업데이트
-        self.current_state = MissionState.WAITING_ROBOT_ARM_COMPLETE
-        
-        # 상태 발행
-        status_msg = String()
-        status_msg.data = f"로봇 팔 물체 집기 중: ({x:.2f}, {y:.2f}, {z:.1f}°)"
-        self.status_pub.publish(status_msg)
-        
     def control_gripper(self, close):
         """그리퍼 제어 (열기/닫기)"""
         gripper_msg = Bool()
@@ -306,82 +688,274 @@ class RobotControl(Node):
         action = "닫기" if close else "열기"
         self.get_logger().info(f'✋ 그리퍼 {action}')
 
-    def execute_lift_up(self):
-        """리프트 위로 동작 (9번 전송)"""
-        self.get_logger().info('🛗 리프트 위로 동작 시작 (9번)')
-        self.current_state = MissionState.LIFT_UP_OPERATING
-        
-        # 리프트에게 9번 명령 전송
-        lift_msg = Int32()
-        lift_msg.data = 9
-        self.lift_command_pub.publish(lift_msg)
-        
-        # 상태 업데이트
-        self.current_state = MissionState.WAITING_LIFT_UP_COMPLETE
-        
-        # 상태 발행
-        status_msg = String()
-        status_msg.data = "리프트 위로 동작 중 (9번)"
-        self.status_pub.publish(status_msg)
-
-    def execute_lift_down(self):
-        """리프트 아래로 동작 (10번 전송)"""
-        self.get_logger().info('🛗 리프트 아래로 동작 시작 (10번)')
-        self.current_state = MissionState.LIFT_DOWN_OPERATING
-        
-        # 리프트에게 10번 명령 전송
-        lift_msg = Int32()
-        lift_msg.data = 10
-        self.lift_command_pub.publish(lift_msg)
-        
-        # 상태 업데이트
-        self.current_state = MissionState.WAITING_LIFT_DOWN_COMPLETE
-        
-        # 상태 발행
-        status_msg = String()
-        status_msg.data = "리프트 아래로 동작 중 (10번)"
-        self.status_pub.publish(status_msg)
-
-    def execute_robot_arm_delivery(self):
-        """로봇 팔 배송 위치로 이동"""
+    @staticmethod
+    def delivery_slot(row, column):
+        """배송 칸 (row, column) 좌표"""
         base_delivery_x = -5.0  # 첫 번째 코드의 좌표로 수정
         base_delivery_y = 15.0
         delivery_z = -180.0
         
         offset = 3.0
         
-        delivery_x = base_delivery_x - offset * self.row
-        delivery_y = base_delivery_y + offset * self.column
-    
-        self.column += 1
-        
-        if self.column >= 2:
-            self.row = (self.row + 1) % 3
-            self.column = 0
-        
-        
-        self.get_logger().info(f'🚚 로봇 팔 배송 위치로 이동: ({delivery_x}, {delivery_y})')
-        self.current_state = MissionState.ROBOT_ARM_DELIVERY
-        
-        # 로봇 팔에게 배송 위치 명령 전송
-        arm_msg = Point()
-        arm_msg.x = delivery_x
-        arm_msg.y = delivery_y
-        arm_msg.z = delivery_z
-        self.robot_arm_position_pub.publish(arm_msg)
-        
-        # 상태 업데이트
-        self.current_state = MissionState.WAITING_ROBOT_ARM_DELIVERY_COMPLETE
-        
-        # 상태 발행
-        status_msg = String()
-        status_msg.data = f"로봇 팔 배송 위치로 이동 중: ({delivery_x}, {delivery_y})"
-        self.status_pub.publish(status_msg)
+        delivery_x = base_delivery_x - offset * row
+        delivery_y = base_delivery_y + offset * column
+        return delivery_x, delivery_y, delivery_z
+
+    @staticmethod
+    def advance_slot(row, column):
+        """2열 x 3행 순서로 다음 칸"""
+        column += 1
+        if column >= 2:
+            row = (row + 1) % 3
+            column = 0
+        return row, column
+
+    def next_delivery_position(self):
+        """다음 배송 칸 좌표를 반환하고 칸 위치를 한 칸 넘김"""
+        position = self.delivery_slot(self.row, self.column)
+        self.row, self.column = self.advance_slot(self.row, self.column)
+        return position
+
+    def pick_origins(self, count):
+        """k번째 집기 직전 팔 위치 (x, y, 그리퍼 각도) 목록"""
+        home = (4.0, 0.0, 0.0)
+        if self.pickup_mode != 'overlap':
+            return [home]  # 매번 홈을 거쳐서 집으러 감
+        # overlap 모드는 직전 배송 칸에서 바로 다음 물체로 이동
+        origins = [home]
+        row, column = self.row, self.column
+        for _ in range(max(0, count - 1)):
+            origins.append(self.delivery_slot(row, column))
+            row, column = self.advance_slot(row, column)
+        return origins
+
+    def plan_pick_order(self, objects):
+        """남은 수량만큼 집을 물체를 고르고 팔 이동/회전/간섭이 최소가 되도록 정렬"""
+        remaining = self.current_mission['quantity'] - self.current_quantity_processed
+        if not self.pick_planning or remaining <= 0 or not objects:
+            return objects
+        count = min(remaining, len(objects))
+        planned, cost, exact = self.pick_planner.plan(objects, count, self.pick_origins(count))
+        unreachable = sum(1 for obj in planned[:count] if not self.pick_planner.is_reachable(obj))
+        method = '정확해' if exact else '근사해'
+        self.get_logger().info(f'🧮 집기 순서 계획 ({method}, {count}/{len(objects)}개, 비용 {cost:.1f}): '
+                               + ' → '.join(f'#{obj["id"] + 1}' for obj in planned[:count]))
+        if unreachable:
+            self.get_logger().warning(f'⚠️ 작업 반경 밖 물체 {unreachable}개를 집어야 합니다')
+        return planned
+
+    def log_detection(self, result_data):
+        if not self.detection_log_path:
+            return
+        record = {
+            'stamp': time.time(),
+            'mission': self.current_mission['name'] if self.current_mission else None,
+            'floor': self.current_mission['floor'] if self.current_mission else None,
+            'quantity': self.current_mission['quantity'] - self.current_quantity_processed if self.current_mission else None,
+            'result': result_data,
+        }
+        try:
+            directory = os.path.dirname(self.detection_log_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.detection_log_path, 'a') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        except OSError as e:
+            self.get_logger().error(f'❌ 검출 결과 기록 실패: {e}')
+
+    # ---------- 집기 사이클 (작업 그래프) ----------
+
+    def start_pickup_cycle(self):
+        """검출된 물체들의 집기~배송 사이클을 작업 그래프로 실행"""
+        remaining = self.current_mission['quantity'] - self.current_quantity_processed
+        count = max(0, min(remaining, len(self.detected_objects)))
+        self.pickup_graph = build_pickup_graph(count, self.pickup_mode, self.dwells)
+        self.pickup_graph.started_at = self.now_sec()
+        self.fresh_objects = None
+        self.wait_handshake = None
+        self.get_logger().info(f'⚙️ 집기 사이클 시작 ({self.pickup_mode} 모드, 물체 {count}개)')
+        self.advance_pickup()
+
+    def advance_pickup(self):
+        """선행 작업이 끝나고 자원이 빈 작업 시작, 모두 끝나면 사이클 종료"""
+        graph = self.pickup_graph
+        if graph is None:
+            return
+        if graph.finished():
+            self.finish_pickup_cycle()
+            return
+        for task in graph.start_ready(self.now_sec()):
+            self.start_pickup_task(task)
+            if self.pickup_graph is not graph:
+                # 작업을 시작하는 도중 사이클이 끝났거나 중단됨
+                return
+
+    def start_pickup_task(self, task):
+        state = PICKUP_TASK_STATES.get(task.kind)
+        if state is not None:
+            self.set_state(state)
+
+        if task.kind == 'gripper_open':
+            self.control_gripper(False)  # False = 열기
+        elif task.kind == 'pick':
+            target = self.pickup_target()
+            if target is None:
+                self.get_logger().warning(f'⚠️ 집을 물체가 없습니다 (물체 #{task.obj + 1}) - 사이클 종료')
+                self.pickup_graph.cancel(self.now_sec())
+                self.advance_pickup()
+                return
+            x, y, z = target['robot_x'], target['robot_y'], target['robot_angle']
+            self.get_logger().info(f'🦾 로봇 팔 물체 집기 시작: ({x:.2f}, {y:.2f}, {z:.1f}°)')
+            self.object_started = self.now_sec()
+            arm_msg = Point()
+            arm_msg.x = float(x)
+            arm_msg.y = float(y)
+            arm_msg.z = float(z)
+            self.issue_pickup_command(task, self.robot_arm_position_pub, arm_msg)
+            status_msg = String()
+            status_msg.data = f"로봇 팔 물체 집기 중: ({x:.2f}, {y:.2f}, {z:.1f}°)"
+            self.status_pub.publish(status_msg)
+        elif task.kind == 'pickup_settle':
+            self.get_logger().info('🔒 물체 집기 완료 - 그리퍼 닫기')
+            self.control_gripper(False)  # True = 닫기
+        elif task.kind in ('lift_up', 'lift_down'):
+            command = 9 if task.kind == 'lift_up' else 10
+            direction = '위로' if task.kind == 'lift_up' else '아래로'
+            self.get_logger().info(f'🛗 리프트 {direction} 동작 시작 ({command}번)')
+            lift_msg = Int32()
+            lift_msg.data = command
+            self.issue_pickup_command(task, self.lift_command_pub, lift_msg)
+            status_msg = String()
+            status_msg.data = f"리프트 {direction} 동작 중 ({command}번)"
+            self.status_pub.publish(status_msg)
+        elif task.kind == 'gripper_close':
+            self.control_gripper(True)
+        elif task.kind == 'deliver':
+            delivery_x, delivery_y, delivery_z = self.next_delivery_position()
+            self.get_logger().info(f'🚚 로봇 팔 배송 위치로 이동: ({delivery_x}, {delivery_y})')
+            arm_msg = Point()
+            arm_msg.x = delivery_x
+            arm_msg.y = delivery_y
+            arm_msg.z = delivery_z
+            self.issue_pickup_command(task, self.robot_arm_position_pub, arm_msg)
+            status_msg = String()
+            status_msg.data = f"로봇 팔 배송 위치로 이동 중: ({delivery_x}, {delivery_y})"
+            self.status_pub.publish(status_msg)
+        elif task.kind == 'release':
+            self.control_gripper(False)  # False = 열기
+        elif task.kind == 'home':
+            self.move_arm_to_home()
+        elif task.kind == 'redetect':
+            self.get_logger().info('🔍 배송 중 남은 물체 재인식')
+            self.issue_pickup_command(task, self.yolo_trigger_pub, self.detection_trigger())
+
+        if not task.is_command:
+            self.schedule(task.duration, lambda: self.complete_pickup_task(task))
+
+    def issue_pickup_command(self, task, publisher, msg):
+        """명령 작업 발행, 완료 신호 감시 시작"""
+        publisher.publish(msg)
+        task.handshake = self.handshakes.issue(self.pickup_handshake_key(task), (publisher, msg), self.now_sec())
+
+    @staticmethod
+    def pickup_handshake_key(task):
+        if task.kind == 'redetect':
+            return MissionState.WAITING_YOLO_COMPLETE.name
+        return PICKUP_TASK_STATES[task.kind].name
+
+    def pickup_target(self):
+        """다음에 집을 물체 (재인식 결과가 있으면 새 좌표 사용)"""
+        if self.fresh_objects is not None:
+            if self.fresh_objects:
+                self.detected_objects = self.plan_pick_order(self.fresh_objects)
+                self.current_object_index = 0
+                self.get_logger().info(f'🔄 재인식 좌표 사용: 남은 물체 {len(self.detected_objects)}개')
+            else:
+                self.get_logger().warning('⚠️ 재인식 결과가 비어 있음 - 기존 좌표 사용')
+            self.fresh_objects = None
+        if self.current_object_index < len(self.detected_objects):
+            return self.detected_objects[self.current_object_index]
+        return None
+
+    def complete_pickup_task(self, task):
+        graph = self.pickup_graph
+        if graph is None or graph.tasks.get(task.name) is not task:
+            return
+        if not graph.complete(task.name, self.now_sec()):
+            return
+        if task.kind == 'home' or (task.kind == 'release' and task_name('home', task.obj) not in graph.tasks):
+            self.finish_object()
+        self.advance_pickup()
+
+    def check_pickup_timeouts(self):
+        """집기 사이클에서 완료 신호를 기다리는 작업들의 타임아웃 처리"""
+        now = self.now_sec()
+        graph = self.pickup_graph
+        for task in list(graph):
+            if task.status != RUNNING or task.handshake is None:
+                continue
+            result = self.handshakes.check(task.handshake, now)
+            if result == 'reissue':
+                self.reissue(task.handshake)
+            elif result == 'lost' and task.optional:
+                self.get_logger().warning(f'⚠️ {task.name} 응답 없음 - 기존 좌표로 계속')
+                self.handshake_lost(task.handshake, escalate=False)
+                self.complete_pickup_task(task)
+                if self.pickup_graph is not graph:
+                    return  # 이 완료로 사이클이 끝남
+            elif result == 'lost':
+                self.handshake_lost(task.handshake)
+                return
+
+    def finish_pickup_cycle(self):
+        graph = self.pickup_graph
+        self.pickup_graph = None
+        self.report_pickup_cycle(graph)
+        self.finish_pickup()
+
+    def report_pickup_cycle(self, graph):
+        """물체별 사이클 시간을 직렬 실행 기준과 비교해서 보고"""
+        finish = {obj: t for obj, t in graph.object_finish_times().items()
+                  if graph.tasks.get(task_name('release', obj)) is not None
+                  and graph[task_name('release', obj)].status == DONE}
+        count = len(finish)
+        if count == 0:
+            return
+        cycles = cycle_times(finish, count, graph.started_at)
+        baseline = serial_baseline(graph, count, self.dwells)
+        mean_cycle = sum(cycles) / len(cycles)
+        mean_baseline = sum(baseline) / len(baseline)
+        saving = (1.0 - mean_cycle / mean_baseline) * 100.0 if mean_baseline > 0 else 0.0
+        for obj, (cycle, serial) in enumerate(zip(cycles, baseline)):
+            self.get_logger().info(f'⏱️ 물체 #{obj + 1} 사이클: {cycle:.1f}초 (직렬 기준 {serial:.1f}초)')
+        self.get_logger().info(f'⏱️ 집기 사이클 ({self.pickup_mode}, {count}개): 평균 {mean_cycle:.1f}초 / 직렬 기준 {mean_baseline:.1f}초 ({saving:.0f}% 단축)')
+
+        event_msg = String()
+        event_msg.data = json.dumps({
+            'event': 'pickup_cycle',
+            'mode': self.pickup_mode,
+            'objects': count,
+            'cycle_s': [round(c, 2) for c in cycles],
+            'serial_baseline_s': [round(b, 2) for b in baseline],
+            'mean_cycle_s': round(mean_cycle, 2),
+            'mean_serial_baseline_s': round(mean_baseline, 2),
+        })
+        self.events_pub.publish(event_msg)
 
     def robot_complete_callback(self, msg):
         """로봇 완료 신호 수신"""
         if self.current_state == MissionState.WAITING_ROBOT_COMPLETE:
+            if not self.accept_completion(self.wait_handshake):
+                return
+            self.wait_handshake = None
             self.get_logger().info(f'✅ 로봇 이동 완료 (응답: {msg.data})')
+            if self.drive_started is not None:
+                from_position, to_position, started = self.drive_started
+                if from_position is not None:
+                    self.cost_model.observe_drive(from_position, to_position, self.now_sec() - started)
+                self.drive_started = None
+            self.current_position = self.current_mission['position']
+            self.last_position = self.current_position
             # 다음 단계: 리프트 동작
             floor = self.current_mission['floor']
             self.execute_lift_operation(floor)
@@ -391,6 +965,29 @@ class RobotControl(Node):
     def lift_complete_callback(self, msg):
         """리프트 완료 신호 수신"""
         self.get_logger().info(f'🛗 리프트 완료 신호 수신: {msg.data}, 현재 상태: {self.current_state.name}')
+
+        if self.pickup_graph is not None:
+            task = self.pickup_graph.running_on('lift')
+            if task is not None and task.is_command:
+                if not self.accept_completion(task.handshake):
+                    return
+                direction = '위로' if task.kind == 'lift_up' else '아래로'
+                self.get_logger().info(f'✅ 리프트 {direction} 동작 완료 (응답: {msg.data})')
+                self.complete_pickup_task(task)
+            else:
+                self.get_logger().debug(f'리프트 완료 신호 수신 (현재 상태: {self.current_state})')
+            return
+
+        if self.current_state in (MissionState.WAITING_LIFT_COMPLETE, MissionState.WATING_LIFT_RETURN_COMPLETE):
+            if not self.accept_completion(self.wait_handshake):
+                return
+            self.wait_handshake = None
+
+        if self.lift_started is not None and self.current_state in (
+                MissionState.WAITING_LIFT_COMPLETE, MissionState.WATING_LIFT_RETURN_COMPLETE):
+            floor, started = self.lift_started
+            self.cost_model.observe_lift(floor, self.now_sec() - started)
+            self.lift_started = None
         
         if self.current_state == MissionState.WAITING_LIFT_COMPLETE:
             position = self.current_mission['position']
@@ -404,93 +1001,112 @@ class RobotControl(Node):
                 # 다음 단계: YOLO 물체 인식
                 self.execute_yolo_detection()
             
-        elif self.current_state == MissionState.WAITING_LIFT_UP_COMPLETE:
-            self.get_logger().info(f'✅ 리프트 위로 동작 완료 (응답: {msg.data})')
-            # 그리퍼 닫기
-            time.sleep(3.3)
-            self.control_gripper(True) 
-            # 다음 단계: 리프트 아래로 동작
-            time.sleep(1.5)
-            self.execute_lift_down()
-            
-        elif self.current_state == MissionState.WAITING_LIFT_DOWN_COMPLETE:
-            self.get_logger().info(f'✅ 리프트 아래로 동작 완료 (응답: {msg.data})')
-            # 다음 단계: 로봇 팔 배송 
-            time.sleep(4.0 )
-            self.execute_robot_arm_delivery()
-            
         elif self.current_state == MissionState.WATING_LIFT_RETURN_COMPLETE:
             self.get_logger().info(f'✅ 리프트 반납 완료 (응답: {msg.data})')
+            self.lift_raised = None
+            if self.lift_return_next is not None:
+                # 이동 전 반납: 미션을 끝내지 않고 다음 단계로
+                next_step = self.lift_return_next
+                self.lift_return_next = None
+                next_step()
+                return
+            self.set_state(MissionState.MISSION_COMPLETE)
             self.move_arm_to_home()
-            time.sleep(3.0)
-            self.complete_mission()
+            self.schedule(self.dwells['lift_return_home'], self.complete_mission)
             
         else:
             self.get_logger().debug(f'리프트 완료 신호 수신 (현재 상태: {self.current_state})')
 
+    def parse_detections(self, result_data):
+        """YOLO 결과 → 로봇 좌표로 변환한 물체 목록 (카메라 중앙에 가까운 순)"""
+        objects = result_data.get('objects') or []
+        detected_objects_with_distance = []
+        
+        # 카메라 중앙 좌표 (640x480 해상도 기준)
+        camera_center_x = 320.0
+        camera_center_y = 240.0
+        
+        for i, obj in enumerate(objects):
+            center_x = obj['pixel_x']
+            center_y = obj['pixel_y']
+            angle = obj['angle']
+            depth_mm = obj.get('depth_mm', None)
+            
+            # 카메라 좌표를 로봇 좌표로 변환
+            robot_x, robot_y, robot_angle = self.camera_to_robot_coordinates(center_x, center_y, angle)
+            
+            # 카메라 중앙으로부터의 거리 계산
+            distance_from_center = math.sqrt(
+                (center_x - camera_center_x)**2 + 
+                (center_y - camera_center_y)**2
+            )
+            
+            detected_object = {
+                'id': i,
+                'pixel_x': center_x,
+                'pixel_y': center_y,
+                'pixel_angle': angle,
+                'depth_mm': depth_mm,
+                'robot_x': robot_x,
+                'robot_y': robot_y,
+                'robot_angle': robot_angle,
+                'distance_from_center': distance_from_center
+            }
+            
+            detected_objects_with_distance.append(detected_object)
+            
+            depth_info = f", depth={depth_mm:.0f}mm" if depth_mm is not None else ""
+            self.get_logger().info(f'🎯 물체 #{i+1}: 픽셀({center_x:.0f}, {center_y:.0f}, {angle:.0f}°{depth_info}) → 로봇({robot_x:.2f}, {robot_y:.2f}, {robot_angle:.1f}°) ✅')
+        
+        # 카메라 중앙으로부터의 거리 기준으로 정렬 (가까운 순)
+        detected_objects_with_distance.sort(key=lambda x: x['distance_from_center'])
+        return detected_objects_with_distance
+
     def yolo_result_callback(self, msg):
         """YOLO 검출 결과 수신"""
+        if self.pickup_graph is not None:
+            # 배송 중 재인식 결과: 다음 물체 집기에 사용
+            task = self.pickup_graph.running_on('camera')
+            if task is None:
+                self.get_logger().debug('YOLO 결과 수신 (재인식 대기 중 아님)')
+                return
+            if not self.accept_completion(task.handshake):
+                return
+            try:
+                result_data = array_to_dict(msg)
+                self.log_detection(result_data)
+                self.fresh_objects = self.parse_detections(result_data)
+                self.get_logger().info(f'✅ 재인식 완료: {len(self.fresh_objects)}개 검출')
+            except (KeyError, TypeError, ValueError) as e:
+                self.get_logger().error(f'❌ 재인식 결과 처리 오류: {e}')
+            self.complete_pickup_task(task)
+            return
+
         if self.current_state == MissionState.WAITING_YOLO_COMPLETE:
+            if not self.accept_completion(self.wait_handshake):
+                return
+            self.wait_handshake = None
             try:
-                result_data = json.loads(msg.data)
-                self.get_logger().info(f'✅ YOLO 검출 완료: {result_data.get("target", "unknown")}')
+                result_data = array_to_dict(msg)
+                self.get_logger().info(f'✅ YOLO 검출 완료: {result_data["target"] or "unknown"} ({result_data["source"]})')
+                self.log_detection(result_data)
                 
                 if 'objects' in result_data and result_data['objects']:
                     objects = result_data['objects']
-                    detected_objects_with_distance = []
-                    
-                    # 카메라 중앙 좌표 (640x480 해상도 기준)
-                    camera_center_x = 320.0
-                    camera_center_y = 240.0
-                    
-                    for i, obj in enumerate(objects):
-                        center_x = obj['pixel_x']
-                        center_y = obj['pixel_y']
-                        angle = obj['angle']
-                        depth_mm = obj.get('depth_mm', None)
-                        
-                        # 카메라 좌표를 로봇 좌표로 변환
-                        robot_x, robot_y, robot_angle = self.camera_to_robot_coordinates(center_x, center_y, angle)
-                        
-                        # 카메라 중앙으로부터의 거리 계산
-                        distance_from_center = math.sqrt(
-                            (center_x - camera_center_x)**2 + 
-                            (center_y - camera_center_y)**2
-                        )
-                        
-                        detected_object = {
-                            'id': i,
-                            'pixel_x': center_x,
-                            'pixel_y': center_y,
-                            'pixel_angle': angle,
-                            'depth_mm': depth_mm,
-                            'robot_x': robot_x,
-                            'robot_y': robot_y,
-                            'robot_angle': robot_angle,
-                            'distance_from_center': distance_from_center
-                        }
-                        
-                        detected_objects_with_distance.append(detected_object)
-                        
-                        depth_info = f", depth={depth_mm:.0f}mm" if depth_mm is not None else ""
-                        self.get_logger().info(f'🎯 물체 #{i+1}: 픽셀({center_x:.0f}, {center_y:.0f}, {angle:.0f}°{depth_info}) → 로봇({robot_x:.2f}, {robot_y:.2f}, {robot_angle:.1f}°) ✅')
-                    
-                    # 카메라 중앙으로부터의 거리 기준으로 정렬 (가까운 순)
-                    detected_objects_with_distance.sort(key=lambda x: x['distance_from_center'])
-                    self.detected_objects = detected_objects_with_distance
+                    self.detected_objects = self.plan_pick_order(self.parse_detections(result_data))
                     
                     total_detected = len(objects)
-                    safe_objects = len(detected_objects_with_distance)
+                    safe_objects = len(self.detected_objects)
                     filtered_out = total_detected - safe_objects
                     
                     self.get_logger().info(f'✅ 총 {total_detected}개 검출, {safe_objects}개 안전 범위 내, {filtered_out}개 필터링됨')
                     
                     if self.detected_objects:
-                        # 첫 번째 안전한 객체로 로봇 팔 이동
+                        # 첫 번째 안전한 객체부터 집기 사이클 시작
                         self.current_object_index = 0
                         detected_object = self.detected_objects[0]
                         self.get_logger().info(f'🎯 첫 번째 안전한 물체 선택: ({detected_object["robot_x"]:.2f}, {detected_object["robot_y"]:.2f})')
-                        self.execute_robot_arm_pickup(detected_object)
+                        self.start_pickup_cycle()
                     else:
                         self.get_logger().warning('⚠️ 안전 범위 내에 검출된 물체가 없습니다.')
                         self.complete_mission()
@@ -498,9 +1114,6 @@ class RobotControl(Node):
                     self.get_logger().warning('⚠️ 검출된 물체가 없습니다.')
                     self.complete_mission()
                     
-            except json.JSONDecodeError as e:
-                self.get_logger().error(f'❌ YOLO 결과 파싱 오류: {e}')
-                self.complete_mission()
             except Exception as e:
                 self.get_logger().error(f'❌ YOLO 결과 처리 오류: {e}')
                 self.complete_mission()
@@ -510,50 +1123,55 @@ class RobotControl(Node):
     def robot_arm_complete_callback(self, msg):
         """로봇 팔 완료 신호 수신"""
         self.get_logger().info(f'✅ 로봇 팔 동작 완료 (응답: {msg.data}), 현재 상태: {self.current_state.name}')
+
+        task = self.pickup_graph.running_on('arm') if self.pickup_graph is not None else None
+        if task is not None and task.is_command:
+            if not self.accept_completion(task.handshake):
+                return
+            if task.kind == 'deliver':
+                self.get_logger().info('🎉 배송 위치 도달 완료')
+            self.complete_pickup_task(task)
+        else:
+            self.get_logger().debug(f'로봇 팔 완료 신호 수신 (현재 상태: {self.current_state})')
+
+    def finish_object(self):
+        """물체 하나 배송 완료 기록"""
+        # 처리된 수량 증가
+        self.current_quantity_processed += 1
+        self.current_object_index += 1  # 다음 객체 인덱스로 이동
+        if self.object_started is not None:
+            self.cost_model.observe_pick(self.now_sec() - self.object_started)
+            self.object_started = None
         
-        if self.current_state == MissionState.WAITING_ROBOT_ARM_COMPLETE:
-            self.get_logger().info('🔒 물체 집기 완료 - 그리퍼 닫기')
-            # 그리퍼 닫기
-            self.control_gripper(False)  # True = 닫기
-            time.sleep(1.5)  # 그리퍼 동작 대기
-            
-            # 다음 단계: 리프트 위로 동작
-            self.execute_lift_up()
-            
-        elif self.current_state == MissionState.WAITING_ROBOT_ARM_DELIVERY_COMPLETE:
-            self.get_logger().info('🎉 배송 위치 도달 완료')
-            time.sleep(1.5)  # 안정화 대기
-            
-            # 그리퍼 열기 (물체 놓기)
-            self.control_gripper(False)  # False = 열기
-            time.sleep(1.5)
+        self.get_logger().info(f'📦 처리 완료: {self.current_quantity_processed}/{self.current_mission["quantity"]} (객체 #{self.current_object_index})')
+
+    def finish_pickup(self):
+        """집기 사이클이 끝난 뒤 리프트 반납 또는 유지 결정"""
+        if self.current_quantity_processed >= self.current_mission['quantity']:
+            self.get_logger().info('✅ 목표 수량 달성! 미션 완료')
+            floor = self.current_mission['floor']
             self.move_arm_to_home()
-            time.sleep(1.5)
-            
-            # 처리된 수량 증가
-            self.current_quantity_processed += 1
-            self.current_object_index += 1  # 다음 객체 인덱스로 이동
-            
-            self.get_logger().info(f'📦 처리 완료: {self.current_quantity_processed}/{self.current_mission["quantity"]} (객체 #{self.current_object_index})')
-            
-            # 목표 수량 달성 체크
-            if self.current_quantity_processed < self.current_mission['quantity'] and self.current_object_index < len(self.detected_objects):
-                # 다음 객체 처리 (이미 검출된 좌표 사용)
-                next_object = self.detected_objects[self.current_object_index]
-                self.get_logger().info(f'🔄 다음 물체 처리: 인덱스 {self.current_object_index} → 로봇 좌표 ({next_object["robot_x"]:.2f}, {next_object["robot_y"]:.2f})')
-                self.execute_robot_arm_pickup(next_object)
-                
-            elif self.current_quantity_processed >= self.current_mission['quantity']:
-                self.get_logger().info('✅ 목표 수량 달성! 미션 완료')
-                self.get_logger().info('🔄 리프트 반납 동작 시작')
-                floor = self.current_mission['floor']
-                self.move_arm_to_home()
-                self.execute_lift_operation(floor + 3)
-            else:
-                self.get_logger().warning(f'⚠️ 처리 가능한 객체 부족: 검출됨 {len(self.detected_objects)}개, 필요 {self.current_mission["quantity"]}개')
+            if self.next_mission_shares_lift():
+                # 다음 미션이 같은 위치/층이면 리프트를 반납하지 않고 남겨둔다
+                self.get_logger().info(f'⏩ 다음 미션도 {self.current_position}번 위치 {floor}층 - 리프트 유지')
+                self.lift_floor_ready = floor
                 self.complete_mission()
+                return
+            self.get_logger().info('🔄 리프트 반납 동작 시작')
+            self.execute_lift_operation(floor + 3)
         else:
-            self.get_logger().debug(f'로봇 팔 완료 신호 수신 (현재 상태: {self.current_state})')
+            self.get_logger().warning(f'⚠️ 처리 가능한 객체 부족: 검출됨 {len(self.detected_objects)}개, 필요 {self.current_mission["quantity"]}개')
+            self.complete_mission()
+
+    def next_mission_shares_lift(self):
+        if not self.batch_planning:
+            return False
+        self.plan_pending_missions()
+        next_mission = self.mission_queue.peek()
+        return (next_mission is not None
+                and next_mission['position'] not in BARRIER_POSITIONS
+                and next_mission['position'] == self.current_mission['position']
+                and next_mission['floor'] == self.current_mission['floor'])
 
     def move_arm_to_home(self):
         """로봇 팔을 홈 위치로 이동"""
@@ -578,17 +1196,69 @@ class RobotControl(Node):
             status_msg.data = f"미션 완료: {self.current_mission['name']} (처리 수량: {self.current_quantity_processed})"
             self.status_pub.publish(status_msg)
         
-        # 로봇 팔 홈 위치로 이동
-        time.sleep(1.5)
-        self.move_arm_to_home()
-        time.sleep(1.5)
-        
+        # 대기 후 로봇 팔 홈 위치로 이동, 다시 대기 후 다음 미션
+        self.set_state(MissionState.MISSION_COMPLETE)
+        self.wait_handshake = None
+
+        def go_home():
+            self.move_arm_to_home()
+            self.schedule(self.dwells['mission_complete'], self.reset_and_continue)
+
+        self.schedule(self.dwells['mission_complete'], go_home)
+
+    def publish_order_complete(self, order_id):
+        """주문의 모든 항목 처리 완료 (중단된 항목이 있으면 aborted)"""
+        event_msg = String()
+        event_msg.data = json.dumps({
+            'event': 'order_complete',
+            'order_id': order_id,
+            'result': 'aborted' if order_id in self.aborted_orders else 'done',
+        })
+        self.events_pub.publish(event_msg)
+        self.aborted_orders.discard(order_id)
+
+    def abort_mission(self):
+        """
+        완료 신호가 오지 않는 미션 중단
+        주행 도중이었을 수 있으므로 위치는 모르는 것으로 두고 (다음 미션은 같은 위치여도 주행),
+        리프트가 올라가 있을 수 있으면 반납 완료를 기다린 뒤 미션을 끝낸다
+        """
+        if self.current_mission:
+            self.aborted_orders.update(self.mission_queue.order_ids_of(self.current_mission))
+        self.cancel_scheduled()
+        self.wait_handshake = None
+        self.pickup_graph = None
+        self.fresh_objects = None
+        self.lift_return_next = None
+        self.lift_floor_ready = None
+        self.current_position = None
+        self.drive_started = None
+        if self.current_mission:
+            status_msg = String()
+            status_msg.data = f"미션 중단: {self.current_mission['name']} ({self.current_state.name} 응답 없음)"
+            self.status_pub.publish(status_msg)
+        if self.lift_raised is not None:
+            # 반납 완료 → complete_mission (반납도 응답이 없으면 다시 중단되고, 연달아 유실되면 안전 정지)
+            self.get_logger().warning(f'🔄 미션 중단 - 리프트 반납 후 다음 미션 ({self.lift_raised}층)')
+            self.execute_lift_operation(self.lift_raised + 3)
+            return
+        self.complete_mission()
+
+    def reset_and_continue(self):
+        """미션 상태 초기화 후 다음 미션 실행"""
+        if self.current_mission:
+            for order_id in self.mission_queue.complete(self.current_mission):
+                self.publish_order_complete(order_id)
+            self.publish_queue_state()
+            self.record_mission_makespan()
         self.current_mission = None
         self.current_step = 0
         self.current_quantity_processed = 0
         self.detected_objects = []
         self.current_object_index = 0
-        self.current_state = MissionState.IDLE
+        self.pickup_graph = None
+        self.fresh_objects = None
+        self.set_state(MissionState.IDLE)
         
         # 다음 미션 실행
         if self.mission_queue:
@@ -598,8 +1268,47 @@ class RobotControl(Node):
         else:
             self.get_logger().info('🏁 모든 미션 완료!')
 
+    def record_mission_makespan(self):
+        """미션별 예측/실제 소요 시간을 누적하고, 대기열이 비면 배치 결과를 보고"""
+        if self.mission_started is not None:
+            actual = self.now_sec() - self.mission_started
+            self.telemetry.observe_mission(actual, self.now_sec(), self.mission_label())
+            predicted = self.current_mission.get('predicted_s')
+            if predicted is not None:
+                self.batch_predicted += predicted
+                self.batch_actual += actual
+                self.batch_missions += 1
+                self.get_logger().info(f'⏱️ 미션 소요: 예측 {predicted:.0f}초 / 실제 {actual:.0f}초')
+            self.mission_started = None
+        try:
+            self.cost_model.save()
+        except OSError as e:
+            self.get_logger().error(f'❌ 비용 모델 저장 실패: {e}')
+        try:
+            self.handshakes.save()
+        except OSError as e:
+            self.get_logger().error(f'❌ 완료 신호 기록 저장 실패: {e}')
+
+        if not self.mission_queue and self.batch_missions > 0:
+            error = self.batch_actual - self.batch_predicted
+            self.get_logger().info(f'📈 배치 완료 ({self.batch_missions}개 미션): 예측 {self.batch_predicted:.0f}초, 실제 {self.batch_actual:.0f}초 (오차 {error:+.0f}초)')
+            event_msg = String()
+            event_msg.data = json.dumps({
+                'event': 'batch_complete',
+                'missions': self.batch_missions,
+                'predicted_makespan_s': round(self.batch_predicted, 1),
+                'actual_makespan_s': round(self.batch_actual, 1),
+            })
+            self.events_pub.publish(event_msg)
+            self.batch_predicted = 0.0
+            self.batch_actual = 0.0
+            self.batch_missions = 0
+            # 배치가 끝날 때마다 바로 발행해서 최신 분포를 남김
+            self.publish_telemetry()
+
     def status_monitor(self):
         """상태 모니터링"""
+        self.publish_queue_state()
         if self.current_state != MissionState.IDLE:
             current_mission_name = self.current_mission['name'] if self.current_mission else 'None'
             processed_quantity = f"{self.current_quantity_processed}/{self.current_mission['quantity']}" if self.current_mission else '0/0'
@@ -616,6 +1325,7 @@ def main(args=None):
     except KeyboardInterrupt:
         node.get_logger().info('🛑 노드가 종료됩니다.')
     finally:
+        node.publish_telemetry()
         node.destroy_node()
         rclpy.shutdown()
 
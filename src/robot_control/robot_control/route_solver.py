@@ -0,0 +1,125 @@
+"""방문 순서 최적화 (열린 경로 TSP)
+
+노드 0..n-1 을 모두 한 번씩 방문하는 순서를 찾는다.
+start_cost[j]: 현재 상태에서 j를 처음 방문하는 비용
+cost[i][j]:    i 다음에 j를 방문하는 비용 (비대칭 가능)
+
+visit_cost(j, visited_mask): 이미 방문한 집합에 따라 달라지는 j 방문 비용 (선택)
+
+작은 문제는 Held-Karp DP로 정확히 풀고, 큰 문제는 최근접 이웃 + 2-opt/재배치로 근사한다.
+"""
+
+EXACT_LIMIT = 10
+
+
+def path_cost(order, start_cost, cost, visit_cost=None):
+    if not order:
+        return 0.0
+    total = start_cost[order[0]]
+    for a, b in zip(order, order[1:]):
+        total += cost[a][b]
+    if visit_cost is not None:
+        mask = 0
+        for j in order:
+            total += visit_cost(j, mask)
+            mask |= 1 << j
+    return total
+
+
+def solve_exact(start_cost, cost, visit_cost=None):
+    """Held-Karp 동적 계획법, O(n^2 2^n)"""
+    n = len(start_cost)
+    if n == 0:
+        return [], 0.0
+    full = (1 << n) - 1
+    inf = float('inf')
+    dp = [[inf] * n for _ in range(1 << n)]
+    parent = [[-1] * n for _ in range(1 << n)]
+    for j in range(n):
+        dp[1 << j][j] = start_cost[j] + (visit_cost(j, 0) if visit_cost is not None else 0.0)
+
+    for mask in range(1, full + 1):
+        row = dp[mask]
+        for last in range(n):
+            base = row[last]
+            if base == inf:
+                continue
+            cost_last = cost[last]
+            for nxt in range(n):
+                bit = 1 << nxt
+                if mask & bit:
+                    continue
+                value = base + cost_last[nxt]
+                if visit_cost is not None:
+                    value += visit_cost(nxt, mask)
+                if value < dp[mask | bit][nxt]:
+                    dp[mask | bit][nxt] = value
+                    parent[mask | bit][nxt] = last
+
+    last = min(range(n), key=lambda j: dp[full][j])
+    best = dp[full][last]
+    order = []
+    mask = full
+    while last != -1:
+        order.append(last)
+        previous = parent[mask][last]
+        mask ^= 1 << last
+        last = previous
+    order.reverse()
+    return order, best
+
+
+def solve_heuristic(start_cost, cost, max_passes=20, visit_cost=None):
+    """최근접 이웃으로 초기해를 만들고 2-opt 뒤집기와 재배치로 개선"""
+    n = len(start_cost)
+    if n == 0:
+        return [], 0.0
+
+    def extra(j, mask):
+        return visit_cost(j, mask) if visit_cost is not None else 0.0
+
+    remaining = set(range(n))
+    current = min(remaining, key=lambda j: start_cost[j] + extra(j, 0))
+    order = [current]
+    mask = 1 << current
+    remaining.remove(current)
+    while remaining:
+        current = min(remaining, key=lambda j, c=current, m=mask: cost[c][j] + extra(j, m))
+        order.append(current)
+        mask |= 1 << current
+        remaining.remove(current)
+
+    best = path_cost(order, start_cost, cost, visit_cost)
+    for _ in range(max_passes):
+        improved = False
+        # 2-opt: 구간 뒤집기 (비대칭 비용이므로 전체 비용을 다시 계산)
+        for i in range(n - 1):
+            for k in range(i + 1, n):
+                candidate = order[:i] + order[i:k + 1][::-1] + order[k + 1:]
+                value = path_cost(candidate, start_cost, cost, visit_cost)
+                if value + 1e-9 < best:
+                    order, best, improved = candidate, value, True
+        # 재배치: 노드 하나를 다른 위치로 옮기기
+        for i in range(n):
+            node = order[i]
+            rest = order[:i] + order[i + 1:]
+            for k in range(n):
+                if k == i:
+                    continue
+                candidate = rest[:k] + [node] + rest[k:]
+                value = path_cost(candidate, start_cost, cost, visit_cost)
+                if value + 1e-9 < best:
+                    order, best, improved = candidate, value, True
+                    break
+        if not improved:
+            break
+    return order, best
+
+
+def solve_order(start_cost, cost, exact_limit=EXACT_LIMIT, visit_cost=None):
+    """노드 수에 따라 정확해/근사해 선택, (순서, 비용, 정확해 여부) 반환"""
+    if len(start_cost) <= exact_limit:
+        order, value = solve_exact(start_cost, cost, visit_cost)
+        return order, value, True
+    order, value = solve_heuristic(start_cost, cost, visit_cost=visit_cost)
+    return order, value, False
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+미션 텔레메트리 로그 분석
+
+RobotControl 이 telemetry_log_path 에 남긴 단계별 소요 시간으로
+근무 시간(shift) 동안 어느 단계가 가장 많은 시간을 차지했는지 보여준다.
+
+사용 예: ros2 run robot_control telemetry_report ~/.ros/robot_control_telemetry.jsonl
+"""
+import argparse
+import os
+
+from robot_control.mission_telemetry import HISTOGRAM_EDGES, IDLE_STAGES, load_log
+
+
+def main():
+    parser = argparse.ArgumentParser(description='미션 단계별 소요 시간 분석')
+    parser.add_argument('logs', nargs='+', help='텔레메트리 JSONL 로그')
+    parser.add_argument('--histogram', action='store_true', help='단계별 히스토그램 출력')
+    args = parser.parse_args()
+
+    stages = {}
+    for path in args.logs:
+        for stage, stats in load_log(os.path.expanduser(path)).items():
+            merged = stages.setdefault(stage, stats)
+            if merged is not stats:
+                for value in stats.samples:
+                    merged.add(value)
+
+    missions = stages.pop('mission', None)
+    busy = {stage: stats for stage, stats in stages.items() if stage not in IDLE_STAGES}
+    busy_total = sum(stats.total for stats in busy.values())
+
+    print(f"{'stage':<12} {'count':>6} {'total(s)':>10} {'share':>6} {'mean':>7} {'p50':>7} {'p90':>7} {'p99':>7} {'max':>7}")
+    print('-' * 80)
+    for stage, stats in sorted(stages.items(), key=lambda item: -item[1].total):
+        s = stats.summary()
+        share = stats.total / busy_total if stage in busy and busy_total > 0 else 0.0
+        print(f"{stage:<12} {s['count']:6d} {s['total_s']:10.1f} {share:6.1%} {s['mean_s']:7.2f} "
+              f"{s['p50_s']:7.2f} {s['p90_s']:7.2f} {s['p99_s']:7.2f} {s['max_s']:7.2f}")
+        if args.histogram:
+            labels = [f'≤{edge:g}' for edge in HISTOGRAM_EDGES] + [f'>{HISTOGRAM_EDGES[-1]:g}']
+            print('             ' + ' '.join(f'{label}:{count}' for label, count in zip(labels, s['histogram']) if count))
+
+    if missions is not None:
+        s = missions.summary()
+        print(f"\n미션 {s['count']}개: 평균 {s['mean_s']:.1f}초, p50 {s['p50_s']:.1f}초, p90 {s['p90_s']:.1f}초, 최대 {s['max_s']:.1f}초")
+    if busy:
+        bottleneck = max(busy, key=lambda stage: busy[stage].total)
+        print(f"병목 단계: {bottleneck} (작업 시간의 {busy[bottleneck].total / busy_total:.1%})")
+
+
+if __name__ == '__main__':
+    main()
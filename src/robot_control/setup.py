@@ -23,7 +23,9 @@ setup(
     tests_require=['pytest'],
     entry_points={
         'console_scripts': [
-            'robot_control_node = robot_control.robot_control_node:main'
+            'robot_control_node = robot_control.robot_control_node:main',
+            'pick_planner_benchmark = robot_control.pick_planner_benchmark:main',
+            'telemetry_report = robot_control.telemetry_report:main',
         ],
     },
 )
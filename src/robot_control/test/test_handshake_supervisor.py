@@ -0,0 +1,52 @@
+from robot_control.handshake_supervisor import HandshakeSupervisor
+
+
+def supervisor(**options):
+    timeouts = {'WAITING_YOLO_COMPLETE': (5.0, 1), 'WAITING_ROBOT_COMPLETE': (10.0, 0)}
+    return HandshakeSupervisor(timeouts, **options)
+
+
+def test_reissue_then_lost():
+    handshakes = supervisor()
+    handshake = handshakes.issue('WAITING_YOLO_COMPLETE', None, now=0.0)
+    assert handshakes.check(handshake, 4.0) == 'wait'
+    assert handshakes.check(handshake, 5.0) == 'reissue'
+    assert handshakes.check(handshake, 9.0) == 'wait'
+    assert handshakes.check(handshake, 10.0) == 'lost'
+
+
+def test_non_escalating_loss_does_not_count_toward_safe_stop():
+    handshakes = supervisor()
+    for i in range(5):
+        handshake = handshakes.issue('WAITING_YOLO_COMPLETE', None, now=float(i))
+        handshakes.lost(handshake, float(i) + 10.0, escalate=False)
+    assert handshakes.consecutive_lost == 0
+    assert handshakes.snapshot()['counters']['WAITING_YOLO_COMPLETE']['lost'] == 5
+
+    handshake = handshakes.issue('WAITING_ROBOT_COMPLETE', None, now=20.0)
+    handshakes.lost(handshake, 30.0)
+    assert handshakes.consecutive_lost == 1
+
+
+def test_completion_resets_streak_and_learns_timeout():
+    handshakes = supervisor(min_samples=3, slack=0.0, margin=1.0, min_timeout=0.5)
+    lost = handshakes.issue('WAITING_ROBOT_COMPLETE', None, now=0.0)
+    handshakes.lost(lost, 10.0)
+    for i in range(3):
+        handshake = handshakes.issue('WAITING_ROBOT_COMPLETE', 3, now=100.0 * i)
+        handshakes.complete(handshake, 100.0 * i + 2.0)
+    assert handshakes.consecutive_lost == 0
+    assert handshakes.timeout_for('WAITING_ROBOT_COMPLETE', 3) == 2.0
+    assert handshakes.timeout_for('WAITING_ROBOT_COMPLETE', 1) == 2.0
+
+
+def test_history_persists(tmp_path):
+    path = str(tmp_path / 'handshakes.json')
+    handshakes = supervisor(path=path)
+    handshake = handshakes.issue('WAITING_ROBOT_COMPLETE', None, now=0.0)
+    handshakes.complete(handshake, 4.0)
+    handshakes.save()
+
+    reloaded = supervisor(path=path)
+    reloaded.load()
+    assert reloaded.typical('WAITING_ROBOT_COMPLETE') == 4.0
@@ -0,0 +1,57 @@
+import itertools
+import random
+
+from robot_control.mission_planner import BatchPlanner, CostModel
+from robot_control.route_solver import path_cost, solve_exact
+
+
+def mission(order_id, name='apple', position=3, floor=1, quantity=1, enqueued_at=0.0):
+    return {'order_id': order_id, 'name': name, 'position': position, 'floor': floor,
+            'quantity': quantity, 'enqueued_at': enqueued_at}
+
+
+def test_merge_keeps_all_order_ids_of_merged_missions():
+    planner = BatchPlanner(CostModel())
+    first = planner.merge([mission('A'), mission('B')])
+    second = planner.merge([mission('C'), mission('D')])
+    assert first[0]['order_ids'] == ['A', 'B']
+
+    merged = planner.merge(first + second)
+    assert len(merged) == 1
+    assert merged[0]['order_ids'] == ['A', 'B', 'C', 'D']
+    assert merged[0]['quantity'] == 4
+
+
+def test_merge_deduplicates_order_ids():
+    planner = BatchPlanner(CostModel())
+    merged = planner.merge([mission('A', quantity=1), mission('A', quantity=2)])
+    assert merged[0]['order_ids'] == ['A']
+    assert merged[0]['quantity'] == 3
+
+
+def test_plan_with_merged_missions_keeps_order_ids():
+    planner = BatchPlanner(CostModel())
+    first = planner.merge([mission('A'), mission('B')])
+    second = planner.merge([mission('C'), mission('D')])
+    planned, _, exact = planner.plan(first + second + [mission('E', position=5)], start_position=0)
+    order_ids = [order_id for m in planned for order_id in m.get('order_ids', [m['order_id']])]
+    assert sorted(order_ids) == ['A', 'B', 'C', 'D', 'E']
+    assert exact
+
+
+def test_merge_does_not_cross_barrier():
+    planner = BatchPlanner(CostModel())
+    merged = planner.merge([mission('A'), mission('L', position=7), mission('B')])
+    assert [m['order_id'] for m in merged] == ['A', 'L', 'B']
+
+
+def test_held_karp_matches_brute_force():
+    rng = random.Random(0)
+    for n in range(1, 7):
+        start_cost = [rng.uniform(0, 10) for _ in range(n)]
+        cost = [[rng.uniform(0, 10) for _ in range(n)] for _ in range(n)]
+        order, value = solve_exact(start_cost, cost)
+        best = min(path_cost(list(p), start_cost, cost) for p in itertools.permutations(range(n)))
+        assert sorted(order) == list(range(n))
+        assert abs(value - best) < 1e-9
+        assert abs(path_cost(order, start_cost, cost) - value) < 1e-9
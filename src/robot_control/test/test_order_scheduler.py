@@ -0,0 +1,61 @@
+from robot_control.order_scheduler import OrderScheduler
+
+
+def items(*names):
+    return [{'name': name, 'quantity': 1, 'position': 3, 'floor': 1} for name in names]
+
+
+def test_duplicate_order_id_is_rejected():
+    scheduler = OrderScheduler(None)
+    assert scheduler.submit('A', items('apple'), now=0.0)
+    assert not scheduler.submit('A', items('apple'), now=100.0)
+    assert len(scheduler) == 1
+    assert scheduler.metrics(now=1.0)['duplicates'] == 1
+
+
+def test_anonymous_duplicates_only_within_window():
+    scheduler = OrderScheduler(None, anonymous_dedupe_window=10.0)
+    order_id, anonymous = scheduler.make_order_id({'order': [{'name': 'apple'}]})
+    assert anonymous and order_id.startswith('anon-')
+    assert scheduler.submit(order_id, items('apple'), anonymous, now=0.0)
+    assert not scheduler.submit(order_id, items('apple'), anonymous, now=5.0)
+    assert scheduler.submit(order_id, items('apple'), anonymous, now=20.0)
+
+
+def test_explicit_order_id_wins():
+    scheduler = OrderScheduler(None)
+    assert scheduler.make_order_id({'order_id': 42, 'order': []}) == ('42', False)
+
+
+def test_complete_reports_orders_once_all_items_finish():
+    scheduler = OrderScheduler(None)
+    scheduler.submit('A', items('apple', 'pear'), now=0.0)
+    first = scheduler.pop(now=1.0)
+    assert scheduler.complete(first) == []
+    second = scheduler.pop(now=2.0)
+    assert scheduler.complete(second) == ['A']
+
+
+def test_complete_merged_mission_reports_every_order():
+    scheduler = OrderScheduler(None)
+    scheduler.submit('A', items('apple'), now=0.0)
+    scheduler.submit('B', items('apple'), now=0.0)
+    merged = dict(scheduler.pending[0], quantity=2, order_ids=['A', 'B'])
+    scheduler.replace_pending([merged])
+    assert scheduler.complete(scheduler.pop(now=1.0)) == ['A', 'B']
+
+
+def test_persist_and_reload_requeues_interrupted(tmp_path):
+    path = str(tmp_path / 'queue.json')
+    scheduler = OrderScheduler(path)
+    scheduler.submit('A', items('apple'), now=0.0)
+    scheduler.submit('B', items('pear'), now=1.0)
+    interrupted = scheduler.pop(now=2.0)
+
+    reloaded = OrderScheduler(path)
+    assert reloaded.load() == 2
+    assert reloaded.peek()['order_id'] == interrupted['order_id']
+    assert 'started_at' not in reloaded.peek()
+    assert [m['order_id'] for m in reloaded.snapshot()] == ['A', 'B']
+    # 재시작 뒤에도 이미 받은 주문은 중복
+    assert not reloaded.submit('A', items('apple'), now=3.0)
@@ -0,0 +1,41 @@
+import itertools
+
+from robot_control.pick_planner import PickPlanner, rotation_delta
+
+
+def obj(x, y, angle=0.0):
+    return {'robot_x': x, 'robot_y': y, 'robot_angle': angle}
+
+
+def test_rotation_delta_is_symmetric():
+    assert rotation_delta(10.0, 170.0) == 20.0
+    assert rotation_delta(0.0, 90.0) == 90.0
+    assert rotation_delta(-45.0, 135.0) == 0.0
+
+
+def test_reach_penalty():
+    planner = PickPlanner(reach_min=3.0, reach_max=35.0)
+    assert planner.is_reachable(obj(10.0, 0.0))
+    assert planner.reach_penalty(obj(1.0, 0.0)) == 2.0
+    assert planner.reach_penalty(obj(0.0, 40.0)) == 5.0
+
+
+def test_plan_matches_brute_force():
+    planner = PickPlanner(clearance=4.0)
+    objects = [obj(10.0, 0.0, 30.0), obj(12.0, 1.0, 80.0), obj(20.0, 5.0, 10.0),
+               obj(11.0, -2.0, 0.0), obj(25.0, -3.0, 45.0)]
+    origins = [(0.0, 0.0, 0.0), (15.0, 15.0, 0.0)]
+    planned, value, exact = planner.plan(objects, len(objects), origins)
+    best = min(planner.evaluate(list(order), objects, origins)['cost']
+               for order in itertools.permutations(range(len(objects))))
+    assert exact
+    assert abs(value - best) < 1e-6
+    order = [objects.index(o) for o in planned]
+    assert abs(planner.evaluate(order, objects, origins)['cost'] - value) < 1e-6
+
+
+def test_unchosen_objects_go_last():
+    planner = PickPlanner()
+    objects = [obj(50.0, 0.0), obj(10.0, 0.0), obj(12.0, 8.0)]
+    planned, _, _ = planner.plan(objects, 2, [(0.0, 0.0, 0.0)])
+    assert planned[-1] is objects[0]
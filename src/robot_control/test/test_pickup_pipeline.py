@@ -0,0 +1,97 @@
+import pytest
+
+from robot_control.pickup_pipeline import (
+    DONE, RUNNING, build_pickup_graph, cycle_times, serial_baseline, task_name)
+
+DWELLS = {
+    'gripper_open': 0.5,
+    'pickup_settle': 1.5,
+    'lift_up_settle': 3.3,
+    'gripper_close': 1.5,
+    'lift_down_settle': 4.0,
+    'delivery_settle': 1.5,
+    'release': 1.5,
+    'home': 1.5,
+}
+COMMANDS = {'pick': 4.0, 'lift_up': 3.0, 'lift_down': 3.0, 'deliver': 4.0, 'redetect': 1.0}
+
+
+def command_durations(graph):
+    return {task.name: COMMANDS[task.kind] for task in graph if task.is_command}
+
+
+def run_order(graph):
+    """실행 순서를 start_ready/complete 로 흉내 (명령 작업은 COMMANDS 초 뒤 완료)"""
+    durations = command_durations(graph)
+    finish = graph.simulate(durations)
+    return sorted(finish, key=lambda name: (finish[name], list(graph.tasks).index(name)))
+
+
+def test_serial_graph_is_a_single_chain():
+    graph = build_pickup_graph(2, 'serial', DWELLS)
+    names = list(graph.tasks)
+    for previous, task in zip(names, names[1:]):
+        assert graph[task].after == (previous,)
+    assert run_order(graph) == names
+    assert not any(task.kind == 'redetect' for task in graph)
+
+
+def test_overlap_skips_home_and_redetects_during_delivery():
+    graph = build_pickup_graph(3, 'overlap', DWELLS)
+    kinds = [task.kind for task in graph]
+    assert kinds.count('home') == 1  # 마지막 물체만 홈으로
+    assert kinds.count('gripper_open') == 1
+    assert kinds.count('redetect') == 2
+    assert graph[task_name('redetect', 0)].optional
+    assert set(graph[task_name('pick', 1)].after) == {
+        task_name('release', 0), task_name('redetect', 0)}
+
+    finish = graph.simulate(command_durations(graph))
+    # 재인식은 배송 (팔) 과 겹쳐서 배송보다 먼저 끝남
+    assert finish[task_name('redetect', 0)] < finish[task_name('deliver', 0)]
+
+
+def test_overlap_is_faster_than_serial():
+    serial = build_pickup_graph(3, 'serial', DWELLS)
+    overlap = build_pickup_graph(3, 'overlap', DWELLS)
+    serial_end = max(serial.simulate(command_durations(serial)).values())
+    overlap_end = max(overlap.simulate(command_durations(overlap)).values())
+    assert overlap_end < serial_end
+
+
+def test_resources_are_never_shared():
+    graph = build_pickup_graph(2, 'overlap', DWELLS)
+    now = 0.0
+    while not graph.finished():
+        graph.start_ready(now)
+        running = [task for task in graph if task.status == RUNNING]
+        resources = [task.resource for task in running]
+        assert len(resources) == len(set(resources))
+        task = running[0]
+        graph.complete(task.name, now + (task.duration or 1.0))
+        now += task.duration or 1.0
+
+
+def test_serial_baseline_from_executed_graph():
+    graph = build_pickup_graph(2, 'overlap', DWELLS)
+    now = 0.0
+    while not graph.finished():
+        for task in graph.start_ready(now):
+            pass
+        task = next(task for task in graph if task.status == RUNNING)
+        now += task.duration or COMMANDS[task.kind]
+        graph.complete(task.name, now)
+    assert all(task.status == DONE for task in graph)
+    baseline = serial_baseline(graph, 2, DWELLS)
+    assert len(baseline) == 2
+    assert all(cycle > 0 for cycle in baseline)
+
+
+def test_cycle_times():
+    assert cycle_times({0: 10.0, 1: 25.0}, 2, start=2.0) == [8.0, 15.0]
+    assert cycle_times({0: 10.0}, 3) == [10.0]
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        build_pickup_graph(1, 'parallel', DWELLS)
@@ -1,6 +1,7 @@
 from launch import LaunchDescription
 from launch_ros.actions import Node
 from launch.actions import TimerAction, DeclareLaunchArgument
+from launch.conditions import IfCondition
 from launch.substitutions import LaunchConfiguration
 
 def generate_launch_description():
@@ -14,8 +15,12 @@ def generate_launch_description():
     # 카메라 이름 설정 (LaunchArgument에서 가져오기)
     camera_name = LaunchConfiguration('camera_name')
 
+    # 검출 노드는 창을 띄우지 않음, 화면이 필요하면 viewer:=true
+    viewer_arg = DeclareLaunchArgument('viewer', default_value='false')
+
     return LaunchDescription([
         camera_name_arg, # 인자 선언 추가
+        viewer_arg,
 
         Node(
             package='realsense2_camera',
@@ -49,6 +54,19 @@ def generate_launch_description():
                     output='screen',
                     # 만약 detector 노드에서 카메라 이름이 필요하다면 여기에 파라미터로 전달할 수 있습니다.
                     # parameters=[{'camera_base_frame': 'd415_camera_link'}] # 예시
+                ),
+                Node(
+                    package='detection_viewer',
+                    executable='detection_viewer',
+                    name='black_object_viewer',
+                    output='screen',
+                    condition=IfCondition(LaunchConfiguration('viewer')),
+                    parameters=[{
+                        'image_topic': '/yolo_result',
+                        'service_prefix': '/black_object_detector_node',
+                        'key_bindings': ['space:trigger', 's:save', 'r:reset'],
+                        'window_name': 'Black Object Detection',
+                    }]
                 )
             ]
         )
@@ -1,9 +1,21 @@
 from launch import LaunchDescription
 from launch_ros.actions import Node
-from launch.actions import TimerAction
+from launch.actions import DeclareLaunchArgument
+from launch.conditions import IfCondition
+from launch.substitutions import LaunchConfiguration
 
 def generate_launch_description():
     return LaunchDescription([
+        # 추론 백엔드 (torch / onnxruntime / openvino), 모델은 export_obb_model 로 미리 내보냄
+        DeclareLaunchArgument('backend', default_value='torch'),
+        DeclareLaunchArgument('imgsz', default_value='640'),
+        DeclareLaunchArgument('precision', default_value='fp32'),
+        DeclareLaunchArgument('inference_threads', default_value='0'),
+        DeclareLaunchArgument('warmup_iterations', default_value='3'),
+        DeclareLaunchArgument('roi_enabled', default_value='true'),
+        # 검출 노드는 창을 띄우지 않음, 화면이 필요하면 viewer:=true (원격이면 viewer_compressed:=true)
+        DeclareLaunchArgument('viewer', default_value='false'),
+        DeclareLaunchArgument('viewer_compressed', default_value='false'),
         Node(
             package='realsense2_camera',
             executable='realsense2_camera_node',
@@ -23,15 +35,34 @@ def generate_launch_description():
                 'depth_fps': 30,
             }]
         ),
-        TimerAction(
-            period=5.0,  # 5초 대기
-            actions=[
-                Node(
-                    package='yolo_obb_detection',
-                    executable='yolo_obb_node',
-                    name='yolo_obb_node',
-                    output='screen',
-                )
-            ]
+        # 카메라를 기다리지 않고 바로 띄워 모델 로드/워밍업을 카메라 기동과 겹침 (준비 상태는 /yolo/ready)
+        Node(
+            package='yolo_obb_detection',
+            executable='yolo_obb_node',
+            name='yolo_obb_node',
+            output='screen',
+            parameters=[{
+                'backend': LaunchConfiguration('backend'),
+                'imgsz': LaunchConfiguration('imgsz'),
+                'precision': LaunchConfiguration('precision'),
+                'inference_threads': LaunchConfiguration('inference_threads'),
+                'warmup_iterations': LaunchConfiguration('warmup_iterations'),
+                'roi_enabled': LaunchConfiguration('roi_enabled'),
+            }]
+        ),
+        Node(
+            package='detection_viewer',
+            executable='detection_viewer',
+            name='yolo_viewer',
+            output='screen',
+            condition=IfCondition(LaunchConfiguration('viewer')),
+            parameters=[{
+                'image_topic': '/yolo_result',
+                'compressed': LaunchConfiguration('viewer_compressed'),
+                'status_topic': '/yolo_obb_node/status',
+                'service_prefix': '/yolo_obb_node',
+                'key_bindings': ['space:trigger', 's:save', 'r:reset'],
+                'window_name': 'YOLO Detection',
+            }]
         )
     ])
\ No newline at end of file
@@ -30,6 +30,15 @@ setup(
         'console_scripts': [
             'yolo_obb_node = yolo_obb_detection.yolo_obb_node:main',
             'black_object_detector_node = yolo_obb_detection.opencv_node:main',
+            'auto_annotate = yolo_obb_detection.auto_annotate:main',
+            'export_obb_model = yolo_obb_detection.export_obb_model:main',
+            'backend_benchmark = yolo_obb_detection.backend_benchmark:main',
+            'quantize_obb_model = yolo_obb_detection.quantize_obb_model:main',
+            'roi_eval = yolo_obb_detection.roi_eval:main',
+            'black_object_benchmark = yolo_obb_detection.black_object_benchmark:main',
+            'detection_json_bridge = yolo_obb_detection.detection_json_bridge:main',
+            'detection_msg_benchmark = yolo_obb_detection.detection_msg_benchmark:main',
+            'display_latency_benchmark = yolo_obb_detection.display_latency_benchmark:main',
         ],
     },
 )
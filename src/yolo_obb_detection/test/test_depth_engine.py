@@ -0,0 +1,67 @@
+import cv2
+import numpy as np
+
+from yolo_obb_detection.depth_engine import DepthTracks, ObbDepthEngine, object_depth_stats
+
+
+def box(cx, cy, w, h):
+    corners = [[cx - w, cy - h], [cx + w, cy - h], [cx + w, cy + h], [cx - w, cy + h]]
+    return np.array(corners, dtype=np.float32)
+
+
+def mask_median(depth, polygon):
+    """물체 하나씩 마스크를 그려서 구한 중앙값 (기준값)"""
+    mask = np.zeros(depth.shape, dtype=np.uint8)
+    cv2.fillPoly(mask, [np.round(polygon).astype(np.int32)], 1)
+    values = depth[(mask > 0) & (depth > 0)]
+    return float(np.median(values)) if values.size else np.nan
+
+
+def test_median_matches_per_object_mask():
+    rng = np.random.default_rng(0)
+    depth = rng.integers(300, 1500, size=(240, 320)).astype(np.uint16)
+    depth[rng.random(depth.shape) < 0.2] = 0  # 뎁스 구멍
+    polygons = np.stack([box(60, 60, 30, 20), box(200, 80, 25, 40), box(150, 190, 40, 25)])
+
+    stats = object_depth_stats(depth, polygons, shrink=1.0)
+    for i, polygon in enumerate(polygons):
+        assert abs(stats['median'][i] - mask_median(depth, polygon)) < 1e-6
+        assert stats['p25'][i] <= stats['median'][i] <= stats['p75'][i]
+        assert 0.7 < stats['valid_ratio'][i] < 0.9
+
+
+def test_zero_and_far_depth_are_ignored():
+    depth = np.zeros((100, 100), dtype=np.uint16)
+    depth[20:40, 20:40] = 500
+    depth[20:30, 20:40] = 9000  # max_depth 보다 먼 값
+    stats = object_depth_stats(depth, np.stack([box(30, 30, 10, 10), box(75, 75, 10, 10)]),
+                               shrink=1.0, max_depth=4000)
+    assert stats['median'][0] == 500
+    assert np.isnan(stats['median'][1])
+    assert stats['valid'][1] == 0
+
+
+def test_no_polygons():
+    stats = object_depth_stats(np.ones((10, 10), dtype=np.uint16), np.zeros((0, 4, 2)))
+    assert stats['median'].shape == (0,)
+
+
+def test_tracks_keep_objects_apart():
+    tracks = DepthTracks(window=3, min_samples=2, max_distance=20.0, max_age=1.0)
+    ids, _ = tracks.update([(10, 10), (100, 100)], np.array([500.0, 900.0]), stamp=0.0)
+    ids2, smoothed = tracks.update([(102, 101), (11, 9)], np.array([910.0, 510.0]), stamp=0.1)
+    assert ids2 == [ids[1], ids[0]]
+    assert smoothed == [905.0, 505.0]
+    # 오래 안 보인 트랙은 새 트랙으로
+    ids3, _ = tracks.update([(10, 10)], np.array([500.0]), stamp=5.0)
+    assert ids3[0] not in ids
+
+
+def test_engine_reset_starts_new_tracks():
+    depth = np.full((100, 100), 700, dtype=np.uint16)
+    engine = ObbDepthEngine(shrink=1.0, min_valid_ratio=0.0)
+    first = engine.update(box(50, 50, 10, 10)[None], depth, stamp=0.0)
+    engine.reset()
+    second = engine.update(box(50, 50, 10, 10)[None], depth, stamp=0.1)
+    assert first[0]['depth_mm'] == second[0]['depth_mm'] == 700.0
+    assert first[0]['track_id'] != second[0]['track_id']
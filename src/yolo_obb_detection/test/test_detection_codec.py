@@ -0,0 +1,53 @@
+import json
+import math
+
+from yolo_obb_detection.detection_codec import (
+    array_to_dict, array_to_json, dict_to_array, json_to_array, make_array, make_detection,
+    seconds_to_stamp)
+
+
+def test_missing_values_become_nan_and_minus_one():
+    detection = make_detection(0, pixel_x=10.0, depth_mm=None)
+    assert detection.track_id == -1 and detection.class_id == -1
+    assert math.isnan(detection.depth_mm)
+    assert math.isnan(detection.angle)
+
+
+def test_round_trip_keeps_none():
+    objects = [
+        {'id': 0, 'track_id': 3, 'class_id': 1, 'confidence': 0.5, 'pixel_x': 120.25,
+         'pixel_y': 64.5, 'angle': -30.0, 'depth_mm': 412.0, 'depth_valid_ratio': 0.75},
+        {'id': 1, 'track_id': None, 'pixel_x': 5.0, 'pixel_y': 6.0, 'angle': 0.0,
+         'depth_mm': None},
+    ]
+    data = {'target': 'cup', 'source': 'yolo_obb_node', 'timestamp': 12.5, 'objects': objects}
+
+    result = array_to_dict(dict_to_array(data))
+    assert result['target'] == 'cup'
+    assert result['source'] == 'yolo_obb_node'
+    assert result['timestamp'] == 12.5
+    for original, decoded in zip(objects, result['objects']):
+        for key, value in original.items():
+            assert decoded[key] == value
+    assert result['objects'][1]['depth_mm'] is None
+    assert result['objects'][1]['track_id'] is None
+    assert result['objects'][1]['class_id'] is None
+
+
+def test_json_round_trip():
+    detections = [make_detection(0, pixel_x=1.5, angle=45.0)]
+    msg = make_array('cup', 'opencv_node', detections, seconds_to_stamp(3.25))
+    text = array_to_json(msg)
+    assert json.loads(text)['objects'][0]['depth_mm'] is None
+    again = json_to_array(text)
+    assert again.header.stamp.sec == 3 and again.header.stamp.nanosec == 250_000_000
+    assert again.detections[0].pixel_x == 1.5
+    assert math.isnan(again.detections[0].depth_mm)
+
+
+def test_final_angle_fallback():
+    msg = dict_to_array({'objects': [{'pixel_x': 1.0, 'final_angle': 15.0}]})
+    assert msg.detections[0].angle == 15.0
+    assert msg.detections[0].id == 0
+    assert msg.target == ''
+    assert msg.source == 'legacy_json'
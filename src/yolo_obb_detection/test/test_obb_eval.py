@@ -0,0 +1,43 @@
+import numpy as np
+
+from yolo_obb_detection.obb_eval import ObbEvaluator, angle_difference, load_labels, polygon_iou
+
+
+def square(cx, cy, half):
+    return np.array([[cx - half, cy - half], [cx + half, cy - half],
+                     [cx + half, cy + half], [cx - half, cy + half]], dtype=np.float32)
+
+
+def test_polygon_iou():
+    a = square(0, 0, 1)
+    assert abs(polygon_iou(a, a) - 1.0) < 1e-9
+    assert abs(polygon_iou(a, a[::-1]) - 1.0) < 1e-9  # 꼭짓점 순서 무관
+    assert abs(polygon_iou(a, square(1, 0, 1)) - 1.0 / 3.0) < 1e-9
+    assert polygon_iou(a, square(5, 5, 1)) == 0.0
+
+
+def test_angle_difference():
+    assert angle_difference(179.0, 1.0) == 2.0
+    assert angle_difference(0.0, 90.0) == 90.0
+
+
+def test_load_labels(tmp_path):
+    path = tmp_path / 'a.txt'
+    path.write_text('1 0.1 0.1 0.2 0.1 0.2 0.2 0.1 0.2\nbroken line\n')
+    points, classes = load_labels(str(path), 100, 50)
+    assert classes.tolist() == [1]
+    assert np.allclose(points[0][0], (10.0, 5.0))
+    points, classes = load_labels(str(tmp_path / 'missing.txt'), 100, 50)
+    assert points.shape == (0, 4, 2) and classes.size == 0
+
+
+def test_average_precision():
+    evaluator = ObbEvaluator()
+    gt = np.stack([square(10, 10, 5), square(40, 40, 5)])
+    predictions = np.stack([square(10, 10, 5), square(80, 80, 5), square(41, 40, 5)])
+    evaluator.add(predictions, [0.9, 0.8, 0.3], [0, 0, 0], gt, np.array([0, 0]))
+    # 정밀도: 1/1, 1/2, 2/3 → 보간 AP = 0.5 * 1 + 0.5 * 2/3
+    assert abs(evaluator.average_precision(0) - (0.5 + 1.0 / 3.0)) < 1e-9
+    summary = evaluator.summary()
+    assert summary['objects'] == 2
+    assert summary['matched'] == 2
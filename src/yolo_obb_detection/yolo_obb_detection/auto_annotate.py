@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+수집한 프레임 자동 라벨링 (OBB 모델로 미리 라벨을 달아 사람은 검토만)
+
+images_dir 의 이미지를 배치 단위로 읽어 모델에 넣고, 결과를 out 디렉터리에 쓴다:
+    labels/<이름>.txt     YOLO-OBB 라벨 (class x1 y1 x2 y2 x3 y3 x4 y4, 0~1 정규화)
+    annotations.jsonl     이미지별 검출 결과 + YOLO/HSV 보정/최종 각도 + 검토 사유 (재시작 기준)
+    review.txt            사람이 확인해야 할 이미지 목록 (낮은 신뢰도, 검출 없음, 각도 불일치)
+    classes.txt           클래스 이름
+
+- 디코딩과 후처리(HSV 보정, 라벨 쓰기)는 스레드 풀에서, 추론은 메인 스레드에서
+  (다음 배치 디코딩이 현재 배치 추론과 겹친다)
+- 추론도 배치 단위 (predict_batch): torch 는 --batch 장을 한 번에 넣고, export_obb_model 로 내보낸
+  ONNX/OpenVINO 모델은 입력 배치가 1로 고정이라 한 장씩 돈다 (배치를 키워 내보내면 그 크기씩)
+- 추론은 yolo_obb_node 와 같은 백엔드/디코딩 (--backend 로 onnxruntime, openvino 선택)
+- annotations.jsonl 에 있는 이미지는 건너뛰므로, 중간에 끊겨도 다시 실행하면 이어서 한다
+
+사용 예:
+    ros2 run yolo_obb_detection auto_annotate ~/segmentation_project/data/image --model best.pt
+"""
+import argparse
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from yolo_obb_detection.inference_backends import BACKENDS, create_backend, exported_model_path
+from yolo_obb_detection.obb_geometry import correct_rotation_with_hsv, correction_confidence, final_angle, obb_angle
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.bmp')
+
+
+def list_images(images_dir):
+    return sorted(name for name in os.listdir(images_dir)
+                  if name.lower().endswith(IMAGE_EXTENSIONS) and not name.startswith('.'))
+
+
+def load_done(manifest_path):
+    """이미 처리한 이미지 이름 (마지막 줄이 쓰다 끊겼으면 무시)"""
+    done = set()
+    if not os.path.exists(manifest_path):
+        return done
+    with open(manifest_path, 'rb+') as f:
+        data = f.read()
+        if data and not data.endswith(b'\n'):
+            # 끊긴 마지막 줄 잘라내기 (이어 쓸 줄과 붙지 않도록)
+            f.truncate(data.rfind(b'\n') + 1)
+    with open(manifest_path, 'r') as f:
+        for line in f:
+            try:
+                done.add(json.loads(line)['image'])
+            except (ValueError, KeyError):
+                continue
+    return done
+
+
+def decode(images_dir, name):
+    return name, cv2.imread(os.path.join(images_dir, name), cv2.IMREAD_COLOR)
+
+
+def obb_detections(result):
+    """ObbResult → [(class, conf, 4x2 꼭짓점)]"""
+    return [(int(c), float(p), pts) for c, p, pts in zip(result.classes, result.confidences, result.points)]
+
+
+def annotate(name, image, detections, labels_dir, review_conf):
+    """라벨 파일 쓰기 + annotations.jsonl 한 줄 (dict) 반환"""
+    height, width = image.shape[:2]
+    lines = []
+    objects = []
+    reasons = set()
+    if not detections:
+        reasons.add('no_objects')
+    for cls, conf, points in detections:
+        normalised = points / np.array([width, height], dtype=np.float32)
+        lines.append(f'{cls} ' + ' '.join(f'{v:.6f}' for v in np.clip(normalised, 0.0, 1.0).flatten()))
+
+        int_points = points.astype(np.int32)
+        yolo_angle = obb_angle(int_points)
+        hsv_angle = correct_rotation_with_hsv(image, int_points)
+        confidence = correction_confidence(yolo_angle, hsv_angle)
+        if conf < review_conf:
+            reasons.add('low_confidence')
+        if hsv_angle is None or confidence <= 0.3:
+            reasons.add('angle_disagreement')
+        objects.append({
+            'class': cls,
+            'confidence': round(conf, 4),
+            'points': [[round(float(x), 1), round(float(y), 1)] for x, y in points],
+            'yolo_angle': round(yolo_angle, 1),
+            'hsv_angle': round(hsv_angle, 1) if hsv_angle is not None else None,
+            'final_angle': round(final_angle(yolo_angle, hsv_angle, confidence), 1),
+            'correction_confidence': round(confidence, 3),
+        })
+
+    label_path = os.path.join(labels_dir, os.path.splitext(name)[0] + '.txt')
+    tmp_path = label_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write('\n'.join(lines) + ('\n' if lines else ''))
+    os.replace(tmp_path, label_path)
+    return {'image': name, 'width': width, 'height': height, 'objects': objects, 'review': sorted(reasons)}
+
+
+def write_review_list(manifest_path, review_path):
+    flagged = []
+    with open(manifest_path, 'r') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get('review'):
+                flagged.append(f"{record['image']}\t{','.join(record['review'])}")
+    with open(review_path + '.tmp', 'w') as f:
+        f.write('\n'.join(flagged) + ('\n' if flagged else ''))
+    os.replace(review_path + '.tmp', review_path)
+    return len(flagged)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='OBB 모델로 수집 프레임 자동 라벨링')
+    parser.add_argument('images_dir', help='이미지 디렉터리 (realsense_data_collector save_path)')
+    parser.add_argument('--model', default='/home/xotn/ros2_ws/src/yolo_obb_detection/models/best.pt')
+    parser.add_argument('--out', default=None, help='결과 디렉터리 (기본: <images_dir>/auto_labels)')
+    parser.add_argument('--backend', choices=BACKENDS, default='torch')
+    parser.add_argument('--threads', type=int, default=0, help='추론 스레드 수 (0 은 런타임 기본값)')
+    parser.add_argument('--batch', type=int, default=16, help='디코딩/추론/기록 단위')
+    parser.add_argument('--workers', type=int, default=4, help='디코딩/후처리 스레드 수')
+    parser.add_argument('--imgsz', type=int, default=640)
+    parser.add_argument('--conf', type=float, default=0.25, help='라벨로 남길 최소 신뢰도')
+    parser.add_argument('--review-conf', type=float, default=0.6, help='이보다 낮은 검출이 있으면 검토 대상')
+    args, _ = parser.parse_known_args()
+
+    images_dir = os.path.expanduser(args.images_dir)
+    out_dir = os.path.expanduser(args.out or os.path.join(images_dir, 'auto_labels'))
+    labels_dir = os.path.join(out_dir, 'labels')
+    os.makedirs(labels_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, 'annotations.jsonl')
+
+    names = list_images(images_dir)
+    done = load_done(manifest_path)
+    pending = [name for name in names if name not in done]
+    print(f'📂 {images_dir}: 이미지 {len(names)}개, 처리 완료 {len(names) - len(pending)}개, 남은 {len(pending)}개')
+    if not pending:
+        print(f'🔎 검토 대상 {write_review_list(manifest_path, os.path.join(out_dir, "review.txt"))}개')
+        return
+
+    model_path = os.path.expanduser(args.model)
+    if args.backend != 'torch' and model_path.endswith('.pt'):
+        model_path = exported_model_path(model_path, args.backend, args.imgsz)
+    model = create_backend(args.backend, model_path, args.imgsz, args.threads)
+    with open(os.path.join(out_dir, 'classes.txt'), 'w') as f:
+        f.write(''.join(f'{model.names[i]}\n' for i in sorted(model.names)))
+    batches = [pending[i:i + args.batch] for i in range(0, len(pending), args.batch)]
+    processed = 0
+    flagged = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool, open(manifest_path, 'a') as manifest:
+        # 디코딩은 두 배치 앞서서
+        decoding = deque()
+        for batch in batches[:2]:
+            decoding.append([pool.submit(decode, images_dir, name) for name in batch])
+        next_batch = 2
+        writing = deque()
+
+        def drain(limit):
+            nonlocal processed, flagged
+            while len(writing) > limit:
+                record = writing.popleft().result()
+                manifest.write(json.dumps(record, ensure_ascii=False) + '\n')
+                manifest.flush()
+                processed += 1
+                flagged += bool(record['review'])
+
+        try:
+            while decoding:
+                decoded = [future.result() for future in decoding.popleft()]
+                if next_batch < len(batches):
+                    decoding.append([pool.submit(decode, images_dir, name) for name in batches[next_batch]])
+                    next_batch += 1
+
+                valid = [(name, image) for name, image in decoded if image is not None]
+                for name, image in decoded:
+                    if image is None:
+                        print(f'⚠️ 읽을 수 없는 이미지: {name}')
+                if not valid:
+                    continue
+                results = model.predict_batch([image for _, image in valid], conf=args.conf)
+                for (name, image), result in zip(valid, results):
+                    writing.append(pool.submit(annotate, name, image, obb_detections(result),
+                                               labels_dir, args.review_conf))
+                drain(args.batch)
+
+                elapsed = time.perf_counter() - start
+                rate = processed / elapsed if elapsed > 0 else 0.0
+                remaining = len(pending) - processed
+                print(f'🏷️ {processed}/{len(pending)} ({rate:.1f} img/s, {rate * 3600:,.0f} img/h, '
+                      f'남은 시간 {remaining / rate / 60 if rate > 0 else 0:.1f}분, 검토 대상 {flagged})')
+            drain(0)
+        except KeyboardInterrupt:
+            drain(0)
+            print(f'\n⏸️ 중단: {processed}개 저장됨 - 다시 실행하면 이어서 처리')
+
+    elapsed = time.perf_counter() - start
+    total_flagged = write_review_list(manifest_path, os.path.join(out_dir, 'review.txt'))
+    print(f'✅ {processed}개 라벨링 {elapsed:.1f}초 ({processed / elapsed if elapsed > 0 else 0:.1f} img/s), '
+          f'검토 대상 누적 {total_flagged}개 → {os.path.join(out_dir, "review.txt")}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+OBB 추론 백엔드 벤치마크 (백엔드 x 정밀도 x 입력 크기 x 스레드 수)
+
+프레임당 지연 (전처리 + 추론 + 디코딩/NMS) 의 평균/p50/p95 와 처리량을 보고한다.
+--images 를 주면 수집한 프레임을 돌려 쓰고, 없으면 640x480 합성 영상을 쓴다.
+ONNX / OpenVINO 모델은 export_obb_model, INT8 모델은 quantize_obb_model 로 먼저 만들어 둔다 (없는 조합은 건너뜀).
+
+사용 예:
+    ros2 run yolo_obb_detection backend_benchmark --model best.pt --imgsz 320 480 640 --threads 2 4
+"""
+import argparse
+import os
+import time
+
+import cv2
+import numpy as np
+
+from yolo_obb_detection.inference_backends import BACKENDS, PRECISIONS, create_backend, exported_model_path
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.bmp')
+
+
+def load_frames(images_dir, count):
+    if images_dir:
+        names = sorted(n for n in os.listdir(images_dir) if n.lower().endswith(IMAGE_EXTENSIONS))[:count]
+        frames = [cv2.imread(os.path.join(images_dir, n), cv2.IMREAD_COLOR) for n in names]
+        frames = [f for f in frames if f is not None]
+        if frames:
+            return frames
+    rng = np.random.default_rng(0)
+    frames = []
+    for _ in range(min(count, 8)):
+        frame = cv2.GaussianBlur(rng.integers(0, 255, (480, 640, 3), dtype=np.uint8), (15, 15), 0)
+        frames.append(frame)
+    return frames
+
+
+def measure(backend, frames, iterations, warmup, conf):
+    for i in range(warmup):
+        backend.predict(frames[i % len(frames)], conf=conf)
+    latencies = []
+    detections = 0
+    start = time.perf_counter()
+    for i in range(iterations):
+        began = time.perf_counter()
+        result = backend.predict(frames[i % len(frames)], conf=conf)
+        latencies.append(time.perf_counter() - began)
+        detections += len(result)
+    elapsed = time.perf_counter() - start
+    latencies = np.array(latencies) * 1000.0
+    return {
+        'mean_ms': float(latencies.mean()),
+        'p50_ms': float(np.percentile(latencies, 50)),
+        'p95_ms': float(np.percentile(latencies, 95)),
+        'fps': iterations / elapsed,
+        'detections': detections / iterations,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='OBB 추론 백엔드 벤치마크')
+    parser.add_argument('--model', default='/home/xotn/ros2_ws/src/yolo_obb_detection/models/best.pt')
+    parser.add_argument('--backends', nargs='+', choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument('--imgsz', nargs='+', type=int, default=[320, 480, 640])
+    parser.add_argument('--precision', nargs='+', choices=PRECISIONS, default=['fp32'])
+    parser.add_argument('--threads', nargs='+', type=int, default=[0], help='0 은 런타임 기본값')
+    parser.add_argument('--images', default=None, help='수집한 프레임 디렉터리')
+    parser.add_argument('--iterations', type=int, default=100)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--conf', type=float, default=0.7)
+    args, _ = parser.parse_known_args()
+
+    weights = os.path.expanduser(args.model)
+    frames = load_frames(os.path.expanduser(args.images) if args.images else None, args.iterations)
+    print(f'🖼️ 프레임 {len(frames)}장 ({frames[0].shape[1]}x{frames[0].shape[0]}), 반복 {args.iterations}회')
+    print(f'{"backend":<17} {"imgsz":>5} {"threads":>7} {"mean ms":>8} {"p50 ms":>8} {"p95 ms":>8} {"fps":>7} {"det/frame":>9}')
+
+    for kind in args.backends:
+        for precision in args.precision:
+            if precision == 'int8' and kind == 'torch':
+                continue
+            label = kind if precision == 'fp32' else f'{kind}/{precision}'
+            for imgsz in args.imgsz:
+                path = exported_model_path(weights, kind, imgsz, precision)
+                if not os.path.exists(path):
+                    print(f'{label:<17} {imgsz:>5}   - 모델 없음 ({path}) → export_obb_model / quantize_obb_model 로 생성')
+                    continue
+                for threads in args.threads:
+                    try:
+                        backend = create_backend(kind, path, imgsz, threads)
+                    except ImportError as e:
+                        print(f'{label:<17} {imgsz:>5}   - 런타임 없음 ({e})')
+                        break
+                    stats = measure(backend, frames, args.iterations, args.warmup, args.conf)
+                    print(f'{label:<17} {backend.imgsz:>5} {threads or "auto":>7} {stats["mean_ms"]:>8.1f} '
+                          f'{stats["p50_ms"]:>8.1f} {stats["p95_ms"]:>8.1f} {stats["fps"]:>7.1f} {stats["detections"]:>9.2f}')
+                    del backend
+
+
+if __name__ == '__main__':
+    main()
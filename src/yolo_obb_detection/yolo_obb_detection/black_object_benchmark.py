@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+검정 물체 고전 검출 벤치마크 (기존 opencv_node.process 방식 vs BlackObjectPipeline)
+
+ROI 안에 집을 물체 몇 개 + 작은 검정 잡음 덩어리 N 개를 그린 합성 프레임 (+ 뎁스) 으로
+마스크 → 컨투어 → 박스 필터 → 물체별 뎁스 까지의 프레임당 시간을 잰다.
+기존 방식은 HSV 변환/분리/병합 + 3채널 inRange, 모든 컨투어에 minAreaRect,
+물체마다 전체 프레임 크기 마스크 + bitwise_and 로 뎁스를 구한다.
+두 방식의 검출 중심이 같은지, 뎁스가 다른 물체 수도 센다
+(박스가 겹치면 새 방식은 겹친 픽셀을 작은 박스에만 주므로 값이 달라질 수 있다).
+
+사용 예:
+    ros2 run yolo_obb_detection black_object_benchmark --blobs 50 --frames 300
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from yolo_obb_detection.black_object_pipeline import BlackObjectPipeline
+from yolo_obb_detection.depth_engine import object_depth_stats
+from yolo_obb_detection.shelf_roi import DEFAULT_ROI
+
+
+def make_frames(count, blobs, objects, seed=0):
+    rng = np.random.default_rng(seed)
+    roi_x, roi_y, roi_w, roi_h = DEFAULT_ROI
+    frames = []
+    for _ in range(count):
+        image = np.clip(rng.normal(170, 20, (480, 640, 3)), 0, 255).astype(np.uint8)
+        depth = rng.integers(380, 420, (480, 640)).astype(np.uint16)
+        depth[rng.random((480, 640)) < 0.05] = 0
+        for k in range(objects):
+            center = (roi_x + 45 + 80 * (k % 3), roi_y + 55 + 100 * (k // 3))
+            rect = (center, (float(rng.uniform(35, 50)), float(rng.uniform(70, 90))), float(rng.uniform(0, 180)))
+            box = np.intp(cv2.boxPoints(rect))
+            cv2.drawContours(image, [box], -1, (10, 10, 10), -1)
+            cv2.drawContours(depth, [box], -1, int(rng.integers(280, 320)), -1)
+        for _ in range(blobs):
+            center = (int(rng.integers(roi_x, roi_x + roi_w)), int(rng.integers(roi_y, roi_y + roi_h)))
+            cv2.circle(image, center, int(rng.integers(4, 9)), (10, 10, 10), -1)
+        frames.append((image, depth))
+    return frames
+
+
+def legacy_process(image, depth_image):
+    """기존 opencv_node.process 의 계산 부분 (시각화/발행 제외)"""
+    roi_x, roi_y, roi_w, roi_h = DEFAULT_ROI
+    roi = image[roi_y:roi_y + roi_h, roi_x:roi_x + roi_w]
+    hsv = cv2.cvtColor(roi, cv2.COLOR_BGR2HSV)
+    h, s, v = cv2.split(hsv)
+    v_eq = cv2.equalizeHist(v)
+    hsv_eq = cv2.merge((h, s, v_eq))
+    mask = cv2.inRange(hsv_eq, np.array([0, 0, 0]), np.array([180, 255, 55]))
+    mask = cv2.erode(mask, np.ones((5, 5), np.uint8), iterations=1)
+    mask = cv2.medianBlur(mask, 5)
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    results = []
+    for cnt in contours:
+        area = cv2.contourArea(cnt)
+        rect = cv2.minAreaRect(cnt)
+        (cx, cy), (w_box, h_box), _ = rect
+        box_global = np.intp(cv2.boxPoints(rect)) + np.array([[roi_x, roi_y]])
+        center = (int(cx) + roi_x, int(cy) + roi_y)
+        if not (1500 <= area <= 10000 and 211 <= center[0] <= 577 and 6 <= center[1] <= 392
+                and 20 <= w_box <= 120 and 30 <= h_box <= 150):
+            continue
+        full_mask = np.zeros_like(depth_image, dtype=np.uint8)
+        cv2.drawContours(full_mask, [box_global], -1, 255, -1)
+        region = cv2.bitwise_and(depth_image, depth_image, mask=full_mask)
+        valid = region[region > 0]
+        results.append((center, float(np.median(valid)) if len(valid) else None))
+    return results
+
+
+def pipeline_process(pipeline, image, depth_image):
+    detections, _, _ = pipeline.process(image)
+    accepted = [d for d in detections if d['accepted']]
+    stats = object_depth_stats(depth_image, [d['box'] for d in accepted], shrink=1.0)
+    return [(d['center'], None if np.isnan(m) else float(m)) for d, m in zip(accepted, stats['median'])]
+
+
+def measure(function, frames, repeat):
+    times = []
+    for _ in range(repeat):
+        for image, depth in frames:
+            started = time.perf_counter()
+            function(image, depth)
+            times.append(time.perf_counter() - started)
+    times = np.array(times) * 1000.0
+    return float(times.mean()), float(np.percentile(times, 95))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='검정 물체 검출 벤치마크')
+    parser.add_argument('--blobs', nargs='+', type=int, default=[0, 50, 100, 200], help='잡음 덩어리 개수 (겹치면 컨투어 하나)')
+    parser.add_argument('--objects', type=int, default=4)
+    parser.add_argument('--frames', type=int, default=30, help='합성 프레임 수')
+    parser.add_argument('--repeat', type=int, default=5)
+    args, _ = parser.parse_known_args()
+
+    pipeline = BlackObjectPipeline()
+    print(f'{"blobs":>5} {"contours":>8} {"objects":>7} {"legacy ms":>10} {"p95":>7} {"fps":>7} '
+          f'{"pipeline ms":>12} {"p95":>7} {"fps":>7} {"same":>5} {"depth Δ":>7}')
+    for blobs in args.blobs:
+        frames = make_frames(args.frames, blobs, args.objects)
+        same, depth_changed = True, 0
+        for image, depth in frames:
+            legacy, new = legacy_process(image, depth), pipeline_process(pipeline, image, depth)
+            same &= [center for center, _ in legacy] == [center for center, _ in new]
+            depth_changed += sum(a[1] != b[1] for a, b in zip(legacy, new))
+        contours = np.mean([len(cv2.findContours(pipeline.mask_of(image), cv2.RETR_EXTERNAL,
+                                                 cv2.CHAIN_APPROX_SIMPLE)[0]) for image, _ in frames])
+        objects = np.mean([len(pipeline_process(pipeline, image, depth)) for image, depth in frames])
+        legacy_mean, legacy_p95 = measure(legacy_process, frames, args.repeat)
+        new_mean, new_p95 = measure(lambda image, depth: pipeline_process(pipeline, image, depth), frames, args.repeat)
+        print(f'{blobs:>5} {contours:>8.1f} {objects:>7.1f} {legacy_mean:>10.2f} {legacy_p95:>7.2f} '
+              f'{1000.0 / legacy_mean:>7.0f} {new_mean:>12.2f} {new_p95:>7.2f} {1000.0 / new_mean:>7.0f} '
+              f'{"yes" if same else "NO":>5} {depth_changed:>7}')
+
+
+if __name__ == '__main__':
+    main()
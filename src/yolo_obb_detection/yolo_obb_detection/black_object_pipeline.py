@@ -0,0 +1,102 @@
+"""
+검정 물체 고전 검출 파이프라인 (opencv_node 용)
+
+프레임마다 같은 크기 버퍼를 다시 쓰고 ROI 안에서만 계산한다:
+    V 채널 → 히스토그램 평활 → V <= 55 이진화 → 침식 → 중앙값 필터 → 외곽 컨투어
+- 검정 범위가 H, S 전 구간이라 V 채널만 꺼내 쓴다 (분리/병합, 3채널 inRange 생략)
+- 면적 필터를 먼저 적용해 작은 잡음 덩어리에는 minAreaRect 등 컨투어별 작업을 하지 않는다
+- 뎁스는 depth_engine 이 통과한 박스들의 외접 사각형 안에서만 한 번에 계산
+"""
+import cv2
+import numpy as np
+
+from yolo_obb_detection.shelf_roi import DEFAULT_ROI
+
+BLACK_V_MAX = 55
+MIN_AREA = 1500
+MAX_AREA = 10000
+# 중심 좌표 (전체 프레임) / 박스 크기 허용 범위
+CENTER_X_RANGE = (211, 577)
+CENTER_Y_RANGE = (6, 392)
+WIDTH_RANGE = (20, 120)
+HEIGHT_RANGE = (30, 150)
+
+
+class BlackObjectPipeline:
+    """process(image) → (검출 목록, 면적에서 걸러진 컨투어 목록 (ROI 좌표), 거부 사유별 개수)"""
+
+    def __init__(self, roi=DEFAULT_ROI, min_area=MIN_AREA, max_area=MAX_AREA):
+        self.roi = roi
+        self.min_area = min_area
+        self.max_area = max_area
+        self.kernel = np.ones((5, 5), np.uint8)
+        self.shape = None
+
+    def _buffers(self, shape):
+        if shape != self.shape:
+            self.shape = shape
+            self.hsv = np.empty(shape + (3,), np.uint8)
+            self.value = np.empty(shape, np.uint8)
+            self.equalized = np.empty(shape, np.uint8)
+            self.mask = np.empty(shape, np.uint8)
+            self.eroded = np.empty(shape, np.uint8)
+            self.blurred = np.empty(shape, np.uint8)
+
+    def mask_of(self, image):
+        """ROI 의 검정 마스크 (내부 버퍼, 다음 호출 때 덮어씀)"""
+        roi_x, roi_y, roi_w, roi_h = self.roi
+        roi = image[roi_y:roi_y + roi_h, roi_x:roi_x + roi_w]
+        self._buffers(roi.shape[:2])
+        cv2.cvtColor(roi, cv2.COLOR_BGR2HSV, dst=self.hsv)
+        cv2.extractChannel(self.hsv, 2, dst=self.value)
+        cv2.equalizeHist(self.value, dst=self.equalized)
+        cv2.threshold(self.equalized, BLACK_V_MAX, 255, cv2.THRESH_BINARY_INV, dst=self.mask)
+        cv2.erode(self.mask, self.kernel, dst=self.eroded, iterations=1)
+        cv2.medianBlur(self.eroded, 5, dst=self.blurred)
+        return self.blurred
+
+    def process(self, image):
+        roi_x, roi_y = self.roi[:2]
+        contours, _ = cv2.findContours(self.mask_of(image), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        detections = []
+        area_rejected = []
+        reasons = {}
+        for i, cnt in enumerate(contours):
+            area = cv2.contourArea(cnt)
+            if area < self.min_area or area > self.max_area:
+                area_rejected.append(cnt)
+                reason = '면적이 너무 작음' if area < self.min_area else '면적이 너무 큼'
+                reasons[reason] = reasons.get(reason, 0) + 1
+                continue
+
+            (cx, cy), (w_box, h_box), angle = rect = cv2.minAreaRect(cnt)
+            center_x, center_y = int(cx) + roi_x, int(cy) + roi_y
+            box = np.intp(cv2.boxPoints(rect)) + np.array([[roi_x, roi_y]])
+            reason = None
+            if not (CENTER_X_RANGE[0] <= center_x <= CENTER_X_RANGE[1]
+                    and CENTER_Y_RANGE[0] <= center_y <= CENTER_Y_RANGE[1]):
+                reason = '중심 좌표 범위 벗어남'
+            elif w_box < WIDTH_RANGE[0]:
+                reason = 'w 작음'
+            elif w_box > WIDTH_RANGE[1]:
+                reason = 'w 큼'
+            elif h_box < HEIGHT_RANGE[0]:
+                reason = 'h 작음'
+            elif h_box > HEIGHT_RANGE[1]:
+                reason = 'h 큼'
+            elif w_box > h_box:
+                angle += 90
+            if reason is not None:
+                reasons[reason] = reasons.get(reason, 0) + 1
+            detections.append({
+                'id': i,
+                'center': (center_x, center_y),
+                'box': box,
+                'angle': angle,
+                'width': w_box,
+                'height': h_box,
+                'area': area,
+                'accepted': reason is None,
+                'reason': reason,
+            })
+        return detections, area_rejected, reasons
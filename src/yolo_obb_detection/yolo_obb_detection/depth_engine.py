@@ -0,0 +1,183 @@
+"""
+OBB 별 뎁스 추정 (프레임당 한 번에)
+
+- 모든 OBB 다각형을 라벨 영상 하나에 그리고 (겹치면 작은 물체가 위),
+  유효 뎁스 픽셀을 라벨별로 정렬해서 중앙값/사분위를 한 번에 계산한다
+- 다각형은 중심 쪽으로 shrink 배 줄여서 그린다 (가장자리의 배경/선반 뎁스가 섞이지 않도록)
+- 시간 평활은 물체(트랙)마다 따로: 중심이 가까운 이전 트랙에 이어 붙이고, 오래 안 보인 트랙은 버린다
+"""
+import itertools
+from collections import deque
+
+import cv2
+import numpy as np
+
+
+def rasterize_obbs(polygons, shape, shrink=1.0):
+    """
+    꼭짓점 (N, 4, 2) → (라벨 영상, (x0, y0)) - 라벨 0 은 배경, i+1 은 i 번째 물체
+    라벨 영상은 전체 프레임이 아닌 다각형들의 외접 사각형 크기
+    """
+    height, width = shape[:2]
+    polygons = np.asarray(polygons, dtype=np.float32).reshape(-1, 4, 2)
+    if len(polygons) == 0:
+        return np.zeros((0, 0), dtype=np.int32), (0, 0)
+    centers = polygons.mean(axis=1, keepdims=True)
+    polygons = centers + (polygons - centers) * shrink
+    x0, y0 = np.floor(polygons.reshape(-1, 2).min(axis=0)).astype(int)
+    x1, y1 = np.ceil(polygons.reshape(-1, 2).max(axis=0)).astype(int) + 1
+    x0, y0 = max(0, x0), max(0, y0)
+    x1, y1 = min(width, x1), min(height, y1)
+    if x1 <= x0 or y1 <= y0:
+        return np.zeros((0, 0), dtype=np.int32), (0, 0)
+
+    labels = np.zeros((y1 - y0, x1 - x0), dtype=np.int32)
+    local = np.round(polygons - (x0, y0)).astype(np.int32)
+    areas = [cv2.contourArea(p) for p in local]
+    for i in sorted(range(len(local)), key=lambda k: -areas[k]):
+        cv2.fillPoly(labels, [local[i]], i + 1)
+    return labels, (x0, y0)
+
+
+def _grouped_quantiles(groups, values, count, quantiles):
+    """groups (0..count-1) 별 values 분위수 (선형 보간), 값이 없는 그룹은 nan"""
+    order = np.lexsort((values, groups))
+    ordered = values[order].astype(np.float64)
+    sizes = np.bincount(groups, minlength=count)
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    present = sizes > 0
+    results = []
+    for q in quantiles:
+        position = starts + q * np.maximum(sizes - 1, 0)
+        low = np.floor(position).astype(np.int64)
+        high = np.ceil(position).astype(np.int64)
+        fraction = position - low
+        value = np.full(count, np.nan)
+        if ordered.size:
+            low_c, high_c = np.minimum(low, ordered.size - 1), np.minimum(high, ordered.size - 1)
+            value[present] = (ordered[low_c] * (1 - fraction) + ordered[high_c] * fraction)[present]
+        results.append(value)
+    return results
+
+
+def object_depth_stats(depth_image, polygons, shrink=0.8, max_depth=0):
+    """
+    물체별 뎁스 통계 (depth_image 단위 그대로, 보통 mm)
+    반환: dict (각 (N,) 배열) - median, p25, p75 (유효 픽셀 없으면 nan), valid (유효 픽셀 수), valid_ratio
+    """
+    count = len(polygons)
+    labels, (x0, y0) = rasterize_obbs(polygons, depth_image.shape, shrink)
+    if count == 0 or labels.size == 0:
+        empty = np.full(count, np.nan)
+        return {'median': empty, 'p25': empty.copy(), 'p75': empty.copy(),
+                'valid': np.zeros(count, dtype=np.int64), 'valid_ratio': np.zeros(count)}
+    region = depth_image[y0:y0 + labels.shape[0], x0:x0 + labels.shape[1]]
+    inside = labels > 0
+    valid = inside & (region > 0)
+    if max_depth > 0:
+        valid &= region <= max_depth
+    groups = labels[valid] - 1
+    p25, median, p75 = _grouped_quantiles(groups, region[valid], count, (0.25, 0.5, 0.75))
+    totals = np.bincount(labels[inside] - 1, minlength=count)
+    valid_counts = np.bincount(groups, minlength=count)
+    return {
+        'median': median,
+        'p25': p25,
+        'p75': p75,
+        'valid': valid_counts,
+        'valid_ratio': valid_counts / np.maximum(totals, 1),
+    }
+
+
+class DepthTracks:
+    """물체별 뎁스 평활 (중심 거리로 트랙 연결)"""
+
+    def __init__(self, window=5, min_samples=3, max_distance=20.0, max_age=1.0):
+        self.window = window
+        self.min_samples = min_samples      # 이만큼 쌓이기 전에는 현재 값 사용
+        self.max_distance = max_distance    # 픽셀
+        self.max_age = max_age              # 초
+        self.tracks = {}                    # id → {'center', 'depths', 'stamp'}
+        self.ids = itertools.count(1)
+
+    def update(self, centers, depths, stamp):
+        """centers (N, 2), depths (N,) (nan 은 측정 실패) → (트랙 id 목록, 평활된 뎁스 목록 (없으면 None))"""
+        self.tracks = {k: t for k, t in self.tracks.items() if stamp - t['stamp'] <= self.max_age}
+        # 가까운 쌍부터 하나씩 연결
+        pairs = []
+        for i, center in enumerate(centers):
+            for track_id, track in self.tracks.items():
+                distance = float(np.hypot(*(np.asarray(center) - track['center'])))
+                if distance <= self.max_distance:
+                    pairs.append((distance, i, track_id))
+        assigned, used = {}, set()
+        for _, i, track_id in sorted(pairs):
+            if i not in assigned and track_id not in used:
+                assigned[i] = track_id
+                used.add(track_id)
+
+        track_ids, smoothed = [], []
+        for i, center in enumerate(centers):
+            track_id = assigned.get(i)
+            if track_id is None:
+                track_id = next(self.ids)
+                self.tracks[track_id] = {'depths': deque(maxlen=self.window)}
+            track = self.tracks[track_id]
+            track['center'] = np.asarray(center, dtype=np.float64)
+            track['stamp'] = stamp
+            if not np.isnan(depths[i]):
+                track['depths'].append(float(depths[i]))
+            track_ids.append(track_id)
+            if np.isnan(depths[i]):
+                smoothed.append(None)
+            elif len(track['depths']) >= self.min_samples:
+                smoothed.append(float(np.mean(track['depths'])))
+            else:
+                smoothed.append(float(depths[i]))
+        return track_ids, smoothed
+
+    def reset(self):
+        self.tracks.clear()
+
+
+class ObbDepthEngine:
+    """프레임마다 update() - 물체별 {'track_id', 'depth_mm', 'raw_depth_mm', 'spread_mm', 'valid_ratio'}"""
+
+    def __init__(self, shrink=0.8, min_valid_ratio=0.2, max_depth=0, **track_options):
+        self.shrink = shrink
+        self.min_valid_ratio = min_valid_ratio  # 유효 뎁스 픽셀이 이보다 적으면 측정 실패로
+        self.max_depth = max_depth
+        self.tracks = DepthTracks(**track_options)
+
+    def update(self, points, depth_image, stamp, color_shape=None):
+        points = np.asarray(points, dtype=np.float32).reshape(-1, 4, 2)
+        centers = points.mean(axis=1)
+        if depth_image is None:
+            depths = {'median': np.full(len(points), np.nan), 'p25': None, 'p75': None,
+                      'valid_ratio': np.zeros(len(points))}
+        else:
+            polygons = points
+            if color_shape is not None and color_shape[:2] != depth_image.shape[:2]:
+                # 뎁스 영상 해상도가 다르면 꼭짓점 배율 맞춤
+                scale = np.array([depth_image.shape[1] / color_shape[1], depth_image.shape[0] / color_shape[0]],
+                                 dtype=np.float32)
+                polygons = points * scale
+            depths = object_depth_stats(depth_image, polygons, self.shrink, self.max_depth)
+            depths['median'] = np.where(depths['valid_ratio'] >= self.min_valid_ratio, depths['median'], np.nan)
+        track_ids, smoothed = self.tracks.update(centers, depths['median'], stamp)
+
+        estimates = []
+        for i, track_id in enumerate(track_ids):
+            raw = depths['median'][i]
+            spread = None if depths['p25'] is None or np.isnan(raw) else float(depths['p75'][i] - depths['p25'][i])
+            estimates.append({
+                'track_id': track_id,
+                'depth_mm': smoothed[i],
+                'raw_depth_mm': None if np.isnan(raw) else float(raw),
+                'spread_mm': spread,
+                'valid_ratio': float(depths['valid_ratio'][i]),
+            })
+        return estimates
+
+    def reset(self):
+        self.tracks.reset()
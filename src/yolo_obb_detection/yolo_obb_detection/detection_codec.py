@@ -0,0 +1,98 @@
+"""
+OrientedDetectionArray ↔ 기존 JSON 검출 결과 변환
+
+기존 /yolo/detection_result (std_msgs/String) 의 JSON 형식:
+    {"target": ..., "timestamp": ..., "objects": [{"pixel_x", "pixel_y", "angle", "depth_mm", ...}]}
+YoloObbNode 는 각도를 final_angle 로, opencv_node 는 angle 로 보냈으므로 읽을 때는 둘 다 받는다.
+float32 필드의 NaN, 정수 필드의 -1 은 JSON 에서 null (None).
+"""
+import json
+import math
+
+from builtin_interfaces.msg import Time
+from logistics_interfaces.msg import OrientedDetection, OrientedDetectionArray
+
+DETECTIONS_TOPIC = '/yolo/detections'
+LEGACY_TOPIC = '/yolo/detection_result'
+
+INT_FIELDS = ('id', 'track_id', 'class_id')
+FLOAT_FIELDS = ('confidence', 'pixel_x', 'pixel_y', 'angle', 'yolo_angle', 'correction_confidence',
+                'width', 'height', 'depth_mm', 'depth_valid_ratio', 'robot_x', 'robot_y')
+
+
+def make_detection(index, **values):
+    """키워드로 채운 OrientedDetection (없는 값은 NaN / -1, None 도 같음)"""
+    detection = OrientedDetection()
+    detection.id = index
+    for name in INT_FIELDS[1:]:
+        value = values.get(name)
+        setattr(detection, name, -1 if value is None else int(value))
+    for name in FLOAT_FIELDS:
+        value = values.get(name)
+        setattr(detection, name, math.nan if value is None else float(value))
+    return detection
+
+
+def make_array(target, source, detections, stamp=None, frame_id=''):
+    msg = OrientedDetectionArray()
+    if stamp is not None:
+        msg.header.stamp = stamp
+    msg.header.frame_id = frame_id
+    msg.target = target or ''
+    msg.source = source
+    msg.detections = list(detections)
+    return msg
+
+
+def stamp_seconds(stamp):
+    return stamp.sec + stamp.nanosec * 1e-9
+
+
+def detection_to_dict(detection):
+    record = {}
+    for name in INT_FIELDS:
+        value = getattr(detection, name)
+        record[name] = None if value < 0 else value
+    for name in FLOAT_FIELDS:
+        value = getattr(detection, name)
+        record[name] = None if math.isnan(value) else float(value)
+    return record
+
+
+def dict_to_detection(record, index):
+    values = {name: record.get(name) for name in INT_FIELDS[1:] + FLOAT_FIELDS}
+    if values['angle'] is None:
+        values['angle'] = record.get('final_angle')  # 예전 YoloObbNode JSON
+    identifier = record.get('id')
+    return make_detection(index if identifier is None else int(identifier), **values)
+
+
+def array_to_dict(msg):
+    """기존 JSON 과 같은 모양의 dict (timestamp 는 원본 영상 시각)"""
+    return {
+        'target': msg.target,
+        'source': msg.source,
+        'timestamp': stamp_seconds(msg.header.stamp),
+        'objects': [detection_to_dict(d) for d in msg.detections],
+    }
+
+
+def seconds_to_stamp(seconds):
+    nanoseconds = int(round(seconds * 1e9))
+    return Time(sec=nanoseconds // 1_000_000_000, nanosec=nanoseconds % 1_000_000_000)
+
+
+def dict_to_array(data, source='legacy_json', stamp=None):
+    objects = data.get('objects') or []
+    if stamp is None and data.get('timestamp') is not None:
+        stamp = seconds_to_stamp(float(data['timestamp']))
+    return make_array(data.get('target'), data.get('source', source),
+                      [dict_to_detection(record, i) for i, record in enumerate(objects)], stamp)
+
+
+def array_to_json(msg):
+    return json.dumps(array_to_dict(msg))
+
+
+def json_to_array(text, stamp=None):
+    return dict_to_array(json.loads(text), stamp=stamp)
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+검출 결과 JSON 호환 브리지
+
+- mode=to_json (기본): /yolo/detections (OrientedDetectionArray) → /yolo/detection_result (String JSON)
+  아직 JSON 을 읽는 외부 도구/기록 스크립트용
+- mode=from_json: /yolo/detection_result (String JSON) → /yolo/detections
+  JSON 만 내는 예전 검출기를 새 소비자 (RobotControl 등) 에 붙일 때
+두 모드를 동시에 띄우면 서로 되돌려 보내므로 하나만 쓴다.
+"""
+import rclpy
+from rclpy.node import Node
+from std_msgs.msg import String
+from logistics_interfaces.msg import OrientedDetectionArray
+
+from yolo_obb_detection.detection_codec import DETECTIONS_TOPIC, LEGACY_TOPIC, array_to_json, json_to_array
+
+MODES = ('to_json', 'from_json')
+
+
+class DetectionJsonBridge(Node):
+    def __init__(self):
+        super().__init__('detection_json_bridge')
+        self.declare_parameter('mode', 'to_json')
+        self.mode = self.get_parameter('mode').value
+        if self.mode not in MODES:
+            self.get_logger().warn(f'⚠️ 알 수 없는 mode: {self.mode} - to_json 사용')
+            self.mode = 'to_json'
+
+        if self.mode == 'to_json':
+            self.pub = self.create_publisher(String, LEGACY_TOPIC, 10)
+            self.sub = self.create_subscription(OrientedDetectionArray, DETECTIONS_TOPIC, self.to_json, 10)
+            route = f'{DETECTIONS_TOPIC} → {LEGACY_TOPIC} (JSON)'
+        else:
+            self.pub = self.create_publisher(OrientedDetectionArray, DETECTIONS_TOPIC, 10)
+            self.sub = self.create_subscription(String, LEGACY_TOPIC, self.from_json, 10)
+            route = f'{LEGACY_TOPIC} (JSON) → {DETECTIONS_TOPIC}'
+        self.get_logger().info(f'🔁 검출 결과 브리지: {route}')
+
+    def to_json(self, msg):
+        out = String()
+        out.data = array_to_json(msg)
+        self.pub.publish(out)
+
+    def from_json(self, msg):
+        try:
+            self.pub.publish(json_to_array(msg.data))
+        except (ValueError, TypeError, AttributeError) as e:
+            self.get_logger().error(f'❌ JSON 검출 결과 변환 오류: {e}')
+
+
+def main(args=None):
+    rclpy.init(args=args)
+    node = DetectionJsonBridge()
+    try:
+        rclpy.spin(node)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        node.destroy_node()
+        rclpy.shutdown()
+
+
+if __name__ == '__main__':
+    main()
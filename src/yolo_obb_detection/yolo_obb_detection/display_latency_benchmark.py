@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+처리 노드 화면 출력 비용 벤치마크 (노드 안 imshow/waitKey vs 발행만 하고 detection_viewer 에서 보기)
+
+합성 프레임을 검정 물체 파이프라인으로 처리하고 결과를 그린 뒤 출력 방식별로
+executor 스레드가 프레임당 붙잡히는 시간을 잰다:
+    imshow - 기존 방식, 노드 안에서 cv2.imshow + cv2.waitKey(1) (화면이 있을 때만)
+    raw    - /yolo_result Image 발행 (cv2_to_imgmsg 처럼 픽셀 복사)
+    jpeg   - /yolo_result/compressed 발행 (JPEG 인코딩)
+    none   - 보는 구독자가 없어 그리기/발행 생략
+imshow 는 창 이벤트 처리 (창 이동, 크기 조절, 가려짐 등) 에 따라 waitKey 가 길게 막히므로 max 도 본다.
+
+사용 예:
+    ros2 run yolo_obb_detection display_latency_benchmark --frames 300
+"""
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from yolo_obb_detection.black_object_benchmark import make_frames
+from yolo_obb_detection.black_object_pipeline import BlackObjectPipeline
+
+MODES = ('imshow', 'raw', 'jpeg', 'none')
+
+
+def display_available():
+    # 화면 없는 리눅스에서 namedWindow 는 예외 대신 프로세스를 죽일 수 있어 먼저 확인
+    if sys.platform.startswith('linux') and not (os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY')):
+        return False
+    try:
+        cv2.namedWindow('display_latency_benchmark', cv2.WINDOW_AUTOSIZE)
+        return True
+    except cv2.error:
+        return False
+
+
+def draw(image, detections):
+    result = image.copy()
+    for detection in detections:
+        color = (0, 255, 0) if detection['accepted'] else (0, 0, 255)
+        cv2.drawContours(result, [detection['box']], 0, color, 2)
+        cv2.circle(result, detection['center'], 4, (0, 0, 255), -1)
+    return result
+
+
+def output(mode, result, jpeg_quality):
+    if mode == 'imshow':
+        cv2.imshow('display_latency_benchmark', result)
+        cv2.waitKey(1)
+    elif mode == 'raw':
+        result.tobytes()
+    elif mode == 'jpeg':
+        cv2.imencode('.jpg', result, [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality])
+
+
+def measure(mode, frames, pipeline, repeat, jpeg_quality):
+    process_times, output_times = [], []
+    for _ in range(repeat):
+        for image, _ in frames:
+            started = time.perf_counter()
+            detections, _, _ = pipeline.process(image)
+            processed = time.perf_counter()
+            if mode != 'none':
+                output(mode, draw(image, detections), jpeg_quality)
+            process_times.append(processed - started)
+            output_times.append(time.perf_counter() - processed)
+    process_times = np.array(process_times) * 1000.0
+    output_times = np.array(output_times) * 1000.0
+    total = process_times + output_times
+    return {
+        'process': float(process_times.mean()),
+        'output': float(output_times.mean()),
+        'output_p95': float(np.percentile(output_times, 95)),
+        'output_max': float(output_times.max()),
+        'total': float(total.mean()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='처리 노드 화면 출력 비용 벤치마크')
+    parser.add_argument('--frames', type=int, default=60, help='합성 프레임 수')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--jpeg-quality', type=int, default=80)
+    parser.add_argument('--modes', nargs='+', default=list(MODES), choices=MODES)
+    args, _ = parser.parse_known_args()
+
+    modes = list(args.modes)
+    if 'imshow' in modes and not display_available():
+        print('화면이 없어 imshow 는 건너뜀 (DISPLAY 가 있는 곳에서 다시 실행)')
+        modes.remove('imshow')
+
+    frames = make_frames(args.frames, blobs=20, objects=4)
+    pipeline = BlackObjectPipeline()
+    print(f'{"mode":<7} {"process ms":>10} {"output ms":>10} {"p95":>7} {"max":>7} {"total ms":>9} {"fps cap":>8}')
+    for mode in modes:
+        stats = measure(mode, frames, pipeline, args.repeat, args.jpeg_quality)
+        print(f'{mode:<7} {stats["process"]:>10.2f} {stats["output"]:>10.2f} {stats["output_p95"]:>7.2f} '
+              f'{stats["output_max"]:>7.2f} {stats["total"]:>9.2f} {1000.0 / stats["total"]:>8.0f}')
+    if 'imshow' in modes:
+        cv2.destroyAllWindows()
+
+
+if __name__ == '__main__':
+    main()
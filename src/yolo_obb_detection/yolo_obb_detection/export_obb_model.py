@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+best.pt → ONNX / OpenVINO IR 내보내기 (yolo_obb_node 의 backend 파라미터용)
+
+입력 크기마다 따로 내보내고 이름에 크기를 붙인다:
+    best_320.onnx, best_640.onnx, best_640_openvino_model/ ...
+
+사용 예:
+    ros2 run yolo_obb_detection export_obb_model --model best.pt --format onnx openvino --imgsz 320 480 640
+"""
+import argparse
+import os
+import shutil
+
+from yolo_obb_detection.inference_backends import exported_model_path
+
+FORMATS = {'onnx': 'onnxruntime', 'openvino': 'openvino'}
+
+
+def export(weights, fmt, imgsz, opset=None):
+    """내보낸 모델 경로 반환"""
+    from ultralytics import YOLO
+
+    options = {'format': fmt, 'imgsz': imgsz, 'dynamic': False, 'batch': 1}
+    if fmt == 'onnx':
+        options['simplify'] = True
+        if opset:
+            options['opset'] = opset
+    produced = str(YOLO(weights).export(**options))
+    target = exported_model_path(weights, FORMATS[fmt], imgsz)
+    if os.path.abspath(produced) != os.path.abspath(target):
+        if os.path.isdir(target):
+            shutil.rmtree(target)
+        os.replace(produced, target)
+    return target
+
+
+def main():
+    parser = argparse.ArgumentParser(description='OBB 모델 내보내기 (ONNX / OpenVINO)')
+    parser.add_argument('--model', default='/home/xotn/ros2_ws/src/yolo_obb_detection/models/best.pt')
+    parser.add_argument('--format', nargs='+', choices=sorted(FORMATS), default=['onnx', 'openvino'])
+    parser.add_argument('--imgsz', nargs='+', type=int, default=[640])
+    parser.add_argument('--opset', type=int, default=None)
+    args, _ = parser.parse_known_args()
+
+    weights = os.path.expanduser(args.model)
+    for fmt in args.format:
+        for imgsz in args.imgsz:
+            target = export(weights, fmt, imgsz, args.opset)
+            print(f'📦 {fmt} imgsz={imgsz} → {target}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,336 @@
+"""
+OBB 추론 백엔드 (PyTorch / ONNX Runtime / OpenVINO)
+
+모든 백엔드가 같은 전처리(letterbox)와 같은 후처리(디코딩 + 회전 NMS)를 쓰고,
+백엔드마다 다른 건 "입력 텐서 → 원시 출력 (1, 4 + 클래스 수 + 1, 앵커 수)" 한 단계뿐이다.
+그래서 같은 가중치라면 백엔드를 바꿔도 검출 결과 형식과 각도 규약이 같다.
+
+원시 출력 채널: cx, cy, w, h (입력 픽셀), 클래스 점수 (sigmoid 후), 회전각 (라디안)
+
+모델 파일:
+    torch      best.pt
+    onnxruntime best_640.onnx              (export_obb_model 로 생성)
+    openvino   best_640_openvino_model/    (export_obb_model 로 생성, 디렉터리 또는 그 안의 .xml)
+    INT8       best_640_int8.onnx          (quantize_obb_model 로 생성, onnxruntime / openvino 공용)
+
+런타임 패키지는 해당 백엔드를 만들 때만 import 한다.
+"""
+import ast
+import math
+import os
+
+import cv2
+import numpy as np
+
+BACKENDS = ('torch', 'onnxruntime', 'openvino')
+PRECISIONS = ('fp32', 'int8')
+
+
+class ObbResult:
+    """검출 결과 (원본 영상 좌표)"""
+
+    def __init__(self, points, confidences, classes, names):
+        self.points = points              # (N, 4, 2) float32, 꼭짓점 순서는 ultralytics xyxyxyxy 와 같음
+        self.confidences = confidences    # (N,)
+        self.classes = classes            # (N,) int
+        self.names = names                # {class: 이름}
+
+    def __len__(self):
+        return len(self.confidences)
+
+
+def letterbox(image, imgsz, pad_value=114):
+    """비율 유지 축소 + 가운데 정렬 패딩 → (패딩된 영상, 배율, (왼쪽, 위) 패딩)"""
+    height, width = image.shape[:2]
+    ratio = min(imgsz / height, imgsz / width)
+    new_w, new_h = int(round(width * ratio)), int(round(height * ratio))
+    pad_w, pad_h = (imgsz - new_w) / 2, (imgsz - new_h) / 2
+    if (new_w, new_h) != (width, height):
+        image = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+    top, bottom = int(round(pad_h - 0.1)), int(round(pad_h + 0.1))
+    left, right = int(round(pad_w - 0.1)), int(round(pad_w + 0.1))
+    image = cv2.copyMakeBorder(image, top, bottom, left, right, cv2.BORDER_CONSTANT,
+                               value=(pad_value, pad_value, pad_value))
+    return image, ratio, (left, top)
+
+
+def preprocess(image, imgsz):
+    """BGR uint8 → (1, 3, imgsz, imgsz) float32 RGB 0~1"""
+    padded, ratio, pad = letterbox(image, imgsz)
+    blob = cv2.dnn.blobFromImage(padded, scalefactor=1.0 / 255.0, swapRB=True)
+    return blob, ratio, pad
+
+
+def xywhr_to_points(boxes):
+    """(N, 5) cx, cy, w, h, 라디안 → (N, 4, 2) 꼭짓점"""
+    centers = boxes[:, :2]
+    w, h, theta = boxes[:, 2:3], boxes[:, 3:4], boxes[:, 4:5]
+    cos, sin = np.cos(theta), np.sin(theta)
+    vec1 = np.concatenate([w / 2 * cos, w / 2 * sin], axis=1)
+    vec2 = np.concatenate([-h / 2 * sin, h / 2 * cos], axis=1)
+    return np.stack([centers + vec1 + vec2, centers + vec1 - vec2,
+                     centers - vec1 - vec2, centers - vec1 + vec2], axis=1)
+
+
+def _covariance(boxes):
+    """회전 박스를 2차원 가우시안으로 볼 때의 공분산 성분 (a, b, c)"""
+    a, b = boxes[:, 2] ** 2 / 12, boxes[:, 3] ** 2 / 12
+    cos, sin = np.cos(boxes[:, 4]), np.sin(boxes[:, 4])
+    return a * cos ** 2 + b * sin ** 2, a * sin ** 2 + b * cos ** 2, (a - b) * cos * sin
+
+
+def probiou(boxes1, boxes2, eps=1e-7):
+    """회전 박스 (N, 5) x (M, 5) → ProbIoU (N, M), ultralytics batch_probiou 와 같은 식"""
+    x1, y1 = boxes1[:, 0:1], boxes1[:, 1:2]
+    x2, y2 = boxes2[None, :, 0], boxes2[None, :, 1]
+    a1, b1, c1 = (v[:, None] for v in _covariance(boxes1))
+    a2, b2, c2 = (v[None, :] for v in _covariance(boxes2))
+    denominator = (a1 + a2) * (b1 + b2) - (c1 + c2) ** 2 + eps
+    t1 = ((a1 + a2) * (y1 - y2) ** 2 + (b1 + b2) * (x1 - x2) ** 2) / denominator * 0.25
+    t2 = ((c1 + c2) * (x2 - x1) * (y1 - y2)) / denominator * 0.5
+    t3 = np.log(((a1 + a2) * (b1 + b2) - (c1 + c2) ** 2)
+                / (4 * np.sqrt(np.clip(a1 * b1 - c1 ** 2, 0, None) * np.clip(a2 * b2 - c2 ** 2, 0, None)) + eps)
+                + eps) * 0.5
+    distance = np.clip(t1 + t2 + t3, eps, 100.0)
+    return 1 - np.sqrt(1 - np.exp(-distance) + eps)
+
+
+def rotated_nms(boxes, scores, classes, iou_threshold, max_wh=7680):
+    """
+    클래스별 회전 박스 NMS → 남길 인덱스 (점수 내림차순)
+    클래스마다 좌표를 멀리 떨어뜨려 한 번에 계산하고, 점수가 더 높은 박스와 ProbIoU 가
+    iou_threshold 이상이면 버린다 (ultralytics 회전 NMS 와 같은 규칙)
+    """
+    order = np.argsort(-scores, kind='stable')
+    shifted = boxes[order].copy()
+    shifted[:, :2] += classes[order, None] * max_wh
+    ious = np.triu(probiou(shifted, shifted), k=1)
+    return order[(ious >= iou_threshold).sum(axis=0) == 0]
+
+
+def decode(raw, conf_threshold, iou_threshold, ratio, pad, max_det=300, max_nms=30000):
+    """원시 출력 (1, 4 + nc + 1, A) → 원본 영상 좌표의 (꼭짓점, 신뢰도, 클래스)"""
+    preds = np.asarray(raw, dtype=np.float32)[0].T          # (A, 4 + nc + 1)
+    class_scores = preds[:, 4:-1]
+    classes = class_scores.argmax(axis=1)
+    confidences = class_scores[np.arange(len(preds)), classes]
+    mask = confidences > conf_threshold
+    if not mask.any():
+        return np.zeros((0, 4, 2), np.float32), np.zeros(0, np.float32), np.zeros(0, np.int64)
+
+    boxes = np.concatenate([preds[mask, :4], preds[mask, -1:]], axis=1)
+    confidences, classes = confidences[mask], classes[mask]
+
+    if len(confidences) > max_nms:
+        top = np.argsort(-confidences, kind='stable')[:max_nms]
+        boxes, confidences, classes = boxes[top], confidences[top], classes[top]
+    keep = rotated_nms(boxes, confidences, classes, iou_threshold)[:max_det]
+    boxes, confidences, classes = boxes[keep], confidences[keep], classes[keep]
+
+    # 각도를 [0, pi/2) 로 맞추고 그만큼 w/h 교환 (ultralytics regularize_rboxes 와 같음)
+    w, h, theta = boxes[:, 2].copy(), boxes[:, 3].copy(), boxes[:, 4]
+    swap = theta % math.pi >= math.pi / 2
+    boxes[:, 2] = np.where(swap, h, w)
+    boxes[:, 3] = np.where(swap, w, h)
+    boxes[:, 4] = theta % (math.pi / 2)
+
+    # letterbox 되돌리기
+    boxes[:, 0] -= pad[0]
+    boxes[:, 1] -= pad[1]
+    boxes[:, :4] /= ratio
+    points = xywhr_to_points(boxes)
+    return points.astype(np.float32), confidences, classes.astype(np.int64)
+
+
+def parse_names(value):
+    """ultralytics 메타데이터의 names (dict 또는 문자열) → {int: str}"""
+    if isinstance(value, str):
+        value = ast.literal_eval(value)
+    return {int(k): str(v) for k, v in dict(value).items()}
+
+
+class ObbBackend:
+    """백엔드 공통: run(blob) 만 구현하면 됨"""
+
+    name = None
+
+    def __init__(self, model_path, imgsz=640, threads=0):
+        self.model_path = model_path
+        self.imgsz = imgsz
+        self.threads = threads
+        self.names = {}
+        self.batch_size = None  # run() 한 번에 넣을 영상 수 (None 은 제한 없음, 내보낸 모델은 입력 배치에 고정)
+
+    def run(self, blob):
+        raise NotImplementedError
+
+    def predict(self, image, conf=0.25, iou=0.7):
+        blob, ratio, pad = preprocess(image, self.imgsz)
+        raw = self.run(blob)
+        points, confidences, classes = decode(raw, conf, iou, ratio, pad)
+        return ObbResult(points, confidences, classes, self.names)
+
+    def predict_batch(self, images, conf=0.25, iou=0.7):
+        """
+        여러 영상을 (N, 3, imgsz, imgsz) 로 쌓아 run() 한 번에 추론 → ObbResult 목록
+        batch_size 가 고정된 모델은 그 크기씩 나눠서 돌리고, 모자란 마지막 묶음은 빈 영상으로 채운다
+        (batch=1 로 내보낸 모델이면 영상마다 한 번씩 도는 것과 같음)
+        """
+        prepared = [preprocess(image, self.imgsz) for image in images]
+        step = self.batch_size or max(1, len(prepared))
+        results = []
+        for start in range(0, len(prepared), step):
+            chunk = prepared[start:start + step]
+            blob = np.concatenate([b for b, _, _ in chunk], axis=0)
+            if self.batch_size and len(chunk) < self.batch_size:
+                padding = np.zeros((self.batch_size - len(chunk),) + blob.shape[1:],
+                                   dtype=blob.dtype)
+                blob = np.concatenate([blob, padding], axis=0)
+            raw = self.run(blob)
+            for i, (_, ratio, pad) in enumerate(chunk):
+                points, confidences, classes = decode(raw[i:i + 1], conf, iou, ratio, pad)
+                results.append(ObbResult(points, confidences, classes, self.names))
+        return results
+
+    def warmup(self, iterations=2):
+        blob = np.zeros((self.batch_size or 1, 3, self.imgsz, self.imgsz), dtype=np.float32)
+        for _ in range(iterations):
+            self.run(blob)
+
+
+class TorchBackend(ObbBackend):
+    name = 'torch'
+
+    def __init__(self, model_path, imgsz=640, threads=0):
+        super().__init__(model_path, imgsz, threads)
+        import torch
+        from ultralytics import YOLO
+
+        if threads > 0:
+            torch.set_num_threads(threads)
+        self.torch = torch
+        yolo = YOLO(model_path)
+        self.names = parse_names(yolo.names)
+        self.model = yolo.model.float().eval()
+
+    def run(self, blob):
+        with self.torch.inference_mode():
+            output = self.model(self.torch.from_numpy(blob))
+        if isinstance(output, (list, tuple)):
+            output = output[0]
+        return output.numpy()
+
+
+class OnnxRuntimeBackend(ObbBackend):
+    name = 'onnxruntime'
+
+    def __init__(self, model_path, imgsz=640, threads=0):
+        super().__init__(model_path, imgsz, threads)
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        if threads > 0:
+            options.intra_op_num_threads = threads
+        options.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(model_path, options, providers=['CPUExecutionProvider'])
+        self.input_name = self.session.get_inputs()[0].name
+        self.imgsz = _fixed_size(self.session.get_inputs()[0].shape, imgsz)
+        self.batch_size = _fixed_batch(self.session.get_inputs()[0].shape)
+        metadata = self.session.get_modelmeta().custom_metadata_map
+        if 'names' in metadata:
+            self.names = parse_names(metadata['names'])
+
+    def run(self, blob):
+        return self.session.run(None, {self.input_name: blob})[0]
+
+
+class OpenVinoBackend(ObbBackend):
+    name = 'openvino'
+
+    def __init__(self, model_path, imgsz=640, threads=0):
+        super().__init__(model_path, imgsz, threads)
+        import openvino as ov
+
+        xml_path = model_path
+        if os.path.isdir(model_path):
+            xml_files = sorted(f for f in os.listdir(model_path) if f.endswith('.xml'))
+            if not xml_files:
+                raise FileNotFoundError(f'no OpenVINO .xml model in {model_path}')
+            xml_path = os.path.join(model_path, xml_files[0])
+        core = ov.Core()
+        model = core.read_model(xml_path)
+        config = {'PERFORMANCE_HINT': 'LATENCY'}
+        if threads > 0:
+            config['INFERENCE_NUM_THREADS'] = threads
+        self.compiled = core.compile_model(model, 'CPU', config)
+        self.request = self.compiled.create_infer_request()
+        input_shape = (list(model.inputs[0].get_partial_shape().to_shape())
+                       if model.inputs[0].get_partial_shape().is_static else [])
+        self.imgsz = _fixed_size(input_shape, imgsz)
+        self.batch_size = _fixed_batch(input_shape)
+        self.names = _openvino_names(model, os.path.dirname(xml_path))
+
+    def run(self, blob):
+        self.request.infer({0: blob})
+        return self.request.get_output_tensor(0).data.copy()
+
+
+def _fixed_size(shape, default):
+    """내보낸 모델 입력이 고정 크기면 그 크기를 쓴다"""
+    if len(shape) == 4 and isinstance(shape[2], int) and shape[2] > 0:
+        return shape[2]
+    return default
+
+
+def _fixed_batch(shape):
+    """내보낸 모델 입력 배치가 고정이면 그 크기 (동적이면 None)"""
+    if len(shape) == 4 and isinstance(shape[0], int) and shape[0] > 0:
+        return shape[0]
+    return None
+
+
+def _openvino_names(model, directory):
+    # ONNX 를 바로 읽으면 메타데이터가 framework 아래, IR 은 model_info 또는 metadata.yaml
+    for path in (['framework', 'names'], ['model_info', 'names']):
+        try:
+            return parse_names(model.get_rt_info(path).astype(str))
+        except Exception:
+            continue
+    metadata_path = os.path.join(directory, 'metadata.yaml')
+    if os.path.exists(metadata_path):
+        import yaml
+        with open(metadata_path, 'r') as f:
+            metadata = yaml.safe_load(f) or {}
+        if 'names' in metadata:
+            return parse_names(metadata['names'])
+    return {}
+
+
+def create_backend(kind, model_path, imgsz=640, threads=0):
+    classes = {'torch': TorchBackend, 'onnxruntime': OnnxRuntimeBackend, 'openvino': OpenVinoBackend}
+    if kind not in classes:
+        raise ValueError(f'unknown backend {kind!r} (expected one of {BACKENDS})')
+    return classes[kind](os.path.expanduser(model_path), imgsz, threads)
+
+
+def exported_model_path(weights, kind, imgsz, precision='fp32'):
+    """
+    best.pt 기준으로 export_obb_model / quantize_obb_model 이 만드는 파일 경로
+    INT8 모델은 QDQ ONNX 하나를 onnxruntime, openvino 가 같이 읽는다
+    """
+    if kind not in BACKENDS:
+        raise ValueError(f'unknown backend {kind!r} (expected one of {BACKENDS})')
+    if precision not in PRECISIONS:
+        raise ValueError(f'unknown precision {precision!r} (expected one of {PRECISIONS})')
+    stem = os.path.splitext(weights)[0]
+    if precision == 'int8':
+        if kind == 'torch':
+            raise ValueError('int8 models run on onnxruntime or openvino, not torch')
+        return f'{stem}_{imgsz}_int8.onnx'
+    if kind == 'torch':
+        return weights
+    if kind == 'onnxruntime':
+        return f'{stem}_{imgsz}.onnx'
+    return f'{stem}_{imgsz}_openvino_model'
@@ -0,0 +1,142 @@
+"""
+OBB 검출 평가 (mAP@0.5, 각도 오차, 중심 오차)
+
+정답은 YOLO-OBB 라벨 파일 (class x1 y1 ... x4 y4, 0~1 정규화) 또는 기준 모델의 예측.
+매칭은 클래스가 같고 다각형 IoU 가 iou_threshold 이상인 것을 신뢰도 순으로 하나씩.
+"""
+import os
+
+import numpy as np
+
+from yolo_obb_detection.obb_geometry import obb_angle
+
+
+def load_labels(path, width, height):
+    """YOLO-OBB 라벨 → (꼭짓점 (N, 4, 2) 픽셀, 클래스 (N,)), 파일이 없으면 빈 배열"""
+    points, classes = [], []
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            for line in f:
+                values = line.split()
+                if len(values) != 9:
+                    continue
+                classes.append(int(float(values[0])))
+                points.append(np.array(values[1:], dtype=np.float32).reshape(4, 2) * (width, height))
+    if not points:
+        return np.zeros((0, 4, 2), np.float32), np.zeros(0, np.int64)
+    return np.stack(points).astype(np.float32), np.array(classes, dtype=np.int64)
+
+
+def _area(polygon):
+    x, y = polygon[:, 0], polygon[:, 1]
+    return 0.5 * abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+
+
+def _counter_clockwise(polygon):
+    x, y = polygon[:, 0], polygon[:, 1]
+    signed = np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1))
+    return polygon if signed >= 0 else polygon[::-1]
+
+
+def _clip(subject, clipper):
+    """Sutherland-Hodgman: 볼록 다각형 subject 를 볼록 다각형 clipper 안쪽으로 자름 (둘 다 반시계)"""
+    output = list(subject)
+    for i in range(len(clipper)):
+        if not output:
+            break
+        a, b = clipper[i], clipper[(i + 1) % len(clipper)]
+        edge = b - a
+        inputs, output = output, []
+        for j in range(len(inputs)):
+            p, q = inputs[j], inputs[(j + 1) % len(inputs)]
+            p_side = edge[0] * (p[1] - a[1]) - edge[1] * (p[0] - a[0])
+            q_side = edge[0] * (q[1] - a[1]) - edge[1] * (q[0] - a[0])
+            if p_side >= 0:
+                output.append(p)
+            if (p_side >= 0) != (q_side >= 0):
+                t = p_side / (p_side - q_side)
+                output.append(p + t * (q - p))
+    return np.array(output, dtype=np.float64).reshape(-1, 2)
+
+
+def polygon_iou(a, b):
+    """볼록 사각형 두 개의 IoU (cv2.intersectConvexConvex 는 거의 겹치는 경우 0 을 돌려줄 때가 있어 직접 계산)"""
+    a = _counter_clockwise(np.asarray(a, dtype=np.float64))
+    b = _counter_clockwise(np.asarray(b, dtype=np.float64))
+    # 외접 사각형이 안 겹치면 바로 0
+    if (a[:, 0].max() < b[:, 0].min() or b[:, 0].max() < a[:, 0].min()
+            or a[:, 1].max() < b[:, 1].min() or b[:, 1].max() < a[:, 1].min()):
+        return 0.0
+    intersection = _clip(a, b)
+    inter = _area(intersection) if len(intersection) >= 3 else 0.0
+    union = _area(a) + _area(b) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def angle_difference(a, b):
+    """OBB 방향 차이 (180도 대칭, 0~90)"""
+    diff = abs(a - b) % 180.0
+    return min(diff, 180.0 - diff)
+
+
+class ObbEvaluator:
+    """이미지별로 add() 하고 summary() 로 결과"""
+
+    def __init__(self, iou_threshold=0.5, error_conf=0.25):
+        self.iou_threshold = iou_threshold
+        self.error_conf = error_conf       # 각도/중심 오차는 이 신뢰도 이상 검출만
+        self.records = {}                  # class → [(conf, 맞았는지)]
+        self.gt_counts = {}
+        self.angle_errors = []
+        self.center_errors = []
+        self.images = 0
+
+    def add(self, pred_points, pred_conf, pred_classes, gt_points, gt_classes):
+        self.images += 1
+        for cls in gt_classes:
+            self.gt_counts[int(cls)] = self.gt_counts.get(int(cls), 0) + 1
+        matched = np.zeros(len(gt_classes), dtype=bool)
+        for i in np.argsort(-np.asarray(pred_conf), kind='stable'):
+            cls = int(pred_classes[i])
+            best, best_iou = -1, self.iou_threshold
+            for j in np.flatnonzero((gt_classes == cls) & ~matched):
+                iou = polygon_iou(pred_points[i], gt_points[j])
+                if iou >= best_iou:
+                    best, best_iou = j, iou
+            hit = best >= 0
+            self.records.setdefault(cls, []).append((float(pred_conf[i]), hit))
+            if hit:
+                matched[best] = True
+                if pred_conf[i] >= self.error_conf:
+                    self.angle_errors.append(angle_difference(obb_angle(pred_points[i]), obb_angle(gt_points[best])))
+                    self.center_errors.append(float(np.linalg.norm(pred_points[i].mean(0) - gt_points[best].mean(0))))
+
+    def average_precision(self, cls):
+        records = sorted(self.records.get(cls, []), key=lambda r: -r[0])
+        total = self.gt_counts.get(cls, 0)
+        if total == 0:
+            return None
+        if not records:
+            return 0.0
+        hits = np.array([hit for _, hit in records], dtype=np.float64)
+        tp = np.cumsum(hits)
+        fp = np.cumsum(1.0 - hits)
+        recall = np.concatenate([[0.0], tp / total, [1.0]])
+        precision = np.concatenate([[1.0], tp / np.maximum(tp + fp, 1e-9), [0.0]])
+        # 모든 점 보간 (precision envelope)
+        precision = np.flip(np.maximum.accumulate(np.flip(precision)))
+        steps = np.flatnonzero(recall[1:] != recall[:-1])
+        return float(np.sum((recall[steps + 1] - recall[steps]) * precision[steps + 1]))
+
+    def summary(self):
+        per_class = {cls: self.average_precision(cls) for cls in sorted(self.gt_counts)}
+        values = [ap for ap in per_class.values() if ap is not None]
+        return {
+            'images': self.images,
+            'objects': int(sum(self.gt_counts.values())),
+            'map50': float(np.mean(values)) if values else 0.0,
+            'ap50_per_class': per_class,
+            'matched': len(self.angle_errors),
+            'mean_angle_error': float(np.mean(self.angle_errors)) if self.angle_errors else None,
+            'mean_center_error': float(np.mean(self.center_errors)) if self.center_errors else None,
+        }
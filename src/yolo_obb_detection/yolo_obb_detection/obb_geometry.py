@@ -0,0 +1,124 @@
+"""OBB 각도 계산과 HSV 기반 회전 보정 (yolo_obb_node 와 오프라인 도구가 같이 씀)"""
+import math
+
+import cv2
+import numpy as np
+
+
+def obb_angle(points):
+    """OBB 꼭짓점 4개 (4x2) → 짧은 변 방향 각도 (0~360도)"""
+    len_side1 = np.linalg.norm(points[1] - points[0])
+    len_side2 = np.linalg.norm(points[2] - points[1])
+
+    if len_side1 <= len_side2:
+        angle = math.degrees(math.atan2(points[1][1] - points[0][1], points[1][0] - points[0][0]))
+    else:
+        angle = math.degrees(math.atan2(points[2][1] - points[1][1], points[2][0] - points[1][0]))
+
+    if angle < 0:
+        angle += 360
+    return angle
+
+
+def correct_rotation_with_hsv(image, obb_points, logger=None):
+    """HSV 기반으로 회전 각도 보정, 실패하면 None"""
+
+    def debug(message):
+        if logger is not None:
+            logger.debug(message)
+
+    try:
+        # ROI 영역 확장 (여유 공간 확보)
+        x, y, w, h = cv2.boundingRect(obb_points)
+        margin = 20
+        roi_y_start = max(0, y - margin)
+        roi_y_end = min(image.shape[0], y + h + margin)
+        roi_x_start = max(0, x - margin)
+        roi_x_end = min(image.shape[1], x + w + margin)
+
+        roi = image[roi_y_start:roi_y_end, roi_x_start:roi_x_end]
+
+        # ROI가 유효한지 확인
+        roi_h, roi_w = roi.shape[:2]
+        if roi_h <= 0 or roi_w <= 0:
+            debug('ROI 크기가 유효하지 않음')
+            return None
+
+        # HSV 변환
+        hsv = cv2.cvtColor(roi, cv2.COLOR_BGR2HSV)
+
+        # ROI 중심점의 색상 (ROI 의 실제 크기 기준)
+        # uint8 스칼라 그대로 둔다: 기존 YoloObbNode 와 같은 범위 계산 (val ± 40 이 넘치는 경우 포함)
+        hue, sat, val = hsv[roi_h // 2, roi_w // 2]
+
+        # HSV 범위 설정 - 더 넓은 범위로 설정
+        if sat < 30:  # 무채색 객체: 채도가 낮으면 밝기 기반으로
+            lower_hsv = np.array([0, 0, max(0, val - 40)])
+            upper_hsv = np.array([180, 255, min(255, val + 40)])
+        else:  # 유채색 객체
+            lower_hsv = np.array([max(0, hue - 30), 30, 30])
+            upper_hsv = np.array([min(180, hue + 30), 255, 255])
+
+        # 마스크 생성
+        color_mask = cv2.inRange(hsv, lower_hsv, upper_hsv)
+
+        # 노이즈 제거
+        kernel = np.ones((3, 3), np.uint8)
+        color_mask = cv2.morphologyEx(color_mask, cv2.MORPH_OPEN, kernel)
+        color_mask = cv2.morphologyEx(color_mask, cv2.MORPH_CLOSE, kernel)
+
+        # 컨투어 찾기
+        contours, _ = cv2.findContours(color_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        if not contours:
+            debug('유효한 컨투어를 찾을 수 없음')
+            return None
+
+        # 가장 큰 컨투어 선택
+        largest_contour = max(contours, key=cv2.contourArea)
+
+        # 컨투어 크기 검증
+        area = cv2.contourArea(largest_contour)
+        if area < 50:
+            debug(f'컨투어 크기가 너무 작음: {area}')
+            return None
+
+        # MinAreaRect로 정확한 회전각 계산
+        rect = cv2.minAreaRect(largest_contour)
+        corrected_angle = rect[2]
+
+        # 각도 보정
+        if rect[1][0] < rect[1][1]:  # width < height
+            corrected_angle += 90
+
+        # 0-360도 범위로 정규화
+        if corrected_angle < 0:
+            corrected_angle += 360
+        elif corrected_angle >= 360:
+            corrected_angle -= 360
+
+        debug(f'HSV 보정 성공: {corrected_angle:.1f}도 (컨투어 크기: {area:.1f})')
+        return corrected_angle
+
+    except Exception as e:
+        if logger is not None:
+            logger.warn(f'HSV 보정 중 예외 발생: {str(e)}')
+        return None
+
+
+def correction_confidence(yolo_angle, corrected_angle):
+    """YOLO 각도와 HSV 보정 각도가 얼마나 가까운지 (0~1)"""
+    if corrected_angle is None:
+        return 0.0
+
+    angle_diff = abs(yolo_angle - corrected_angle)
+    if angle_diff > 180:
+        angle_diff = 360 - angle_diff
+
+    return max(0, 1 - angle_diff / 90.0)
+
+
+def final_angle(yolo_angle, corrected_angle, confidence, min_confidence=0.3):
+    """HSV 보정이 YOLO 각도와 어느 정도 맞으면 보정 각도, 아니면 YOLO 각도"""
+    if corrected_angle is not None and confidence > min_confidence:
+        return corrected_angle
+    return yolo_angle
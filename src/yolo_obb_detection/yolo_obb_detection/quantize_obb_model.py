@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+OBB 모델 INT8 정적 양자화 + 정확도/지연 보고서
+
+1) best_<imgsz>.onnx (없으면 best.pt 에서 내보냄) 를 수집한 프레임으로 보정(calibration)해서
+   best_<imgsz>_int8.onnx (QDQ) 생성 - onnxruntime / openvino 백엔드가 그대로 읽는다
+2) 검증 이미지에서 FP32 best.pt 와 INT8 모델을 같은 디코딩으로 돌려
+   mAP@0.5, 평균 각도 오차, 평균 중심 오차, 지연을 비교
+   (라벨이 없으면 FP32 예측을 정답으로 보고 INT8 이 얼마나 따라가는지만 본다)
+3) 정확도 손실이 기준을 넘으면 INT8 모델을 *_int8.rejected.onnx 로 바꿔 노드가 못 쓰게 하고 종료 코드 1
+
+출력 헤드의 박스 디코딩 연산(DFL, 좌표 계산)은 양자화하지 않는다 (좌표 오차가 커짐).
+
+사용 예:
+    ros2 run yolo_obb_detection quantize_obb_model --model best.pt --calib-images ~/data/image \\
+        --val-images ~/data/val/images --val-labels ~/data/val/labels
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from yolo_obb_detection.inference_backends import create_backend, exported_model_path, preprocess
+from yolo_obb_detection.obb_eval import ObbEvaluator, load_labels
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.bmp')
+
+
+def list_images(images_dir, limit=None, seed=0):
+    names = sorted(n for n in os.listdir(images_dir) if n.lower().endswith(IMAGE_EXTENSIONS))
+    if limit is not None and len(names) > limit:
+        # 연속 촬영 프레임이 몰리지 않도록 고르게 뽑음
+        rng = np.random.default_rng(seed)
+        names = sorted(rng.choice(names, size=limit, replace=False))
+    return [os.path.join(images_dir, n) for n in names]
+
+
+def calibration_reader(paths, imgsz, input_name):
+    from onnxruntime.quantization import CalibrationDataReader
+
+    class FrameReader(CalibrationDataReader):
+        def __init__(self):
+            self.paths = iter(paths)
+
+        def get_next(self):
+            for path in self.paths:
+                image = cv2.imread(path, cv2.IMREAD_COLOR)
+                if image is not None:
+                    return {input_name: preprocess(image, imgsz)[0]}
+            return None
+
+    return FrameReader()
+
+
+def head_decode_nodes(model):
+    """출력 헤드에서 Conv 가 아닌 노드 (박스/각도 디코딩) 이름"""
+    pattern = re.compile(r'^/model\.(\d+)/')
+    indices = [int(m.group(1)) for m in (pattern.match(node.name) for node in model.graph.node) if m]
+    if not indices:
+        return []
+    head = f'/model.{max(indices)}/'
+    return [node.name for node in model.graph.node if node.name.startswith(head) and node.op_type != 'Conv']
+
+
+def quantize(fp32_path, int8_path, calib_paths, imgsz, method, per_channel):
+    import onnx
+    import onnxruntime as ort
+    from onnxruntime.quantization import CalibrationMethod, QuantFormat, QuantType, quantize_static
+
+    input_name = ort.InferenceSession(fp32_path, providers=['CPUExecutionProvider']).get_inputs()[0].name
+    excluded = head_decode_nodes(onnx.load(fp32_path))
+    quantize_static(
+        fp32_path, int8_path,
+        calibration_reader(calib_paths, imgsz, input_name),
+        quant_format=QuantFormat.QDQ,
+        per_channel=per_channel,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        calibrate_method={'minmax': CalibrationMethod.MinMax,
+                          'entropy': CalibrationMethod.Entropy,
+                          'percentile': CalibrationMethod.Percentile}[method],
+        nodes_to_exclude=excluded)
+    # 클래스 이름 등 ultralytics 메타데이터 유지
+    fp32 = onnx.load(fp32_path)
+    int8 = onnx.load(int8_path)
+    del int8.metadata_props[:]
+    int8.metadata_props.extend(fp32.metadata_props)
+    onnx.save(int8, int8_path)
+    return len(excluded)
+
+
+def predict_all(backend, paths, conf):
+    """반환: ({경로: (ObbResult, 영상 크기)}, 평균 지연 ms)"""
+    predictions = {}
+    latencies = []
+    for path in paths:
+        image = cv2.imread(path, cv2.IMREAD_COLOR)
+        if image is None:
+            continue
+        started = time.perf_counter()
+        result = backend.predict(image, conf=conf)
+        latencies.append(time.perf_counter() - started)
+        predictions[path] = (result, image.shape[:2])
+    return predictions, float(np.mean(latencies) * 1000.0) if latencies else 0.0
+
+
+def score(predictions, truth, error_conf):
+    """truth(경로, 영상 크기) → (정답 꼭짓점, 정답 클래스)"""
+    evaluator = ObbEvaluator(error_conf=error_conf)
+    for path, (result, shape) in predictions.items():
+        gt_points, gt_classes = truth(path, shape)
+        evaluator.add(result.points, result.confidences, result.classes, gt_points, gt_classes)
+    return evaluator.summary()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='OBB 모델 INT8 양자화 + 정확도 비교')
+    parser.add_argument('--model', default='/home/xotn/ros2_ws/src/yolo_obb_detection/models/best.pt')
+    parser.add_argument('--imgsz', type=int, default=640)
+    parser.add_argument('--calib-images', required=True, help='보정용 프레임 (realsense_data_collector save_path)')
+    parser.add_argument('--calib-count', type=int, default=300)
+    parser.add_argument('--val-images', default=None, help='검증 이미지 (기본: 보정에 쓰지 않은 calib-images)')
+    parser.add_argument('--val-labels', default=None, help='YOLO-OBB 라벨 디렉터리 (없으면 FP32 예측을 정답으로)')
+    parser.add_argument('--val-count', type=int, default=200)
+    parser.add_argument('--method', choices=('minmax', 'entropy', 'percentile'), default='minmax')
+    parser.add_argument('--per-tensor', action='store_true', help='가중치를 채널별이 아닌 텐서 단위로 양자화')
+    parser.add_argument('--backend', choices=('onnxruntime', 'openvino'), default='onnxruntime',
+                        help='INT8 모델을 돌릴 런타임')
+    parser.add_argument('--conf', type=float, default=0.001, help='mAP 계산용 최소 신뢰도')
+    parser.add_argument('--error-conf', type=float, default=0.25, help='각도/중심 오차를 잴 최소 신뢰도')
+    # 거부 기준 (FP32 대비)
+    parser.add_argument('--max-map-drop', type=float, default=0.02)
+    parser.add_argument('--max-angle-error-increase', type=float, default=2.0, help='도')
+    parser.add_argument('--max-center-error-increase', type=float, default=2.0, help='픽셀')
+    args, _ = parser.parse_known_args()
+
+    weights = os.path.expanduser(args.model)
+    fp32_onnx = exported_model_path(weights, 'onnxruntime', args.imgsz)
+    int8_onnx = exported_model_path(weights, 'onnxruntime', args.imgsz, precision='int8')
+    if not os.path.exists(fp32_onnx):
+        from yolo_obb_detection.export_obb_model import export
+        export(weights, 'onnx', args.imgsz)
+        print(f'📦 FP32 ONNX 내보냄: {fp32_onnx}')
+
+    calib_dir = os.path.expanduser(args.calib_images)
+    calib_paths = list_images(calib_dir, args.calib_count)
+    if args.val_images:
+        val_paths = list_images(os.path.expanduser(args.val_images), args.val_count)
+    else:
+        used = set(calib_paths)
+        val_paths = [p for p in list_images(calib_dir) if p not in used][:args.val_count]
+    if not calib_paths or not val_paths:
+        print(f'❌ 이미지 부족: 보정 {len(calib_paths)}장, 검증 {len(val_paths)}장')
+        sys.exit(2)
+
+    started = time.perf_counter()
+    excluded = quantize(fp32_onnx, int8_onnx, calib_paths, args.imgsz, args.method, not args.per_tensor)
+    print(f'🧮 INT8 양자화: 보정 {len(calib_paths)}장, {time.perf_counter() - started:.1f}초 '
+          f'(헤드 디코딩 노드 {excluded}개 제외) → {int8_onnx}')
+
+    fp32_backend = create_backend('torch', weights, args.imgsz)
+    int8_backend = create_backend(args.backend, int8_onnx, args.imgsz)
+    labels_dir = os.path.expanduser(args.val_labels) if args.val_labels else None
+
+    fp32_predictions, fp32_ms = predict_all(fp32_backend, val_paths, args.conf)
+    int8_predictions, int8_ms = predict_all(int8_backend, val_paths, args.conf)
+    if labels_dir:
+        def truth(path, shape):
+            label = os.path.join(labels_dir, os.path.splitext(os.path.basename(path))[0] + '.txt')
+            return load_labels(label, shape[1], shape[0])
+    else:
+        # 라벨이 없으면 FP32 의 확실한 검출을 정답으로 (FP32 자신의 점수는 기준값)
+        def truth(path, shape):
+            result = fp32_predictions[path][0]
+            keep = result.confidences >= args.error_conf
+            return result.points[keep], result.classes[keep]
+    fp32_summary = score(fp32_predictions, truth, args.error_conf)
+    int8_summary = score(int8_predictions, truth, args.error_conf)
+
+    def delta(key):
+        a, b = fp32_summary[key], int8_summary[key]
+        return None if a is None or b is None else b - a
+
+    checks = {
+        'map50_drop': (-delta('map50'), args.max_map_drop),
+        'angle_error_increase': (delta('mean_angle_error'), args.max_angle_error_increase),
+        'center_error_increase': (delta('mean_center_error'), args.max_center_error_increase),
+    }
+    failures = [name for name, (value, limit) in checks.items() if value is None or value > limit]
+    if int8_summary['matched'] == 0:
+        failures.append('no_matches')
+    accepted = not failures
+
+    report = {
+        'model': weights,
+        'int8_model': int8_onnx if accepted else int8_onnx.replace('_int8.onnx', '_int8.rejected.onnx'),
+        'imgsz': args.imgsz,
+        'reference': 'labels' if labels_dir else 'fp32_predictions',
+        'calibration': {'images': len(calib_paths), 'method': args.method, 'per_channel': not args.per_tensor},
+        'validation_images': len(val_paths),
+        'fp32': dict(fp32_summary, latency_ms=fp32_ms, backend='torch'),
+        'int8': dict(int8_summary, latency_ms=int8_ms, backend=args.backend),
+        'checks': {name: {'value': value, 'limit': limit} for name, (value, limit) in checks.items()},
+        'accepted': accepted,
+        'failures': failures,
+        'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+    }
+    if not accepted:
+        os.replace(int8_onnx, report['int8_model'])
+    report_path = os.path.splitext(int8_onnx)[0] + '.report.json'
+    with open(report_path + '.tmp', 'w') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    os.replace(report_path + '.tmp', report_path)
+
+    def fmt(value, unit=''):
+        return '-' if value is None else f'{value:.3f}{unit}'
+
+    print(f'{"":<8} {"mAP@0.5":>8} {"각도 오차":>10} {"중심 오차":>10} {"지연":>10}')
+    for name, summary, ms in (('FP32', fp32_summary, fp32_ms), ('INT8', int8_summary, int8_ms)):
+        print(f'{name:<8} {summary["map50"]:>8.3f} {fmt(summary["mean_angle_error"], "°"):>10} '
+              f'{fmt(summary["mean_center_error"], "px"):>10} {ms:>8.1f}ms')
+    if accepted:
+        print(f'✅ INT8 모델 채택 (속도 {fp32_ms / int8_ms if int8_ms else 0:.2f}배) - 보고서 {report_path}')
+    else:
+        print(f'❌ INT8 모델 거부: {", ".join(failures)} → {report["int8_model"]} - 보고서 {report_path}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
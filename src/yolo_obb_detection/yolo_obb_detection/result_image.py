@@ -0,0 +1,59 @@
+"""
+결과 이미지 발행 (raw Image + JPEG CompressedImage)
+
+처리 노드는 창을 띄우지 않고 그린 결과만 발행한다 (보기는 detection_viewer).
+구독자가 없는 토픽은 변환/인코딩 자체를 건너뛰므로 아무도 안 보면 비용이 거의 없다.
+"""
+import os
+import time
+
+import cv2
+from sensor_msgs.msg import CompressedImage, Image
+
+
+class ResultImagePublisher:
+    def __init__(self, node, bridge, topic, jpeg_quality=80):
+        self.bridge = bridge
+        self.raw_pub = node.create_publisher(Image, topic, 1)
+        self.compressed_pub = node.create_publisher(CompressedImage, topic + '/compressed', 1)
+        self.params = [cv2.IMWRITE_JPEG_QUALITY, int(jpeg_quality)]
+        self.latest = None
+
+    def wanted(self):
+        """보는 구독자가 있는지 (없으면 그리기도 생략 가능)"""
+        return self.raw_pub.get_subscription_count() > 0 or self.compressed_pub.get_subscription_count() > 0
+
+    def publish(self, image, header=None):
+        """header 는 원본 color 헤더 (viewer 가 카메라 → 화면 지연을 잴 수 있게)"""
+        self.latest = image
+        if self.raw_pub.get_subscription_count() > 0:
+            msg = self.bridge.cv2_to_imgmsg(image, 'bgr8')
+            if header is not None:
+                msg.header = header
+            self.raw_pub.publish(msg)
+        if self.compressed_pub.get_subscription_count() > 0:
+            ok, encoded = cv2.imencode('.jpg', image, self.params)
+            if ok:
+                msg = CompressedImage()
+                if header is not None:
+                    msg.header = header
+                msg.format = 'jpeg'
+                msg.data = encoded.tobytes()
+                self.compressed_pub.publish(msg)
+
+    def save_latest(self, directory, prefix):
+        """마지막으로 발행한 결과 이미지를 저장, 저장한 경로 (없으면 None)"""
+        if self.latest is None:
+            return None
+        os.makedirs(directory, exist_ok=True)
+        stamp = time.time()
+        name = time.strftime('%Y%m%d_%H%M%S', time.localtime(stamp)) + f'_{int(stamp * 1000) % 1000:03d}'
+        path = os.path.join(directory, f'{prefix}_{name}.jpg')
+        ok, encoded = cv2.imencode('.jpg', self.latest, [cv2.IMWRITE_JPEG_QUALITY, 95])
+        if not ok:
+            raise ValueError('encode failed')
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(encoded.tobytes())
+        os.replace(tmp_path, path)
+        return path
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+선반 ROI 추론 평가 (전체 프레임 imgsz 640 vs ROI 잘라서 작은 imgsz)
+
+기록한 프레임에서 두 방식을 같은 백엔드로 돌려 지연과 재현율을 비교한다.
+정답은 --labels (YOLO-OBB 라벨) 중 중심이 ROI 안에 있는 물체, 라벨이 없으면
+전체 프레임 추론 결과 중 중심이 ROI 안에 있는 검출 (ROI 추론이 이것을 놓치지 않는지 본다).
+
+사용 예:
+    ros2 run yolo_obb_detection roi_eval ~/segmentation_project/data/image --model best.pt --roi 240 113 250 210
+"""
+import argparse
+import json
+import os
+import time
+
+import cv2
+import numpy as np
+
+from yolo_obb_detection.inference_backends import BACKENDS, create_backend, exported_model_path
+from yolo_obb_detection.obb_eval import ObbEvaluator, load_labels
+from yolo_obb_detection.shelf_roi import DEFAULT_ROI, center_inside, parse_roi, predict_roi, roi_imgsz
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.bmp')
+
+
+def load_backend(kind, weights, imgsz, threads):
+    path = weights if kind == 'torch' or not weights.endswith('.pt') else exported_model_path(weights, kind, imgsz)
+    if not os.path.exists(path):
+        raise SystemExit(f'❌ 모델 없음: {path} → export_obb_model --imgsz {imgsz} 로 생성')
+    backend = create_backend(kind, path, imgsz, threads)
+    backend.warmup()
+    return backend
+
+
+def main():
+    parser = argparse.ArgumentParser(description='선반 ROI 추론 지연/재현율 평가')
+    parser.add_argument('images_dir', help='기록한 프레임 디렉터리')
+    parser.add_argument('--model', default='/home/xotn/ros2_ws/src/yolo_obb_detection/models/best.pt')
+    parser.add_argument('--labels', default=None, help='YOLO-OBB 라벨 디렉터리 (없으면 전체 프레임 추론이 기준)')
+    parser.add_argument('--backend', choices=BACKENDS, default='torch')
+    parser.add_argument('--threads', type=int, default=0)
+    parser.add_argument('--imgsz', type=int, default=640, help='전체 프레임 추론 크기')
+    parser.add_argument('--roi', nargs=4, type=int, default=list(DEFAULT_ROI), metavar=('X', 'Y', 'W', 'H'))
+    parser.add_argument('--roi-margin', type=int, default=16)
+    parser.add_argument('--roi-imgsz', type=int, default=0, help='0 이면 ROI 에 맞춰 자동')
+    parser.add_argument('--conf', type=float, default=0.7, help='yolo_obb_node confidence_threshold')
+    parser.add_argument('--iou', type=float, default=0.7)
+    parser.add_argument('--count', type=int, default=200)
+    parser.add_argument('--report', default=None, help='결과 JSON 경로')
+    args, _ = parser.parse_known_args()
+
+    roi = parse_roi(args.roi)
+    if roi is None:
+        raise SystemExit(f'❌ 잘못된 ROI: {args.roi}')
+    images_dir = os.path.expanduser(args.images_dir)
+    names = sorted(n for n in os.listdir(images_dir) if n.lower().endswith(IMAGE_EXTENSIONS))[:args.count]
+    weights = os.path.expanduser(args.model)
+    crop_imgsz = args.roi_imgsz or roi_imgsz([roi], args.roi_margin)
+    full_model = load_backend(args.backend, weights, args.imgsz, args.threads)
+    roi_model = load_backend(args.backend, weights, crop_imgsz, args.threads)
+    labels_dir = os.path.expanduser(args.labels) if args.labels else None
+
+    full_eval = ObbEvaluator(error_conf=args.conf)
+    roi_eval = ObbEvaluator(error_conf=args.conf)
+    full_ms, roi_ms = [], []
+    for name in names:
+        image = cv2.imread(os.path.join(images_dir, name), cv2.IMREAD_COLOR)
+        if image is None:
+            continue
+        started = time.perf_counter()
+        full = full_model.predict(image, conf=args.conf, iou=args.iou)
+        full_ms.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        cropped = predict_roi(roi_model, image, roi, args.roi_margin, conf=args.conf, iou=args.iou)
+        roi_ms.append(time.perf_counter() - started)
+
+        if labels_dir:
+            height, width = image.shape[:2]
+            gt_points, gt_classes = load_labels(
+                os.path.join(labels_dir, os.path.splitext(name)[0] + '.txt'), width, height)
+        else:
+            gt_points, gt_classes = full.points, full.classes
+        keep = center_inside(gt_points, roi)
+        gt_points, gt_classes = gt_points[keep], gt_classes[keep]
+        # 비교는 ROI 안 물체만 (전체 프레임 추론의 ROI 밖 검출은 로봇이 쓰지 않음)
+        for evaluator, result in ((full_eval, full), (roi_eval, cropped)):
+            inside = center_inside(result.points, roi)
+            evaluator.add(result.points[inside], result.confidences[inside], result.classes[inside],
+                          gt_points, gt_classes)
+
+    if not full_ms:
+        raise SystemExit(f'❌ 읽을 수 있는 이미지 없음: {images_dir}')
+    full_ms, roi_ms = np.array(full_ms) * 1000.0, np.array(roi_ms) * 1000.0
+    full_summary, roi_summary = full_eval.summary(), roi_eval.summary()
+    objects = full_summary['objects']
+    report = {
+        'images': len(full_ms),
+        'backend': args.backend,
+        'roi': list(roi),
+        'roi_margin': args.roi_margin,
+        'reference': 'labels' if labels_dir else 'full_frame',
+        'objects': objects,
+    }
+    for key, imgsz, ms, summary in (('full_frame', full_model.imgsz, full_ms, full_summary),
+                                    ('roi', roi_model.imgsz, roi_ms, roi_summary)):
+        report[key] = {
+            'imgsz': imgsz,
+            'mean_ms': float(ms.mean()),
+            'p95_ms': float(np.percentile(ms, 95)),
+            'recall': summary['matched'] / objects if objects else None,  # error_conf == conf 라 matched 가 TP 수
+            'map50': summary['map50'],
+            'mean_angle_error': summary['mean_angle_error'],
+            'mean_center_error': summary['mean_center_error'],
+        }
+
+    def fmt(value, spec='.3f'):
+        return '-' if value is None else format(value, spec)
+
+    print(f'🖼️ {report["images"]}장, ROI {roi} (+{args.roi_margin}px), 기준 {report["reference"]}, ROI 안 물체 {objects}개')
+    print(f'{"":<11} {"imgsz":>5} {"mean ms":>8} {"p95 ms":>8} {"recall":>7} {"mAP@0.5":>8} {"각도 오차":>9}')
+    for key in ('full_frame', 'roi'):
+        row = report[key]
+        print(f'{key:<11} {row["imgsz"]:>5} {row["mean_ms"]:>8.1f} {row["p95_ms"]:>8.1f} {fmt(row["recall"]):>7} '
+              f'{row["map50"]:>8.3f} {fmt(row["mean_angle_error"], ".2f"):>9}')
+    speedup = report['full_frame']['mean_ms'] / report['roi']['mean_ms']
+    print(f'⚡ ROI 추론 {speedup:.2f}배 빠름')
+    if args.report:
+        report_path = os.path.expanduser(args.report)
+        with open(report_path + '.tmp', 'w') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        os.replace(report_path + '.tmp', report_path)
+        print(f'📝 보고서: {report_path}')
+
+
+if __name__ == '__main__':
+    main()
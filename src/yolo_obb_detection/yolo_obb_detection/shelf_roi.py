@@ -0,0 +1,66 @@
+"""
+선반 ROI 잘라서 추론
+
+집기 영역은 층마다 화면의 고정된 선반 구역이고, RobotControl.camera_to_robot_coordinates 도
+그 안에서만 보정되어 있다. 전체 프레임을 640 으로 돌리는 대신 ROI (+여백) 만 잘라
+같은 픽셀 배율이 되는 작은 imgsz 로 추론하고, 꼭짓점은 전체 프레임 좌표로 되돌린다.
+"""
+import math
+
+import numpy as np
+
+from yolo_obb_detection.inference_backends import ObbResult
+
+# (x, y, w, h) 픽셀 - opencv_node.process 의 ROI 와 같은 값
+DEFAULT_ROI = (240, 113, 250, 210)
+FLOORS = (1, 2, 3)
+
+
+def parse_roi(values):
+    """[x, y, w, h] → 튜플, 잘못된 값이면 None"""
+    if values is None or len(values) != 4:
+        return None
+    x, y, w, h = (int(v) for v in values)
+    if w <= 0 or h <= 0 or x < 0 or y < 0:
+        return None
+    return x, y, w, h
+
+
+def expand_roi(roi, margin, width, height):
+    """ROI 에 여백을 붙이고 영상 안으로 자름 (경계에 걸친 물체도 온전히 보이도록)"""
+    x, y, w, h = roi
+    x0, y0 = max(0, x - margin), max(0, y - margin)
+    x1, y1 = min(width, x + w + margin), min(height, y + h + margin)
+    return x0, y0, x1 - x0, y1 - y0
+
+
+def roi_imgsz(rois, margin, stride=32, max_imgsz=640):
+    """ROI 들의 긴 변 (+여백) 을 stride 배수로 올린 크기 - 배율이 거의 1 이라 물체 크기가 전체 프레임 추론과 같다"""
+    longest = max(max(w, h) + 2 * margin for _, _, w, h in rois)
+    return min(max_imgsz, int(math.ceil(longest / stride) * stride))
+
+
+def crop(image, roi, margin=0):
+    """→ (잘라낸 영상 (뷰), 실제로 쓴 ROI)"""
+    height, width = image.shape[:2]
+    x, y, w, h = expand_roi(roi, margin, width, height)
+    return image[y:y + h, x:x + w], (x, y, w, h)
+
+
+def to_full_frame(points, used_roi):
+    """잘라낸 영상 기준 꼭짓점 (N, 4, 2) → 전체 프레임 좌표"""
+    return points + np.array(used_roi[:2], dtype=points.dtype)
+
+
+def center_inside(points, roi):
+    """꼭짓점 (N, 4, 2) 중심이 ROI 안에 있는지 (N,) bool"""
+    x, y, w, h = roi
+    centers = points.mean(axis=1) if len(points) else np.zeros((0, 2), dtype=np.float32)
+    return (centers[:, 0] >= x) & (centers[:, 0] < x + w) & (centers[:, 1] >= y) & (centers[:, 1] < y + h)
+
+
+def predict_roi(model, image, roi, margin=0, conf=0.25, iou=0.7):
+    """ROI 만 추론한 ObbResult (꼭짓점은 전체 프레임 좌표)"""
+    cropped, used_roi = crop(image, roi, margin)
+    result = model.predict(cropped, conf=conf, iou=iou)
+    return ObbResult(to_full_frame(result.points, used_roi), result.confidences, result.classes, result.names)
@@ -4,14 +4,24 @@ import rclpy
 from rclpy.node import Node
 from sensor_msgs.msg import Image
 from std_msgs.msg import String
+from std_srvs.srv import Trigger
+from logistics_interfaces.msg import OrientedDetectionArray
 from cv_bridge import CvBridge
 import cv2
 import numpy as np
-from ultralytics import YOLO
 import time
 import math
 import json
-from collections import deque
+import threading
+
+from rclpy.qos import DurabilityPolicy, QoSProfile
+
+from yolo_obb_detection.depth_engine import ObbDepthEngine
+from yolo_obb_detection.detection_codec import DETECTIONS_TOPIC, make_array, make_detection
+from yolo_obb_detection.inference_backends import BACKENDS, PRECISIONS, create_backend, exported_model_path
+from yolo_obb_detection.obb_geometry import correct_rotation_with_hsv, correction_confidence, final_angle, obb_angle
+from yolo_obb_detection.result_image import ResultImagePublisher
+from yolo_obb_detection.shelf_roi import DEFAULT_ROI, FLOORS, parse_roi, predict_roi, roi_imgsz
 
 
 class YoloObbNode(Node):
@@ -21,28 +31,93 @@ class YoloObbNode(Node):
         # 파라미터
         self.declare_parameter('model_path', '/home/xotn/ros2_ws/src/yolo_obb_detection/models/best.pt')
         self.declare_parameter('confidence_threshold', 0.70)
-        self.declare_parameter('display_enabled', True)
+        # 창은 띄우지 않음 - 결과는 /yolo_result(/compressed), 보기/키 입력은 detection_viewer
+        self.declare_parameter('result_jpeg_quality', 80)
+        self.declare_parameter('snapshot_dir', '/home/xotn/ros2_ws/snapshots/yolo')
+        # 추론 백엔드: torch / onnxruntime / openvino
+        # onnxruntime/openvino 에서 model_path 가 .pt 이면 export_obb_model 이 만든 best_<imgsz>.onnx 등을 찾는다
+        self.declare_parameter('backend', 'torch')
+        self.declare_parameter('imgsz', 640)
+        self.declare_parameter('precision', 'fp32')     # int8: quantize_obb_model 이 채택한 best_<imgsz>_int8.onnx
+        self.declare_parameter('inference_threads', 0)  # 0 이면 런타임 기본값
+        self.declare_parameter('iou_threshold', 0.7)
+        self.declare_parameter('warmup_iterations', 3)  # 0 이면 워밍업 생략
+        # 선반 ROI [x, y, w, h]: 트리거의 floor 에 맞는 ROI 만 잘라 작은 imgsz 로 추론
+        # roi_imgsz 0 이면 가장 큰 ROI(+여백) 에 맞춰 자동 (onnxruntime/openvino 는 그 크기로 내보낸 모델 필요)
+        self.declare_parameter('roi_enabled', True)
+        self.declare_parameter('roi_margin', 16)
+        self.declare_parameter('roi_imgsz', 0)
+        self.declare_parameter('roi.default', list(DEFAULT_ROI))
+        for floor in FLOORS:
+            self.declare_parameter(f'roi.floor_{floor}', list(DEFAULT_ROI))
+        # 물체별 뎁스: OBB 를 depth_shrink 배 줄인 영역의 중앙값, 트랙마다 depth_window 프레임 평균
+        self.declare_parameter('depth_shrink', 0.8)
+        self.declare_parameter('depth_min_valid_ratio', 0.2)
+        self.declare_parameter('depth_window', 5)
+        self.declare_parameter('depth_track_distance', 20.0)   # 같은 물체로 볼 중심 거리 (픽셀)
         
         model_path = self.get_parameter('model_path').get_parameter_value().string_value
         self.conf_threshold = self.get_parameter('confidence_threshold').get_parameter_value().double_value
-        self.display_enabled = self.get_parameter('display_enabled').get_parameter_value().bool_value
-        
-        # YOLO 모델 로드
-        try:
-            self.model = YOLO(model_path)
-            self.get_logger().info(f'YOLO model loaded: {model_path}')
-        except Exception as e:
-            self.get_logger().error(f'Failed to load model: {str(e)}')
-            return
+        self.snapshot_dir = self.get_parameter('snapshot_dir').value
+        self.iou_threshold = self.get_parameter('iou_threshold').value
+        backend = self.get_parameter('backend').value
+        imgsz = self.get_parameter('imgsz').value
+        precision = self.get_parameter('precision').value
+        if backend not in BACKENDS:
+            self.get_logger().warn(f'⚠️ 알 수 없는 backend: {backend} - torch 사용')
+            backend = 'torch'
+        if precision not in PRECISIONS or (precision == 'int8' and backend == 'torch'):
+            self.get_logger().warn(f'⚠️ {backend} 에서 precision {precision} 사용 불가 - fp32 사용')
+            precision = 'fp32'
+        self.roi_enabled = self.get_parameter('roi_enabled').value
+        self.roi_margin = self.get_parameter('roi_margin').value
+        self.rois = {}
+        for key in ['default'] + [f'floor_{floor}' for floor in FLOORS]:
+            roi = parse_roi(self.get_parameter(f'roi.{key}').value)
+            if roi is None:
+                self.get_logger().warn(f'⚠️ 잘못된 roi.{key} - 기본 ROI {DEFAULT_ROI} 사용')
+                roi = DEFAULT_ROI
+            self.rois[key] = roi
+        self.current_roi = self.rois['default']
+        if self.roi_enabled:
+            imgsz = self.get_parameter('roi_imgsz').value or roi_imgsz(self.rois.values(), self.roi_margin)
+            self.get_logger().info(f'✂️ 선반 ROI 추론: imgsz {imgsz}, 여백 {self.roi_margin}px, '
+                                   + ', '.join(f'{k}={v}' for k, v in self.rois.items()))
+        if model_path.endswith('.pt'):
+            model_path = exported_model_path(model_path, backend, imgsz, precision)
+        
+        # 준비 상태 (loading → warming_up → ready / failed), 늦게 붙은 구독자도 마지막 상태를 받도록 transient local
+        self.startup_time = time.perf_counter()
+        self.model = None
+        self.model_ready = threading.Event()
+        self.first_detection_reported = False
+        self.trigger_time = None
+        self.ready_info = {'state': 'loading', 'ready': False, 'backend': backend, 'precision': precision,
+                           'model': model_path}
+        self.ready_pub = self.create_publisher(
+            String, '/yolo/ready', QoSProfile(depth=1, durability=DurabilityPolicy.TRANSIENT_LOCAL))
+        self.publish_ready_state('loading')
+        
+        # YOLO 모델 로드 + 워밍업은 백그라운드에서 (torch/ultralytics 등 런타임 import 도 이때)
+        # 준비 전에 온 검출 요청은 보류했다가 준비되면 처리한다
+        self.loader_thread = threading.Thread(
+            target=self.load_model, args=(backend, model_path, imgsz, precision), name='yolo_model_loader', daemon=True)
+        self.loader_thread.start()
         
         self.bridge = CvBridge()
         
         # 최신 이미지 저장용
         self.latest_color_image = None
+        self.latest_color_header = None
         self.latest_depth_image = None
         
-        # 뎁스 값 안정화를 위한 버퍼
-        self.depth_buffer = deque(maxlen=5)
+        # 뎁스 값 안정화는 물체(트랙)별로
+        self.depth_engine = ObbDepthEngine(
+            shrink=self.get_parameter('depth_shrink').value,
+            min_valid_ratio=self.get_parameter('depth_min_valid_ratio').value,
+            window=self.get_parameter('depth_window').value,
+            max_distance=self.get_parameter('depth_track_distance').value)
+        self.depth_estimates = []
         
         # 구독자들
         self.color_sub = self.create_subscription(
@@ -55,16 +130,17 @@ class YoloObbNode(Node):
             String, '/yolo/detection_trigger', self.detection_trigger_callback, 10)
         
         # 퍼블리셔들
-        self.result_pub = self.create_publisher(Image, '/yolo_result', 1)
-        self.detection_result_pub = self.create_publisher(String, '/yolo/detection_result', 10)
-        
-        # OpenCV 윈도우 설정
-        if self.display_enabled:
-            cv2.namedWindow('YOLO Detection', cv2.WINDOW_AUTOSIZE)
-            cv2.namedWindow('Detection Info', cv2.WINDOW_AUTOSIZE)
-            self.get_logger().info('🖥️ OpenCV 디스플레이가 활성화되었습니다.')
-        else:
-            self.get_logger().info('🚫 OpenCV 디스플레이가 비활성화되었습니다.')
+        self.result_image = ResultImagePublisher(
+            self, self.bridge, '/yolo_result', self.get_parameter('result_jpeg_quality').value)
+        # 기존 JSON (/yolo/detection_result) 이 필요하면 detection_json_bridge 실행
+        self.detection_result_pub = self.create_publisher(OrientedDetectionArray, DETECTIONS_TOPIC, 10)
+        
+        # 상태 (viewer 정보 창용) + viewer 키 입력을 받는 서비스
+        self.status_pub = self.create_publisher(String, '~/status', 1)
+        self.status_timer = self.create_timer(1.0, self.publish_status)
+        self.trigger_srv = self.create_service(Trigger, '~/trigger', self.trigger_service)
+        self.save_srv = self.create_service(Trigger, '~/save', self.save_service)
+        self.reset_srv = self.create_service(Trigger, '~/reset', self.reset_service)
         
         # 처리 타이머
         self.timer = self.create_timer(0.1, self.process_images)
@@ -83,11 +159,42 @@ class YoloObbNode(Node):
         self.frame_count = 0
         self.last_fps_time = time.time()
         
-        self.get_logger().info('🎯 YOLO OBB Node started with display')
+        self.get_logger().info('🎯 YOLO OBB Node started (headless, 화면은 detection_viewer)')
+
+    def load_model(self, backend, model_path, imgsz, precision):
+        try:
+            started = time.perf_counter()
+            model = create_backend(backend, model_path, imgsz, self.get_parameter('inference_threads').value)
+            load_ms = (time.perf_counter() - started) * 1000
+            self.get_logger().info(f'YOLO model loaded: {model_path} ({backend} {precision}, imgsz {model.imgsz}, '
+                                   f'{load_ms:.0f} ms)')
+            
+            # 더미 입력으로 첫 추론 비용(그래프 최적화, 메모리 할당 등)을 미리 치름
+            self.publish_ready_state('warming_up', load_ms=round(load_ms, 1))
+            started = time.perf_counter()
+            model.warmup(self.get_parameter('warmup_iterations').value)
+            warmup_ms = (time.perf_counter() - started) * 1000
+        except Exception as e:
+            self.get_logger().error(f'Failed to load model: {str(e)}')
+            self.publish_ready_state('failed', error=str(e))
+            return
+        
+        self.model = model
+        self.model_ready.set()
+        startup_ms = (time.perf_counter() - self.startup_time) * 1000
+        self.publish_ready_state('ready', warmup_ms=round(warmup_ms, 1), startup_ms=round(startup_ms, 1))
+        self.get_logger().info(f'🟢 YOLO 준비 완료: 시작 후 {startup_ms:.0f} ms (워밍업 {warmup_ms:.0f} ms)')
+
+    def publish_ready_state(self, state, **info):
+        self.ready_info.update(info, state=state, ready=state == 'ready', timestamp=time.time())
+        msg = String()
+        msg.data = json.dumps(self.ready_info)
+        self.ready_pub.publish(msg)
 
     def color_callback(self, msg):
         try:
             self.latest_color_image = self.bridge.imgmsg_to_cv2(msg, "bgr8")
+            self.latest_color_header = msg.header
         except Exception as e:
             self.get_logger().error(f'Color callback error: {str(e)}')
 
@@ -101,35 +208,22 @@ class YoloObbNode(Node):
         try:
             trigger_data = json.loads(msg.data)
             self.target_name = trigger_data.get('target', 'unknown')
+            self.current_roi = self.roi_for_floor(trigger_data.get('floor'))
             self.detection_requested = True
+            self.trigger_time = time.perf_counter()
             self.display_info['target'] = self.target_name
-            self.get_logger().info(f'🔍 검출 요청 수신: {self.target_name}')
+            if self.model_ready.is_set():
+                self.get_logger().info(f'🔍 검출 요청 수신: {self.target_name}')
+            else:
+                self.get_logger().info(f'⏳ 검출 요청 수신: {self.target_name} - 모델 준비 후 처리 ({self.ready_info["state"]})')
         except json.JSONDecodeError as e:
             self.get_logger().error(f'검출 트리거 파싱 오류: {e}')
 
-    def get_depth_at_point(self, x, y):
-        if self.latest_depth_image is None:
-            return None
-        
-        height, width = self.latest_depth_image.shape
-        if 0 <= x < width and 0 <= y < height:
-            x_start = max(0, x-2)
-            x_end = min(width, x+3)
-            y_start = max(0, y-2)
-            y_end = min(height, y+3)
-            
-            depth_region = self.latest_depth_image[y_start:y_end, x_start:x_end]
-            valid_depths = depth_region[depth_region > 0]
-            
-            if len(valid_depths) > 0:
-                current_depth = np.median(valid_depths)
-                self.depth_buffer.append(current_depth)
-                
-                if len(self.depth_buffer) >= 3:
-                    return np.mean(self.depth_buffer)
-                else:
-                    return current_depth
-        return None
+    def roi_for_floor(self, floor):
+        try:
+            return self.rois.get(f'floor_{int(floor)}', self.rois['default'])
+        except (TypeError, ValueError):
+            return self.rois['default']
 
     def pixel_to_robot_coordinates(self, pixel_x, pixel_y):
         robot_x = (1 / 15) * pixel_y - (113 / 15)
@@ -144,261 +238,141 @@ class YoloObbNode(Node):
             self.frame_count = 0
             self.last_fps_time = current_time
 
-    def create_info_display(self):
-        info_img = np.zeros((300, 400, 3), dtype=np.uint8)
-        
-        # # 제목
-        # cv2.putText(info_img, 'YOLO Detection Info', (10, 30), 
-        #            cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
-        
-        # 구분선
-        cv2.line(info_img, (10, 40), (390, 40), (255, 255, 255), 1)
-        
-        # # 정보 표시
-        # y_pos = 70
-        # info_lines = [
-        #     f"Target: {self.display_info['target']}",
-        #     f"Objects Count: {self.display_info['objects_count']}",
-        #     f"FPS: {self.display_info['fps']:.1f}",
-        #     f"Detection Requested: {'Yes' if self.detection_requested else 'No'}",
-        #     "",
-        #     "Controls:",
-        #     "ESC - Exit",
-        #     "SPACE - Manual trigger",
-        #     "R - Reset info"
-        # ]
-        
-        # for i, line in enumerate(info_lines):
-        #     color = (0, 255, 0) if i < 4 else (200, 200, 200)
-        #     cv2.putText(info_img, line, (10, y_pos + i * 25), 
-        #                cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
-        
-        return info_img
+    def publish_status(self):
+        status = dict(self.display_info, state=self.ready_info['state'], detection_requested=self.detection_requested)
+        msg = String()
+        msg.data = json.dumps(status)
+        self.status_pub.publish(msg)
 
-    def correct_rotation_with_hsv(self, image, obb_points, center_x, center_y):
-        """HSV 기반으로 회전 각도 보정 - 버그 수정"""
-        
+    def trigger_service(self, request, response):
+        self.detection_requested = True
+        self.get_logger().info('🔍 수동 검출 트리거')
+        response.success = True
+        response.message = 'detection requested' if self.model_ready.is_set() else f'queued ({self.ready_info["state"]})'
+        return response
+
+    def save_service(self, request, response):
         try:
-            # ROI 영역 확장 (여유 공간 확보)
-            x, y, w, h = cv2.boundingRect(obb_points)
-            margin = 20
-            roi_y_start = max(0, y-margin)
-            roi_y_end = min(image.shape[0], y+h+margin)
-            roi_x_start = max(0, x-margin)
-            roi_x_end = min(image.shape[1], x+w+margin)
-            
-            roi = image[roi_y_start:roi_y_end, roi_x_start:roi_x_end]
-            
-            # ROI가 유효한지 확인
-            if roi.shape[0] <= 0 or roi.shape[1] <= 0:
-                self.get_logger().debug('ROI 크기가 유효하지 않음')
-                return None
-            
-            # HSV 변환
-            hsv = cv2.cvtColor(roi, cv2.COLOR_BGR2HSV)
-            
-            # **수정된 부분**: ROI의 실제 크기 사용
-            roi_h, roi_w = roi.shape[:2]
-            if roi_h <= 0 or roi_w <= 0:
-                self.get_logger().debug('ROI 크기가 0 이하')
-                return None
-                
-            # ROI 중심점의 색상 (수정된 인덱스 사용)
-            roi_center_color = hsv[roi_h//2, roi_w//2]
-            
-            # HSV 범위 설정 - 더 넓은 범위로 설정
-            hue = roi_center_color[0]
-            sat = roi_center_color[1] 
-            val = roi_center_color[2]
-            
-            # 무채색 객체 처리
-            if sat < 30:  # 채도가 낮으면 밝기 기반으로
-                lower_hsv = np.array([0, 0, max(0, val - 40)])
-                upper_hsv = np.array([180, 255, min(255, val + 40)])
-            else:  # 유채색 객체
-                lower_hsv = np.array([max(0, hue - 30), 30, 30])
-                upper_hsv = np.array([min(180, hue + 30), 255, 255])
-            
-            # 마스크 생성
-            color_mask = cv2.inRange(hsv, lower_hsv, upper_hsv)
-            
-            # 노이즈 제거
-            kernel = np.ones((3, 3), np.uint8)
-            color_mask = cv2.morphologyEx(color_mask, cv2.MORPH_OPEN, kernel)
-            color_mask = cv2.morphologyEx(color_mask, cv2.MORPH_CLOSE, kernel)
-            
-            # 컨투어 찾기
-            contours, _ = cv2.findContours(color_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            
-            if contours:
-                # 가장 큰 컨투어 선택
-                largest_contour = max(contours, key=cv2.contourArea)
-                
-                # 컨투어 크기 검증
-                area = cv2.contourArea(largest_contour)
-                if area < 50:  # 임계값을 50으로 낮춤
-                    self.get_logger().debug(f'컨투어 크기가 너무 작음: {area}')
-                    return None
-                
-                # MinAreaRect로 정확한 회전각 계산
-                rect = cv2.minAreaRect(largest_contour)
-                corrected_angle = rect[2]
-                
-                # 각도 보정
-                if rect[1][0] < rect[1][1]:  # width < height
-                    corrected_angle += 90
-                
-                # 0-360도 범위로 정규화
-                if corrected_angle < 0:
-                    corrected_angle += 360
-                elif corrected_angle >= 360:
-                    corrected_angle -= 360
-                
-                self.get_logger().debug(f'HSV 보정 성공: {corrected_angle:.1f}도 (컨투어 크기: {area:.1f})')
-                return corrected_angle
-            else:
-                self.get_logger().debug('유효한 컨투어를 찾을 수 없음')
-                return None
-                
-        except Exception as e:
-            self.get_logger().warn(f'HSV 보정 중 예외 발생: {str(e)}')
-            return None
+            path = self.result_image.save_latest(self.snapshot_dir, 'yolo')
+        except (OSError, ValueError) as e:
+            path = None
+            response.message = f'save failed: {e}'
+        else:
+            response.message = path or 'no result image yet'
+        response.success = path is not None
+        if path is not None:
+            self.get_logger().info(f'💾 결과 이미지 저장: {path}')
+        return response
 
-    def calculate_correction_confidence(self, yolo_angle, corrected_angle):
-        if corrected_angle is None:
-            return 0.0
-        
-        angle_diff = abs(yolo_angle - corrected_angle)
-        if angle_diff > 180:
-            angle_diff = 360 - angle_diff
-        
-        confidence = max(0, 1 - angle_diff / 90.0)
-        return confidence
+    def reset_service(self, request, response):
+        self.display_info = {
+            'objects_count': 0,
+            'last_detection_time': 0,
+            'target': 'None',
+            'fps': 0
+        }
+        self.depth_engine.reset()
+        self.get_logger().info('📊 정보 리셋')
+        response.success = True
+        response.message = 'reset'
+        return response
 
     def process_images(self):
-        if self.latest_color_image is None:
+        if self.latest_color_image is None or not self.model_ready.is_set():
             return
         try:
             self.calculate_fps()
             
-            results = self.model.predict(source=self.latest_color_image, imgsz=640, conf=self.conf_threshold, verbose=False)
-            
-            if results[0].obb is not None:
-                self.display_info['objects_count'] = len(results[0].obb)
+            if self.roi_enabled:
+                result = predict_roi(self.model, self.latest_color_image, self.current_roi, self.roi_margin,
+                                     conf=self.conf_threshold, iou=self.iou_threshold)
             else:
-                self.display_info['objects_count'] = 0
-            
-            annotated = self.draw_results(self.latest_color_image, results[0])
+                result = self.model.predict(self.latest_color_image, conf=self.conf_threshold, iou=self.iou_threshold)
+            self.display_info['objects_count'] = len(result)
+            self.depth_estimates = self.depth_engine.update(
+                result.points, self.latest_depth_image, time.time(), self.latest_color_image.shape)
             
             if self.detection_requested:
-                self.publish_detection_results(results[0])
+                self.publish_detection_results(result)
                 self.detection_requested = False
                 self.display_info['last_detection_time'] = time.time()
+                if not self.first_detection_reported and self.trigger_time is not None:
+                    self.first_detection_reported = True
+                    latency_ms = (time.perf_counter() - self.trigger_time) * 1000
+                    self.publish_ready_state('ready', first_detection_ms=round(latency_ms, 1))
+                    self.get_logger().info(f'⏱️ 첫 검출 지연 {latency_ms:.0f} ms '
+                                           f'(시작 후 {time.perf_counter() - self.startup_time:.1f} s)')
             
-            if self.display_enabled:
-                cv2.imshow('YOLO Detection', annotated)
-                
-                info_display = self.create_info_display()
-                cv2.imshow('Detection Info', info_display)
-                
-                key = cv2.waitKey(1) & 0xFF
-                if key == 27:  # ESC
-                    self.get_logger().info('ESC pressed, shutting down...')
-                    rclpy.shutdown()
-                elif key == ord(' '):  # SPACE
-                    self.detection_requested = True
-                    self.get_logger().info('🔍 수동 검출 트리거')
-                elif key == ord('r') or key == ord('R'):  # R
-                    self.display_info = {
-                        'objects_count': 0,
-                        'last_detection_time': 0,
-                        'target': 'None',
-                        'fps': 0
-                    }
-                    self.get_logger().info('📊 정보 리셋')
-            
-            try:
-                result_msg = self.bridge.cv2_to_imgmsg(annotated, "bgr8")
-                self.result_pub.publish(result_msg)
-            except Exception as e:
-                self.get_logger().error(f'Result image publish error: {str(e)}')
+            # 결과 그리기 (물체마다 HSV 보정 포함) 는 보는 구독자가 있을 때만
+            if self.result_image.wanted():
+                try:
+                    annotated = self.draw_results(self.latest_color_image, result)
+                    self.result_image.publish(annotated, self.latest_color_header)
+                except Exception as e:
+                    self.get_logger().error(f'Result image publish error: {str(e)}')
             
         except Exception as e:
             self.get_logger().error(f'Processing error: {str(e)}')
 
     def publish_detection_results(self, result):
-        detected_objects = []
+        detections = []
         
-        if result.obb is not None and len(result.obb) > 0:
-            obb_coords = result.obb.xyxyxyxy.cpu().numpy()
-            
-            for i, coords in enumerate(obb_coords):
+        if len(result) > 0:
+            for i, coords in enumerate(result.points):
                 points = coords.reshape(4, 2).astype(np.int32)
                 
-                len_side1 = np.linalg.norm(points[1] - points[0])
-                len_side2 = np.linalg.norm(points[2] - points[1])
-                
-                if len_side1 <= len_side2:
-                    yolo_angle = math.degrees(math.atan2(points[1][1] - points[0][1], points[1][0] - points[0][0]))
-                else:
-                    yolo_angle = math.degrees(math.atan2(points[2][1] - points[1][1], points[2][0] - points[1][0]))
-                
-                if yolo_angle < 0:
-                    yolo_angle += 360
+                yolo_angle = obb_angle(points)
                 
                 center_x = np.mean(points[:, 0])
                 center_y = np.mean(points[:, 1])
                 
                 try:
-                    corrected_angle = self.correct_rotation_with_hsv(
-                        self.latest_color_image, points, center_x, center_y)
-                    
-                    confidence = self.calculate_correction_confidence(yolo_angle, corrected_angle)
-                    final_angle = corrected_angle if (corrected_angle is not None and confidence > 0.3) else yolo_angle
+                    corrected_angle = correct_rotation_with_hsv(self.latest_color_image, points, self.get_logger())
+                    confidence = correction_confidence(yolo_angle, corrected_angle)
+                    chosen_angle = final_angle(yolo_angle, corrected_angle, confidence)
                     
                 except Exception as e:
                     self.get_logger().warn(f'HSV 보정 실패: {str(e)}')
                     corrected_angle = None
                     confidence = 0.0
-                    final_angle = yolo_angle
+                    chosen_angle = yolo_angle
                 
-                depth_mm = self.get_depth_at_point(int(center_x), int(center_y))
+                depth = self.depth_estimates[i]
                 robot_x, robot_y = self.pixel_to_robot_coordinates(center_x, center_y)
                 
-                detected_object = {
-                    'id': i,
-                    'pixel_x': float(center_x),
-                    'pixel_y': float(center_y),
-                    'yolo_angle': float(yolo_angle),
-                    'corrected_angle': float(corrected_angle) if corrected_angle is not None else None,
-                    'final_angle': float(final_angle),
-                    'correction_confidence': float(confidence),
-                    'depth_mm': float(depth_mm) if depth_mm is not None else None,
-                    'robot_x': float(robot_x),
-                    'robot_y': float(robot_y)
-                }
-                
-                detected_objects.append(detected_object)
+                detections.append(make_detection(
+                    i,
+                    track_id=depth['track_id'],
+                    class_id=result.classes[i],
+                    confidence=result.confidences[i],
+                    pixel_x=center_x,
+                    pixel_y=center_y,
+                    angle=chosen_angle,
+                    yolo_angle=yolo_angle,
+                    correction_confidence=confidence,
+                    width=np.linalg.norm(points[1] - points[0]),
+                    height=np.linalg.norm(points[2] - points[1]),
+                    depth_mm=depth['depth_mm'],
+                    depth_valid_ratio=depth['valid_ratio'],
+                    robot_x=robot_x,
+                    robot_y=robot_y))
                 
                 if corrected_angle is not None:
                     self.get_logger().info(
-                        f'🎯 보정 결과 #{i+1}: YOLO({yolo_angle:.0f}°) → HSV보정({corrected_angle:.0f}°) → 최종({final_angle:.0f}°) [신뢰도: {confidence:.2f}]'
+                        f'🎯 보정 결과 #{i+1}: YOLO({yolo_angle:.0f}°) → HSV보정({corrected_angle:.0f}°) → 최종({chosen_angle:.0f}°) [신뢰도: {confidence:.2f}]'
                     )
                 else:
                     self.get_logger().info(
-                        f'📐 검출 결과 #{i+1}: YOLO({yolo_angle:.0f}°) → HSV보정 실패 → 최종({final_angle:.0f}°)'
+                        f'📐 검출 결과 #{i+1}: YOLO({yolo_angle:.0f}°) → HSV보정 실패 → 최종({chosen_angle:.0f}°)'
                     )
         
-        result_msg = String()
-        result_data = {
-            'target': self.target_name,
-            'timestamp': time.time(),
-            'objects': detected_objects
-        }
-        result_msg.data = json.dumps(result_data)
+        header = self.latest_color_header
+        result_msg = make_array(self.target_name, 'yolo_obb', detections,
+                                header.stamp if header is not None else self.get_clock().now().to_msg(),
+                                header.frame_id if header is not None else '')
         self.detection_result_pub.publish(result_msg)
         
-        self.get_logger().info(f'✅ 검출 결과 발행: {len(detected_objects)}개 객체 (HSV 보정 포함)')
+        self.get_logger().info(f'✅ 검출 결과 발행: {len(detections)}개 객체 (HSV 보정 포함)')
 
     def draw_results(self, image, result):
         annotated = image.copy()
@@ -416,28 +390,17 @@ class YoloObbNode(Node):
         # cv2.putText(annotated, f"Status: {status} | HSV Correction: ON", (10, 55), 
         #         cv2.FONT_HERSHEY_SIMPLEX, 0.6, status_color, 2)
         
-        if result.obb is not None and len(result.obb) > 0:
-            obb_coords = result.obb.xyxyxyxy.cpu().numpy()
-            
-            for i, coords in enumerate(obb_coords):
+        if len(result) > 0:
+            for i, coords in enumerate(result.points):
                 points = coords.reshape(4, 2).astype(np.int32)
                 
-                len_side1 = np.linalg.norm(points[1] - points[0])
-                len_side2 = np.linalg.norm(points[2] - points[1])
-                
-                if len_side1 <= len_side2:
-                    yolo_angle = math.degrees(math.atan2(points[1][1] - points[0][1], points[1][0] - points[0][0]))
-                else:
-                    yolo_angle = math.degrees(math.atan2(points[2][1] - points[1][1], points[2][0] - points[1][0]))
-                
-                if yolo_angle < 0:
-                    yolo_angle += 360
+                yolo_angle = obb_angle(points)
                 
                 center_x = np.mean(points[:, 0])
                 center_y = np.mean(points[:, 1])
                 
-                corrected_angle = self.correct_rotation_with_hsv(image, points, center_x, center_y)
-                confidence = self.calculate_correction_confidence(yolo_angle, corrected_angle)
+                corrected_angle = correct_rotation_with_hsv(image, points, self.get_logger())
+                confidence = correction_confidence(yolo_angle, corrected_angle)
                 
                 colors = [(0, 255, 0), (255, 0, 0), (0, 0, 255), (255, 255, 0), (255, 0, 255)]
                 color = colors[i % len(colors)]
@@ -447,10 +410,10 @@ class YoloObbNode(Node):
                 cv2.circle(annotated, (int(center_x), int(center_y)), 8, (0, 0, 255), -1)
                 cv2.circle(annotated, (int(center_x), int(center_y)), 12, (255, 255, 255), 2)
                 
-                final_angle = corrected_angle if (corrected_angle is not None and confidence > 0.3) else yolo_angle
+                chosen_angle = final_angle(yolo_angle, corrected_angle, confidence)
                 arrow_length = 40
-                end_x = int(center_x + arrow_length * math.cos(math.radians(final_angle)))
-                end_y = int(center_y + arrow_length * math.sin(math.radians(final_angle)))
+                end_x = int(center_x + arrow_length * math.cos(math.radians(chosen_angle)))
+                end_y = int(center_y + arrow_length * math.sin(math.radians(chosen_angle)))
                 cv2.arrowedLine(annotated, (int(center_x), int(center_y)), (end_x, end_y), (0, 255, 255), 3, tipLength=0.3)
                 
                 # # 객체 번호와 각도 정보 텍스트도 주석처리
@@ -459,7 +422,7 @@ class YoloObbNode(Node):
                 
                 # yolo_info = f"YOLO: {yolo_angle:.0f}deg"
                 # hsv_info = f"HSV: {corrected_angle:.0f}deg ({confidence:.2f})" if corrected_angle is not None else "HSV: Failed"
-                # final_info = f"Final: {final_angle:.0f}deg"
+                # final_info = f"Final: {chosen_angle:.0f}deg"
                 
                 # bg_height = 75
                 # cv2.rectangle(annotated, 
@@ -474,6 +437,10 @@ class YoloObbNode(Node):
                 # cv2.putText(annotated, final_info, (int(center_x) - 75, int(center_y) + 75),
                 #         cv2.FONT_HERSHEY_SIMPLEX, 0.45, (0, 255, 0), 1)
         
+        if self.roi_enabled:
+            x, y, w, h = self.current_roi
+            cv2.rectangle(annotated, (x, y), (x + w, y + h), (255, 255, 0), 1)
+        
         # 중앙 십자선은 유지
         h, w = annotated.shape[:2]
         cv2.line(annotated, (w//2 - 20, h//2), (w//2 + 20, h//2), (255, 255, 255), 2)
@@ -493,7 +460,6 @@ def main(args=None):
     finally:
         if 'node' in locals():
             node.destroy_node()
-        cv2.destroyAllWindows()
         rclpy.shutdown()
 
 